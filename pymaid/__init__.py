@@ -79,6 +79,12 @@ except Exception as error:
     logger.warning(str(error))
     logger.warning('Error importing pymaid.connectivity:\n' + str(error))
 
+try:
+    from .store import *
+except Exception as error:
+    logger.warning(str(error))
+    logger.warning('Error importing pymaid.store:\n' + str(error))
+
 try:
     from .utils import *
 except Exception as error:
@@ -22,6 +22,8 @@ import math
 import numpy as np
 import pandas as pd
 import scipy.cluster.hierarchy
+import scipy.sparse
+import scipy.sparse.csgraph
 import scipy.spatial
 
 from concurrent.futures import ThreadPoolExecutor
@@ -707,17 +709,30 @@ class ClustResults:
     >>> # Extract 5 clusters
     >>> res.get_clusters(5, criterion = 'maxclust' )
 
+    For large matrices, keep only the condensed (upper triangle) distances
+    as float32 in a memory-mapped file and use the approximate k-NN
+    clustering:
+
+    >>> res = pymaid.ClustResults(big_mat, mat_type='similarity',
+    ...                           condensed=True, dtype=np.float32,
+    ...                           memmap='dist.dat')
+    >>> res.cluster(method='knn', n_neighbors=20)
+    >>> res.get_clusters(50, criterion='maxclust')
+
     """
 
     _PERM_MAT_TYPES = ['similarity', 'distance']
 
-    def __init__(self, mat, labels=None, mat_type='distance'):
+    def __init__(self, mat, labels=None, mat_type='distance', condensed=False,
+                 dtype=None, memmap=None):
         """ Initialize class instance.
 
         Parameters
         ----------
         mat :       numpy.array | pandas.DataFrame
-                    Distance or similarity matrix.
+                    Distance or similarity matrix. Can be square or a
+                    condensed (1-dimensional, see
+                    ``scipy.spatial.distance.squareform``) matrix.
         labels :    list, optional
                     Labels for matrix.
         mat_type :  'distance' | 'similarity', default = 'distance'
@@ -725,31 +740,79 @@ class ClustResults:
                       - 'similarity' = high values are more similar
                       - 'distance' = low values are more similar
 
-                    The "missing" matrix type will be computed. For clustering,
-                    plotting, etc. distance matrices are used.
+                    The "missing" matrix type will be computed when it is
+                    first requested. For clustering, plotting, etc. distance
+                    matrices are used.
+        condensed : bool, optional
+                    If True, will only keep the condensed distance matrix
+                    (half the memory of a square matrix). ``dist_mat`` and
+                    ``sim_mat`` are then generated on request. Implied if
+                    ``mat`` is already condensed. Note that the diagonal
+                    of a condensed similarity matrix is lost: if it is
+                    passed directly, the conversion to distances uses the
+                    maximum off-diagonal similarity.
+        dtype :     numpy.dtype, optional
+                    If provided, will convert the matrix to this data type.
+                    Use e.g. ``np.float32`` to halve memory usage.
+        memmap :    str, optional
+                    Filename. If provided, the condensed distance matrix will
+                    be stored in a memory-mapped file instead of RAM. Implies
+                    ``condensed=True``.
 
         """
         if mat_type not in ClustResults._PERM_MAT_TYPES:
             raise ValueError('Matrix type "{0}" unkown.'.format(mat_type))
 
-        if mat_type == 'similarity':
-            self.dist_mat = self._invert_mat(mat)
-            self.sim_mat = mat
-        else:
-            self.dist_mat = mat
-            self.sim_mat = self._invert_mat(mat)
-
         self.labels = labels
         self.mat_type = mat_type
 
-        if isinstance(labels, type(None)) and isinstance(mat, pd.DataFrame):
-            self.labels = mat.columns.tolist()
+        # Cache for linkages (one per method)
+        self._linkages = {}
+
+        if isinstance(mat, pd.DataFrame):
+            self._ids = mat.columns.tolist()
+        else:
+            self._ids = None
+
+        if isinstance(labels, type(None)) and not isinstance(self._ids, type(None)):
+            self.labels = self._ids
+
+        # The inverse of the matrix is "max value - matrix" in either direction
+        self._inv_max = mat.max().max() if isinstance(mat, pd.DataFrame) else mat.max()
+
+        if np.asarray(mat).ndim == 1 or condensed or memmap:
+            # Keep only the condensed distance matrix
+            self._condensed = _to_condensed(mat,
+                                            invert=mat_type == 'similarity',
+                                            inv_max=self._inv_max,
+                                            dtype=dtype,
+                                            memmap=memmap)
+            self._n_obs = scipy.spatial.distance.num_obs_y(self._condensed)
+        else:
+            self._condensed = None
+            self._n_obs = mat.shape[0]
+
+            if not isinstance(dtype, type(None)):
+                mat = mat.astype(dtype)
+
+            # The "missing" matrix is generated upon first request
+            if mat_type == 'similarity':
+                self.sim_mat = mat
+            else:
+                self.dist_mat = mat
 
     def __getattr__(self, key):
-        if key == 'linkage':
+        if key.startswith('__'):
+            # Make sure e.g. pickle/copy don't mistake this for a method
+            raise AttributeError(key)
+        elif key == 'linkage':
             self.cluster()
             return self.linkage
+        elif key in ['dist_mat', 'sim_mat']:
+            return self._get_matrix(key)
         elif key == 'condensed_dist_mat':
+            if not isinstance(self._condensed, type(None)):
+                return self._condensed
             return scipy.spatial.distance.squareform(self.dist_mat,
                                                      checks=False)
         elif key in ['leafs', 'leaves']:
@@ -759,6 +822,29 @@ class ClustResults:
         elif key == 'agg_coeff':
             return self.calc_agg_coeff()
 
+    def _get_matrix(self, key):
+        """ Generates (and keeps) the requested square matrix. """
+        if not isinstance(self._condensed, type(None)):
+            logger.warning('Generating square matrix from condensed '
+                           'distances ({0} x {0}).'.format(self._n_obs))
+            mat = scipy.spatial.distance.squareform(self._condensed,
+                                                    checks=False)
+            if key == 'sim_mat':
+                mat = self._invert_mat(mat, inv_max=self._inv_max)
+                # The diagonal of the original matrix is lost when condensed
+                np.fill_diagonal(mat, self._inv_max)
+            if not isinstance(self._ids, type(None)):
+                mat = pd.DataFrame(mat, index=self._ids, columns=self._ids)
+        elif key == 'sim_mat':
+            mat = self._invert_mat(self.__dict__['dist_mat'])
+        else:
+            mat = self._invert_mat(self.__dict__['sim_mat'])
+
+        # Keep for future use
+        self.__dict__[key] = mat
+
+        return mat
+
     def get_leafs(self, use_labels=False):
         """ Use to retrieve labels.
 
@@ -771,13 +857,15 @@ class ClustResults:
 
         """
 
-        if isinstance(self.dist_mat, pd.DataFrame):
+        leaves = scipy.cluster.hierarchy.leaves_list(self.linkage)
+
+        if not isinstance(self._ids, type(None)):
             if use_labels:
-                return [self.labels[i] for i in scipy.cluster.hierarchy.leaves_list(self.linkage)]
+                return [self.labels[i] for i in leaves]
             else:
-                return [self.dist_mat.columns.tolist()[i] for i in scipy.cluster.hierarchy.leaves_list(self.linkage)]
+                return [self._ids[i] for i in leaves]
         else:
-            return scipy.cluster.hierarchy.leaves_list(self.linkage)
+            return leaves
 
     def calc_cophenet(self):
         """ Returns Cophenetic Correlation coefficient of your clustering.
@@ -821,37 +909,51 @@ class ClustResults:
 
         return coeff
 
-    def _invert_mat(self, sim_mat):
+    def _invert_mat(self, sim_mat, inv_max=None):
         """ Inverts matrix."""
-        if isinstance(sim_mat, pd.DataFrame):
-            return (sim_mat - sim_mat.max().max()) * -1
-        else:
-            return (sim_mat - sim_mat.max()) * -1
+        if isinstance(inv_max, type(None)):
+            inv_max = self._inv_max
+        return inv_max - sim_mat
 
-    def cluster(self, method='ward'):
+    def cluster(self, method='ward', n_neighbors=15):
         """ Cluster distance matrix.
 
         This will automatically be called when attribute linkage is requested
-        for the first time.
+        for the first time. Linkages are cached: clustering again with the
+        same method will simply reuse the previous results.
 
         Parameters
         ----------
-        method :    str, optional
-                    Clustering method (see scipy.cluster.hierarchy.linkage
-                    for reference)
+        method :        str, optional
+                        Clustering method (see scipy.cluster.hierarchy.linkage
+                        for reference). Use "knn" for an approximate single
+                        linkage computed from the minimum spanning tree of
+                        the k-nearest-neighbour graph. This is much cheaper
+                        than exact linkage for very large matrices.
+        n_neighbors :   int, optional
+                        Number of nearest neighbours per observation. Only
+                        relevant if ``method='knn'``.
 
         """
 
-        # Use condensed distance matrix - otherwise clustering thinks we are
-        # passing observations instead of final scores
-        self.linkage = scipy.cluster.hierarchy.linkage(self.condensed_dist_mat,
-                                                       method=method)
+        key = method if method != 'knn' else (method, n_neighbors)
+
+        if key not in self._linkages:
+            if method == 'knn':
+                self._linkages[key] = _knn_linkage(self.condensed_dist_mat,
+                                                   n_neighbors=n_neighbors)
+            else:
+                # Use condensed distance matrix - otherwise clustering thinks
+                # we are passing observations instead of final scores
+                self._linkages[key] = scipy.cluster.hierarchy.linkage(self.condensed_dist_mat,
+                                                                      method=method)
+            logger.info('Clustering done using method "{0}"'.format(method))
+
+        self.linkage = self._linkages[key]
 
         # Save method in case we want to look it up later
         self.cluster_method = method
 
-        logger.info('Clustering done using method "{0}"'.format(method))
-
     def plot_dendrogram(self, color_threshold=None, return_dendrogram=False,
                         labels=None, fig=None, **kwargs):
         """ Plot dendrogram using matplotlib.
@@ -1096,7 +1198,7 @@ class ClustResults:
 
         cl = self.get_clusters(k, criterion, return_type='indices')
 
-        cl = [[self.dist_mat.index.tolist()[i] for i in l] for l in cl]
+        cl = [[self._ids[i] for i in l] for l in cl]
 
         colors = [colorsys.hsv_to_rgb(1 / len(cl) * i, 1, 1)
                   for i in range(len(cl) + 1)]
@@ -1129,14 +1231,17 @@ class ClustResults:
         cl = scipy.cluster.hierarchy.fcluster(
             self.linkage, k, criterion=criterion)
 
+        # Group indices by cluster (clusters are sorted by their ID)
+        srt = np.argsort(cl, kind='mergesort')
+        _, splits = np.unique(cl[srt], return_index=True)
+        indices = np.split(srt, splits[1:])
+
         if self.labels and return_type.lower() == 'labels':
-            return [[self.labels[j] for j in range(len(cl)) if cl[j] == i] for i in range(min(cl), max(cl) + 1)]
-        elif return_type.lower() == 'rows':
-            return [[self.dist_mat.columns.tolist()[j] for j in range(len(cl)) if cl[j] == i] for i in range(min(cl), max(cl) + 1)]
-        elif return_type.lower() == 'columns':
-            return [[self.dist_mat.index.tolist()[j] for j in range(len(cl)) if cl[j] == i] for i in range(min(cl), max(cl) + 1)]
+            return [[self.labels[j] for j in ix] for ix in indices]
+        elif return_type.lower() in ['rows', 'columns']:
+            return [[self._ids[j] for j in ix] for ix in indices]
         else:
-            return [[j for j in range(len(cl)) if cl[j] == i] for i in range(min(cl), max(cl) + 1)]
+            return [ix.tolist() for ix in indices]
 
     def to_tree(self):
         """ Turns linkage to ete3 tree.
@@ -1158,7 +1263,7 @@ class ClustResults:
                 'Please install ete3 package to use this function.')
 
         max_dist = self.linkage[-1][2]
-        n_original_obs = self.dist_mat.shape[0]
+        n_original_obs = self._n_obs
 
         list_of_childs = {n_original_obs + i: e[:2]
                           for i, e in enumerate(self.linkage)}
@@ -1173,7 +1278,7 @@ class ClustResults:
         dist_to_parent = {
             n: max_dist - total_dist[list_of_parents[n]] for n in list_of_parents}
 
-        names = {i: n for i, n in enumerate(self.dist_mat.columns.tolist())}
+        names = {i: n for i, n in enumerate(self._ids)}
 
         # Create empty tree
         tree = ete3.Tree()
@@ -1192,6 +1297,204 @@ class ClustResults:
         return tree
 
 
+def _to_condensed(mat, invert=False, inv_max=None, dtype=None, memmap=None):
+    """ Turns square or condensed matrix into condensed distance matrix.
+
+    Works row by row to avoid intermediate copies of the full matrix.
+
+    Parameters
+    ----------
+    mat :       numpy.array | pandas.DataFrame
+                Square or condensed matrix.
+    invert :    bool, optional
+                If True, will invert matrix (i.e. similarity -> distance)
+                using ``inv_max - mat``.
+    inv_max :   int | float, optional
+                Value used for inversion. Defaults to max of ``mat``.
+    dtype :     numpy.dtype, optional
+                Data type of the condensed matrix. Defaults to that of
+                ``mat``.
+    memmap :    str, optional
+                If provided will write condensed matrix to a memory-mapped
+                file with this name.
+
+    Returns
+    -------
+    numpy.array | numpy.memmap
+                Condensed matrix. If ``mat`` already is a condensed distance
+                matrix of the requested data type, it is returned as is.
+
+    """
+
+    if isinstance(mat, pd.DataFrame):
+        mat = mat.values
+
+    if isinstance(dtype, type(None)):
+        dtype = mat.dtype
+
+    if invert and isinstance(inv_max, type(None)):
+        inv_max = mat.max()
+
+    if mat.ndim == 1:
+        n = scipy.spatial.distance.num_obs_y(mat)
+    elif mat.ndim == 2 and mat.shape[0] == mat.shape[1]:
+        n = mat.shape[0]
+    else:
+        raise ValueError('Matrix must be square or condensed.')
+
+    if mat.ndim == 1 and not invert and not memmap and mat.dtype == dtype:
+        return mat
+
+    size = n * (n - 1) // 2
+    if memmap:
+        out = np.memmap(memmap, dtype=dtype, mode='w+', shape=(size,))
+    else:
+        out = np.empty(size, dtype=dtype)
+
+    if mat.ndim == 1:
+        # Process in chunks of ~10M values
+        for i in range(0, size, int(1e7)):
+            out[i: i + int(1e7)] = mat[i: i + int(1e7)]
+    else:
+        i = 0
+        for row in range(n - 1):
+            out[i: i + n - row - 1] = mat[row, row + 1:]
+            i += n - row - 1
+
+    if invert:
+        for i in range(0, size, int(1e7)):
+            out[i: i + int(1e7)] = inv_max - out[i: i + int(1e7)]
+
+    if memmap:
+        out.flush()
+
+    return out
+
+
+def _knn_graph(y, n_neighbors=15, groups=None, chunk_size=int(1e7)):
+    """ Generates k-nearest-neighbour graph from condensed distance matrix.
+
+    Parameters
+    ----------
+    y :             numpy.array
+                    Condensed distance matrix. Is processed in chunks of rows,
+                    so this can be a memory-mapped array.
+    n_neighbors :   int
+                    Number of neighbours per observation.
+    groups :        numpy.array, optional
+                    Group label for each observation. If provided, will only
+                    consider neighbours from other groups.
+    chunk_size :    int, optional
+                    Approximate number of distances processed at a time.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+                    (N, N) sparse matrix with distances to nearest neighbours.
+
+    """
+
+    n = scipy.spatial.distance.num_obs_y(y)
+    k = min(n_neighbors, n - 1)
+
+    rows, cols, dists = [], [], []
+    step = max(1, chunk_size // n)
+    for start in range(0, n, step):
+        r = np.arange(start, min(n, start + step))[:, None]
+        c = np.arange(n)[None, :]
+
+        # Indices into condensed matrix for (min(r, c), max(r, c))
+        i, j = np.minimum(r, c), np.maximum(r, c)
+        ix = n * i - i * (i + 1) // 2 + (j - i - 1)
+
+        # Diagonal is not part of the condensed matrix
+        d = y[np.where(r == c, 0, ix)].astype(np.float64)
+        d[r == c] = np.inf
+
+        if not isinstance(groups, type(None)):
+            d[groups[r.ravel()][:, None] == groups[None, :]] = np.inf
+
+        # Get k closest neighbours
+        nn = np.argpartition(d, k - 1, axis=1)[:, :k]
+        nn_dist = np.take_along_axis(d, nn, axis=1)
+
+        is_edge = np.isfinite(nn_dist)
+        rows.append(np.repeat(r.ravel(), k)[is_edge.ravel()])
+        cols.append(nn[is_edge])
+        dists.append(nn_dist[is_edge])
+
+    rows, cols, dists = np.concatenate(rows), np.concatenate(cols), np.concatenate(dists)
+
+    # Zero-distances would be dropped as non-edges
+    dists[dists <= 0] = np.finfo(np.float64).tiny
+
+    return scipy.sparse.csr_matrix((dists, (rows, cols)), shape=(n, n))
+
+
+def _knn_linkage(y, n_neighbors=15):
+    """ Approximates single linkage from k-nearest-neighbour graph.
+
+    Uses the minimum spanning tree of the k-NN graph. Unconnected components
+    of the graph are joined via their closest observations (Boruvka-style)
+    before the linkage is generated.
+
+    Parameters
+    ----------
+    y :             numpy.array
+                    Condensed distance matrix.
+    n_neighbors :   int
+                    Number of neighbours per observation.
+
+    Returns
+    -------
+    numpy.array
+                    Linkage matrix (see ``scipy.cluster.hierarchy.linkage``).
+
+    """
+
+    n = scipy.spatial.distance.num_obs_y(y)
+
+    graph = _knn_graph(y, n_neighbors)
+    while True:
+        mst = scipy.sparse.csgraph.minimum_spanning_tree(graph)
+        n_comp, comp = scipy.sparse.csgraph.connected_components(mst,
+                                                                 directed=False)
+        if n_comp == 1:
+            break
+        logger.debug('Joining {} unconnected components'.format(n_comp))
+        # Add each observation's closest neighbour in another component
+        graph = graph.maximum(_knn_graph(y, 1, groups=comp))
+
+    # Sort edges by distance
+    mst = mst.tocoo()
+    srt = np.argsort(mst.data, kind='mergesort')
+    edges = np.c_[mst.row[srt], mst.col[srt]]
+    dists = mst.data[srt]
+
+    # Union-find: track the cluster each observation currently belongs to
+    parent = np.arange(2 * n - 1)
+    size = np.ones(2 * n - 1, dtype=int)
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    Z = np.zeros((n - 1, 4))
+    for i, ((a, b), d) in enumerate(zip(edges, dists)):
+        a, b = find(a), find(b)
+        new = n + i
+        parent[a] = parent[b] = new
+        size[new] = size[a] + size[b]
+        Z[i] = [min(a, b), max(a, b), d, size[new]]
+
+    return Z
+
+
 def _calc_sparseness(x, mode='activity_ratio'):
     """ Calculates sparseness for a set of neurons.
 
@@ -15,6 +15,7 @@
 #    along
 
 import logging
+
 logger = logging.getLogger('pymaid')
 logger.setLevel(logging.INFO)
 if len(logger.handlers) == 0:
@@ -39,6 +40,28 @@ use_igraph = True
 # Default color for neurons
 default_color = (.95, .65, .04)
 
+# Directory in which closed (past) windows of the project history are cached
+# on disk (see pymaid.get_history). Off by default. To activate, set e.g.:
+#   pymaid.config.history_cache = os.path.expanduser('~/.pymaid/history')
+history_cache = None
+
+# Directory in which image tiles are cached on disk (see pymaid.tiles.LoadTiles)
+# and the max size of that cache in megabytes. Off by default. To activate,
+# set e.g.:
+#   pymaid.config.tile_cache = os.path.expanduser('~/.pymaid/tiles')
+tile_cache = None
+tile_cache_size = 2000
+
+# Time in seconds for which resolutions of annotations/names to skeleton IDs
+# (see pymaid.eval_skids) are memoized per CatmaidInstance. Only applies if
+# caching is on. Set to 0 to deactivate.
+skid_cache_ttl = 300
+
+# Time in seconds after which neuron names, user and annotation lists held in
+# a CatmaidInstance's metadata registry are refreshed from the server. Only
+# applies if caching is on. Set to 0 to deactivate or None for no limit.
+metadata_ttl = 300
+
 def _type_of_script():
     """ Returns context in which pymaid is run. """
     try:
@@ -22,6 +22,7 @@ from itertools import combinations
 
 import pandas as pd
 import numpy as np
+import scipy.sparse
 import scipy.spatial
 import scipy.stats
 
@@ -33,10 +34,12 @@ logger = config.logger
 __all__ = sorted(['filter_connectivity', 'cable_overlap',
                   'predict_connectivity', 'adjacency_matrix', 'group_matrix',
                   'adjacency_from_connectors', 'cn_table_from_connectors',
-                  'connection_density', 'sparseness'])
+                  'connection_density', 'sparseness',
+                  'SparseAdjacencyMatrix'])
 
 
-def filter_connectivity(x, restrict_to, remote_instance=None):
+def filter_connectivity(x, restrict_to, remote_instance=None,
+                        connector_store=None):
     """ Filters connectivity data by volume or skeleton data.
 
     Use this e.g. to restrict connectivity to edges within a given volume or
@@ -61,6 +64,9 @@ def filter_connectivity(x, restrict_to, remote_instance=None):
                         will be interpreted as volumes.
     remote_instance :   CATMAID instance, optional
                         If not passed, will try using globally defined.
+    connector_store :   ConnectorStore, optional
+                        If provided, connectors between neurons are
+                        retrieved from this store instead of the server.
 
     Returns
     -------
@@ -106,10 +112,11 @@ def filter_connectivity(x, restrict_to, remote_instance=None):
 
         # First get connector between neurons on the table
         if not x[x.relation == 'upstream'].empty:
-            upstream = fetch.get_connectors_between(x[x.relation == 'upstream'].skeleton_id,
-                                                    neurons,
-                                                    directional=True,
-                                                    remote_instance=remote_instance)
+            upstream = _get_connectors_between(x[x.relation == 'upstream'].skeleton_id,
+                                               neurons,
+                                               directional=True,
+                                               remote_instance=remote_instance,
+                                               connector_store=connector_store)
             # Now filter connectors
             if isinstance(restrict_to, (core.CatmaidNeuron, core.CatmaidNeuronList)):
                 upstream = upstream[upstream.connector_id.isin(
@@ -121,10 +128,11 @@ def filter_connectivity(x, restrict_to, remote_instance=None):
             upstream = None
 
         if not x[x.relation == 'downstream'].empty:
-            downstream = fetch.get_connectors_between(neurons,
-                                                      x[x.relation =='downstream'].skeleton_id,
-                                                      directional=True,
-                                                      remote_instance=remote_instance)
+            downstream = _get_connectors_between(neurons,
+                                                 x[x.relation =='downstream'].skeleton_id,
+                                                 directional=True,
+                                                 remote_instance=remote_instance,
+                                                 connector_store=connector_store)
             # Now filter connectors
             if isinstance(restrict_to, (core.CatmaidNeuron, core.CatmaidNeuronList)):
                 downstream = downstream[downstream.connector_id.isin(
@@ -148,10 +156,11 @@ def filter_connectivity(x, restrict_to, remote_instance=None):
             raise TypeError('Adjacency matrix appears to be grouped. Unable '
                             'to process that.')
 
-        cn_data = fetch.get_connectors_between(x.index.values,
-                                               x.columns.values,
-                                               directional=True,
-                                               remote_instance=remote_instance)
+        cn_data = _get_connectors_between(x.index.values,
+                                          x.columns.values,
+                                          directional=True,
+                                          remote_instance=remote_instance,
+                                          connector_store=connector_store)
 
         # Now filter connectors
         if isinstance(restrict_to, (core.CatmaidNeuron, core.CatmaidNeuronList)):
@@ -170,26 +179,20 @@ def filter_connectivity(x, restrict_to, remote_instance=None):
     edges = cn_data[['source_neuron', 'target_neuron']].values
 
     if edges.shape[0] > 0:
-        # Turn individual edges into synaptic connections
-        unique_edges, counts = np.unique(edges, return_counts=True, axis=0)
-        unique_skids = np.unique(edges).astype(str)
-        unique_edges = unique_edges.astype(str)
+        # Turn individual edges into synaptic connections: duplicate entries
+        # are summed up by the sparse matrix
+        unique_skids, ix = np.unique(edges.astype(int), return_inverse=True)
+        ix = ix.reshape(edges.shape)
+        adj = scipy.sparse.coo_matrix((np.ones(ix.shape[0]),
+                                       (ix[:, 0], ix[:, 1])),
+                                      shape=(len(unique_skids),
+                                             len(unique_skids))).toarray()
+        unique_skids = unique_skids.astype(str)
     else:
-        unique_edges = []
-        counts = []
+        adj = np.zeros((0, 0))
         unique_skids = []
 
-    # Create empty adj_mat
-    adj_mat = pd.DataFrame(np.zeros((len(unique_skids), len(unique_skids))),
-                           columns=unique_skids, index=unique_skids)
-
-    # Fill in values
-    for i, e in enumerate(config.tqdm(unique_edges,
-                                      disable=config.pbar_hide,
-                                      desc='Regenerating',
-                                      leave=config.pbar_leave)):
-        # using df.at here speeds things up tremendously!
-        adj_mat.at[str(e[0]), str(e[1])] = counts[i]
+    adj_mat = pd.DataFrame(adj, columns=unique_skids, index=unique_skids)
 
     if datatype == 'adjacency_matrix':
         return adj_mat.reindex(index=x.index.astype(str),
@@ -481,7 +484,7 @@ def predict_connectivity(source, target, method='possible_contacts',
     return matrix.astype(int)
 
 
-def cn_table_from_connectors(x, remote_instance=None):
+def cn_table_from_connectors(x, remote_instance=None, connector_store=None):
     """ Generate connectivity table from neurons' connectors.
 
     This function creates the connectivity table from scratch using just the
@@ -492,8 +495,13 @@ def cn_table_from_connectors(x, remote_instance=None):
 
     Parameters
     ----------
-    x :         CatmaidNeuron | CatmaidNeuronList
-                Neuron(s) for which to generate connectivity table.
+    x :                 CatmaidNeuron | CatmaidNeuronList
+                        Neuron(s) for which to generate connectivity table.
+    remote_instance :   CATMAID instance, optional
+                        If not passed, will try using globally defined.
+    connector_store :   ConnectorStore, optional
+                        If provided, connector details are retrieved from
+                        this store instead of the server.
 
     Returns
     -------
@@ -541,107 +549,136 @@ def cn_table_from_connectors(x, remote_instance=None):
     if isinstance(x, core.CatmaidNeuron):
         x = core.CatmaidNeuronList(x)
 
-    # Get connector details for all neurons
-    all_cn = x.connectors.connector_id.values
-    cn_details = fetch.get_connector_details(all_cn)
+    # Get connector details for all neurons and explode into links
+    cn_details = _get_connector_details(x.connectors.connector_id.values,
+                                        remote_instance=remote_instance,
+                                        connector_store=connector_store)
+    links = _explode_links(cn_details, resolve_skids=True,
+                           remote_instance=remote_instance)
+
+    # Map treenodes and connectors to fragments. Attention: we NEED to index
+    # by position as skeleton IDs might not be unique!
+    nodes = _fragment_table(x, 'nodes', 'treenode_id')
+    cn = _fragment_table(x, 'connectors', 'connector_id')
+
+    # Upstream: links onto a fragment's treenodes from neurons not in x
+    us = links[~links.pre_skid.isin(x.skeleton_id.astype(int))]
+    us = us.merge(nodes.rename(columns={'treenode_id': 'post_node'}),
+                  on='post_node').merge(cn, on=['connector_id', 'ix'])
+    us = us.groupby(['pre_skid', 'ix']).size()
+
+    # Downstream: links from a fragment's treenodes
+    ds = links.merge(nodes.rename(columns={'treenode_id': 'pre_node'}),
+                     on='pre_node').merge(cn, on=['connector_id', 'ix'])
+    ds = ds.groupby(['post_skid', 'ix']).size()
+
+    tables = []
+    for counts, rel in zip([us, ds], ['upstream', 'downstream']):
+        partners, row = np.unique(counts.index.get_level_values(0),
+                                  return_inverse=True)
+        mat = scipy.sparse.coo_matrix((counts.values.astype(float),
+                                       (row.ravel(),
+                                        counts.index.get_level_values(1))),
+                                      shape=(len(partners), len(x))).toarray()
+        # Make sure we keep the order of the original neuronlist
+        table = pd.DataFrame(mat, columns=x.skeleton_id)
+        table.insert(0, 'skeleton_id', partners)
+        table.insert(1, 'relation', rel)
+        table.insert(2, 'total', mat.sum(axis=1))
+        tables.append(table)
+
+    cn_table = pd.concat(tables, axis=0, ignore_index=True)
 
-    # Remove connectors for which there are either no pre- or no postsynaptic
-    # neurons
-    cn_details = cn_details[cn_details.postsynaptic_to.apply(len) != 0]
-    cn_details = cn_details[~cn_details.presynaptic_to.isnull()]
+    # Add names
+    names = fetch.get_names(cn_table.skeleton_id.values,
+                            remote_instance=remote_instance)
+    cn_table.insert(0, 'neuron_name',
+                    [names[str(s)] for s in cn_table.skeleton_id.values])
 
-    # We need to map treenode ID to skeleton ID in cases where there are more
-    # links (postsynaptic_to_node) than targets (postsynaptic_to)
-    multi_links = cn_details[cn_details.postsynaptic_to.apply(len) < cn_details.postsynaptic_to_node.apply(len)]
-    if not multi_links.empty:
-        tn_to_fetch = [tn for l in multi_links.postsynaptic_to_node for tn in l]
-        tn_to_skid = fetch.get_skid_from_treenode(tn_to_fetch,
-                                                  remote_instance=remote_instance)
-    else:
-        tn_to_skid = {}
-
-    # Collect all pre and postsynaptic neurons
-    all_pre = cn_details[~cn_details.presynaptic_to.isin(x.skeleton_id.astype(int))]
-    all_post = cn_details[cn_details.presynaptic_to.isin(x.skeleton_id.astype(int))]
-
-    all_partners = np.append(all_pre.presynaptic_to.values,
-                             [n for l in all_post.postsynaptic_to.values for n in l])
-
-    us_dict = {}
-    ds_dict = {}
-    # Go over over all neurons and process connectivity
-    for i, n in enumerate(config.tqdm(x, desc='Processing',
-                          disable=config.pbar_hide, leave=config.pbar_leave)):
-
-        # First prepare upstream partners:
-        # Get all treenodes
-        this_tn = set(n.nodes.treenode_id.values)
-        # Prepare upstream partners
-        this_us = all_pre[all_pre.connector_id.isin(n.connectors.connector_id.values)].copy()
-        # Get the number of all links per connector
-        this_us['n_links'] = [len(this_tn & set(r.postsynaptic_to_node))
-                                           for r in this_us.itertuples()]
-        # Group by input and store as dict. Attention: we NEED to index by
-        # neuron as skeleton IDs might not be unique!
-        us_dict[n] = this_us.groupby('presynaptic_to').n_links.sum().to_dict()
-        this_us = this_us.groupby('presynaptic_to').n_links.sum()
-
-        # Now prepare downstream partners:
-        # Get all downstream connectors
-        this_ds = all_post[all_post.presynaptic_to == int(n.skeleton_id)]
-        # Prepare dict
-        ds_dict[n] = {p: 0 for p in all_partners}
-        # Easy cases first (single link to target per connector)
-        is_single = this_ds.postsynaptic_to.apply(len) >= this_ds.postsynaptic_to_node.apply(len)
-        for r in this_ds[is_single].itertuples():
-            for s in r.postsynaptic_to:
-                ds_dict[n][s] += 1
-        # Now hard cases - will have to look up skeleton ID via treenode ID
-        for r in this_ds[~is_single].itertuples():
-            for s in r.postsynaptic_to_node:
-                ds_dict[n][tn_to_skid[s]] += 1
-
-    # Now that we have all data, let's generate the table
-    us_table = pd.DataFrame.from_dict(us_dict)
-    ds_table = pd.DataFrame.from_dict(ds_dict)
-
-    # Make sure we keep the order of the original neuronlist
-    us_table = us_table[[n for n in x]]
-    us_table.columns=[n.skeleton_id for n in us_table.columns]
-    ds_table = ds_table[[n for n in x]]
-    ds_table.columns=[n.skeleton_id for n in ds_table.columns]
-
-    ds_table['relation'] = 'downstream'
-    us_table['relation'] = 'upstream'
-
-    # Generate table
-    cn_table = pd.concat([us_table, ds_table], axis=0)
-
-    # Replace NaN with 0
-    cn_table = cn_table.fillna(0)
-
-    # Make skeleton ID a column
-    cn_table = cn_table.reset_index(drop=False)
-    cn_table.columns = ['skeleton_id'] + list(cn_table.columns[1:])
+    # Sort by number of synapses
+    cn_table = cn_table.sort_values(['relation', 'total'],
+                                    ascending=False).reset_index(drop=True)
 
-    # Add names
-    names = fetch.get_names(cn_table.skeleton_id.values)
-    cn_table['neuron_name'] = [names[str(s)] for s in cn_table.skeleton_id.values]
-    cn_table['total'] = cn_table[x.skeleton_id].sum(axis=1)
+    return cn_table
 
-    # Drop rows with 0 synapses (e.g. if neuron is only up- but not downstream)
-    cn_table = cn_table[cn_table.total > 0]
 
-    # Sort by number of synapses
-    cn_table = cn_table.sort_values(['relation', 'total'], ascending=False).reset_index()
+def _explode_links(cn_details, resolve_skids=False, remote_instance=None):
+    """ Turns connector details into a table of links.
 
-    # Sort columnes
-    cn_table = cn_table[['neuron_name', 'skeleton_id', 'relation', 'total'] + list(set(x.skeleton_id))]
+    Parameters
+    ----------
+    cn_details :        pandas.DataFrame
+                        Connector details from
+                        :func:`~pymaid.get_connector_details`.
+    resolve_skids :     bool, optional
+                        If True, will add skeleton IDs of postsynaptic
+                        treenodes. Where connectors have multiple links onto
+                        the same neuron, these have to be fetched from
+                        the server.
 
-    return cn_table
+    Returns
+    -------
+    pandas.DataFrame
+                        One row per (unique) postsynaptic link::
 
+                            connector_id  pre_skid  pre_node  post_node  (post_skid)
+                          0
+                          1
+    """
+    # Remove connectors for which there are either no pre- or no
+    # postsynaptic neurons
+    cn_details = cn_details[~cn_details.presynaptic_to.isnull()]
+    n_links = cn_details.postsynaptic_to_node.apply(len).values
+    cn_details = cn_details[n_links > 0]
+    n_links = n_links[n_links > 0]
+
+    row = np.repeat(np.arange(cn_details.shape[0]), n_links)
+    links = pd.DataFrame({'connector_id': cn_details.connector_id.values[row],
+                          'pre_skid': cn_details.presynaptic_to.values[row],
+                          'pre_node': cn_details.presynaptic_to_node.values[row]}
+                         ).astype(int)
+    if cn_details.shape[0]:
+        links['post_node'] = np.concatenate(cn_details.postsynaptic_to_node.values).astype(int)
+    else:
+        links['post_node'] = np.array([], dtype=int)
+
+    if resolve_skids:
+        # If there is one target neuron per link, skeleton IDs line up with
+        # the postsynaptic treenodes
+        is_single = cn_details.postsynaptic_to.apply(len).values >= n_links
+        single = is_single[row]
+        post_skid = np.zeros(links.shape[0], dtype=int)
+        if is_single.any():
+            post_skid[single] = np.concatenate([s[:n] for s, n in zip(cn_details.postsynaptic_to.values[is_single],
+                                                                      n_links[is_single])])
+        # For the rest we have to map treenode IDs to skeleton IDs
+        if (~single).any():
+            tn = np.unique(links.post_node.values[~single])
+            tn_to_skid = fetch.get_skid_from_treenode(tn,
+                                                      remote_instance=remote_instance)
+            post_skid[~single] = pd.Series(tn_to_skid).fillna(-1).astype(int).reindex(
+                                    links.post_node.values[~single]).values
+        links['post_skid'] = post_skid
+
+    # A treenode can only be linked once per connector
+    return links.drop_duplicates(['connector_id', 'post_node'])
 
-def adjacency_from_connectors(source, target=None, remote_instance=None):
+
+def _fragment_table(x, table, id_col):
+    """ Maps IDs in a table of each neuron (e.g. ``nodes``) to the neuron's
+    position ``ix`` in neuronlist ``x``.
+    """
+    data = [getattr(n, table)[id_col].values for n in x]
+    if not data:
+        return pd.DataFrame({id_col: [], 'ix': []}, dtype=int)
+    return pd.DataFrame({id_col: np.concatenate(data).astype(int),
+                         'ix': np.repeat(np.arange(len(x)),
+                                         [len(d) for d in data])}
+                        ).drop_duplicates()
+
+
+def adjacency_from_connectors(source, target=None, remote_instance=None,
+                              connector_store=None):
     """ Regenerates adjacency matrices from neurons' connectors.
 
     Notes
@@ -656,6 +693,11 @@ def adjacency_from_connectors(source, target=None, remote_instance=None):
     source,target : skeleton IDs | CatmaidNeuron | CatmaidNeuronList
                     Neuron(s) for which to generate adjacency matrix.
                     If ``target==None``, will use ``target=source``.
+    remote_instance : CATMAID instance, optional
+                    If not passed, will try using globally defined.
+    connector_store : ConnectorStore, optional
+                    If provided, connector details are retrieved from this
+                    store instead of the server.
 
     Returns
     -------
@@ -710,41 +752,59 @@ def adjacency_from_connectors(source, target=None, remote_instance=None):
     if isinstance(target, core.CatmaidNeuron):
         target = core.CatmaidNeuronList(target)
 
-    # Generate empty adjacency matrix
-    adj = np.zeros((len(source), len(target)))
-
-    # Get connector details for all neurons
+    # Get connector details for all neurons and explode into links
     all_cn = list(set(np.append(source.connectors.connector_id.values,
                                 target.connectors.connector_id.values)))
-    cn_details = fetch.get_connector_details(all_cn)
-
-    # Now go over all source neurons and process connections
-    for i, s in enumerate(config.tqdm(source, desc='Processing',
-                          disable=config.pbar_hide, leave=config.pbar_leave)):
+    cn_details = _get_connector_details(all_cn,
+                                        remote_instance=remote_instance,
+                                        connector_store=connector_store)
+    links = _explode_links(cn_details)
+
+    # Links from a source's treenodes via one of its connectors...
+    links = links.merge(_fragment_table(source, 'nodes', 'treenode_id'),
+                        left_on='pre_node', right_on='treenode_id')
+    links = links.merge(_fragment_table(source, 'connectors', 'connector_id'),
+                        on=['connector_id', 'ix'])
+    links = links[['connector_id', 'post_node', 'ix']]
+
+    # ... onto a target's treenodes via one of its postsynapses
+    links = links.merge(_fragment_table(target, 'nodes', 'treenode_id'),
+                        left_on='post_node', right_on='treenode_id',
+                        suffixes=('_s', '_t'))
+    links = links.merge(_fragment_table(target, 'postsynapses', 'connector_id'),
+                        left_on=['connector_id', 'ix_t'],
+                        right_on=['connector_id', 'ix'])
+
+    counts = links.groupby(['ix_s', 'ix_t']).size()
+    adj = scipy.sparse.coo_matrix((counts.values.astype(float),
+                                   (counts.index.get_level_values(0),
+                                    counts.index.get_level_values(1))),
+                                  shape=(len(source), len(target))).toarray()
 
-        # Get all connectors presynaptic for this source
-        this_cn = cn_details[(cn_details.presynaptic_to == int(s.skeleton_id)) &
-                             (cn_details.connector_id.isin(s.connectors.connector_id))
-                             ]
-
-        # Go over all target neurons
-        for k, t in enumerate(target):
-            t_tn = set(t.nodes.treenode_id.values)
-            t_post = t.postsynapses.connector_id.values
+    return pd.DataFrame(adj,
+                        index=source.skeleton_id,
+                        columns=target.skeleton_id)
 
-            # Extract number of connections from source to this target
-            this_t = this_cn[this_cn.connector_id.isin(t_post)]
 
-            # Now figure out how many links are between this connector and
-            # the target
-            n_links = sum([len(t_tn & set(r.postsynaptic_to_node))
-                           for r in this_t.itertuples()])
+def _get_connector_details(x, remote_instance=None, connector_store=None):
+    """ Get connector details - via ``connector_store`` if provided. """
+    if isinstance(connector_store, type(None)):
+        return fetch.get_connector_details(x, remote_instance=remote_instance)
+    return connector_store.get_connector_details(x,
+                                                 remote_instance=remote_instance)
 
-            adj[i][k] = n_links
 
-    return pd.DataFrame(adj,
-                        index=source.skeleton_id,
-                        columns=target.skeleton_id)
+def _get_connectors_between(a, b, directional=True, remote_instance=None,
+                            connector_store=None):
+    """ Get connectors between neurons - via ``connector_store`` if
+    provided.
+    """
+    if isinstance(connector_store, type(None)):
+        return fetch.get_connectors_between(a, b, directional=directional,
+                                            remote_instance=remote_instance)
+    return connector_store.get_connectors_between(a, b,
+                                                  directional=directional,
+                                                  remote_instance=remote_instance)
 
 
 def _edges_from_connectors(a, b=None, remote_instance=None):
@@ -790,7 +850,7 @@ def _edges_from_connectors(a, b=None, remote_instance=None):
 
 def adjacency_matrix(s, t=None, remote_instance=None, source_grp={},
                      target_grp={}, syn_threshold=None, syn_cutoff=None,
-                     use_connectors=False):
+                     use_connectors=False, sparse=False):
     """ Generate adjacency matrix between sets of neurons.
 
     Directional: sources = rows, targets = columns.
@@ -833,10 +893,14 @@ def adjacency_matrix(s, t=None, remote_instance=None, source_grp={},
                         if e.g. you are using pruned neurons. **Important**:
                         This does not work if you have multiple fragments per
                         neuron!
+    sparse :            bool, optional
+                        If True, will return a
+                        :class:`~pymaid.SparseAdjacencyMatrix` instead of a
+                        DataFrame. Use this for very large sets of neurons.
 
     Returns
     -------
-    matrix :          pandas.Dataframe
+    matrix :          pandas.Dataframe | SparseAdjacencyMatrix
 
     See Also
     --------
@@ -885,6 +949,15 @@ def adjacency_matrix(s, t=None, remote_instance=None, source_grp={},
     >>> ax = sns.heatmap(adj_merged)
     >>> plt.show()
 
+    Generate a sparse adjacency matrix for a large set of neurons:
+
+    >>> adj = pymaid.adjacency_matrix('annotation:large network',
+    ...                               sparse=True)
+    >>> adj
+    <SparseAdjacencyMatrix: 10512 sources x 10512 targets with 381002 edges>
+    >>> # Access the scipy.sparse.csr_matrix and skeleton IDs
+    >>> adj.matrix, adj.sources, adj.targets
+
     """
 
     remote_instance = utils._eval_remote_instance(remote_instance)
@@ -913,21 +986,10 @@ def adjacency_matrix(s, t=None, remote_instance=None, source_grp={},
     else:
         edges = fetch.get_edges(neurons, remote_instance=remote_instance)
 
-    # Turn into a adjacency matrix
-    matrix = edges.pivot(values='weight',
-                         columns='target_skid',
-                         index='source_skid').fillna(0)
-
-    # Filter to actual sources and targets
-    matrix = matrix.reindex(neuronsA, columns=neuronsB, fill_value=0)
-
-    # Apply cutoff and threshold
-    matrix = matrix.clip(upper=syn_cutoff)
-
-    if syn_threshold:
-        matrix[matrix < syn_threshold] = 0
-
-    matrix.datatype = 'adjacency_matrix'
+    matrix = _edges_to_adjacency(edges, neuronsA, neuronsB,
+                                 syn_threshold=syn_threshold,
+                                 syn_cutoff=syn_cutoff,
+                                 sparse=sparse)
 
     if source_grp or target_grp:
         matrix = group_matrix(matrix,
@@ -940,14 +1002,58 @@ def adjacency_matrix(s, t=None, remote_instance=None, source_grp={},
     return matrix
 
 
+def _edges_to_adjacency(edges, sources, targets, syn_threshold=None,
+                        syn_cutoff=None, sparse=False):
+    """ Turns edge list into adjacency matrix.
+
+    Parameters
+    ----------
+    edges :             pandas.DataFrame
+                        Edge list as returned by :func:`~pymaid.get_edges`.
+    sources/targets :   list of int
+                        Skeleton IDs of sources (rows) and targets (columns).
+    syn_threshold :     int, optional
+                        If set, will ignore connections with less synapses.
+    syn_cutoff :        int, optional
+                        If set, will cut off connections above given value.
+    sparse :            bool, optional
+                        If True, will return SparseAdjacencyMatrix.
+
+    Returns
+    -------
+    pandas.DataFrame | SparseAdjacencyMatrix
+
+    """
+
+    # Turn into a sparse adjacency matrix of actual sources and targets
+    matrix = SparseAdjacencyMatrix.from_edges(edges, sources, targets)
+
+    # Apply cutoff and threshold
+    if syn_cutoff:
+        matrix.matrix.data = np.minimum(matrix.matrix.data, syn_cutoff)
+
+    if syn_threshold:
+        matrix.matrix.data[matrix.matrix.data < syn_threshold] = 0
+        matrix.matrix.eliminate_zeros()
+
+    if not sparse:
+        matrix = matrix.to_dense()
+        matrix.index.name = 'source_skid'
+        matrix.columns.name = 'target_skid'
+        matrix.datatype = 'adjacency_matrix'
+
+    return matrix
+
+
 def group_matrix(mat, row_groups={}, col_groups={}, drop_ungrouped=False,
                  method='SUM', remote_instance=None):
     """ Groups adjacency matrix into neuron groups.
 
     Parameters
     ----------
-    mat :               pandas.DataFrame | numpy.array
-                        Matrix to group.
+    mat :               pandas.DataFrame | numpy.array | SparseAdjacencyMatrix | scipy.sparse matrix
+                        Matrix to group. Sparse matrices are grouped using
+                        sparse aggregation matrices.
     row_groups :        dict, optional
                         Row groups to be formed. Can be either:
                           1. ``{group1: [neuron1, neuron2, ...], ...}``
@@ -964,6 +1070,9 @@ def group_matrix(mat, row_groups={}, col_groups={}, drop_ungrouped=False,
     Returns
     -------
     pandas.DataFrame
+                        If input was DataFrame or numpy array.
+    SparseAdjacencyMatrix
+                        If input was sparse.
     """
 
     remote_instance = utils._eval_remote_instance(remote_instance,
@@ -984,9 +1093,15 @@ def group_matrix(mat, row_groups={}, col_groups={}, drop_ungrouped=False,
     # Make copy of original DataFrame
     elif isinstance(mat, pd.DataFrame):
         mat = mat.copy()
-    else:
-        raise TypeError('Can only work with numpy arrays or pandas '
-                        'DataFrames, got "{}"'.format(type(mat)))
+    # Sparse matrices are left as they are
+    elif scipy.sparse.issparse(mat):
+        mat = SparseAdjacencyMatrix(mat,
+                                    np.arange(mat.shape[0]),
+                                    np.arange(mat.shape[1]))
+    elif not isinstance(mat, SparseAdjacencyMatrix):
+        raise TypeError('Can only work with numpy arrays, pandas '
+                        'DataFrames or sparse matrices, got '
+                        '"{}"'.format(type(mat)))
 
     # Convert to neuron->group format if necessary
     if col_groups and utils._is_iterable(list(col_groups.values())[0]):
@@ -995,11 +1110,17 @@ def group_matrix(mat, row_groups={}, col_groups={}, drop_ungrouped=False,
         row_groups = {n: g for g in row_groups for n in utils.eval_skids(row_groups[g], remote_instance=remote_instance)}
 
     # Make sure everything is string
-    mat.index = mat.index.astype(str)
-    mat.columns = mat.columns.astype(str)
     col_groups = {str(k): str(v) for k, v in col_groups.items()}
     row_groups = {str(k): str(v) for k, v in row_groups.items()}
 
+    if isinstance(mat, SparseAdjacencyMatrix):
+        return _group_sparse_matrix(mat, row_groups, col_groups,
+                                    drop_ungrouped=drop_ungrouped,
+                                    method=method)
+
+    mat.index = mat.index.astype(str)
+    mat.columns = mat.columns.astype(str)
+
     if row_groups:
         # Drop non-grouped values if applicable
         if drop_ungrouped:
@@ -1048,6 +1169,211 @@ def group_matrix(mat, row_groups={}, col_groups={}, drop_ungrouped=False,
     return mat
 
 
+def _aggregation_matrix(ids, groups, drop_ungrouped=False):
+    """ Generates sparse (N groups, M ids) matrix mapping ids to groups.
+
+    Parameters
+    ----------
+    ids :               array-like
+                        IDs (e.g. skeleton IDs) to be grouped.
+    groups :            dict
+                        ``{id: group}``. IDs not in dict are kept as their
+                        own group unless ``drop_ungrouped=True``. Must be
+                        strings.
+    drop_ungrouped :    bool, optional
+                        If True, IDs without group are dropped.
+
+    Returns
+    -------
+    agg :               scipy.sparse.csr_matrix
+    labels :            numpy.array
+                        Group labels (sorted) for rows in ``agg``.
+    """
+
+    ids = np.asarray(ids).astype(str)
+
+    if not groups:
+        labels = ids
+        keep = np.arange(ids.shape[0])
+    else:
+        labels = np.array([groups.get(i, i) for i in ids], dtype=object)
+        if drop_ungrouped:
+            keep = np.where(np.isin(ids, list(groups.keys())))[0]
+        else:
+            keep = np.arange(ids.shape[0])
+        labels = labels[keep].astype(str)
+
+    labels, inv = np.unique(labels, return_inverse=True)
+    agg = scipy.sparse.csr_matrix((np.ones(keep.shape[0]), (inv, keep)),
+                                  shape=(labels.shape[0], ids.shape[0]))
+
+    return agg, labels
+
+
+def _group_sparse_matrix(mat, row_groups, col_groups, drop_ungrouped=False,
+                         method='SUM'):
+    """ Groups sparse adjacency matrix. See :func:`~pymaid.group_matrix`. """
+
+    R, row_labels = _aggregation_matrix(mat.sources, row_groups,
+                                        drop_ungrouped=drop_ungrouped)
+    C, col_labels = _aggregation_matrix(mat.targets, col_groups,
+                                        drop_ungrouped=drop_ungrouped)
+
+    M = mat.matrix.astype(float)
+
+    if method in ['SUM', 'AVERAGE']:
+        grouped = R.dot(M).dot(C.T)
+        if method == 'AVERAGE':
+            # Divide by number of cells in each block
+            row_sizes = np.asarray(R.sum(axis=1)).ravel()
+            col_sizes = np.asarray(C.sum(axis=1)).ravel()
+            grouped = scipy.sparse.diags(1 / row_sizes).dot(grouped).dot(scipy.sparse.diags(1 / col_sizes))
+    else:
+        M = M.tocoo()
+        # Map each non-zero cell to its row and column group
+        row_grp = np.asarray(R.argmax(axis=0)).ravel()[M.row]
+        col_grp = np.asarray(C.argmax(axis=0)).ravel()[M.col]
+        # Drop cells of ungrouped rows/columns
+        is_grouped = (np.asarray(R.sum(axis=0)).ravel()[M.row] > 0) & \
+                     (np.asarray(C.sum(axis=0)).ravel()[M.col] > 0)
+        row_grp, col_grp, data = row_grp[is_grouped], col_grp[is_grouped], M.data[is_grouped]
+
+        # Sort by block and reduce
+        block = row_grp * len(col_labels) + col_grp
+        srt = np.argsort(block, kind='mergesort')
+        block, data = block[srt], data[srt]
+        uni, starts, counts = np.unique(block, return_index=True,
+                                        return_counts=True)
+        func = np.maximum if method == 'MAX' else np.minimum
+        values = func.reduceat(data, starts) if data.shape[0] else data
+
+        # Blocks that are not completely filled also contain zeros
+        block_size = np.asarray(R.sum(axis=1)).ravel()[uni // len(col_labels)] * \
+                     np.asarray(C.sum(axis=1)).ravel()[uni % len(col_labels)]
+        values = np.where(counts < block_size, func(values, 0), values)
+
+        grouped = scipy.sparse.csr_matrix((values, (uni // len(col_labels),
+                                                    uni % len(col_labels))),
+                                          shape=(len(row_labels), len(col_labels)))
+
+    grouped = SparseAdjacencyMatrix(grouped, row_labels, col_labels)
+    grouped.matrix.eliminate_zeros()
+
+    # Add flag that this matrix has been grouped
+    grouped.is_grouped = True
+
+    return grouped
+
+
+class SparseAdjacencyMatrix:
+    """ Sparse adjacency matrix: sources = rows, targets = columns.
+
+    Thin wrapper around a ``scipy.sparse.csr_matrix`` that keeps track of
+    skeleton IDs (or group names) for its rows and columns.
+
+    Parameters
+    ----------
+    matrix :    scipy.sparse matrix
+                (N, M) matrix with connection weights. Will be converted to
+                CSR format.
+    sources :   array-like
+                N skeleton IDs (or group names) for rows.
+    targets :   array-like
+                M skeleton IDs (or group names) for columns.
+
+    See Also
+    --------
+    :func:`~pymaid.adjacency_matrix`
+            Use with ``sparse=True`` to generate sparse adjacency matrices.
+
+    """
+
+    def __init__(self, matrix, sources, targets):
+        self.matrix = scipy.sparse.csr_matrix(matrix)
+        self.sources = np.asarray(sources)
+        self.targets = np.asarray(targets)
+
+        if self.matrix.shape != (self.sources.shape[0], self.targets.shape[0]):
+            raise ValueError('Shape of matrix {} does not match number of '
+                             'sources and targets ({}, {})'.format(self.matrix.shape,
+                                                                   self.sources.shape[0],
+                                                                   self.targets.shape[0]))
+
+        self.datatype = 'adjacency_matrix'
+        self.is_grouped = False
+
+    def __repr__(self):
+        return '<{}: {} sources x {} targets with {} edges>'.format(type(self).__name__,
+                                                                    self.shape[0],
+                                                                    self.shape[1],
+                                                                    self.matrix.nnz)
+
+    @property
+    def shape(self):
+        """ Shape of the matrix (sources, targets). """
+        return self.matrix.shape
+
+    @classmethod
+    def from_edges(cls, edges, sources, targets):
+        """ Generate sparse adjacency matrix from edge list.
+
+        Parameters
+        ----------
+        edges :     pandas.DataFrame
+                    Edge list as returned by :func:`~pymaid.get_edges`. Must
+                    contain ``source_skid``, ``target_skid`` and ``weight``
+                    columns.
+        sources :   list of skeleton IDs
+                    Sources (rows) of the matrix. Edges from other sources are
+                    ignored.
+        targets :   list of skeleton IDs
+                    Targets (columns) of the matrix. Edges onto other targets
+                    are ignored.
+
+        Returns
+        -------
+        SparseAdjacencyMatrix
+
+        """
+        sources = np.asarray(sources)
+        targets = np.asarray(targets)
+
+        # Compare as integers: casting to the dtype of fixed-width string
+        # arrays would truncate IDs
+        rows = pd.Index(sources.astype(np.int64)).get_indexer(edges.source_skid.values.astype(np.int64))
+        cols = pd.Index(targets.astype(np.int64)).get_indexer(edges.target_skid.values.astype(np.int64))
+        keep = (rows >= 0) & (cols >= 0)
+
+        matrix = scipy.sparse.coo_matrix((edges.weight.values[keep],
+                                          (rows[keep], cols[keep])),
+                                         shape=(sources.shape[0],
+                                                targets.shape[0]))
+
+        return cls(matrix.tocsr(), sources, targets)
+
+    def to_dense(self):
+        """ Turn into pandas DataFrame. """
+        return pd.DataFrame(self.matrix.toarray().astype(float),
+                            index=self.sources,
+                            columns=self.targets)
+
+    def to_edges(self):
+        """ Turn into edge list.
+
+        Returns
+        -------
+        pandas.DataFrame
+                    DataFrame with ``source_skid``, ``target_skid`` and
+                    ``weight`` columns.
+
+        """
+        coo = self.matrix.tocoo()
+        return pd.DataFrame({'source_skid': self.sources[coo.row],
+                             'target_skid': self.targets[coo.col],
+                             'weight': coo.data},
+                            columns=['source_skid', 'target_skid', 'weight'])
+
+
 def connection_density(s, t, method='MEDIAN', normalize='DENSITY',
                        remote_instance=None):
     """ Calculate connection density.
@@ -1207,10 +1533,11 @@ def sparseness(x, which='LTS'):
 
     Parameters
     ----------
-    x :         DataFrame | array-like
+    x :         DataFrame | array-like | SparseAdjacencyMatrix | scipy.sparse matrix
                 (N, M) dataset with N (rows) observations for M (columns)
                 neurons. One-dimensional data will be converted to two
-                dimensions (N rows, 1 column).
+                dimensions (N rows, 1 column). For sparse matrices, all
+                missing values are zeros.
     which :     "LTS" | "LTK"
                 Determines whether lifetime sparseness (LTS) or lifetime
                 kurtosis (LTK) is returned.
@@ -1218,8 +1545,8 @@ def sparseness(x, which='LTS'):
     Returns
     -------
     sparseness
-                ``pandas.Series`` if input was pandas DataFrame, else
-                ``numpy.array``.
+                ``pandas.Series`` if input was pandas DataFrame or
+                SparseAdjacencyMatrix, else ``numpy.array``.
 
     Examples
     --------
@@ -1239,6 +1566,12 @@ def sparseness(x, which='LTS'):
 
     """
 
+    if isinstance(x, SparseAdjacencyMatrix):
+        return pd.Series(_sparse_sparseness(x.matrix, which=which),
+                         index=x.targets)
+    elif scipy.sparse.issparse(x):
+        return _sparse_sparseness(x, which=which)
+
     if not isinstance(x, (pd.DataFrame, np.ndarray)):
         x = np.array(x)
 
@@ -1256,3 +1589,30 @@ def sparseness(x, which='LTS'):
         raise ValueError('Parameter "which" must be either "LTS" or "LTK"')
 
 
+def _sparse_sparseness(x, which='LTS'):
+    """ Calculate sparseness for columns of a sparse matrix without
+    densifying it. See :func:`~pymaid.sparseness`.
+    """
+
+    x = scipy.sparse.csc_matrix(x, dtype=float)
+    is_nan = np.isnan(x.data)
+
+    # Number of non-NaN observations per column
+    cols = np.repeat(np.arange(x.shape[1]), np.diff(x.indptr))
+    N = x.shape[0] - np.bincount(cols[is_nan], minlength=x.shape[1])
+
+    data, cols = x.data[~is_nan], cols[~is_nan]
+
+    def col_sum(v):
+        return np.bincount(cols, weights=v, minlength=x.shape[1])
+
+    if which == 'LTK':
+        # Expand 4th central moment into raw moments
+        m1, m2, m3, m4 = [col_sum(data ** i) / N for i in range(1, 5)]
+        var = m2 - m1 ** 2
+        m4c = m4 - 4 * m1 * m3 + 6 * m1 ** 2 * m2 - 3 * m1 ** 4
+        return m4c / var ** 2 - 3
+    elif which == 'LTS':
+        return 1 / (1 - (1/N)) * (1 - col_sum(data / N[cols]) ** 2 / col_sum(data ** 2 / N[cols]))
+    else:
+        raise ValueError('Parameter "which" must be either "LTS" or "LTK"')
@@ -2386,6 +2386,14 @@ class CatmaidNeuronList:
         """ Update neuron skeletons from server."""
         self.get_skeletons(skip_existing=False)
 
+    def sync(self, since=None, drop_removed=True):
+        """ Update only neurons that have changed on the server since they
+        were retrieved. See :func:`~pymaid.sync_neurons` for details.
+        """
+        return fetch.sync_neurons(self, since=since,
+                                  drop_removed=drop_removed,
+                                  remote_instance=self._remote_instance)
+
     def get_skeletons(self, skip_existing=False):
         """Helper function to fill in/update skeleton data of neurons.
         Updates ``.nodes``, ``.connectors``, ``.tags``, ``.date_retrieved`` and
@@ -27,7 +27,7 @@ import numpy as np
 import pandas as pd
 from py2cytoscape.data.cyrest_client import CyRestClient
 
-from . import utils, fetch, graph
+from . import utils, fetch
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -250,26 +250,20 @@ def watch_network(x, sleep=3, n_circles=1, min_pre=2, min_post=2, layout=None,
     by_threshold = {v : [s for s, t in by_neuron.items() if v == t] for v in by_neuron.values()}
 
     # Generate the initial network
-    to_add = np.array(x)
-    if n_circles:
-        for (t_pre, t_post), skids in by_threshold.items():
-            # Don't attempt to fetch neither pre nor post
-            if t_pre == -1 and t_post == -1:
-                continue
-            temp = fetch.get_nth_partners(skids, n_circles=n_circles,
-                                          min_pre=t_pre, min_post=t_post,
-                                          remote_instance=remote_instance).skeleton_id
-            to_add = np.concatenate([to_add, temp])
+    skids = _get_network_skids(x, by_threshold, n_circles, remote_instance)
+    nodes, edges = _get_network_snapshot(skids, group_by, remote_instance)
 
-    g = graph.network2nx(to_add.astype(int),
-                         group_by=group_by,
-                         remote_instance=remote_instance)
+    g = nx.DiGraph()
+    g.add_nodes_from([(n, {'neuron_name': name}) for n, name in nodes.items()])
+    g.add_edges_from([(s, t, {'weight': w}) for s, t, w in edges.values])
     network = generate_network(g, clear_session=True, apply_style=False,
                                layout=layout)
 
     if layout:
         cy.layout.apply(name=layout, network=network)
 
+    suids = _NetworkIndex(network)
+
     logger.info('Watching network. Use CTRL-C to stop.')
     if remote_instance.caching:
         logger.warning('Caching disabled.')
@@ -277,86 +271,26 @@ def watch_network(x, sleep=3, n_circles=1, min_pre=2, min_post=2, layout=None,
     utils.set_loggers('WARNING')
     while True:
         # Pull new set of partners
-        to_add = x
-        if n_circles:
-            for (t_pre, t_post), skids in by_threshold.items():
-                # Don't attempt to fetch neither pre nor post
-                if t_pre == -1 and t_post == -1:
-                    continue
-                temp = fetch.get_nth_partners(skids, n_circles=n_circles,
-                                              min_pre=t_pre, min_post=t_post,
-                                              remote_instance=remote_instance).skeleton_id
-                to_add = np.concatenate([to_add, temp])
-
-        g = graph.network2nx(to_add.astype(int),
-                             group_by=group_by,
-                             remote_instance=remote_instance)
-
-        # Add nodes that came in new
-        ntable = network.get_node_table()
-        nodes_to_add = [s for s in g.nodes if s not in ntable.id.values]
-        if nodes_to_add:
-            network.add_nodes(nodes_to_add)
-
-        # Update neuron names
-        ntable = network.get_node_table()
-        names = ntable.set_index('name').neuron_name.to_dict()
-        names.update({s: g.nodes[s]['neuron_name'] for s in g.nodes})
-        ntable['id'] = ntable.name
-        ntable['neuron_name'] = ntable.name.map(names)
-        network.update_node_table(ntable, data_key_col='name',
-                                  network_key_col='name')
+        skids = _get_network_skids(x, by_threshold, n_circles,
+                                   remote_instance)
+        new_nodes, new_edges = _get_network_snapshot(skids, group_by,
+                                                     remote_instance)
 
-        # Remove nodes that do not exist anymore
-        ntable = network.get_node_table()
-        nodes_to_remove = ntable[~ntable['id'].isin(g.nodes)]
-        if not nodes_to_remove.empty:
-            for v in nodes_to_remove.SUID.values:
-                network.delete_node(v)
-
-        # Remove edges
-        etable = network.get_edge_table()
-        edges_removed = 0
-        for e in etable.itertuples():
-            if (e.source, e.target) not in g.edges:
-                edges_removed += 1
-                network.delete_edge(e.SUID)
-
-        # Add edges
-        etable = network.get_edge_table()
-        edges = [(s, t) for s, t in zip(etable.source.values, etable.target.values)]
-        skid_to_SUID = ntable.set_index('name').SUID.to_dict()
-        edges_to_add = []
-        for e in set(g.edges) - set(edges):
-            edges_to_add.append({'source': skid_to_SUID[e[0]],
-                                 'target': skid_to_SUID[e[1]],
-                                 'interaction': None,
-                                 'directed': True})
-        if edges_to_add:
-            network.add_edges(edges_to_add)
-
-        # Fix table and modify weights if applicable
-        etable = network.get_edge_table()
-        if not etable.loc[etable.source.isnull()].empty:
-            etable.loc[etable.source.isnull(), 'source'] = etable.loc[etable.source.isnull(), 'name'].map(lambda x : x[:x.index('(')-1])
-            etable.loc[etable.target.isnull(), 'target'] = etable.loc[etable.target.isnull(), 'name'].map(lambda x : x[x.index(')')+2:])
-        new_weights = [g.edges[e]['weight'] for e in etable[['source','target']].values]
-        weights_modified = [new_w for new_w, old_w in zip(new_weights, etable.weight.values) if new_w != old_w]
-        etable['weight'] = new_weights
-        # For some reason, there os no official wrapper for this, so we have to get our hands dirty
-        network._CyNetwork__update_table('edge', etable,
-                                         network_key_col='SUID',
-                                         data_key_col='SUID')
+        # Compute what has changed and push only that to Cytoscape
+        diff = _diff_networks(nodes, edges, new_nodes, new_edges)
+        nodes, edges = new_nodes, new_edges
 
         # If changes were made, give some feedback and/or change layout
-        if nodes_to_add or not nodes_to_remove.empty or edges_to_add or edges_removed or weights_modified:
+        if any([len(v) for v in diff.values()]):
+            _apply_diff(network, diff, suids)
+
             if verbose:
                 logger.info('{} - nodes added/removed: {}/{}; edges added/removed/modified {}/{}/{}'.format(datetime.datetime.now(),
-                                                           len(nodes_to_add),
-                                                           len(nodes_to_remove),
-                                                           len(edges_to_add),
-                                                           edges_removed,
-                                                           len(weights_modified),
+                                                           len(diff['nodes_added']),
+                                                           len(diff['nodes_removed']),
+                                                           len(diff['edges_added']),
+                                                           len(diff['edges_removed']),
+                                                           len(diff['weights_changed']),
                                                            )
                             )
 
@@ -365,3 +299,170 @@ def watch_network(x, sleep=3, n_circles=1, min_pre=2, min_post=2, layout=None,
 
         # ZzzZzzzZ
         time.sleep(sleep)
+
+
+def _get_network_skids(x, by_threshold, n_circles, remote_instance):
+    """ Returns skeleton IDs of seeds + partners as array of str. """
+    to_add = np.array(x).astype(int)
+    if n_circles:
+        for (t_pre, t_post), skids in by_threshold.items():
+            # Don't attempt to fetch neither pre nor post
+            if t_pre == -1 and t_post == -1:
+                continue
+            temp = fetch.get_nth_partners(skids, n_circles=n_circles,
+                                          min_pre=t_pre, min_post=t_post,
+                                          remote_instance=remote_instance).skeleton_id
+            to_add = np.concatenate([to_add, np.asarray(temp).astype(int)])
+    return np.unique(to_add).astype(str)
+
+
+def _get_network_snapshot(skids, group_by, remote_instance):
+    """ Fetches nodes (names) and edges between given neurons.
+
+    Returns
+    -------
+    nodes :     pandas.Series
+                Neuron names indexed by node ID (skeleton ID or group).
+    edges :     pandas.DataFrame
+                Edge list with ``source``, ``target`` and ``weight``.
+    """
+    names = fetch.get_names(skids, remote_instance=remote_instance)
+    nodes = pd.Series({s: names.get(s, s) for s in skids}, dtype=object)
+
+    edges = fetch.get_edges(skids, remote_instance=remote_instance)
+    edges = pd.DataFrame({'source': edges.source_skid.astype(str).values,
+                          'target': edges.target_skid.astype(str).values,
+                          'weight': edges.weight.values})
+
+    # Collapse groups into single nodes
+    if group_by:
+        to_group = {str(s): str(g) for g, ss in group_by.items() for s in ss}
+        nodes.index = [to_group.get(s, s) for s in nodes.index]
+        nodes = nodes[~nodes.index.duplicated()]
+        for g in group_by:
+            if str(g) in nodes.index:
+                nodes[str(g)] = str(g)
+        edges['source'] = edges.source.map(lambda s: to_group.get(s, s))
+        edges['target'] = edges.target.map(lambda s: to_group.get(s, s))
+        edges = edges.groupby(['source', 'target'],
+                              as_index=False).weight.sum()
+
+    return nodes, edges[['source', 'target', 'weight']]
+
+
+def _diff_networks(old_nodes, old_edges, new_nodes, new_edges):
+    """ Computes node/edge/weight changes between two network snapshots
+    (see :func:`~pymaid.cytoscape._get_network_snapshot`).
+
+    Returns
+    -------
+    dict
+            ``nodes_added`` and ``nodes_removed`` (lists),
+            ``names_changed`` (Series, includes new nodes), ``edges_added``,
+            ``edges_removed``
+            and ``weights_changed`` (DataFrames).
+    """
+    nodes_added = new_nodes.index.difference(old_nodes.index).tolist()
+    nodes_removed = old_nodes.index.difference(new_nodes.index).tolist()
+
+    # Names for new nodes and nodes that have been renamed
+    kept = new_nodes.index.intersection(old_nodes.index)
+    renamed = kept[new_nodes[kept].values != old_nodes[kept].values]
+    names_changed = new_nodes[renamed.tolist() + nodes_added]
+
+    merged = pd.merge(old_edges, new_edges, on=['source', 'target'],
+                      how='outer', suffixes=('_old', '_new'), indicator=True)
+
+    edges_added = merged.loc[merged._merge == 'right_only',
+                             ['source', 'target', 'weight_new']]
+    edges_removed = merged.loc[merged._merge == 'left_only',
+                               ['source', 'target', 'weight_old']]
+    both = merged[merged._merge == 'both']
+    weights_changed = both.loc[both.weight_old.values != both.weight_new.values,
+                               ['source', 'target', 'weight_new']]
+
+    return {'nodes_added': nodes_added,
+            'nodes_removed': nodes_removed,
+            'names_changed': names_changed,
+            'edges_added': edges_added.rename(columns={'weight_new': 'weight'}),
+            'edges_removed': edges_removed.rename(columns={'weight_old': 'weight'}),
+            'weights_changed': weights_changed.rename(columns={'weight_new': 'weight'})}
+
+
+class _NetworkIndex:
+    """ Keeps track of Cytoscape SUIDs for nodes and edges of a network. """
+
+    def __init__(self, network):
+        self.network = network
+        self.refresh_nodes()
+        self.refresh_edges()
+
+    def refresh_nodes(self):
+        ntable = self.network.get_node_table()
+        self.nodes = ntable.set_index('name').SUID.to_dict()
+
+    def refresh_edges(self):
+        etable = self.network.get_edge_table()
+        # Edges added via the API might be missing source/target - in that
+        # case we have to parse them from the name "source (interaction) target"
+        if etable.empty:
+            self.edges = {}
+            return
+        source = etable.name.map(lambda x: x[:x.index('(') - 1])
+        target = etable.name.map(lambda x: x[x.index(')') + 2:])
+        if 'source' in etable:
+            source = etable.source.where(~etable.source.isnull(), source)
+        if 'target' in etable:
+            target = etable.target.where(~etable.target.isnull(), target)
+        self.edges = dict(zip(zip(source.astype(str), target.astype(str)),
+                              etable.SUID.values))
+
+
+def _apply_diff(network, diff, suids):
+    """ Pushes changes from :func:`~pymaid.cytoscape._diff_networks` to
+    Cytoscape network. Updates are batched wherever CyREST allows it.
+    """
+    # Removing a node in Cytoscape also removes its edges
+    removed = set(diff['nodes_removed'])
+    for n in removed:
+        network.delete_node(suids.nodes.pop(n))
+
+    for s, t in diff['edges_removed'][['source', 'target']].values:
+        suid = suids.edges.pop((s, t), None)
+        if s not in removed and t not in removed and suid is not None:
+            network.delete_edge(suid)
+    suids.edges = {k: v for k, v in suids.edges.items()
+                   if k[0] not in removed and k[1] not in removed}
+
+    if diff['nodes_added']:
+        network.add_nodes(diff['nodes_added'])
+        suids.refresh_nodes()
+
+    if not diff['edges_added'].empty:
+        network.add_edges([{'source': suids.nodes[s],
+                            'target': suids.nodes[t],
+                            'interaction': None,
+                            'directed': True}
+                           for s, t in diff['edges_added'][['source', 'target']].values])
+        suids.refresh_edges()
+
+    # Update names of new and renamed nodes in one go
+    names = diff['names_changed']
+    if not names.empty:
+        ntable = pd.DataFrame({'name': names.index.values,
+                               'id': names.index.values,
+                               'neuron_name': names.values})
+        network.update_node_table(ntable, data_key_col='name',
+                                  network_key_col='name')
+
+    # Update weights of new and modified edges in one go
+    to_update = pd.concat([diff['edges_added'], diff['weights_changed']])
+    if not to_update.empty:
+        etable = pd.DataFrame({'SUID': [suids.edges[(s, t)] for s, t in
+                                        to_update[['source', 'target']].values],
+                               'weight': to_update.weight.values})
+        # For some reason, there is no official wrapper for this, so we have
+        # to get our hands dirty
+        network._CyNetwork__update_table('edge', etable,
+                                         network_key_col='SUID',
+                                         data_key_col='SUID')
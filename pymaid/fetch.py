@@ -47,6 +47,7 @@ dtype: object
 
 import base64
 import datetime
+import hashlib
 import json
 import numbers
 import os
@@ -57,14 +58,20 @@ import time
 import urllib
 import webbrowser
 
+import concurrent.futures
+import threading
+
+from collections import deque, OrderedDict
+
 import requests
 from requests_futures.sessions import FuturesSession
 
+import dateutil.tz
 import numpy as np
 import networkx as nx
 import pandas as pd
 
-from . import core, graph, utils, morpho, graph_utils, config, cache
+from . import core, graph, utils, morpho, graph_utils, config, cache, store
 from .intersect import in_volume
 
 __all__ = sorted(['CatmaidInstance', 'add_annotations', 'add_tags',
@@ -91,12 +98,129 @@ __all__ = sorted(['CatmaidInstance', 'add_annotations', 'add_tags',
                   'get_node_location', 'add_meta_annotations',
                   'remove_meta_annotations', 'get_annotated',
                   'upload_neuron', 'update_radii', 'get_neuron_id',
-                  'get_connectors_in_bbox'])
+                  'get_connectors_in_bbox', 'find_changed_skeletons',
+                  'sync_neurons'])
 
 # Set up logging
 logger = config.logger
 
 
+class _ChunkTuner:
+    """ Keeps track of chunk size and number of requests in flight for a
+    chunked endpoint.
+
+    Both are adjusted AIMD-style from measured response times and errors:
+    additive increase while responses come back faster than
+    ``target_time``, multiplicative decrease on errors or slow responses.
+    Like TCP's slow start, the number of requests in flight starts low and
+    is doubled after each fast round until the first error or slow response.
+
+    Parameters
+    ----------
+    chunk_size :    int
+                    Initial chunk size.
+    inflight :      int, optional
+                    Initial number of parallel requests.
+    target_time :   float
+                    Target response time per request in seconds.
+    max_size :      int, optional
+                    Upper limit for chunk size. Defaults to 10x initial.
+
+    """
+
+    def __init__(self, chunk_size, inflight=2, target_time=2, max_size=None):
+        self.chunk_size = float(chunk_size)
+        self.inflight = int(inflight)
+        self.slow_start = True
+        self.target_time = target_time
+        self.min_size = 1
+        self.max_size = max_size if max_size else chunk_size * 10
+        self.step = max(1, chunk_size / 4)
+
+    def __repr__(self):
+        return '<ChunkTuner: chunk size {}, {} in flight>'.format(int(self.chunk_size),
+                                                                 self.inflight)
+
+    @property
+    def size(self):
+        return max(self.min_size, int(min(self.chunk_size, self.max_size)))
+
+    def update(self, times, n_errors, max_inflight):
+        """ Update chunk size and number of requests in flight.
+
+        Parameters
+        ----------
+        times :         list of float
+                        Response times [s] of successful requests.
+        n_errors :      int
+                        Number of failed requests.
+        max_inflight :  int
+                        Global limit for parallel requests.
+
+        """
+        if n_errors:
+            self.slow_start = False
+            self.chunk_size = max(self.min_size, self.chunk_size / 2)
+            self.inflight = max(1, self.inflight // 2)
+        elif times:
+            t = float(np.median(times))
+            if t <= self.target_time:
+                self.chunk_size = min(self.max_size,
+                                      self.chunk_size + self.step)
+                if self.slow_start:
+                    self.inflight *= 2
+                else:
+                    self.inflight += 1
+            else:
+                self.slow_start = False
+                self.chunk_size = max(self.min_size,
+                                      self.chunk_size * self.target_time / t)
+
+        self.inflight = min(self.inflight, max_inflight)
+
+
+class _RequestSlots:
+    """ Counting semaphore with adjustable limit.
+
+    Caps the number of chunked requests a CatmaidInstance has in flight
+    across all calls and threads.
+
+    Parameters
+    ----------
+    limit :     int
+                Max number of requests in flight.
+
+    """
+
+    def __init__(self, limit):
+        self.limit = int(limit)
+        self.active = 0
+        self._cond = threading.Condition()
+
+    def __repr__(self):
+        return '<RequestSlots: {} of {} in use>'.format(self.active,
+                                                        self.limit)
+
+    def acquire(self):
+        """ Wait for a free slot and take it. """
+        with self._cond:
+            while self.active >= max(1, self.limit):
+                self._cond.wait()
+            self.active += 1
+
+    def release(self):
+        """ Give back a slot. """
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def set_limit(self, limit):
+        """ Change limit. Slots in use are not revoked. """
+        with self._cond:
+            self.limit = int(limit)
+            self._cond.notify_all()
+
+
 class CatmaidInstance:
     """ Class giving access to a CATMAID instance. Holds base url, credentials
     and fetches data. You can either pass it to functions individually or
@@ -117,7 +241,9 @@ class CatmaidInstance:
     max_threads :   int | None
                     Maximum parallel threads to be used. Note that some
                     functions (e.g. :func:`pymaid.get_skid_from_treenode`)
-                    override this parameter.
+                    override this parameter. Also caps the number of
+                    parallel requests for chunked queries (see
+                    :func:`CatmaidInstance.fetch_chunked`).
     set_global :    bool, optional
                     If True, this instance will be set as global (default)
                     CatmaidInstance. This overrides pre-existing global
@@ -198,6 +324,11 @@ class CatmaidInstance:
 
         self.caching = caching
         self._cache = cache.Cache(size_limit=128)
+        self._node_index = store.NodeIndex()
+        self._chunk_tuners = {}
+        self._chunk_slots = _RequestSlots(min(2, max_threads))
+        self._skid_cache = {}
+        self._metadata = store.MetadataRegistry()
 
         self._session = requests.Session()
         self._future_session = FuturesSession(session=self._session,
@@ -237,6 +368,9 @@ class CatmaidInstance:
         """ Clear cache. """
         self._cache = cache.Cache(size_limit=self._cache.size_limit,
                                   time_limit=self._cache.time_limit)
+        self._node_index.clear()
+        self._skid_cache = {}
+        self._metadata.clear()
         logger.info('Cached cleared.')
 
     def load_cache(self, filename):
@@ -272,6 +406,7 @@ class CatmaidInstance:
         self.__max_threads = v
         self._future_session = FuturesSession(session=self._session,
                                               max_workers=self.__max_threads)
+        self._chunk_slots.set_limit(min(self._chunk_slots.limit, v))
 
     def make_global(self):
         """Sets this variable as global by attaching it as sys.module"""
@@ -282,7 +417,8 @@ class CatmaidInstance:
             logger.info('Global CATMAID instance set. Caching is OFF.')
 
     def fetch(self, url, post=None, desc='Fetching', callback=None, files=None,
-             disable_pbar=False, leave_pbar=True, return_type='json'):
+             disable_pbar=False, leave_pbar=True, return_type='json',
+             use_cache=True):
         """ Requires the url to connect to and the variables for POST,
         if any, in a dictionary.
 
@@ -290,8 +426,13 @@ class CatmaidInstance:
         ----------
         return_type :   "json" | "raw" | "request"
                         Defines returned data.
+        use_cache :     bool, optional
+                        If False, will bypass the response cache for this
+                        request: cached responses are not used and new
+                        responses are not added.
 
         """
+        caching = self.caching and use_cache
 
         # Keep track of if a single response is expected
         if not utils._is_iterable(url):
@@ -306,7 +447,7 @@ class CatmaidInstance:
         if not isinstance(post, type(None)):
             if len(url) != len(post):
                 raise ValueError('POST needs to be provided for each url.')
-            if self.caching:
+            if caching:
                 futures = [self._cache.get_cached_url(u, self._future_session,
                                                       post=p,
                                                       files=files) for u, p in zip(url, post)]
@@ -315,7 +456,7 @@ class CatmaidInstance:
                                                      data=p,
                                                      files=files) for u, p in zip(url, post)]
         else:
-            if self.caching:
+            if caching:
                 futures = [self._cache.get_cached_url(u, self._future_session,
                                                       post=None) for u in url]
             else:
@@ -332,7 +473,7 @@ class CatmaidInstance:
             r.raise_for_status()
 
         # Add new responses to cache
-        if self.caching:
+        if caching:
             self._cache.update_responses(url, post, resp)
 
             # Flag if any data is from cache
@@ -355,6 +496,147 @@ class CatmaidInstance:
         else:
             return resp
 
+    def fetch_chunked(self, url, items, key, post=None, chunk_size=100,
+                      method='POST', desc='Fetching', disable_pbar=False,
+                      leave_pbar=True):
+        """ Fetch data for a (long) list of items in chunks.
+
+        Chunk size and number of parallel requests are tuned per endpoint
+        from measured response times and errors. Failed chunks (server
+        errors, timeouts, requests or URLs too long) are split in half and
+        retried. A new chunk is sent as soon as one comes back. Chunks of
+        all calls to this instance (e.g. from different threads) share one
+        limit for requests in flight, which follows the most recently tuned
+        endpoint and is capped by ``max_threads``.
+
+        Parameters
+        ----------
+        url :           str
+                        URL to query.
+        items :         list-like
+                        Items (e.g. node IDs) to split into chunks.
+        key :           str
+                        Parameter name for items. Must contain a
+                        placeholder for the index, e.g. ``'node_ids[{}]'``.
+        post :          dict, optional
+                        Additional parameters sent with each chunk.
+        chunk_size :    int, optional
+                        Initial chunk size. Only used the first time this
+                        endpoint is queried.
+        method :        "POST" | "GET"
+                        If "GET", parameters are encoded in the URL.
+
+        Returns
+        -------
+        list
+                        Responses (json) for each chunk in order of items.
+
+        """
+        items = list(items)
+
+        tuner_id = (url.split('?')[0], key, method)
+        if tuner_id not in self._chunk_tuners:
+            self._chunk_tuners[tuner_id] = _ChunkTuner(chunk_size,
+                                                       min(2, self.max_threads))
+        tuner = self._chunk_tuners[tuner_id]
+
+        def make_params(chunk):
+            params = dict(post) if post else {}
+            params.update({key.format(i): v for i, v in enumerate(chunk)})
+            return params
+
+        def make_future(params):
+            if method == 'GET':
+                u = url + ('&' if '?' in url else '?')
+                u += urllib.parse.urlencode(params)
+                params = None
+            else:
+                u = url
+            if self.caching:
+                return u, params, self._cache.get_cached_url(u,
+                                                             self._future_session,
+                                                             post=params)
+            elif params:
+                return u, params, self._future_session.post(u, data=params)
+            return u, params, self._future_session.get(u, params=None)
+
+        def release(f):
+            self._chunk_slots.release()
+
+        retry = deque()
+        results = {}
+        pending = {}
+        done = deque()
+        times, n_errors = [], 0
+        pos = 0
+        with config.tqdm(desc=desc, total=len(items),
+                         disable=disable_pbar or config.pbar_hide,
+                         leave=leave_pbar & config.pbar_leave) as pbar:
+            while pos < len(items) or retry or pending or done:
+                # Top up requests in flight: failed chunks first, then new
+                # chunks at current chunk size
+                while len(pending) + len(done) < tuner.inflight and (retry or pos < len(items)):
+                    if retry:
+                        a, b = retry.popleft()
+                    else:
+                        a, b = pos, min(pos + tuner.size, len(items))
+                        pos = b
+                    self._chunk_slots.acquire()
+                    u, params, f = make_future(make_params(items[a:b]))
+                    if isinstance(f, concurrent.futures.Future):
+                        f.add_done_callback(release)
+                        pending[f] = (a, b, u, params)
+                    else:
+                        # Cached responses are ready right away
+                        self._chunk_slots.release()
+                        done.append((f, (a, b, u, params)))
+
+                if not done:
+                    finished, _ = concurrent.futures.wait(pending,
+                                                          return_when=concurrent.futures.FIRST_COMPLETED)
+                    done.extend((f, pending.pop(f)) for f in finished)
+
+                while done:
+                    f, (a, b, u, params) = done.popleft()
+                    try:
+                        r = f.result()
+                        r.raise_for_status()
+                    except (requests.exceptions.HTTPError,
+                            requests.exceptions.ConnectionError,
+                            requests.exceptions.Timeout) as e:
+                        status = getattr(getattr(e, 'response', None),
+                                         'status_code', None)
+                        # Client errors won't go away by splitting the chunk
+                        # - except if the request was too large
+                        if b - a <= 1 or (status and status < 500 and status not in (413, 414, 429)):
+                            raise
+                        # Don't let the chunk size grow back into the limit
+                        if status in (413, 414):
+                            tuner.max_size = min(tuner.max_size, b - a - 1)
+                        n_errors += 1
+                        retry.extend([(a, (a + b) // 2), ((a + b) // 2, b)])
+                        continue
+
+                    if not getattr(r, 'is_cached', False):
+                        times.append(r.elapsed.total_seconds())
+                        if self.caching:
+                            self._cache.update_responses([u], [params], [r])
+
+                    results[a] = r.json()
+                    pbar.update(b - a)
+
+                # Tune after errors or once a full window came back
+                if n_errors or len(times) >= tuner.inflight or not pending:
+                    tuner.update(times, n_errors, self.max_threads)
+                    self._chunk_slots.set_limit(tuner.inflight)
+
+                    if n_errors:
+                        logger.debug('{} chunk(s) failed. Retrying with '
+                                     'smaller chunks ({})'.format(n_errors, tuner))
+                    times, n_errors = [], 0
+
+        return [results[k] for k in sorted(results)]
+
     def make_url(self, *args, **GET):
         """ Generates URL.
 
@@ -1034,6 +1316,260 @@ def get_neuron(x, remote_instance=None, connector_flag=1, tag_flag=1,
 get_3D_skeleton = get_3D_skeletons = get_neurons = get_neuron
 
 
+@cache.never_cache
+def find_changed_skeletons(x, since=None, remote_instance=None):
+    """ Find neurons that have changed on the server since a given time.
+
+    A neuron is considered changed if any of its nodes or connector links
+    have been created or edited since, if its number of nodes or its
+    synaptic (pre-/postsynaptic) links differ from the local copy or if it
+    has been renamed. Neurons that no longer exist (e.g. after a merge) are
+    flagged too.
+
+    Node counts of all neurons are checked first in a few cheap, batched
+    requests. Node and link tables are only downloaded for neurons that
+    could still be unchanged, i.e. neurons given as skeleton IDs or whose
+    node count matches the local copy.
+
+    Parameters
+    ----------
+    x :                 skeleton IDs | CatmaidNeuron | CatmaidNeuronList
+                        Neurons to check. If skeleton IDs, only edits since
+                        ``since`` are checked.
+    since :             str | datetime | pandas.Timestamp, optional
+                        Time of last sync. Naive timestamps are interpreted
+                        as local time. If None, will use the
+                        ``.date_retrieved`` of each neuron.
+    remote_instance :   CatmaidInstance, optional
+                        If not passed directly, will try using global.
+
+    Returns
+    -------
+    pandas.DataFrame
+            DataFrame in which each row represents a neuron::
+
+                skeleton_id  exists  n_nodes  last_edited  changed
+             0
+             1
+
+            ``last_edited`` is in UTC and truncated to the minute. It is
+            NaT for neurons whose node count already showed a change.
+
+    Notes
+    -----
+    Changes that touch neither nodes, links nor name (e.g. adding a tag to
+    an existing node) are not detected.
+
+    See Also
+    --------
+    :func:`~pymaid.sync_neurons`
+                Use to update a local CatmaidNeuronList in place.
+
+    """
+    remote_instance = utils._eval_remote_instance(remote_instance)
+
+    skids = utils.eval_skids(x, warn_duplicates=False,
+                             remote_instance=remote_instance)
+    skids = [str(s) for s in skids]
+
+    # Get time of last sync per neuron (in UTC)
+    if not isinstance(since, type(None)):
+        since = {s: since for s in skids}
+    elif isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+        since = {str(n.skeleton_id): n.date_retrieved
+                 for n in core.CatmaidNeuronList(x)}
+    else:
+        raise ValueError('Need `since` if no CatmaidNeuron/List is provided.')
+    since = pd.Series({s: _to_utc(t) for s, t in since.items()})
+    since = since.reindex(skids).values.astype('datetime64[m]')
+
+    # Cheap summary first: node counts from the review status
+    counts = remote_instance.fetch_chunked(remote_instance._get_review_status_url(),
+                                           skids, 'skeleton_ids[{}]',
+                                           chunk_size=1000,
+                                           desc='Checking counts')
+    counts = {str(s): v[0] for d in counts for s, v in d.items()}
+
+    status = pd.DataFrame({'skeleton_id': skids})
+    status['n_nodes'] = status.skeleton_id.map(counts).fillna(0).astype(int)
+    status['exists'] = status.n_nodes > 0
+    status['last_edited'] = np.full(len(skids), np.datetime64('NaT'),
+                                    dtype='datetime64[m]')
+    status['changed'] = ~status.exists.values
+
+    # For neurons we can compare against the local copy. This catches
+    # deletions which don't leave an edition time behind
+    is_neuron = isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList))
+    if is_neuron:
+        x = core.CatmaidNeuronList(x)
+        local = {str(n.skeleton_id): n for n in reversed(x.neurons)}
+        local_n = {s: n.nodes.shape[0] for s, n in local.items()}
+        status.loc[status.n_nodes.values != status.skeleton_id.map(local_n).values,
+                   'changed'] = True
+
+    # Only neurons that could still be unchanged need a closer look
+    to_check = status.skeleton_id.values[~status.changed.values].tolist()
+    if not to_check:
+        return status[['skeleton_id', 'exists', 'n_nodes', 'last_edited',
+                       'changed']]
+
+    # Node table: [ID, parent ID, x, y, z, confidence, radius, skeleton_id,
+    # edition_time, user_id]
+    url = remote_instance._get_treenode_table_url()
+    data = remote_instance.fetch_chunked(url, to_check, 'skeleton_ids[{}]',
+                                         chunk_size=10,
+                                         desc='Checking nodes')
+    nodes = pd.DataFrame([[n[7], n[8]] for d in data for n in d],
+                         columns=['skeleton_id', 'edition_time'])
+    nodes['skeleton_id'] = nodes.skeleton_id.astype(str)
+    nodes['edition_time'] = _parse_epochs(nodes.edition_time.values)
+    last_edited = nodes.groupby('skeleton_id').edition_time.max()
+    last_edited = status.skeleton_id.map(last_edited).values.astype('datetime64[m]')
+
+    links = get_connector_links(to_check, remote_instance=remote_instance)
+    links['skeleton_id'] = links.skeleton_id.astype(str)
+    links = links[links.skeleton_id.isin(to_check)]
+    if not links.empty:
+        edited = np.maximum(links.creation_time.values.astype('datetime64[m]'),
+                            links.edition_time.values.astype('datetime64[m]'))
+        last_link = pd.Series(edited).groupby(links.skeleton_id.values).max()
+        last_edited = np.fmax(last_edited,
+                              status.skeleton_id.map(last_link).values.astype('datetime64[m]'))
+    status['last_edited'] = last_edited
+
+    # Anything edited since last sync (comparison at minute resolution)
+    status['changed'] = status.changed.values | (last_edited >= since)
+
+    if is_neuron:
+        names = get_names(to_check, remote_instance=remote_instance)
+
+        syn = links[links.relation.isin(['presynaptic_to', 'postsynaptic_to'])]
+        syn = syn.groupby('skeleton_id')
+
+        for i, s in enumerate(skids):
+            if status.changed.values[i]:
+                continue
+
+            n = local[s]
+            if names.get(s, n.neuron_name) != n.neuron_name:
+                status.loc[i, 'changed'] = True
+                continue
+
+            # Compare sets of (treenode, connector, relation)
+            cn = n.connectors[n.connectors.relation.isin([0, 1])]
+            local_links = set(zip(cn.treenode_id.astype(int),
+                                  cn.connector_id.astype(int),
+                                  cn.relation.astype(int)))
+            remote_links = set()
+            if s in syn.groups:
+                this = syn.get_group(s)
+                remote_links = set(zip(this.treenode_id.astype(int),
+                                       this.connector_id.astype(int),
+                                       (this.relation == 'postsynaptic_to').astype(int)))
+            if local_links != remote_links:
+                status.loc[i, 'changed'] = True
+
+    return status[['skeleton_id', 'exists', 'n_nodes', 'last_edited',
+                   'changed']]
+
+
+@cache.never_cache
+def sync_neurons(x, since=None, drop_removed=True, remote_instance=None):
+    """ Update CatmaidNeuronList in place, re-fetching only changed neurons.
+
+    Uses :func:`~pymaid.find_changed_skeletons` to find out which neurons
+    have changed since they were last retrieved and then fetches only
+    those. This is a lot faster than reloading an entire list.
+
+    Parameters
+    ----------
+    x :                 CatmaidNeuron | CatmaidNeuronList
+                        Neurons to sync. Will be updated in place.
+    since :             str | datetime | pandas.Timestamp, optional
+                        Time of last sync. If None, will use
+                        ``.date_retrieved`` of each neuron.
+    drop_removed :      bool, optional
+                        If True, neurons that no longer exist on the server
+                        (e.g. after a merge) will be removed from ``x``.
+    remote_instance :   CatmaidInstance, optional
+                        If not passed directly, will try using global.
+
+    Returns
+    -------
+    pandas.DataFrame
+            Status of each neuron as returned by
+            :func:`~pymaid.find_changed_skeletons`.
+
+    Examples
+    --------
+    >>> nl = pymaid.get_neuron('annotation:glomerulus DA1')
+    >>> nl.to_pickle('DA1.pkl')
+    >>> # Next day
+    >>> nl = pd.read_pickle('DA1.pkl')
+    >>> status = pymaid.sync_neurons(nl)
+    >>> status.changed.sum()
+    3
+
+    """
+    remote_instance = utils._eval_remote_instance(remote_instance)
+
+    if not isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+        raise TypeError('Expected CatmaidNeuron/List, got "{}"'.format(type(x)))
+
+    # Take the time before checking so that no edits slip through
+    now = datetime.datetime.now().isoformat()
+
+    status = find_changed_skeletons(x, since=since,
+                                    remote_instance=remote_instance)
+
+    changed = status[status.changed & status.exists].skeleton_id.tolist()
+    removed = status[~status.exists].skeleton_id.tolist()
+
+    neurons = core.CatmaidNeuronList(x)
+
+    logger.info('{} of {} neurons changed'.format(len(changed),
+                                                  len(neurons)))
+
+    # Nodes of changed neurons might have been moved to other skeletons
+    remote_instance._node_index.drop(skeleton_ids=changed + removed)
+
+    if changed:
+        skdata = get_neuron(changed, remote_instance=remote_instance,
+                            return_df=True).set_index('skeleton_id')
+        to_update = [n for n in neurons if str(n.skeleton_id) in changed]
+        for n in config.tqdm(to_update, desc='Processing neurons',
+                             disable=config.pbar_hide, leave=config.pbar_leave):
+            s = str(n.skeleton_id)
+            n.nodes = skdata.loc[s, 'nodes']
+            n.connectors = skdata.loc[s, 'connectors']
+            n.tags = skdata.loc[s, 'tags']
+            n.neuron_name = skdata.loc[s, 'neuron_name']
+
+            # Delete and update attributes
+            n._clear_temp_attr()
+
+    for n in neurons:
+        n.date_retrieved = now
+
+    if removed:
+        logger.warning('{} neuron(s) no longer exist: {}'.format(len(removed),
+                                                                 ', '.join(removed)))
+        if drop_removed and isinstance(x, core.CatmaidNeuronList):
+            x.neurons[:] = [n for n in x.neurons
+                            if str(n.skeleton_id) not in removed]
+
+    return status
+
+
+def _to_utc(t):
+    """ Turns timestamp into naive UTC datetime. Naive timestamps are
+    considered local time. """
+    t = pd.Timestamp(t)
+    if t.tzinfo is None:
+        t = t.tz_localize(dateutil.tz.tzlocal())
+    return t.tz_convert('UTC').tz_localize(None).to_datetime64()
+
+
 @cache.undo_on_error
 def get_arbor(x, remote_instance=None, node_flag=1, connector_flag=1,
               tag_flag=1):
@@ -1358,10 +1894,67 @@ def get_nth_partners(x, n_circles=1, min_pre=2, min_post=2,
     return df
 
 
+def _parse_connectivity(data, directions=None):
+    """ Flatten connectivity JSON into partner rows and edge arrays.
+
+    Parameters
+    ----------
+    data :          dict
+                    Response from the connectivity endpoint:
+                    ``{direction: {partner: {'skids': {query: [c1, .., c5]},
+                    'num_nodes': n}}}``
+    directions :    list of str, optional
+                    CATMAID directions to keep (e.g. 'incoming').
+
+    Returns
+    -------
+    partners :      pandas.DataFrame
+                    One row per partner and direction with columns
+                    ``skeleton_id``, ``num_nodes`` and ``relation``.
+    edges :         dict of numpy arrays
+                    ``row`` (index into ``partners``), ``query`` (query
+                    skeleton ID as str) and ``counts`` (N, 5 links per
+                    confidence).
+
+    """
+    relations = {'incoming': 'upstream',
+                 'outgoing': 'downstream',
+                 'gapjunctions': 'gapjunction',
+                 'attachments': 'attachment'}
+
+    if isinstance(directions, type(None)):
+        directions = list(relations)
+
+    p_skids, p_nodes, p_rel = [], [], []
+    row, query, counts = [], [], []
+    for d in relations:
+        if d not in directions:
+            continue
+        for p, v in data.get(d, {}).items():
+            q = v['skids']
+            row += [len(p_skids)] * len(q)
+            query += list(q.keys())
+            counts += [(list(c) + [0] * 5)[:5] for c in q.values()]
+            p_skids.append(str(p))
+            p_nodes.append(v['num_nodes'])
+            p_rel.append(relations[d])
+
+    partners = pd.DataFrame({'skeleton_id': np.array(p_skids, dtype=str),
+                             'num_nodes': np.array(p_nodes, dtype=int),
+                             'relation': np.array(p_rel, dtype=str)},
+                            columns=['skeleton_id', 'num_nodes', 'relation'])
+
+    edges = {'row': np.array(row, dtype=int),
+             'query': np.array(query, dtype=str),
+             'counts': np.array(counts, dtype=int).reshape(-1, 5)}
+
+    return partners, edges
+
+
 @cache.undo_on_error
 def get_partners(x, remote_instance=None, threshold=1, min_size=2, filt=[],
                  min_confidence=1, directions=['incoming', 'outgoing',
-                 'gapjunctions', 'attachments']):
+                 'gapjunctions', 'attachments'], return_type='wide'):
     """ Retrieve partners connected by synapses, gap junctions or attachments
     to a set of neurons.
 
@@ -1395,12 +1988,17 @@ def get_partners(x, remote_instance=None, threshold=1, min_size=2, filt=[],
                         If set, edges with lower confidence will be ignored.
     directions :        'incoming' | 'outgoing' | 'gapjunctions' | 'attachments', optional
                         Use to restrict to either up- or downstream partners.
+    return_type :       'wide' | 'long', optional
+                        Format of the returned table. 'wide' has one column
+                        per query neuron. 'long' has one row per connected
+                        partner/query pair and is much smaller for large
+                        sets of query neurons.
 
     Returns
     -------
     pandas.DataFrame
-        DataFrame in which each row represents a neuron and the number of
-        synapses with the query neurons::
+        If ``return_type='wide'``, DataFrame in which each row represents a
+        neuron and the number of synapses with the query neurons::
 
            neuron_name  skeleton_id    num_nodes    relation    total  skid1  skid2 ...
          0   name1         skid1      node_count1   upstream    n_syn  n_syn  ...
@@ -1411,6 +2009,17 @@ def get_partners(x, remote_instance=None, threshold=1, min_size=2, filt=[],
         ``relation`` can be ``'upstream'`` (incoming), ``'downstream'``
         (outgoing), ``'attachment'`` or ``'gapjunction'`` (gap junction).
 
+        If ``return_type='long'``, DataFrame in which each row represents
+        a connection between a partner and a query neuron::
+
+           neuron_name  skeleton_id  num_nodes   relation  query_skid  weight
+         0   name1         skid1     node_count1  upstream   skidA      n_syn
+         1   name1         skid1     node_count1  upstream   skidB      n_syn
+         ...
+
+        Filters (``threshold``, ``min_size``, ``filt``) are applied to
+        partners as in the wide format.
+
     Warning
     -------
     By default, will exclude single node partners! Set ``min_size=1`` to return
@@ -1450,6 +2059,9 @@ def get_partners(x, remote_instance=None, threshold=1, min_size=2, filt=[],
     if not isinstance(min_confidence, (float, int)) or min_confidence < 0 or min_confidence > 5:
         raise ValueError('min_confidence must be 0-5.')
 
+    if return_type not in ['wide', 'long']:
+        raise ValueError('return_type must be "wide" or "long"')
+
     # This maps CATMAID JSON relations to more relatable terms (I think)
     relations = {'incoming': 'upstream',
                  'outgoing': 'downstream',
@@ -1485,45 +2097,26 @@ def get_partners(x, remote_instance=None, threshold=1, min_size=2, filt=[],
     connectivity_data = remote_instance.fetch(
         remote_connectivity_url, connectivity_post)
 
-    # Delete directions that we don't want
-    connectivity_data.update(
-        {d: [] for d in connectivity_data if d not in directions})
+    # Flatten JSON into one row per partner and one entry per edge
+    partners, edges = _parse_connectivity(connectivity_data, directions)
 
     # Get neurons' names
-    names = get_names([n for d in connectivity_data for n in connectivity_data[
-                      d]] + list(x), remote_instance)
-
-    df = pd.DataFrame(columns=['neuron_name', 'skeleton_id',
-                               'num_nodes', 'relation'] + list(x))
+    names = get_names(np.unique(partners.skeleton_id.values).tolist() + list(x),
+                      remote_instance)
+    partners.insert(0, 'neuron_name', partners.skeleton_id.map(names))
 
     # Number of synapses is returned as list of links with 0-5 confidence:
     # {'skid': [0, 1, 2, 3, 4, 5]}
     # This is being collapsed into a single value before returning it.
-    for d in relations:
-        if d not in connectivity_data:
-            continue
-        df_temp = pd.DataFrame([[
-            names[str(n)],
-            str(n),
-            int(connectivity_data[d][n]['num_nodes']),
-            relations[d]]
-            + [sum(connectivity_data[d][n]['skids'].get(s,
-                                                        [0, 0, 0, 0, 0])[min_confidence - 1:]) for s in x]
-            for i, n in enumerate(connectivity_data[d])
-        ],
-            columns=['neuron_name', 'skeleton_id', 'num_nodes',
-                     'relation'] + [str(s) for s in x],
-            dtype=object
-        )
+    weights = edges['counts'][:, max(min_confidence - 1, 0):].sum(axis=1)
+    cols = pd.Index(x).get_indexer(edges['query'])
 
-        df = pd.concat([df, df_temp], axis=0)
-
-    df['total'] = df[x].sum(axis=1).values
+    partners['total'] = np.bincount(edges['row'], weights=weights,
+                                    minlength=partners.shape[0]).astype(int)
 
     # Now filter for synapse threshold and size
-    df = df[(df.num_nodes >= min_size) & (df.total >= threshold)]
-
-    df.sort_values(['relation', 'total'], inplace=True, ascending=False)
+    keep = (partners.num_nodes.values >= min_size) & \
+           (partners.total.values >= threshold)
 
     if filt:
         if not isinstance(filt, (list, np.ndarray)):
@@ -1531,9 +2124,26 @@ def get_partners(x, remote_instance=None, threshold=1, min_size=2, filt=[],
 
         filt = [str(s) for s in filt]
 
-        df = df[df.skeleton_id.isin(filt) | df.neuron_name.isin(filt)]
+        keep &= partners.skeleton_id.isin(filt).values | \
+                partners.neuron_name.isin(filt).values
+
+    if return_type == 'long':
+        is_edge = keep[edges['row']] & (weights > 0)
+        df = partners.iloc[edges['row'][is_edge]].reset_index(drop=True)
+        df.insert(4, 'query_skid', x[cols[is_edge]])
+        df.insert(5, 'weight', weights[is_edge].astype(int))
+        df = df.drop('total', axis=1)
+        df.sort_values(['relation', 'weight'], inplace=True, ascending=False)
+    else:
+        mat = np.zeros((partners.shape[0], len(x)), dtype=int)
+        np.add.at(mat, (edges['row'], cols), weights.astype(int))
 
-    df.datatype = 'connectivity_table'
+        df = pd.concat([partners.drop('total', axis=1),
+                        pd.DataFrame(mat, columns=x),
+                        partners[['total']]], axis=1)
+        df = df[keep]
+        df.sort_values(['relation', 'total'], inplace=True, ascending=False)
+        df.datatype = 'connectivity_table'
 
     # Return reindexed concatenated dataframe
     df.reset_index(drop=True, inplace=True)
@@ -1577,16 +2187,31 @@ def get_names(x, remote_instance=None):
 
     x = list(set(x))
 
-    remote_get_names_url = remote_instance._get_neuronnames()
+    registry = _get_metadata_registry(remote_instance)
+    if not isinstance(registry, type(None)):
+        names = registry.get_names(x)
+        to_fetch = [s for s in x if str(s) not in names]
+    else:
+        names = {}
+        to_fetch = x
 
-    get_names_postdata = {}
-    get_names_postdata['self.project_id'] = remote_instance.project_id
+    if to_fetch:
+        remote_get_names_url = remote_instance._get_neuronnames()
 
-    for i in range(len(x)):
-        key = 'skids[%i]' % i
-        get_names_postdata[key] = x[i]
+        get_names_postdata = {}
+        get_names_postdata['self.project_id'] = remote_instance.project_id
+
+        for i in range(len(to_fetch)):
+            key = 'skids[%i]' % i
+            get_names_postdata[key] = to_fetch[i]
+
+        fetched = _fetch_metadata(remote_instance, remote_get_names_url,
+                                  get_names_postdata)
 
-    names = remote_instance.fetch(remote_get_names_url, get_names_postdata)
+        if not isinstance(registry, type(None)):
+            registry.update_names(fetched)
+
+        names.update(fetched)
 
     logger.debug(
         'Names for %i of %i skeleton IDs retrieved' % (len(names), len(x)))
@@ -1596,7 +2221,7 @@ def get_names(x, remote_instance=None):
 
 @cache.undo_on_error
 def get_node_details(x, remote_instance=None, chunk_size=10000,
-                     convert_ts=True):
+                     convert_ts=True, return_reviews=False):
     """ Retrieve detailed info for treenodes and/or connectors.
 
     Parameters
@@ -1610,9 +2235,14 @@ def get_node_details(x, remote_instance=None, chunk_size=10000,
     chunk_size :        int, optional
                         Querying large number of nodes will result in server
                         errors. We will thus query them in amenable bouts.
+                        This is the initial chunk size: it is subsequently
+                        adjusted to the server's response times.
     convert_ts :        bool, optional
                         If True, will convert timestamps from strings to
-                        datetime objects.
+                        datetime64.
+    return_reviews :    bool, optional
+                        If True, will also return a table with one row per
+                        review.
 
     Returns
     -------
@@ -1626,6 +2256,14 @@ def get_node_details(x, remote_instance=None, chunk_size=10000,
          0
          1
 
+    reviews :           pandas.DataFrame
+        Only if ``return_reviews=True``. DataFrame in which each row
+        represents a single review::
+
+            node_id  reviewer  review_time
+         0
+         1
+
     """
 
     if isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
@@ -1641,50 +2279,93 @@ def get_node_details(x, remote_instance=None, chunk_size=10000,
     logger.debug(
         'Retrieving details for %i nodes...' % len(node_ids))
 
-    urls = []
-    post = []
-    for ix in range(0, len(node_ids), chunk_size):
-        urls.append(remote_instance._get_node_info_url())
-        post.append({'node_ids[{}]'.format(k): tn for k, tn in enumerate(node_ids[ix:ix + chunk_size])})
-
     # Get responses
-    resp = remote_instance.fetch(urls, post, desc='Chunks')
-    # Merge into a single dictionary
-    data = {k: d[k] for d in resp for k in d}
-
-    # Generate dataframe
-    data_columns = ['creation_time', 'user', 'edition_time',
-                    'editor', 'reviewers', 'review_times']
-    df = pd.DataFrame(
-        [[e] + [d[k] for k in data_columns] for e, d in data.items()],
-        columns=['node_id'] + data_columns,
-        dtype=object
-    )
+    resp = remote_instance.fetch_chunked(remote_instance._get_node_info_url(),
+                                         node_ids, 'node_ids[{}]',
+                                         chunk_size=chunk_size, desc='Chunks')
+
+    # Collect columns
+    ids = np.array([k for d in resp for k in d], dtype=np.int64)
+    values = [v for d in resp for v in d.values()]
+
+    df = pd.DataFrame({'node_id': ids,
+                       'creation_time': [v['creation_time'] for v in values],
+                       'creator': np.array([v['user'] for v in values],
+                                           dtype=np.int64),
+                       'edition_time': [v['edition_time'] for v in values],
+                       'editor': np.array([v['editor'] for v in values],
+                                          dtype=np.int64),
+                       'reviewers': [v['reviewers'] for v in values]},
+                      columns=['node_id', 'creation_time', 'creator',
+                               'edition_time', 'editor', 'reviewers'])
+
+    # Reviews in long format
+    n_reviews = np.array([len(v['reviewers']) for v in values], dtype=int)
+    reviews = pd.DataFrame({'node_id': np.repeat(ids, n_reviews),
+                            'reviewer': np.array([u for v in values for u in v['reviewers']],
+                                                 dtype=np.int64),
+                            'review_time': [t for v in values for t in v['review_times']]},
+                           columns=['node_id', 'reviewer', 'review_time'])
 
-    # Rename column 'user' to 'creator'
-    df.rename({'user': 'creator'}, axis='columns', inplace=True)
+    if convert_ts:
+        df['creation_time'] = _parse_timestamps(df.creation_time.values)
+        df['edition_time'] = _parse_timestamps(df.edition_time.values)
+        reviews['review_time'] = _parse_timestamps(reviews.review_time.values)
 
+    # Keep list of review times per node (as datetime objects)
     if convert_ts:
-        df['creation_time'] = [datetime.datetime.strptime(
-            d[:16], '%Y-%m-%dT%H:%M') for d in df['creation_time'].values]
-        df['edition_time'] = [datetime.datetime.strptime(
-            d[:16], '%Y-%m-%dT%H:%M') for d in df['edition_time'].values]
-        df['review_times'] = [[datetime.datetime.strptime(
-            d[:16], '%Y-%m-%dT%H:%M') for d in lst] for lst in df['review_times'].values]
+        review_times = pd.to_datetime(reviews.review_time.values).to_pydatetime()
+    else:
+        review_times = reviews.review_time.values.astype(object)
+    if df.shape[0]:
+        df['review_times'] = [list(t) for t in np.split(review_times,
+                                                        np.cumsum(n_reviews)[:-1])]
+    else:
+        df['review_times'] = []
+
+    if return_reviews:
+        return df, reviews
 
     return df
 
 
+def _parse_timestamps(x):
+    """ Parse CATMAID timestamps (e.g. '2017-06-12T14:32:51.123Z') in bulk.
+
+    Timestamps are truncated to minutes and returned as datetime64.
+    """
+    x = pd.Series(x, dtype=object).astype(str).str[:16]
+    return pd.to_datetime(x, format='%Y-%m-%dT%H:%M').values
+
+
+def _parse_epochs(x):
+    """ Parse CATMAID epoch timestamps (seconds since 1970, UTC) in bulk.
+
+    Like ``_parse_timestamps``, times are truncated to minutes and returned
+    as (UTC) datetime64.
+    """
+    x = pd.to_datetime(np.asarray(x, dtype=float), unit='s', utc=True)
+    return x.floor('min').values
+
+
 @cache.undo_on_error
-def get_skid_from_treenode(treenode_ids, remote_instance=None):
+def get_skid_from_treenode(treenode_ids, remote_instance=None,
+                           chunk_size=10000):
     """ Retrieve skeleton IDs from a list of nodes.
 
+    Nodes are resolved in batches. If caching is on, mappings are kept in a
+    compact node index on the CatmaidInstance and reused for subsequent
+    queries. Use ``remote_instance.clear_cache()`` after editing skeletons.
+
     Parameters
     ----------
     treenode_ids :      int | list of int
                         Treenode ID(s) to retrieve skeleton IDs for.
     remote_instance :   CATMAID instance, optional
                         If not passed directly, will try using global.
+    chunk_size :        int, optional
+                        Initial number of nodes to resolve per batch request.
+                        Batches are fetched in parallel.
 
     Returns
     -------
@@ -1702,12 +2383,68 @@ def get_skid_from_treenode(treenode_ids, remote_instance=None):
     if not isinstance(treenode_ids, (list, np.ndarray)):
         treenode_ids = [treenode_ids]
 
-    urls = [remote_instance._get_skid_from_tnid(tn) for tn in treenode_ids]
+    tn_ids = np.asarray(treenode_ids, dtype=np.int64)
+
+    if remote_instance.caching:
+        skids = remote_instance._node_index.get(tn_ids)
+    else:
+        skids = np.full(tn_ids.shape[0], -1, dtype=np.int64)
+
+    to_fetch = np.unique(tn_ids[skids < 0])
+
+    if to_fetch.shape[0]:
+        found = _get_skid_from_treenode_batch(to_fetch, remote_instance,
+                                              chunk_size=chunk_size)
+
+        # Fall back to single queries for nodes not found by batch requests
+        # (e.g. if the batch endpoint is not available)
+        missing = to_fetch[~np.isin(to_fetch, found[:, 0])]
+        if missing.shape[0]:
+            urls = [remote_instance._get_skid_from_tnid(tn) for tn in missing]
+            data = remote_instance.fetch(urls, desc='Fetch skids')
+            single = np.array([[tn, d.get('skeleton_id', -1) or -1]
+                               for tn, d in zip(missing, data)],
+                              dtype=np.int64).reshape(-1, 2)
+            found = np.concatenate([found, single[single[:, 1] >= 0]])
+
+        lookup = store.NodeIndex(found[:, 0], found[:, 1])
+        is_missing = skids < 0
+        skids[is_missing] = lookup.get(tn_ids[is_missing])
 
-    data = remote_instance.fetch(urls, desc='Fetch skids')
+        if remote_instance.caching:
+            remote_instance._node_index.update(found[:, 0], found[:, 1])
 
-    return {treenode_ids[i]: d.get('skeleton_id',
-                                   None) for i, d in enumerate(data)}
+    return {tn: int(s) if s >= 0 else None for tn, s in zip(treenode_ids,
+                                                              skids)}
+
+
+def _get_skid_from_treenode_batch(treenode_ids, remote_instance,
+                                  chunk_size=10000):
+    """ Resolve node IDs via the treenode compact-detail endpoint.
+
+    Returns
+    -------
+    numpy.ndarray
+            (N, 2) array of (node ID, skeleton ID) for all nodes found.
+            Empty if the endpoint is not available.
+
+    """
+    url = remote_instance._get_treenode_table_url()
+
+    try:
+        data = remote_instance.fetch_chunked(url, treenode_ids,
+                                             'treenode_ids[{}]',
+                                             chunk_size=chunk_size,
+                                             desc='Fetch skids')
+    except requests.exceptions.HTTPError as e:
+        logger.debug('Batch node lookup failed: {}'.format(e))
+        return np.zeros((0, 2), dtype=np.int64)
+
+    # Format is [[ID, parent ID, x, y, z, confidence, radius, skeleton_id,
+    # edition_time, user_id], ...]
+    return np.array([[n[0], n[7]] for d in data for n in d
+                     if isinstance(n, list)],
+                    dtype=np.int64).reshape(-1, 2)
 
 
 @cache.undo_on_error
@@ -2031,8 +2768,9 @@ def get_connector_links(x, with_tags=False, chunk_size=50,
                         If True will also return dictionary of connector tags.
     chunk_size :        int, optional
                         Neurons are split into chunks of this size and then
-                        queried sequentially to prevent server from returning
-                        an error.
+                        queried in parallel to prevent server from returning
+                        an error. This is the initial chunk size: it is
+                        subsequently adjusted to the server's response times.
     remote_instance :   CATMAID instance, optional
                         If not passed directly, will try using global.
 
@@ -2067,47 +2805,38 @@ def get_connector_links(x, with_tags=False, chunk_size=50,
     skids = utils.eval_skids(x, warn_duplicates=False,
                              remote_instance=remote_instance)
 
+    link_types = ['presynaptic_to', 'postsynaptic_to',
+                  'abutting', 'gapjunction_with']
+
     df_collection = []
     tags = {}
-    with config.tqdm(desc='Fetching links', total=len(skids),
-                     disable=config.pbar_hide,
-                     leave=config.pbar_leave) as pbar:
-        for chunk in [skids[i:i+chunk_size] for i in range(0, len(skids), chunk_size)]:
-            # Generate URLs
-            GET = {'skeleton_ids[{}]'.format(i): s for i, s in enumerate(chunk)}
-            link_types = ['presynaptic_to', 'postsynaptic_to',
-                          'abutting', 'gapjunction_with']
-            urls = [remote_instance._get_connector_links_url(relation_type=cn,
-                                                             **GET) for cn in link_types]
-
-            # Fetch data
-            responses = remote_instance.fetch(urls, disable_pbar=True)
-
-            # Extract tags
-            if with_tags:
-                for r in responses:
-                    tags.update(r['tags'])
-
-            # Generate separate DataFrames
-            data = [pd.DataFrame(r['links'],
-                                 columns=['skeleton_id', 'connector_id',
-                                          'x', 'y', 'z', 'confidence',
-                                          'creator_id', 'treenode_id',
-                                          'creation_time', 'edition_time']
-                                ) for r in responses]
-
-            # Add link type to each DataFrame
-            for t, d in zip(link_types, data):
-                d['relation'] = t
-
-            # Concatenate DataFrames
-            df = pd.concat(data, axis=0)
-
-            # Store
-            df_collection.append(df)
-
-            # Update progress bar
-            pbar.update(len(chunk))
+    for cn in link_types:
+        url = remote_instance._get_connector_links_url(relation_type=cn)
+
+        # Fetch data
+        responses = remote_instance.fetch_chunked(url, skids,
+                                                  'skeleton_ids[{}]',
+                                                  chunk_size=chunk_size,
+                                                  method='GET',
+                                                  desc='Fetching {}'.format(cn))
+
+        # Extract tags
+        if with_tags:
+            for r in responses:
+                tags.update(r['tags'])
+
+        # Generate DataFrame
+        df = pd.DataFrame([l for r in responses for l in r['links']],
+                          columns=['skeleton_id', 'connector_id',
+                                   'x', 'y', 'z', 'confidence',
+                                   'creator_id', 'treenode_id',
+                                   'creation_time', 'edition_time'])
+
+        # Add link type
+        df['relation'] = cn
+
+        # Store
+        df_collection.append(df)
 
     # Merge DataFrames
     df = pd.concat(df_collection, axis=0)
@@ -2129,7 +2858,7 @@ def get_connector_links(x, with_tags=False, chunk_size=50,
 
 
 @cache.undo_on_error
-def get_connector_details(x, remote_instance=None):
+def get_connector_details(x, remote_instance=None, chunk_size=1000):
     """ Retrieve details on sets of connectors.
 
     Parameters
@@ -2139,6 +2868,10 @@ def get_connector_details(x, remote_instance=None):
                         CatmaidNeuron/List, will use their connectors.
     remote_instance :   CATMAID instance, optional
                         If not passed directly, will try using global.
+    chunk_size :        int, optional
+                        Connectors are queried in chunks of this size. This
+                        is the initial chunk size: it is subsequently
+                        adjusted to the server's response times.
 
     Returns
     -------
@@ -2174,22 +2907,11 @@ def get_connector_details(x, remote_instance=None):
 
     # Depending on DATA_UPLOAD_MAX_NUMBER_FIELDS of your CATMAID server
     # (default = 1000), we have to cut requests into batches smaller than that
-    DATA_UPLOAD_MAX_NUMBER_FIELDS = min(50000, len(connector_ids))
-
-    connectors = []
-    with config.tqdm(total=len(connector_ids), desc='CN details',
-                     disable=config.pbar_hide,
-                     leave=config.pbar_leave) as pbar:
-        for b in range(0, len(connector_ids), DATA_UPLOAD_MAX_NUMBER_FIELDS):
-            get_connectors_postdata = {}
-            for i, s in enumerate(connector_ids[b:b + DATA_UPLOAD_MAX_NUMBER_FIELDS]):
-                key = 'connector_ids[%i]' % i
-                get_connectors_postdata[key] = s  # connector_ids[i]
-
-            connectors += remote_instance.fetch(remote_get_connectors_url,
-                                                get_connectors_postdata)
-
-            pbar.update(DATA_UPLOAD_MAX_NUMBER_FIELDS)
+    resp = remote_instance.fetch_chunked(remote_get_connectors_url,
+                                         connector_ids, 'connector_ids[{}]',
+                                         chunk_size=chunk_size,
+                                         desc='CN details')
+    connectors = [cn for r in resp for cn in r]
 
     logger.info('Data for %i of %i unique connector IDs retrieved' % (
         len(connectors), len(set(connector_ids))))
@@ -2300,7 +3022,7 @@ def get_connectors_between(a, b, directional=True, remote_instance=None):
 
 
 @cache.undo_on_error
-def get_review(x, remote_instance=None):
+def get_review(x, remote_instance=None, chunk_size=1000):
     """ Retrieve review status for a set of neurons.
 
     Parameters
@@ -2314,6 +3036,10 @@ def get_review(x, remote_instance=None):
                         4. CatmaidNeuron or CatmaidNeuronList object
     remote_instance :   CATMAID instance, optional
                         If not passed directly, will try using global.
+    chunk_size :        int, optional
+                        Neurons are queried in chunks of this size. This is
+                        the initial chunk size: it is subsequently adjusted
+                        to the server's response times.
 
     Returns
     -------
@@ -2342,27 +3068,15 @@ def get_review(x, remote_instance=None):
 
     remote_get_reviews_url = remote_instance._get_review_status_url()
 
-    names = {}
-    review_status = {}
-
-    CHUNK_SIZE = 1000
-
-    with config.tqdm(total=len(x), disable=config.pbar_hide,
-                     desc='Rev. status',
-                     leave=config.pbar_leave) as pbar:
-        for j in range(0, len(x), CHUNK_SIZE):
-            get_review_postdata = {}
-
-            for i in range(j, min(j + CHUNK_SIZE, len(x))):
-                key = 'skeleton_ids[%i]' % i
-                get_review_postdata[key] = str(x[i])
-
-            names.update(get_names(x[j:j + CHUNK_SIZE], remote_instance))
-
-            review_status.update(remote_instance.fetch(
-                remote_get_reviews_url, get_review_postdata))
+    names = get_names(x, remote_instance)
 
-            pbar.update(CHUNK_SIZE)
+    review_status = {}
+    for r in remote_instance.fetch_chunked(remote_get_reviews_url,
+                                           [str(s) for s in x],
+                                           'skeleton_ids[{}]',
+                                           chunk_size=chunk_size,
+                                           desc='Rev. status'):
+        review_status.update(r)
 
     df = pd.DataFrame([[s,
                         names[str(s)],
@@ -2415,7 +3129,7 @@ def remove_annotations(x, annotations, remote_instance=None):
     annotations = utils._make_iterable(annotations)
 
     # Translate into annotations ID
-    an_list = get_annotation_list().set_index('annotation')
+    an_list = get_annotation_list(remote_instance=remote_instance).set_index('annotation')
 
     an_ids = []
     for a in annotations:
@@ -2444,6 +3158,8 @@ def remove_annotations(x, annotations, remote_instance=None):
         resp = remote_instance.fetch(
             remove_annotations_url, remove_annotations_postdata)
 
+        _drop_metadata(remote_instance, tables='annotations')
+
         an_list = an_list.reset_index().set_index('annotation_id')
 
         if len(resp['deleted_annotations']) == 0:
@@ -2513,9 +3229,13 @@ def add_annotations(x, annotations, remote_instance=None):
         key = 'annotations[%i]' % i
         add_annotations_postdata[key] = str(annotations[i])
 
-    return remote_instance.fetch(add_annotations_url,
+    resp = remote_instance.fetch(add_annotations_url,
                                  add_annotations_postdata)
 
+    _drop_metadata(remote_instance, tables='annotations')
+
+    return resp
+
 
 @cache.never_cache
 def add_meta_annotations(to_annotate, to_add, remote_instance=None):
@@ -2571,6 +3291,8 @@ def add_meta_annotations(to_annotate, to_add, remote_instance=None):
     logger.info(remote_instance.fetch(
         add_annotations_url, add_annotations_postdata))
 
+    _drop_metadata(remote_instance, tables='annotations')
+
     return
 
 
@@ -2635,6 +3357,8 @@ def remove_meta_annotations(remove_from, to_remove, remote_instance=None):
     logger.info(remote_instance.fetch(
         add_annotations_url, remove_annotations_postdata))
 
+    _drop_metadata(remote_instance, tables='annotations')
+
     return
 
 
@@ -2905,11 +3629,9 @@ def get_annotation_id(annotations, remote_instance=None, allow_partial=False):
 
     logger.debug('Retrieving list of annotations...')
 
-    remote_annotation_list_url = remote_instance._get_annotation_list()
-    an_list = remote_instance.fetch(remote_annotation_list_url)
-
-    # Turn into pandas array
-    an_list = pd.DataFrame.from_records(an_list['annotations'])
+    an_list = get_annotation_list(remote_instance=remote_instance)
+    an_list = an_list.rename(columns={'annotation': 'name',
+                                      'annotation_id': 'id'})
 
     annotations = utils._make_iterable(annotations)
     annotation_ids = {}
@@ -3309,6 +4031,116 @@ def get_skids_by_annotation(annotations, remote_instance=None,
     return annotated_skids
 
 
+def _resolve_skid_queries(queries, remote_instance=None):
+    """ Resolve annotation and name queries as used by ``eval_skids``.
+
+    Plain (exact) annotations and names are resolved in a single batch of
+    parallel requests. Regex (``/``) and NOT (``~``) annotations are passed on
+    to :func:`~pymaid.get_skids_by_annotation`. If caching is on, resolutions
+    are memoized on the CatmaidInstance for ``config.skid_cache_ttl`` seconds.
+
+    Parameters
+    ----------
+    queries :           list of str
+                        E.g. ``['annotation:glomerulus DA1', 'name:PN DA1']``.
+                        Strings without prefix are treated as names.
+    remote_instance :   CATMAID instance, optional
+                        If not passed directly, will try using global.
+
+    Returns
+    -------
+    dict
+                        ``{query: [skid1, skid2, ...], ...}``
+
+    """
+
+    remote_instance = utils._eval_remote_instance(remote_instance)
+
+    queries = list(OrderedDict.fromkeys(queries))
+
+    resolved = {q: _memo_get(remote_instance, q) for q in queries}
+    resolved = {q: v for q, v in resolved.items() if not isinstance(v, type(None))}
+    cached = set(resolved)
+
+    annotations = {}
+    names = {}
+    for q in queries:
+        if q in resolved:
+            continue
+        if q.startswith('annotation:') or q.startswith('annotations:'):
+            an = q[q.index(':') + 1:].strip()
+            if an.startswith('~') or an.startswith('/'):
+                resolved[q] = get_skids_by_annotation(an,
+                                                      remote_instance=remote_instance)
+            else:
+                annotations[q] = an
+        else:
+            n = q[5:] if q.startswith('name:') else q
+            names[q] = n if n.startswith('/') else '/^{}$'.format(n)
+
+    if annotations:
+        an_list = get_annotation_list(remote_instance=remote_instance)
+        an_ids = dict(zip(an_list.annotation, an_list.annotation_id))
+
+        missing = [an for an in annotations.values() if an not in an_ids]
+        if missing:
+            raise Exception('No matching annotation(s) found: '
+                            '{}'.format(', '.join(missing)))
+
+    # Resolve all remaining annotations and names in one go
+    to_fetch = list(annotations) + list(names)
+    POST = [{'annotated_with': an_ids[annotations[q]]} for q in annotations]
+    POST += [{'name': names[q], 'with_annotations': False} for q in names]
+    urls = [remote_instance._get_annotated_url() for _ in POST]
+
+    resp = remote_instance.fetch(urls, post=POST, desc='Resolving') if urls else []
+
+    missing = []
+    for q, r in zip(to_fetch, resp):
+        skids = [e['skeleton_ids'][0] for e in r['entities'] if e['type'] == 'neuron']
+        skids = list(OrderedDict.fromkeys(skids))
+        if not skids and q in names:
+            missing.append(q)
+        resolved[q] = skids
+
+    if missing:
+        raise Exception('No matching name(s) found: '
+                        '{}'.format(', '.join(missing)))
+
+    for q in queries:
+        if q not in cached:
+            _memo_set(remote_instance, q, resolved[q])
+
+    return resolved
+
+
+def _memo_get(remote_instance, key):
+    """ Get memoized skeleton IDs for given query key.
+
+    Returns ``None`` if memoization is off (caching off or
+    ``config.skid_cache_ttl == 0``) or if there is no valid entry.
+    """
+    memo = getattr(remote_instance, '_skid_cache', None)
+    if not getattr(remote_instance, 'caching', False) or not config.skid_cache_ttl \
+       or isinstance(memo, type(None)):
+        return None
+
+    entry = memo.get(key)
+    if entry and time.time() - entry[0] < config.skid_cache_ttl:
+        return type(entry[1])(entry[1])
+    return None
+
+
+def _memo_set(remote_instance, key, value):
+    """ Memoize skeleton IDs for given query key (see ``_memo_get``). """
+    memo = getattr(remote_instance, '_skid_cache', None)
+    if not getattr(remote_instance, 'caching', False) or not config.skid_cache_ttl \
+       or isinstance(memo, type(None)):
+        return
+
+    memo[key] = (time.time(), type(value)(value))
+
+
 @cache.undo_on_error
 def neuron_exists(x, remote_instance=None):
     """ Check if neurons exist in CATMAID.
@@ -3503,7 +4335,11 @@ def delete_neuron(x, no_prompt=False, remote_instance=None):
 
     url = remote_instance._delete_neuron_url(neuronid)
 
-    return remote_instance.fetch(url)
+    resp = remote_instance.fetch(url)
+
+    _drop_metadata(remote_instance, skeleton_ids=x)
+
+    return resp
 
 
 @cache.never_cache
@@ -4197,14 +5033,17 @@ def get_neuron_list(remote_instance=None, user=None, node_count=1,
 
 
 @cache.undo_on_error
-def get_history(remote_instance=None,
-                start_date=(datetime.date.today() - datetime.timedelta(days=7)).isoformat(),
-                end_date=datetime.date.today().isoformat(), split=True):
+def get_history(remote_instance=None, start_date=None, end_date=None,
+                split=True, cache_dir=None):
     """ Retrieves CATMAID project history.
 
     If the time window is too large, the connection might time out which will
     result in an error! Make sure ``split=True`` to avoid that.
 
+    If a disk cache is set (see ``cache_dir``), windows that lie entirely in
+    the past are cached there and are not requested again. Only windows that
+    include yesterday or today are always fetched from the server.
+
     Parameters
     ----------
     remote_instance :   CATMAID instance, optional
@@ -4220,7 +5059,12 @@ def get_history(remote_instance=None,
     split :             bool, optional
                         If True, history will be requested in bouts of 6 months.
                         Useful if you want to look at a very big time window
-                        as this can lead to gateway timeout.
+                        as this can lead to gateway timeout. Bouts are
+                        requested in parallel.
+    cache_dir :         str | False, optional
+                        Directory to cache closed windows in. If None, will
+                        use ``pymaid.config.history_cache`` which is off by
+                        default. Set to False to not use the disk cache.
 
     Returns
     -------
@@ -4275,6 +5119,14 @@ def get_history(remote_instance=None,
 
     remote_instance = utils._eval_remote_instance(remote_instance)
 
+    if isinstance(start_date, type(None)):
+        start_date = datetime.date.today() - datetime.timedelta(days=7)
+    if isinstance(end_date, type(None)):
+        end_date = datetime.date.today()
+
+    if isinstance(cache_dir, type(None)):
+        cache_dir = config.history_cache
+
     if isinstance(start_date, datetime.date):
         start_date = start_date.isoformat()
     elif isinstance(start_date, datetime.datetime):
@@ -4311,9 +5163,12 @@ def get_history(remote_instance=None,
     else:
         rounds = [(start_date, end_date)]
 
-    data = []
-    for r in config.tqdm(rounds, desc='Retrieving history',
-                         disable=config.pbar_hide, leave=config.pbar_leave):
+    # Windows ending before yesterday won't change anymore
+    last_closed = datetime.date.today() - datetime.timedelta(days=2)
+
+    data = [None] * len(rounds)
+    to_fetch = []
+    for i, r in enumerate(rounds):
         get_history_GET_data = {'pid': remote_instance.project_id,
                                 'start_date': r[0],
                                 'end_date': r[1]
@@ -4324,20 +5179,48 @@ def get_history(remote_instance=None,
         remote_get_history_url += '?%s' % urllib.parse.urlencode(
             get_history_GET_data)
 
+        closed = datetime.datetime.strptime(r[1], "%Y-%m-%d").date() <= last_closed
+
+        fn = None
+        if cache_dir and closed:
+            key = '{}|{}|{}|{}'.format(remote_instance.server,
+                                       remote_instance.project_id, *r)
+            fn = os.path.join(cache_dir,
+                              hashlib.md5(key.encode()).hexdigest() + '.json')
+            if os.path.isfile(fn):
+                logger.debug('Using cached history from %s to %s ' % (r[0], r[1]))
+                with open(fn, 'r') as f:
+                    data[i] = json.load(f)
+                continue
+
+        # Make sure open windows are not served from memory cache
+        if not closed:
+            remote_instance._cache.clear_cached_url(remote_get_history_url)
+
         logger.debug(
             'Retrieving user history from %s to %s ' % (r[0], r[1]))
 
-        data.append(remote_instance.fetch(remote_get_history_url))
+        to_fetch.append((i, remote_get_history_url, fn))
+
+    if to_fetch:
+        resp = remote_instance.fetch([u for _, u, _ in to_fetch],
+                                     desc='Retrieving history')
+        for (i, _, fn), d in zip(to_fetch, resp):
+            data[i] = d
+            if fn:
+                os.makedirs(os.path.dirname(fn), exist_ok=True)
+                with open(fn, 'w') as f:
+                    json.dump(d, f)
 
     # Now merge data into a single dict
-    stats = dict(data[0])
-    for d in data:
+    stats = json.loads(json.dumps(data[0]))
+    for d in data[1:]:
         stats['days'] += [e for e in d['days'] if e not in stats['days']]
         stats['daysformatted'] += [e for e in d['daysformatted']
                                    if e not in stats['daysformatted']]
 
         for u in d['stats_table']:
-            stats['stats_table'][u].update(d['stats_table'][u])
+            stats['stats_table'].setdefault(u, {}).update(d['stats_table'][u])
 
     user_list = get_user_list(remote_instance).set_index('id')
     user_list.index = user_list.index.astype(str)
@@ -4366,9 +5249,15 @@ def get_history(remote_instance=None,
 
 @cache.undo_on_error
 def get_nodes_in_volume(left, right, top, bottom, z1, z2, remote_instance=None,
-                        coord_format='NM', resolution=(4, 4, 50)):
+                        coord_format='NM', resolution=(4, 4, 50), limit=3500,
+                        max_depth=6, volume=None):
     """ Retrieve treenodes and connectors in given bounding box.
 
+    The server returns at most ``limit`` nodes per request. Boxes that hit
+    this limit are split into octants (quadrants for flat boxes) until all
+    tiles are complete. Tiles of each level are fetched in parallel and
+    nodes on tile borders are deduplicated.
+
     Parameters
     ----------
     left :                  int | float
@@ -4388,6 +5277,16 @@ def get_nodes_in_volume(left, right, top, bottom, z1, z2, remote_instance=None,
                             x/y/z resolution in nm [default = (4, 4, 50)]
                             Used to transform to nm if limits are given in
                             pixels.
+    limit :                 int, optional
+                            Max number of nodes per request.
+    max_depth :             int, optional
+                            Max number of times a box is subdivided. If
+                            tiles at this depth still hit the node limit,
+                            results will be incomplete and
+                            ``node_limit_reached`` is True.
+    volume :                str | pymaid.Volume, optional
+                            If provided, will only return treenodes and
+                            connectors within this volume's mesh.
 
     Returns
     -------
@@ -4413,6 +5312,12 @@ def get_nodes_in_volume(left, right, top, bottom, z1, z2, remote_instance=None,
            "node_limit_reached" : boolean
           True/False; if True, node limit was exceeded
 
+    Examples
+    --------
+    >>> # Get all nodes within a neuropil
+    >>> lh = pymaid.get_volume('LH_R')
+    >>> nodes = pymaid.get_nodes_in_volume(*lh.bbox.ravel(), volume=lh)
+
     """
 
     remote_instance = utils._eval_remote_instance(remote_instance)
@@ -4421,51 +5326,132 @@ def get_nodes_in_volume(left, right, top, bottom, z1, z2, remote_instance=None,
     if coord_format == 'NM':
         resolution = (1, 1, 1)
 
-    remote_nodes_list = remote_instance._get_node_list_url()
-
-    node_list_postdata = {
-        'left': left * resolution[0],
-        'right': right * resolution[0],
-        'top': top * resolution[1],
-        'bottom': bottom * resolution[1],
-        'z1': z1 * resolution[2],
-        'z2': z2 * resolution[2],
-        # Atnid seems to be related to fetching the
-        # active node too (will be ignored if atnid =
-        # -1)
-        'atnid': -1,
-        'labels': False,
-        'limit': 3500,  # This limits the number of nodes -> default is 3500
-
-    }
-
-    node_list = remote_instance.fetch(remote_nodes_list, node_list_postdata)
-
-    data = {'treenodes': pd.DataFrame([[i[0], i[1], i[2], i[3], i[4], i[5],
-                                        i[6], i[7],
-                                        datetime.datetime.fromtimestamp(int(i[8]),
-                                                                        tz=datetime.timezone.utc),
-                                        i[9]]
-                                       for i in node_list[0]],
-                                      columns=['treenode_id', 'parent_id',
-                                               'x', 'y', 'z', 'confidence',
-                                               'radius', 'skeleton_id',
-                                               'edition_time', 'user_id'],
-                                      dtype=object),
-            'connectors': pd.DataFrame([[i[0], i[1], i[2], i[3], i[4],
-                                         datetime.datetime.fromtimestamp(int(i[5]),
-                                                                         tz=datetime.timezone.utc),
-                                         i[6], i[7]]
-                                        for i in node_list[1]],
-                                       columns=['connector_id', 'x', 'y', 'z',
-                                                'confidence', 'edition_time',
-                                                'user_id', 'partners'],
-                                       dtype=object),
-            'labels': node_list[3],
-            'node_limit_reached': node_list[4],
-           }
+    bbox = np.array([[left, right], [top, bottom], [z1, z2]], dtype=float)
+    bbox *= np.asarray(resolution, dtype=float).reshape(3, 1)
 
-    return data
+    treenodes, connectors, labels, limit_reached = _get_node_list_tiled(bbox,
+                                                                       limit=limit,
+                                                                       max_depth=max_depth,
+                                                                       remote_instance=remote_instance)
+
+    if limit_reached:
+        logger.warning('Node limit reached at max depth {}: results are '
+                       'incomplete. Try increasing max_depth.'.format(max_depth))
+
+    treenodes = pd.DataFrame(treenodes,
+                             columns=['treenode_id', 'parent_id',
+                                      'x', 'y', 'z', 'confidence',
+                                      'radius', 'skeleton_id',
+                                      'edition_time', 'user_id'],
+                             dtype=object)
+    connectors = pd.DataFrame(connectors,
+                              columns=['connector_id', 'x', 'y', 'z',
+                                       'confidence', 'edition_time',
+                                       'user_id', 'partners'],
+                              dtype=object)
+
+    # Nodes on the border of two tiles are returned twice
+    treenodes = treenodes.drop_duplicates('treenode_id').reset_index(drop=True)
+    connectors = connectors.drop_duplicates('connector_id').reset_index(drop=True)
+
+    for df in [treenodes, connectors]:
+        df['edition_time'] = pd.to_datetime(df.edition_time.values.astype(np.int64),
+                                            unit='s', utc=True)
+
+    if not isinstance(volume, type(None)):
+        for df in [treenodes, connectors]:
+            if not df.empty:
+                is_in = np.asarray(in_volume(df[['x', 'y', 'z']].values.astype(float),
+                                             volume, remote_instance=remote_instance),
+                                   dtype=bool)
+                df.drop(df.index[~is_in], inplace=True)
+                df.reset_index(drop=True, inplace=True)
+
+    return {'treenodes': treenodes,
+            'connectors': connectors,
+            'labels': labels,
+            'node_limit_reached': limit_reached}
+
+
+def _get_node_list_tiled(bbox, limit=3500, max_depth=6, remote_instance=None):
+    """ Fetch node list for a bounding box, subdividing boxes that hit the
+    node limit.
+
+    Parameters
+    ----------
+    bbox :              numpy.ndarray
+                        ``[[left, right], [top, bottom], [z1, z2]]`` in nm.
+
+    Returns
+    -------
+    treenodes :         list
+                        Raw treenode rows (may contain duplicates).
+    connectors :        list
+                        Raw connector rows (may contain duplicates).
+    labels :            dict
+    limit_reached :     bool
+                        True if tiles at ``max_depth`` hit the node limit.
+
+    """
+    url = remote_instance._get_node_list_url()
+
+    treenodes, connectors, labels = [], [], {}
+    limit_reached = False
+
+    tiles = [np.sort(np.asarray(bbox, dtype=float), axis=1)]
+    for depth in range(max_depth + 1):
+        post = [{'left': t[0, 0], 'right': t[0, 1],
+                 'top': t[1, 0], 'bottom': t[1, 1],
+                 'z1': t[2, 0], 'z2': t[2, 1],
+                 # Atnid seems to be related to fetching the
+                 # active node too (will be ignored if atnid =
+                 # -1)
+                 'atnid': -1,
+                 'labels': False,
+                 'limit': limit} for t in tiles]
+
+        data = remote_instance.fetch([url] * len(tiles), post=post,
+                                     desc='Tiles (depth {})'.format(depth))
+
+        to_split = []
+        for t, d in zip(tiles, data):
+            # Truncated tiles are subdivided and fetched again
+            if d[4] and depth < max_depth:
+                to_split.append(t)
+                continue
+            limit_reached |= bool(d[4])
+            treenodes += d[0]
+            connectors += d[1]
+            labels.update(d[3])
+
+        if not to_split:
+            break
+
+        logger.debug('{} of {} tiles hit the node limit: '
+                     'subdividing'.format(len(to_split), len(tiles)))
+        tiles = [s for t in to_split for s in _split_bbox(t)]
+
+    return treenodes, connectors, labels, limit_reached
+
+
+def _split_bbox(bbox):
+    """ Split bounding box in half along all axes that are at least half as
+    long as the longest axis (octants for cubes, quadrants for slabs).
+    """
+    ext = bbox[:, 1] - bbox[:, 0]
+    return _tile_bbox(bbox, np.where(ext >= ext.max() / 2, 2, 1))
+
+
+def _tile_bbox(bbox, n_tiles):
+    """ Split bounding box into a regular grid of ``n_tiles`` (x, y, z)
+    tiles.
+    """
+    bbox = np.sort(np.asarray(bbox, dtype=float), axis=1)
+    edges = [np.linspace(lo, hi, n + 1) for (lo, hi), n in zip(bbox, n_tiles)]
+    return [np.array([[ex0, ex1], [ey0, ey1], [ez0, ez1]])
+            for ex0, ex1 in zip(edges[0][:-1], edges[0][1:])
+            for ey0, ey1 in zip(edges[1][:-1], edges[1][1:])
+            for ez0, ez1 in zip(edges[2][:-1], edges[2][1:])]
 
 
 @cache.undo_on_error
@@ -4481,6 +5467,14 @@ def find_neurons(names=None, annotations=None, volumes=None, users=None,
     will return single-node neurons! Use the ``min_size`` parameter to change
     that behaviour.
 
+    Criteria are evaluated in order of their (estimated) cost: names and
+    annotations first, then users, reviewers and size, and volumes last.
+    With ``intersect=True``, neurons matching the cheaper criteria are pushed
+    into the volume queries: if the candidates left have fewer nodes in total
+    than a volume query is estimated to cost, their nodes are checked instead
+    of querying the whole volume. If caching is on,
+    results for individual criteria are memoized (``config.skid_cache_ttl``).
+
     Parameters
     ----------
     names :             str | list of str
@@ -4587,35 +5581,28 @@ def find_neurons(names=None, annotations=None, volumes=None, users=None,
         logger.warning('Start/End dates can only be used for queries against '
                        '<users> or <reviewed_by>')
 
-    # Now go over all parameters and get sets of skids
+    # Criteria are evaluated roughly in order of their cost: skeleton IDs,
+    # names and annotations first, then users/reviewers/size and volumes
+    # last. Requests within each stage are run in parallel. If intersecting,
+    # we stop as soon as no candidates are left and push the candidates into
+    # the volume queries.
     sets_of_skids = []
 
+    def _exhausted():
+        return intersect and any(not s for s in sets_of_skids)
+
     if not isinstance(skids, type(None)):
         skids = utils.eval_skids(skids, remote_instance=remote_instance)
-        sets_of_skids.append(set(skids, remote_instance=remote_instance))
+        sets_of_skids.append(set(int(s) for s in skids))
 
-    # Get skids by name
+    # Get skids by name and annotation
+    keys, post_data = [], []
     if names:
-        urls = [remote_instance._get_annotated_url() for n in names]
-        post_data = [{'name': str(n), 'with_annotations': 'false'}
-                     for n in names]
-
-        results = remote_instance.fetch(urls,
-                                        post=post_data,
-                                        desc='Get names')
-
-        this_name = []
-        for i, r in enumerate(results):
-            for e in r['entities']:
-                if partial_match and e['type'] == 'neuron' and names[i].lower() in e['name'].lower():
-                    this_name.append(e['skeleton_ids'][0])
-                if not partial_match and e['type'] == 'neuron' and e['name'] == names[i]:
-                    this_name.append(e['skeleton_ids'][0])
+        keys += [('name', str(n), partial_match) for n in names]
+        post_data += [{'name': str(n), 'with_annotations': 'false'}
+                      for n in names]
 
-        sets_of_skids.append(set(this_name))
-
-    # Get skids by annotation
-    if annotations:
+    if annotations and not _exhausted():
         annotation_ids = get_annotation_id(
             annotations, remote_instance, allow_partial=partial_match)
 
@@ -4629,89 +5616,47 @@ def find_neurons(names=None, annotations=None, volumes=None, users=None,
             logger.debug('Found id(s): %s | Unable to retrieve: %i' % (
                 str(annotation_ids), len(annotations) - len(annotation_ids)))
 
-        urls = [remote_instance._get_annotated_url() for an in annotation_ids]
-        post_data = [{'annotated_with': str(an), 'with_annotations': 'false'}
-                     for an in annotation_ids.values()]
-        results = remote_instance.fetch(urls,
-                                        post=post_data,
-                                        desc='Get annot')
-
-        annotated = [set([e['skeleton_ids'][0] for e in res['entities'] if e['type'] == 'neuron']) for res in results]
-
-        # Intersect within search criteria if applicable
-        if intersect:
-            sets_of_skids.append(set.intersection(*annotated))
-        else:
-            sets_of_skids.append(set.union(*annotated))
-
-    # Get skids by user
-    if users:
-        urls = [remote_instance._get_list_skeletons_url() for u in users]
-        GET_data = [{'nodecount_gt': min_size,
-                     'created_by': u} for u in users]
-
-        if from_date and to_date:
-            dates = {'from': ''.join(['{0:02d}'.format(d) for d in from_date]),
-                     'to': ''.join(['{0:02d}'.format(d) for d in to_date])}
-            GET_data = [{**d, **dates} for d in GET_data]
-        urls = [u + '?%s' % urllib.parse.urlencode(g) for u, g in zip(urls, GET_data)]
-
-        results = remote_instance.fetch(urls, desc='Get users')
-
-        # Intersect within search criteria if applicable
-        if intersect:
-            sets_of_skids.append(set.intersection(*[set(res) for res in results]))
-        else:
-            sets_of_skids.append(set.union(*[set(res) for res in results]))
-
-    # Get skids by reviewer
-    if reviewed_by:
-        urls = [remote_instance._get_list_skeletons_url() for u in reviewed_by]
-        GET_data = [{'nodecount_gt': min_size,
-                     'reviewed_by': u} for u in reviewed_by]
-
-        if from_date and to_date:
-            dates = {'from': ''.join(['{0:02d}'.format(d) for d in from_date]),
-                     'to': ''.join(['{0:02d}'.format(d) for d in to_date])}
-            GET_data = [{**d, **dates} for d in GET_data]
-        urls = [u + '?%s' % urllib.parse.urlencode(g) for u, g in zip(urls, GET_data)]
-
-        results = remote_instance.fetch(urls, desc='Get reviewers')
+        keys += [('annotated_with', an) for an in annotation_ids.values()]
+        post_data += [{'annotated_with': str(an), 'with_annotations': 'false'}
+                      for an in annotation_ids.values()]
+
+    def _parse_entities(key, r):
+        if key[0] != 'name':
+            return [e['skeleton_ids'][0] for e in r['entities'] if e['type'] == 'neuron']
+        if partial_match:
+            return [e['skeleton_ids'][0] for e in r['entities']
+                    if e['type'] == 'neuron' and key[1].lower() in e['name'].lower()]
+        return [e['skeleton_ids'][0] for e in r['entities']
+                if e['type'] == 'neuron' and e['name'] == key[1]]
+
+    if keys and not _exhausted():
+        results = _fetch_skid_sets(keys,
+                                   [remote_instance._get_annotated_url() for k in keys],
+                                   post=post_data,
+                                   parse=_parse_entities,
+                                   desc='Get names/annot',
+                                   remote_instance=remote_instance)
 
-        # Intersect within search criteria if applicable
-        if intersect:
-            sets_of_skids.append(set.intersection(*[set(res) for res in results]))
-        else:
-            sets_of_skids.append(set.union(*[set(res) for res in results]))
+        if names:
+            sets_of_skids.append(set.union(*results[:len(names)]))
 
-    # Get by volume
-    if volumes:
-        temp = []
-        for v in config.tqdm(volumes, desc='Get by vols',
-                             disable=config.pbar_hide,
-                             leave=config.pbar_leave):
-            if not isinstance(v, core.Volume):
-                vol = get_volume(v, remote_instance)
+        if annotations:
+            annotated = results[len(names) if names else 0:]
+            # Intersect within search criteria if applicable
+            if intersect:
+                sets_of_skids.append(set.intersection(*annotated))
             else:
-                vol = v
-
-            temp.append(set(get_neurons_in_bbox(vol.bbox,
-                                                remote_instance=remote_instance)))
-
-        # Intersect within search criteria if applicable
-        if intersect:
-            sets_of_skids.append(set.intersection(*temp))
-        else:
-            sets_of_skids.append(set.union(*temp))
+                sets_of_skids.append(set.union(*annotated))
 
     # Get neurons by size if only min_size and no other no parameters were
     # provided
-    if False not in [isinstance(param, type(None)) for param in [names,
-                                                                 annotations,
-                                                                 volumes,
-                                                                 users,
-                                                                 reviewed_by,
-                                                                 skids]]:
+    size_only = False not in [isinstance(param, type(None)) for param in [names,
+                                                                           annotations,
+                                                                           volumes,
+                                                                           users,
+                                                                           reviewed_by,
+                                                                           skids]]
+    if size_only:
         # Make sure people don't accidentally request ALL neurons in the
         # dataset
         if min_size <= 1:
@@ -4727,34 +5672,98 @@ def find_neurons(names=None, annotations=None, volumes=None, users=None,
 
         logger.info(
             'Get all neurons with > {0} nodes'.format(min_size))
-        get_skeleton_list_GET_data = {'nodecount_gt': min_size}
-        remote_get_list_url = remote_instance._get_list_skeletons_url()
-        remote_get_list_url += '?%s' % urllib.parse.urlencode(
-            get_skeleton_list_GET_data)
-        these_neurons = set(remote_instance.fetch(remote_get_list_url))
 
-        sets_of_skids.append(these_neurons)
+    # Filtering by size is done by the server for users and reviewed_by.
+    # If we queried by annotations, names or volumes we need to do this
+    # explicitly
+    filter_size = min_size > 1 and bool(volumes or annotations or names)
+
+    # Get skids by user, reviewer and size
+    keys, urls = [], []
+    if from_date and to_date:
+        dates = {'from': ''.join(['{0:02d}'.format(d) for d in from_date]),
+                 'to': ''.join(['{0:02d}'.format(d) for d in to_date])}
+    else:
+        dates = {}
+    for crit, ids in [('created_by', users), ('reviewed_by', reviewed_by)]:
+        for u in (ids or []):
+            GET_data = {'nodecount_gt': min_size, crit: u, **dates}
+            keys.append((crit, u, min_size, tuple(sorted(dates.items()))))
+            urls.append(remote_instance._get_list_skeletons_url() + '?%s' % urllib.parse.urlencode(GET_data))
+    if size_only or filter_size:
+        keys.append(('nodecount_gt', min_size))
+        urls.append(remote_instance._get_list_skeletons_url() + '?%s' % urllib.parse.urlencode({'nodecount_gt': min_size}))
+
+    size_set = None
+    if keys and not _exhausted():
+        results = _fetch_skid_sets(keys, urls,
+                                   parse=lambda k, r: r,
+                                   desc='Get users/size',
+                                   remote_instance=remote_instance)
+
+        for ids in [users, reviewed_by]:
+            if not ids:
+                continue
+            # Intersect within search criteria if applicable
+            if intersect:
+                sets_of_skids.append(set.intersection(*results[:len(ids)]))
+            else:
+                sets_of_skids.append(set.union(*results[:len(ids)]))
+            results = results[len(ids):]
+
+        if size_only:
+            sets_of_skids.append(results[0])
+        elif filter_size:
+            size_set = results[0]
+            # Size is just another criterion when intersecting
+            if intersect:
+                sets_of_skids.append(size_set)
+
+    # Get by volume
+    if volumes and not _exhausted():
+        bboxes = []
+        for v in volumes:
+            if not isinstance(v, core.Volume):
+                v = get_volume(v, remote_instance)
+            bboxes.append(np.sort(np.asarray(v.bbox, dtype=float), axis=1))
+
+        # Candidates are all neurons that can still make it into the results
+        if intersect and sets_of_skids:
+            candidates = set.intersection(*sets_of_skids)
+        else:
+            candidates = size_set
+
+        if intersect:
+            # Smaller boxes first: cheaper and (typically) more selective
+            bboxes = sorted(bboxes, key=lambda b: np.prod(b[:, 1] - b[:, 0]))
+
+        temp = []
+        for bbox in config.tqdm(bboxes, desc='Get by vols',
+                                disable=config.pbar_hide or len(bboxes) == 1,
+                                leave=config.pbar_leave):
+            temp.append(_find_neurons_in_bbox(bbox, candidates,
+                                              remote_instance=remote_instance))
+            # Push results from previous volumes into the next
+            if intersect:
+                candidates = temp[-1]
+                if not candidates:
+                    break
+
+        # Intersect within search criteria if applicable
+        if intersect:
+            sets_of_skids.append(set.intersection(*temp))
+        else:
+            sets_of_skids.append(set.union(*temp))
 
     # Now intersect/merge ACROSS search criteria
     if intersect:
         logger.info('Intersecting by search parameters')
-        skids = list(set.intersection(*sets_of_skids))
+        skids = set.intersection(*sets_of_skids)
     else:
-        skids = list(set.union(*sets_of_skids))
-
-    # Filtering by size was already done for users and reviewed_by and dates
-    # If we queried by annotations, names or volumes we need to do this
-    # explicitly here
-    if min_size > 1 and (volumes or annotations or names):
-        logger.info('Filtering neurons for size')
-
-        get_skeleton_list_GET_data = {'nodecount_gt': min_size}
-        remote_get_list_url = remote_instance._get_list_skeletons_url()
-        remote_get_list_url += '?%s' % urllib.parse.urlencode(
-            get_skeleton_list_GET_data)
-        neurons_by_size = set(remote_instance.fetch(remote_get_list_url))
-
-        skids = set.intersection(set(skids), neurons_by_size)
+        skids = set.union(*sets_of_skids)
+        if not isinstance(size_set, type(None)):
+            logger.info('Filtering neurons for size')
+            skids = skids & size_set
 
     nl = core.CatmaidNeuronList(list(skids), remote_instance=remote_instance)
     nl.get_names()
@@ -4778,14 +5787,164 @@ def find_neurons(names=None, annotations=None, volumes=None, users=None,
     return nl
 
 
+def _fetch_skid_sets(keys, urls, post=None, parse=None, desc='Fetching',
+                     remote_instance=None):
+    """ Fetch sets of skeleton IDs for search criteria (see find_neurons).
+
+    Sets are memoized under given ``keys``: only criteria without a valid
+    entry are fetched - all in parallel.
+
+    Parameters
+    ----------
+    keys :              list of tuples
+                        One (hashable) key per criterion.
+    urls :              list of str
+    post :              list of dicts, optional
+    parse :             callable
+                        Called with ``(key, response)``. Must return an
+                        iterable of skeleton IDs.
+
+    Returns
+    -------
+    list of sets
+                        In the same order as ``keys``.
+
+    """
+    sets = [_memo_get(remote_instance, k) for k in keys]
+    to_fetch = [i for i, s in enumerate(sets) if isinstance(s, type(None))]
+
+    if to_fetch:
+        resp = remote_instance.fetch([urls[i] for i in to_fetch],
+                                     post=[post[i] for i in to_fetch] if post else None,
+                                     desc=desc)
+        for i, r in zip(to_fetch, resp):
+            sets[i] = set(parse(keys[i], r))
+            _memo_set(remote_instance, keys[i], sets[i])
+
+    return sets
+
+
+def _get_node_counts(skids, remote_instance=None):
+    """ Get node counts for given skeleton IDs from their review status.
+
+    Counts are memoized like skeleton IDs (see ``_memo_get``).
+
+    Returns
+    -------
+    dict
+                ``{skeleton_id: n_nodes, ...}``. Skeletons that do not exist
+                have 0 nodes.
+
+    """
+    counts = {s: _memo_get(remote_instance, ('n_nodes', s)) for s in skids}
+    missing = [s for s, v in counts.items() if isinstance(v, type(None))]
+
+    if missing:
+        resp = remote_instance.fetch_chunked(remote_instance._get_review_status_url(),
+                                             missing, 'skeleton_ids[{}]',
+                                             chunk_size=1000,
+                                             desc='Checking counts')
+        # Review status is {skeleton_id: [n_nodes, n_reviewed], ...}
+        resp = {int(s): v[0] for d in resp for s, v in d.items()}
+        for s in missing:
+            counts[s] = resp.get(int(s), 0)
+            _memo_set(remote_instance, ('n_nodes', s), counts[s])
+
+    return counts
+
+
+def _find_neurons_in_bbox(bbox, candidates=None, max_nodes=50000,
+                          min_nodes=1, min_cable=1, remote_instance=None):
+    """ Find neurons with processes in given bounding box.
+
+    If the remaining ``candidates`` have at most ``max_nodes`` nodes in total
+    (from their review status), downloads and checks their nodes instead of
+    querying the whole bounding box. Like the server, this counts edges
+    (node -> parent) that intersect the box (see
+    ``_neurons_in_bbox_from_nodes``).
+
+    Parameters
+    ----------
+    bbox :              array-like
+                        ``[[left, right], [top, bottom], [z1, z2]]``
+    candidates :        set of int, optional
+                        If provided, only these neurons are returned.
+    max_nodes :         int, optional
+                        Max total number of nodes of candidates to check
+                        individually. Above, the bounding box is queried.
+    min_nodes :         int, optional
+                        Minimum node count within bounding box.
+    min_cable :         int, optional
+                        Minimum cable length [nm] within bounding box.
+
+    Returns
+    -------
+    set
+                        ``{skeleton_id, skeleton_id, ...}``
+
+    """
+    bbox = np.sort(np.asarray(bbox, dtype=float), axis=1)
+    key = ('in_bbox', tuple(bbox.ravel()), min_nodes, min_cable)
+
+    found = _memo_get(remote_instance, key)
+    query = isinstance(candidates, type(None))
+    to_check = []
+    if isinstance(found, type(None)) and not query:
+        is_in = {s: _memo_get(remote_instance, key + (s, )) for s in candidates}
+        to_check = [s for s, v in is_in.items() if isinstance(v, type(None))]
+
+        # Checking candidates costs downloading all of their nodes (each
+        # neuron has at least one)
+        query = len(to_check) > max_nodes or \
+            sum(_get_node_counts(to_check, remote_instance).values()) > max_nodes
+
+    if isinstance(found, type(None)) and query:
+        found = set(get_neurons_in_bbox(bbox, min_nodes=min_nodes,
+                                        min_cable=min_cable,
+                                        remote_instance=remote_instance))
+        _memo_set(remote_instance, key, found)
+
+    if not isinstance(found, type(None)):
+        if isinstance(candidates, type(None)):
+            return found
+        return found & candidates
+
+    # Check remaining candidates individually
+    if to_check:
+        GET = urllib.parse.urlencode({'with_tags': 'false',
+                                      'with_connectors': 'false'})
+        urls = [remote_instance._get_compact_details_url(s) + '?%s' % GET
+                for s in to_check]
+        skdata = remote_instance.fetch(urls, desc='Check candidates')
+
+        # Nodes are [ID, parent ID, user ID, x, y, z, ...]
+        nodes = pd.DataFrame([n[:6] + [s] for s, sk in zip(to_check, skdata)
+                              for n in sk[0]],
+                             columns=['treenode_id', 'parent_id', 'creator_id',
+                                      'x', 'y', 'z', 'skeleton_id'])
+        if nodes.empty:
+            hits = set()
+        else:
+            hits = _neurons_in_bbox_from_nodes(nodes, bbox,
+                                               min_nodes=min_nodes,
+                                               min_cable=min_cable)
+
+        for s in to_check:
+            is_in[s] = int(s) in hits
+            _memo_set(remote_instance, key + (s, ), is_in[s])
+
+    return set(s for s, v in is_in.items() if v)
+
+
 @cache.undo_on_error
 def get_neurons_in_volume(volumes, min_nodes=2, min_cable=1, intersect=False,
-                          only_soma=False, remote_instance=None):
+                          only_soma=False, exact=False, tile_size=None,
+                          remote_instance=None):
     """ Retrieves neurons with processes within CATMAID volumes.
 
-    This function uses the **BOUNDING BOX** around volume as proxy and queries
-    for neurons that are within that volume. See examples on how to work
-    around this.
+    By default, this function uses the **BOUNDING BOX** around volume as
+    proxy and queries for neurons that are within that volume. Use
+    ``exact=True`` or see examples on how to work around this.
 
     Warning
     -------
@@ -4809,6 +5968,18 @@ def get_neurons_in_volume(volumes, min_nodes=2, min_cable=1, intersect=False,
                             volumes or just a single.
     only_soma :             bool, optional
                             If True, only neurons with a soma will be returned.
+    exact :                 bool, optional
+                            If True, will fetch all treenodes within the
+                            bounding box (see
+                            :func:`~pymaid.get_nodes_in_volume`) and keep
+                            only neurons with at least ``min_nodes`` nodes
+                            and ``min_cable`` cable inside the volume's mesh.
+                            Slower but exact.
+    tile_size :             int | float | tuple, optional
+                            Passed to :func:`~pymaid.get_neurons_in_bbox`.
+                            Ignored if ``exact=True``. If ``min_nodes`` or
+                            ``min_cable`` is above 1, will count nodes in
+                            the bounding box instead.
     remote_instance :       CATMAID instance
                             If not passed directly, will try using global.
 
@@ -4852,25 +6023,36 @@ def get_neurons_in_volume(volumes, min_nodes=2, min_cable=1, intersect=False,
         if not isinstance(v, core.Volume):
             volumes[i] = get_volume(v)
 
-    neurons = []
-
-    for v in volumes:
-        logger.info('Retrieving neurons in volume {0}'.format(v.name))
-        temp = get_neurons_in_bbox(v.bbox, min_nodes=min_nodes,
-                                   min_cable=min_cable,
-                                   remote_instance=remote_instance)
-
-        if not intersect:
-            neurons += list(temp)
-        else:
-            neurons += [temp]
+    if exact:
+        neurons = [_get_neurons_in_mesh(v, min_nodes=min_nodes,
+                                        min_cable=min_cable,
+                                        remote_instance=remote_instance)
+                   for v in volumes]
+    elif not isinstance(tile_size, type(None)) and (min_nodes > 1 or min_cable > 1):
+        # Thresholds can't be applied per tile
+        neurons = [_get_neurons_in_bbox_by_nodes(v.bbox, min_nodes=min_nodes,
+                                                 min_cable=min_cable,
+                                                 remote_instance=remote_instance)
+                   for v in volumes]
+    else:
+        # Query all volumes (and their tiles) in parallel
+        urls = [_get_skeletons_in_bbox_urls(v.bbox, min_nodes=min_nodes,
+                                            min_cable=min_cable,
+                                            tile_size=tile_size,
+                                            remote_instance=remote_instance)
+                for v in volumes]
+        data = remote_instance.fetch([u for l in urls for u in l],
+                                     desc='Volumes')
+        offsets = np.cumsum([0] + [len(l) for l in urls])
+        neurons = [set(s for d in data[i:j] for s in d)
+                   for i, j in zip(offsets[:-1], offsets[1:])]
 
     if intersect:
         # Filter for neurons that show up in all neuropils
-        neurons = [n for l in neurons for n in l if False not in [n in v for v in neurons]]
-
-    # Need to do this in case we have several volumes
-    neurons = list(set(neurons))
+        neurons = list(set.intersection(*neurons))
+    else:
+        # Need to do this in case we have several volumes
+        neurons = list(set.union(*neurons))
 
     if only_soma:
         soma = has_soma(neurons, remote_instance=remote_instance)
@@ -4883,9 +6065,102 @@ def get_neurons_in_volume(volumes, min_nodes=2, min_cable=1, intersect=False,
     return neurons
 
 
+def _get_neurons_in_mesh(volume, min_nodes=2, min_cable=1,
+                         remote_instance=None):
+    """ Get skeletons with at least ``min_nodes`` treenodes and ``min_cable``
+    cable (edges to parent nodes) within a volume's mesh.
+    """
+    tn = get_nodes_in_volume(*volume.bbox.ravel(),
+                             remote_instance=remote_instance)['treenodes']
+
+    xyz = tn[['x', 'y', 'z']].values.astype(float)
+    if xyz.shape[0]:
+        inside = np.asarray(in_volume(xyz, volume,
+                                      remote_instance=remote_instance),
+                            dtype=bool)
+    else:
+        inside = np.zeros(0, dtype=bool)
+
+    counts = tn.skeleton_id[inside].astype(int).value_counts()
+
+    # Cable from nodes within the mesh to their parents
+    loc = pd.DataFrame(xyz, index=tn.treenode_id.values.astype(int))
+    child = inside & tn.parent_id.isin(loc.index).values
+    dist = np.linalg.norm(xyz[child] - loc.loc[tn.parent_id.values[child].astype(int)].values,
+                          axis=1)
+    cable = pd.Series(dist).groupby(tn.skeleton_id.values[child].astype(int)).sum()
+    cable = cable.reindex(counts.index).fillna(0)
+
+    return set(counts.index[(counts.values >= min_nodes) &
+                            (cable.values >= min_cable)].tolist())
+
+
+def _segments_in_bbox(a, b, bbox):
+    """ Check which segments ``a -> b`` (N x 3 arrays) intersect an axis-aligned
+    bounding box ``[[left, right], [top, bottom], [z1, z2]]`` (slab test).
+    """
+    d = b - a
+    t0 = np.zeros(a.shape[0])
+    t1 = np.ones(a.shape[0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(3):
+            lo = (bbox[i, 0] - a[:, i]) / d[:, i]
+            hi = (bbox[i, 1] - a[:, i]) / d[:, i]
+            # Segments parallel to this axis have to lie within the slab
+            par = d[:, i] == 0
+            out = par & ((a[:, i] < bbox[i, 0]) | (a[:, i] > bbox[i, 1]))
+            lo[par], hi[par] = -np.inf, np.inf
+            t0 = np.maximum(t0, np.minimum(lo, hi))
+            t1 = np.minimum(t1, np.maximum(lo, hi))
+            t1[out] = -1
+    return t0 <= t1
+
+
+def _neurons_in_bbox_from_nodes(nodes, bbox, min_nodes=1, min_cable=1):
+    """ Apply the server's rule for skeletons in a bounding box to nodes.
+
+    Like the ``in-bounding-box`` query, this counts edges (node -> parent,
+    roots are edges of length 0) that intersect the box: a neuron needs at
+    least ``min_nodes`` of these edges and their summed length must be at
+    least ``min_cable``. Edges to parents not in ``nodes`` are treated like
+    roots.
+
+    Parameters
+    ----------
+    nodes :     pandas.DataFrame
+                Must contain ``treenode_id``, ``parent_id``, ``skeleton_id``
+                and ``x``, ``y``, ``z``.
+    bbox :      array-like
+                ``[[left, right], [top, bottom], [z1, z2]]``
+
+    Returns
+    -------
+    set
+                ``{skeleton_id, skeleton_id, ...}``
+
+    """
+    bbox = np.sort(np.asarray(bbox, dtype=float), axis=1)
+    xyz = nodes[['x', 'y', 'z']].values.astype(float)
+
+    loc = pd.DataFrame(xyz, index=nodes.treenode_id.values.astype(int))
+    has_parent = nodes.parent_id.isin(loc.index).values
+    parent_xyz = xyz.copy()
+    parent_xyz[has_parent] = loc.loc[nodes.parent_id.values[has_parent].astype(int)].values
+
+    hit = _segments_in_bbox(xyz, parent_xyz, bbox)
+    length = np.linalg.norm(parent_xyz[hit] - xyz[hit], axis=1)
+    skids = nodes.skeleton_id.values[hit].astype(int)
+
+    counts = pd.Series(skids).value_counts()
+    cable = pd.Series(length).groupby(skids).sum().reindex(counts.index)
+
+    return set(counts.index[(counts.values >= min_nodes) &
+                            (cable.values >= min_cable)].tolist())
+
+
 @cache.undo_on_error
 def get_neurons_in_bbox(bbox, unit='NM', min_nodes=1, min_cable=1,
-                        remote_instance=None, **kwargs):
+                        tile_size=None, remote_instance=None, **kwargs):
     """ Retrieves neurons with processes within a defined box volume.
 
     Parameters
@@ -4907,6 +6182,15 @@ def get_neurons_in_bbox(bbox, unit='NM', min_nodes=1, min_cable=1,
     min_cable :             int, optional
                             Minimum cable length [nm] for a neuron within
                             given bounding box.
+    tile_size :             int | float | tuple, optional
+                            If provided, will split the bounding box into
+                            tiles no larger than this (in nm; a single value
+                            or x/y/z) and query them in parallel. Use this
+                            for large boxes. Thresholds can't be applied
+                            per tile: if ``min_nodes`` or ``min_cable`` is
+                            above 1, will instead fetch all nodes in the box
+                            (see :func:`~pymaid.get_nodes_in_volume`) and
+                            count edges intersecting it like the server.
     remote_instance :       CATMAID instance
                             If not passed directly, will try using global.
 
@@ -4928,23 +6212,71 @@ def get_neurons_in_bbox(bbox, unit='NM', min_nodes=1, min_cable=1,
                          [bbox['z1'], bbox['z2']]
                          ])
 
-    if not isinstance(bbox, np.ndarray):
-        bbox = np.array(bbox)
+    bbox = np.array(bbox, dtype=float)
 
     if unit == 'PIXEL':
-        bbox[[0, 1]:] *= kwargs.get('xy_res', 3.8)
-        bbox[[2]:] *= kwargs.get('z_res', 35)
+        bbox[[0, 1], :] *= kwargs.get('xy_res', 3.8)
+        bbox[2, :] *= kwargs.get('z_res', 35)
+
+    if not isinstance(tile_size, type(None)) and (min_nodes > 1 or min_cable > 1):
+        return sorted(_get_neurons_in_bbox_by_nodes(bbox, min_nodes=min_nodes,
+                                                    min_cable=min_cable,
+                                                    remote_instance=remote_instance))
 
-    url = remote_instance._get_skeletons_in_bbox(minx=min(bbox[0]),
-                                                 maxx=max(bbox[0]),
-                                                 miny=min(bbox[1]),
-                                                 maxy=max(bbox[1]),
-                                                 minz=min(bbox[2]),
-                                                 maxz=max(bbox[2]),
-                                                 min_nodes=min_nodes,
-                                                 min_cable=min_cable)
+    urls = _get_skeletons_in_bbox_urls(bbox, min_nodes=min_nodes,
+                                       min_cable=min_cable,
+                                       tile_size=tile_size,
+                                       remote_instance=remote_instance)
 
-    return remote_instance.fetch(url)
+    if len(urls) == 1:
+        return remote_instance.fetch(urls[0])
+
+    data = remote_instance.fetch(urls, desc='Tiles')
+
+    # Neurons spanning multiple tiles are returned once per tile
+    return np.unique(np.concatenate([np.zeros(0, dtype=int)] + data)).tolist()
+
+
+def _get_neurons_in_bbox_by_nodes(bbox, min_nodes=1, min_cable=1,
+                                  remote_instance=None):
+    """ Get skeletons in a bounding box from the nodes within it. Used
+    instead of tiled skeleton queries if thresholds are above 1.
+    """
+    bbox = np.sort(np.asarray(bbox, dtype=float), axis=1)
+    tn = get_nodes_in_volume(*bbox.ravel(),
+                             remote_instance=remote_instance)['treenodes']
+    return _neurons_in_bbox_from_nodes(tn, bbox, min_nodes=min_nodes,
+                                       min_cable=min_cable)
+
+
+def _get_skeletons_in_bbox_urls(bbox, min_nodes=1, min_cable=1,
+                                tile_size=None, remote_instance=None):
+    """ Generate URLs to query skeletons in (tiles of) a bounding box.
+
+    Tiled queries only give the same result as a query for the whole box
+    if ``min_nodes`` and ``min_cable`` are not above 1.
+    """
+    bbox = np.sort(np.asarray(bbox, dtype=float), axis=1)
+
+    if not isinstance(tile_size, type(None)) and (min_nodes > 1 or min_cable > 1):
+        raise ValueError('Thresholds above 1 can not be applied to tiles.')
+
+    if isinstance(tile_size, type(None)):
+        tiles = [bbox]
+    else:
+        tile_size = np.broadcast_to(np.asarray(tile_size, dtype=float), (3, ))
+        n_tiles = np.ceil((bbox[:, 1] - bbox[:, 0]) / tile_size)
+        tiles = _tile_bbox(bbox, np.maximum(n_tiles, 1).astype(int))
+
+    return [remote_instance._get_skeletons_in_bbox(minx=t[0, 0],
+                                                   maxx=t[0, 1],
+                                                   miny=t[1, 0],
+                                                   maxy=t[1, 1],
+                                                   minz=t[2, 0],
+                                                   maxz=t[2, 1],
+                                                   min_nodes=min_nodes,
+                                                   min_cable=min_cable)
+            for t in tiles]
 
 
 @cache.undo_on_error
@@ -4988,7 +6320,14 @@ def get_user_list(remote_instance=None):
 
     remote_instance = utils._eval_remote_instance(remote_instance)
 
-    user_list = remote_instance.fetch(remote_instance._get_user_list_url())
+    registry = _get_metadata_registry(remote_instance)
+    if not isinstance(registry, type(None)):
+        df = registry.get_table('users')
+        if not isinstance(df, type(None)):
+            return df
+
+    user_list = _fetch_metadata(remote_instance,
+                                remote_instance._get_user_list_url())
 
     columns = ['id', 'login', 'full_name', 'first_name', 'last_name', 'color']
 
@@ -4999,6 +6338,9 @@ def get_user_list(remote_instance=None):
     df.sort_values(['login'], inplace=True)
     df.reset_index(inplace=True, drop=True)
 
+    if not isinstance(registry, type(None)):
+        registry.update_table('users', df)
+
     return df
 
 
@@ -5302,15 +6644,55 @@ def get_annotation_list(remote_instance=None):
 
     remote_instance = utils._eval_remote_instance(remote_instance)
 
-    an = remote_instance.fetch(remote_instance._get_annotation_list())[
-        'annotations']
+    registry = _get_metadata_registry(remote_instance)
+    if not isinstance(registry, type(None)):
+        df = registry.get_table('annotations')
+        if not isinstance(df, type(None)):
+            return df
+
+    an = _fetch_metadata(remote_instance,
+                         remote_instance._get_annotation_list())['annotations']
 
     df = pd.DataFrame.from_dict(an)
     df.columns = ['annotation_id', 'annotation', 'users']
 
+    if not isinstance(registry, type(None)):
+        registry.update_table('annotations', df)
+
     return df
 
 
+def _get_metadata_registry(remote_instance):
+    """ Returns the CatmaidInstance's metadata registry or ``None`` if it is
+    not in use (caching off or ``config.metadata_ttl == 0``).
+    """
+    if not getattr(remote_instance, 'caching', False) or config.metadata_ttl == 0:
+        return None
+    return getattr(remote_instance, '_metadata', None)
+
+
+def _fetch_metadata(remote_instance, url, post=None):
+    """ Fetch data for the metadata registry.
+
+    If the registry is in use, it takes care of caching: responses bypass
+    the response cache so that expired entries are actually refreshed.
+    """
+    use_cache = isinstance(_get_metadata_registry(remote_instance), type(None))
+    return remote_instance.fetch(url, post, use_cache=use_cache)
+
+
+def _drop_metadata(remote_instance, skeleton_ids=None, tables=None):
+    """ Invalidate metadata after neurons have been renamed, annotated, etc.
+
+    Also drops memoized annotation/name -> skeleton ID resolutions.
+    """
+    registry = getattr(remote_instance, '_metadata', None)
+    if not isinstance(registry, type(None)):
+        registry.drop(skeleton_ids=skeleton_ids, tables=tables)
+    if hasattr(remote_instance, '_skid_cache'):
+        remote_instance._skid_cache = {}
+
+
 def url_to_coordinates(coords, stack_id, active_skeleton_id=None,
                        active_node_id=None, zoom=0, tool='tracingtool',
                        open_browser=False, remote_instance=None):
@@ -5472,7 +6854,7 @@ def rename_neurons(x, new_names, remote_instance=None, no_prompt=False):
         raise ValueError('Need a name for every single neuron to rename.')
 
     if not no_prompt:
-        old_names = get_names(x)
+        old_names = get_names(x, remote_instance=remote_instance)
         df = pd.DataFrame(data=[[old_names[n], new_names[i], n] for i, n in enumerate(x)],
                           columns=['Current name', 'New name', 'Skeleton ID']
                           )
@@ -5498,6 +6880,8 @@ def rename_neurons(x, new_names, remote_instance=None, no_prompt=False):
                                                   post=postdata,
                                                   desc='Renaming')]
 
+    _drop_metadata(remote_instance, skeleton_ids=x)
+
     if False not in [r['success'] for r in responses]:
         logger.info('All neurons successfully renamed.')
     else:
@@ -5845,7 +7229,7 @@ def update_radii(radii, remote_instance=None):
     edition_times = details.set_index('node_id').edition_time.to_dict()
 
     # State has to be provided as {'state': [(node_id, edition_time), ..]}
-    update_post.update({"state": [(str(k), edition_times[str(k)]) for k in radii]})
+    update_post.update({"state": [(str(k), edition_times[int(k)]) for k in radii]})
 
     # We have to explicitly convert the state in a json string because passing
     # it to requests as "post" will fuck this up otherwise
@@ -30,7 +30,7 @@ try:
 except ImportError:
     igraph = None
 
-from . import core, fetch, utils, config
+from . import core, fetch, utils, config, connectivity
 
 # Set up logging
 logger = config.logger
@@ -52,6 +52,7 @@ def network2nx(x, remote_instance=None, threshold=1, group_by=None):
                          4. CatmaidNeuronList object
                          5. Adjacency matrix (pd.DataFrame, rows=sources,
                             columns=targets)
+                         6. :class:`~pymaid.SparseAdjacencyMatrix`
     remote_instance :   CATMAID instance, optional
                         Either pass directly to function or define globally
                         as ``remote_instance``.
@@ -100,17 +101,27 @@ def network2nx(x, remote_instance=None, threshold=1, group_by=None):
         # Reformat into networkx format
         edges = [[str(e.source_skid), str(e.target_skid), {'weight': e.weight}]
                  for e in edges[edges.weight >= threshold].itertuples()]
-    elif isinstance(x, pd.DataFrame):
+    elif isinstance(x, (pd.DataFrame, connectivity.SparseAdjacencyMatrix)):
+        if isinstance(x, pd.DataFrame):
+            sources, targets = x.index.values, x.columns.values
+            rows, cols = np.nonzero(x.values >= threshold)
+            weights = x.values[rows, cols]
+        else:
+            sources, targets = x.sources, x.targets
+            coo = x.matrix.tocoo()
+            is_edge = coo.data >= threshold
+            rows, cols, weights = coo.row[is_edge], coo.col[is_edge], coo.data[is_edge]
+
         # We have to account for the fact that some might not be skids
         skids = []
-        for s in list(set(x.columns.tolist() + x.index.tolist())):
+        for s in set(sources.tolist() + targets.tolist()):
             try:
                 skids.append(int(s))
             except BaseException:
                 pass
         # Generate edge list
-        edges = [[str(s), str(t), {'weight': float(x.loc[s, t])}]
-                 for s in x.index.values for t in x.columns.values if x.loc[s, t] >= threshold]
+        edges = [[str(s), str(t), {'weight': float(w)}]
+                 for s, t, w in zip(sources[rows], targets[cols], weights)]
     else:
         raise ValueError(
             'Unable to process data of type "{0}"'.format(type(x)))
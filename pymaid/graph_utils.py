@@ -1260,7 +1260,8 @@ def subset_neuron(x, subset, clear_temp=True, keep_disc_cn=False,
         x.connectors = x.connectors[x.connectors.treenode_id.isin(subset)]
 
     # Filter tags
-    x.tags = {t: [tn for tn in x.tags[t] if tn in subset] for t in x.tags}
+    subset_set = set(subset)
+    x.tags = {t: [tn for tn in x.tags[t] if tn in subset_set] for t in x.tags}
 
     # Remove empty tags
     x.tags = {t: x.tags[t] for t in x.tags if x.tags[t]}
@@ -23,10 +23,14 @@ import itertools
 
 import pandas as pd
 import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.spatial
 import scipy.spatial.distance
 import networkx as nx
 
-from . import fetch, core, graph_utils, graph, utils, config, resample
+from . import (fetch, core, graph_utils, graph, utils, config, resample,
+               connectivity)
 
 # Set up logging
 logger = config.logger
@@ -36,7 +40,8 @@ __all__ = sorted(['calc_cable', 'strahler_index', 'prune_by_strahler',
                   'bending_flow', 'flow_centrality', 'segregation_index',
                   'to_dotproduct', 'average_neurons', 'tortuosity',
                   'remove_tagged_branches', 'despike_neuron', 'guess_radius',
-                  'smooth_neuron', 'time_machine', 'heal_fragmented_neuron',
+                  'smooth_neuron', 'time_machine', 'time_lapse',
+                  'heal_fragmented_neuron',
                   'break_fragments', 'heal_fragmented_neuron'])
 
 
@@ -861,7 +866,8 @@ def segregation_index(x, centrality_method='centrifugal'):
     return H
 
 
-def bending_flow(x, polypre=False):
+def bending_flow(x, polypre=False, connector_store=None,
+                 remote_instance=None):
     """ Variation of the algorithm for calculating synapse flow from
     Schneider-Mizell et al. (eLife, 2016).
 
@@ -877,6 +883,13 @@ def bending_flow(x, polypre=False):
                 Whether to consider the number of presynapses as a multiple of
                 the numbers of connections each makes. Attention: this works
                 only if all synapses have been properly annotated.
+    connector_store :   ConnectorStore, optional
+                        If provided and ``polypre=True``, connector details
+                        are retrieved from this store instead of the server.
+    remote_instance :   CatmaidInstance, optional
+                        Used to fetch connector details if ``polypre=True``.
+                        If not provided, will use the neuron's own instance
+                        and fall back to the global one.
 
     Notes
     -----
@@ -904,7 +917,9 @@ def bending_flow(x, polypre=False):
                          'not {0}'.format(type(x)))
 
     if isinstance(x, core.CatmaidNeuronList):
-        return [bending_flow(n, mode=mode, polypre=polypre, ) for n in x]
+        return [bending_flow(n, polypre=polypre,
+                             connector_store=connector_store,
+                             remote_instance=remote_instance) for n in x]
 
     if x.soma and x.soma not in x.root:
         logger.warning(
@@ -920,8 +935,12 @@ def bending_flow(x, polypre=False):
 
     if polypre:
         # Get details for all presynapses
-        cn_details = fetch.get_connector_details(
-            y.connectors[y.connectors.relation == 0])
+        if not remote_instance:
+            remote_instance = x._remote_instance
+        cn_details = connectivity._get_connector_details(
+            y.connectors[y.connectors.relation == 0],
+            remote_instance=remote_instance,
+            connector_store=connector_store)
 
     # Get list of nodes with pre/postsynapses
     pre_node_ids = y.connectors[y.connectors.relation == 0].treenode_id.values
@@ -980,7 +999,8 @@ def bending_flow(x, polypre=False):
     return
 
 
-def flow_centrality(x, mode='centrifugal', polypre=False):
+def flow_centrality(x, mode='centrifugal', polypre=False,
+                    connector_store=None, remote_instance=None):
     """ Calculates synapse flow centrality (SFC).
 
     From Schneider-Mizell et al. (2016): "We use flow centrality for
@@ -1016,6 +1036,13 @@ def flow_centrality(x, mode='centrifugal', polypre=False):
                 the numbers of connections each makes. Attention: this works
                 only if all synapses have been properly annotated (i.e. all
                 postsynaptic sites).
+    connector_store :   ConnectorStore, optional
+                        If provided and ``polypre=True``, connector details
+                        are retrieved from this store instead of the server.
+    remote_instance :   CatmaidInstance, optional
+                        Used to fetch connector details if ``polypre=True``.
+                        If not provided, will use the neuron's own instance
+                        and fall back to the global one.
 
     See Also
     --------
@@ -1042,7 +1069,9 @@ def flow_centrality(x, mode='centrifugal', polypre=False):
                          'not {0}'.format(type(x)))
 
     if isinstance(x, core.CatmaidNeuronList):
-        return [flow_centrality(n, mode=mode, polypre=polypre) for n in x]
+        return [flow_centrality(n, mode=mode, polypre=polypre,
+                                connector_store=connector_store,
+                                remote_instance=remote_instance) for n in x]
 
     if x.soma and x.soma not in x.root:
         logger.warning(
@@ -1061,8 +1090,12 @@ def flow_centrality(x, mode='centrifugal', polypre=False):
 
     if polypre:
         # Get details for all presynapses
-        cn_details = fetch.get_connector_details(
-            y.connectors[y.connectors.relation == 0])
+        if not remote_instance:
+            remote_instance = x._remote_instance
+        cn_details = connectivity._get_connector_details(
+            y.connectors[y.connectors.relation == 0],
+            remote_instance=remote_instance,
+            connector_store=connector_store)
 
     # Get list of nodes with pre/postsynapses
     pre_node_ids = y.connectors[y.connectors.relation ==
@@ -1277,83 +1310,151 @@ def stitch_neurons(*x, method='LEAFS', master='SOMA', tn_to_stitch=None):
         # Make sure we're working with integers
         tn_to_stitch = [int(tn) for tn in tn_to_stitch]
 
-    # Generate a union of all graphs
-    g = nx.union_all([n.graph for n in x]).to_undirected()
-
-    # Set existing edges to zero weight to make sure they remain when
-    # calculating the minimum spanning tree
-    nx.set_edge_attributes(g, 0, 'weight')
-
-    # If two nodes occupy the same position (e.g. if fragments are the
-    # result of cutting), they will have a distance of 0. Hence, we won't be
-    # able to simply filter by distance
-    nx.set_edge_attributes(g, False, 'new')
+    # Keep track of original master root
+    master_root = master.root[0]
 
-    # Now iterate over every possible combination of fragments
-    for a, b in itertools.combinations(x, 2):
-        # Collect relevant treenodes
-        if not isinstance(tn_to_stitch, type(None)):
-            tnA = a.nodes.loc[a.nodes.treenode_id.isin(tn_to_stitch)]
-            tnB = b.nodes.loc[a.nodes.treenode_id.isin(tn_to_stitch)]
-        else:
-            tnA = pd.DataFrame([])
-            tnB = pd.DataFrame([])
+    # Generate one big node table
+    nodes = x.nodes
+    ids = nodes.treenode_id.values.astype(int)
+
+    # Map parents to row indices (roots get -1)
+    has_parent = nodes.parent_id.notnull().values.copy()
+    parent_ix = np.full(len(ids), -1)
+    parent_ix[has_parent] = pd.Index(ids).get_indexer(
+                                nodes.parent_id.values[has_parent].astype(int))
+    has_parent &= parent_ix >= 0
+    child_ix = np.where(has_parent)[0]
+
+    # Find actual fragments (neurons might themselves be fragmented)
+    adj = scipy.sparse.coo_matrix((np.ones(len(child_ix)),
+                                   (child_ix, parent_ix[has_parent])),
+                                  shape=(len(ids), len(ids)))
+    n_frags, frag = scipy.sparse.csgraph.connected_components(adj,
+                                                              directed=False)
+
+    # Collect treenodes that may be used for stitching
+    if method == 'LEAFS':
+        allowed = nodes['type'].isin(['end', 'root']).values.copy()
+    else:
+        allowed = np.ones(len(ids), dtype=bool)
 
-        if tnA.empty:
-            if method == 'LEAFS':
-                tnA = a.nodes.loc[a.nodes['type'].isin(['end', 'root'])]
-            else:
-                tnA = a.nodes
-        if tnB.empty:
-            if method == 'LEAFS':
-                tnB = b.nodes.loc[b.nodes['type'].isin(['end', 'root'])]
-            else:
-                tnB = b.nodes
+    if not isinstance(tn_to_stitch, type(None)):
+        # Use preferred treenodes for neurons that have any
+        preferred = np.isin(ids, tn_to_stitch)
+        offsets = np.cumsum([0] + [n.n_nodes for n in x])
+        for k in range(len(x)):
+            this = slice(offsets[k], offsets[k + 1])
+            if preferred[this].any():
+                allowed[this] = preferred[this]
+
+        # Make sure every fragment can be reached
+        missing = ~np.isin(np.arange(n_frags), frag[allowed])
+        if missing.any():
+            allowed |= missing[frag]
+
+    # Get edges of the minimum spanning tree between fragments
+    cand = np.where(allowed)[0]
+    new_edges = [(cand[a], cand[b]) for a, b, d in _fragment_mst(
+                                                nodes[['x', 'y', 'z']].values[cand],
+                                                frag[cand])]
 
-        # Get distance between treenodes in A and B
-        d = scipy.spatial.distance.cdist(tnA[['x', 'y', 'z']].values,
-                                         tnB[['x', 'y', 'z']].values,
-                                         metric='euclidean')
+    # Generate one big neuron
+    master.nodes = nodes
+    master.connectors = x.connectors
+    for n in x:
+        master.tags.update(n.tags)
 
-        # List of edges
-        tn_comb = itertools.product(tnA.treenode_id.values, tnB.treenode_id.values)
+    if new_edges:
+        # Orient the combined tree towards the original master root
+        new_edges = np.array(new_edges)
+        adj = scipy.sparse.coo_matrix((np.ones(len(child_ix) + len(new_edges)),
+                                       (np.append(child_ix, new_edges[:, 0]),
+                                        np.append(parent_ix[has_parent],
+                                                  new_edges[:, 1]))),
+                                      shape=(len(ids), len(ids)))
+        root_ix = np.where(ids == master_root)[0][0]
+        order, pred = scipy.sparse.csgraph.breadth_first_order(adj, root_ix,
+                                                               directed=False,
+                                                               return_predecessors=True)
+
+        parents = nodes.parent_id.values.astype(object)
+        parents[order] = [int(ids[p]) if p >= 0 else None for p in pred[order]]
+        master.nodes['parent_id'] = parents
 
-        # Add edges to union graph
-        g.add_edges_from([(a, b, {'weight': w, 'new': True}) for (a, b), w in zip(tn_comb, d.ravel())])
+        # Add node tags
+        master.tags['stitched'] = master.tags.get('stitched', []) + \
+                                  ids[new_edges].ravel().tolist()
 
-    # Get minimum spanning tree
-    edges = nx.minimum_spanning_edges(g)
+    # We need to regenerate the graph
+    master._clear_temp_attr()
 
-    # Edges that need adding are those with weight > 0
-    to_add = [e for e in edges if e[2]['new']]
+    return master
 
-    # Keep track of original master root
-    master_root = master.root[0]
 
-    # Generate one big neuron
-    master.nodes = x.nodes
-    master.connectors = x.connectors
-    for n in x:
-        master.tags.update(n.tags)
-    master._clear_temp_attr()
+def _fragment_mst(coords, frag):
+    """ Finds edges connecting all fragments with minimal total length.
 
-    for e in to_add:
-        # Reroot to one of the nodes in the edge
-        master.reroot(e[0], inplace=True)
+    This is the minimum spanning tree across fragments. The shortest edge
+    between any group of fragments and the remaining points is an edge of
+    the Delaunay triangulation of all points (no other point can lie within
+    the sphere spanned by it). Candidate edges are therefore taken from a
+    single triangulation and joined shortest first (Kruskal's algorithm).
 
-        # Connect the nodes
-        master.nodes.loc[master.nodes.treenode_id == e[0], 'parent_id'] = e[1]
+    Parameters
+    ----------
+    coords :    numpy.array
+                (N, 3) coordinates of points that can be used for stitching.
+    frag :      numpy.array
+                (N, ) fragment label for each point.
 
-        # Add node tags
-        master.tags['stitched'] = master.tags.get('stitched', []) + list(e[0:2])
+    Returns
+    -------
+    list
+                ``[(i, j, distance), ...]`` where ``i`` and ``j`` index into
+                ``coords``.
+    """
+    coords = np.asarray(coords, dtype=float)
+    frag = np.unique(frag, return_inverse=True)[1].ravel()
+    n_frags = frag.max() + 1 if len(frag) else 0
 
-        # We need to regenerate the graph
-        master._clear_temp_attr()
+    if n_frags < 2:
+        return []
 
-    # Reroot to original root
-    master.reroot(master_root, inplace=True)
+    # Candidate edges
+    if len(coords) < 5:
+        # Too few points for a triangulation in 3D
+        pairs = np.array(list(itertools.combinations(range(len(coords)), 2)))
+    else:
+        # Joggle input to also triangulate flat or duplicate points
+        tri = scipy.spatial.Delaunay(coords, qhull_options='QJ')
+        pairs = np.concatenate([tri.simplices[:, [a, b]] for a, b in
+                                itertools.combinations(range(tri.simplices.shape[1]), 2)])
+        pairs = np.unique(np.sort(pairs, axis=1), axis=0)
+
+    # Only edges between fragments are of interest
+    pairs = pairs[frag[pairs[:, 0]] != frag[pairs[:, 1]]]
+    dist = np.linalg.norm(coords[pairs[:, 0]] - coords[pairs[:, 1]], axis=1)
+
+    # Union-find over fragments
+    uf = np.arange(n_frags)
+
+    def find(a):
+        while uf[a] != a:
+            uf[a] = uf[uf[a]]
+            a = uf[a]
+        return a
+
+    edges = []
+    for k in np.argsort(dist, kind='stable'):
+        i, j = pairs[k]
+        a, b = find(frag[i]), find(frag[j])
+        if a != b:
+            uf[a] = b
+            edges.append((i, j, dist[k]))
+            if len(edges) == n_frags - 1:
+                break
 
-    return master
+    return edges
 
 
 def average_neurons(x, limit=10, base_neuron=None):
@@ -2051,116 +2152,323 @@ def time_machine(x, target, inplace=False, remote_instance=None):
     --------
     >>> n = pymaid.get_neuron(16)
     >>> previous_n = pymaid.time_machine(n, '2016-1-1')
+
+    See Also
+    --------
+    :func:`~pymaid.time_lapse`
+                        Reconstruct neuron(s) at multiple points in time.
+
     """
 
     remote_instance = utils._eval_remote_instance(remote_instance)
 
-    if isinstance(x, core.CatmaidNeuronList):
-        return core.CatmaidNeuronList([time_machine(n, target,
-                                                    inplace=inplace,
-                                                    remote_instance=remote_instance)
-                                  for n in config.tqdm(x,
-                                                       'Rejuvenating',
-                                                       disable=config.pbar_hide,
-                                                       leave=config.pbar_leave)])
+    if not isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+        x = fetch.get_neuron(x, remote_instance=remote_instance)
 
-    if not isinstance(x, core.CatmaidNeuron):
-        x = fetch.get_neuron(x)
+    target = _localize_target(target)
+
+    # Fetch histories for all neurons in one go
+    hist = _fetch_history(x, remote_instance=remote_instance)
+
+    if isinstance(x, core.CatmaidNeuronList):
+        young = core.CatmaidNeuronList([_rejuvenate(n, hist[str(n.skeleton_id)],
+                                                    target)
+                                       for n in config.tqdm(x,
+                                                            'Rejuvenating',
+                                                            disable=config.pbar_hide,
+                                                            leave=config.pbar_leave)])
+    else:
+        young = _rejuvenate(x, hist[str(x.skeleton_id)], target)
 
     if not inplace:
-        x = x.copy()
+        return young
+
+    if isinstance(x, core.CatmaidNeuronList):
+        for n, y in zip(x, young):
+            n.__dict__.update(y.__dict__)
+    else:
+        x.__dict__.update(young.__dict__)
+
+    return
+
+
+def time_lapse(x, targets, summary=False, remote_instance=None):
+    """ Reconstructs neuron(s) at multiple points in time.
+
+    Batched version of :func:`~pymaid.time_machine`: the history of each
+    neuron is fetched and parsed only once and then swept over all target
+    times. See :func:`~pymaid.time_machine` for details on what can and can
+    not be reversed.
+
+    Parameters
+    ----------
+    x :                 skeleton ID(s) | CatmaidNeuron | CatmaidNeuronList
+                        Neuron(s) to rejuvenate.
+    targets :           iterable of str | tuple | datetime | pandas.Timestamp
+                        Dates or dates + times to time-travel to.
+    summary :           bool, optional
+                        If True, will not return neurons but a DataFrame with
+                        summary stats per neuron and target time.
+    remote_instance :   CatmaidInstance, optional
 
+    Returns
+    -------
+    dict
+                        If ``summary=False``: ``{target: CatmaidNeuronList}``
+                        with target times as ``pandas.Timestamp`` (UTC).
+    pandas.DataFrame
+                        If ``summary=True``::
+
+                           skeleton_id  target  n_nodes  n_connectors  cable_length
+                         0
+                         1
+
+                        Cable length is in micrometers [um].
+
+    Examples
+    --------
+    Plot growth curves for a set of neurons:
+
+    >>> import matplotlib.pyplot as plt
+    >>> dates = pd.date_range('2016-01-01', '2018-01-01', freq='M')
+    >>> growth = pymaid.time_lapse([16, 2863104], dates, summary=True)
+    >>> growth.pivot(index='target', columns='skeleton_id',
+    ...              values='cable_length').plot()
+    >>> plt.show()
+
+    See Also
+    --------
+    :func:`~pymaid.time_machine`
+                        Reconstruct neuron(s) at a single point in time.
+
+    """
+
+    remote_instance = utils._eval_remote_instance(remote_instance)
+
+    if not isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+        x = fetch.get_neuron(x, remote_instance=remote_instance)
+
+    if isinstance(x, core.CatmaidNeuron):
+        x = core.CatmaidNeuronList(x)
+
+    if not utils._is_iterable(targets):
+        targets = [targets]
+
+    targets = sorted(set([_localize_target(t) for t in targets]))
+
+    hist = _fetch_history(x, remote_instance=remote_instance)
+
+    snapshots = {t: [] for t in targets}
+    stats = []
+    with config.tqdm(total=len(x) * len(targets), desc='Rejuvenating',
+                     disable=config.pbar_hide, leave=config.pbar_leave) as pbar:
+        for n in x:
+            h = hist[str(n.skeleton_id)]
+            for t in targets:
+                if summary:
+                    nodes, cn, _, _ = _rejuvenate_tables(h, t)
+                    stats.append([n.skeleton_id, t, nodes.shape[0],
+                                  cn.shape[0], _cable(nodes)])
+                else:
+                    snapshots[t].append(_rejuvenate(n, h, t))
+                pbar.update(1)
+
+    if summary:
+        return pd.DataFrame(stats, columns=['skeleton_id', 'target', 'n_nodes',
+                                            'n_connectors', 'cable_length'])
+
+    return {t: core.CatmaidNeuronList(snapshots[t], make_copy=False)
+            for t in targets}
+
+
+def _localize_target(target):
+    """ Turns target time into UTC ``pandas.Timestamp``. """
     if not isinstance(target, pd.Timestamp):
         target = pd.Timestamp(target)
 
     # Need to localize all timestamps
-    target = target.tz_localize('UTC')
+    if target.tzinfo is None:
+        target = target.tz_localize('UTC')
+    else:
+        target = target.tz_convert('UTC')
 
     if target > pd.Timestamp.now().tz_localize('UTC'):
         raise ValueError("This is not Back to the Future II: for forward time "
                          "travel, you'll have to trace yourself.")
 
-    # First get the entire history of the neuron
-    url = remote_instance._get_compact_details_url(x.skeleton_id,
-                                                   with_history=True,
-                                                   with_merge_history=True,
-                                                   with_connectors=True,
-                                                   with_tags=True,
-                                                   with_annotations=True)
-    data = remote_instance.fetch(url)
-
-    # Turn stuff into DataFrames for easier sifting/sorting
-    nodes = pd.DataFrame(data[0], columns=['treenode_id', 'parent_id',
-                                           'user_id', 'x', 'y', 'z', 'radius',
-                                           'confidence', 'creation_timestamp',
-                                           'modified_timestamp', 'ordering_by'])
-    nodes.loc[:, 'parent_id'] = nodes.parent_id.values.astype(object)
-    nodes.loc[~nodes.parent_id.isnull(), 'parent_id'] = nodes.loc[~nodes.parent_id.isnull(), 'parent_id'].map(int)
-    nodes.loc[nodes.parent_id.isnull(), 'parent_id'] = None
-
-    connectors = pd.DataFrame(data[1], columns=['treenode_id', 'connector_id',
-                                                'relation', 'x', 'y', 'z',
-                                                'creation_timestamp',
-                                                'modified_timestamp'])
-    # This is a dictionary with {'tag': [[treenode_id, date_tagged], ...]}
-    tags = data[2]
-    annotations = pd.DataFrame(data[4], columns=['annotation_id',
-                                                 'annotated_timestamp'])
+    return target
+
+
+def _to_utc(values):
+    """ Vectorized parsing of CATMAID's ISO timestamps to UTC. """
+    try:
+        return pd.to_datetime(values, utc=True)
+    except ValueError:
+        # Newer pandas won't mix formats (e.g. with and w/o microseconds)
+        return pd.to_datetime(values, utc=True, format='ISO8601')
+
+
+def _to_ns(values):
+    """ Turns UTC datetimes into int64 nanoseconds for fast comparisons. """
+    if isinstance(values, pd.Timestamp):
+        return np.datetime64(values.tz_convert(None), 'ns').astype(np.int64)
+    values = pd.Series(values)
+    return values.dt.tz_convert(None).values.astype('datetime64[ns]').astype(np.int64)
+
+
+def _fetch_history(x, remote_instance=None):
+    """ Fetches and parses full history for given neuron(s).
+
+    Returns
+    -------
+    dict
+                ``{skeleton_id: history}`` where each history is a dictionary
+                with nodes, connectors, connector links, tags and annotations.
+
+    """
+    remote_instance = utils._eval_remote_instance(remote_instance)
+
+    skids = utils.eval_skids(x, warn_duplicates=False,
+                             remote_instance=remote_instance)
+
+    urls = [remote_instance._get_compact_details_url(s,
+                                                     with_history=True,
+                                                     with_merge_history=True,
+                                                     with_connectors=True,
+                                                     with_tags=True,
+                                                     with_annotations=True)
+            for s in skids]
+    data = remote_instance.fetch(urls, desc='Fetching histories')
+
     an_list = fetch.get_annotation_list(remote_instance=remote_instance)
-    annotations['annotation'] = annotations.annotation_id.map(an_list.set_index('annotation_id').annotation.to_dict())
-
-    # Convert stuff to timestamps
-    for ts in ['creation_timestamp', 'modified_timestamp']:
-        nodes[ts] = nodes[ts].map(pd.Timestamp)
-        connectors[ts] = connectors[ts].map(pd.Timestamp)
-    annotations['annotated_timestamp'] = annotations['annotated_timestamp'].map(pd.Timestamp)
-    tags = {t: [[e[0], pd.Timestamp(e[1])] for e in tags[t]] for t in tags}
-
-    # General rules:
-    # 1. creation_timestamp and modified timestamp represent a validity
-    #    intervals.
-    # 2. Nodes where creation_timestamp is older than modified_timestamp,
-    #    represent the existing, most up-to-date versions.
-    # 3. Nodes with creation_timestamp younger than modified_timestamp, and
-    #    with NO future version of themselves, got cut off/deleted at
-    #    modification time.
-    # 4. Useful little detail: nodes/connectors are ordered by new -> old
-
-    # First change the modified_timestamp for nodes that still exist
-    # (see rule 2) to right now
-    nodes.loc[nodes.creation_timestamp > nodes.modified_timestamp, 'modified_timestamp'] = pd.Timestamp.now().tz_localize('UTC')
-    connectors.loc[connectors.creation_timestamp > connectors.modified_timestamp, 'modified_timestamp'] = pd.Timestamp.now().tz_localize('UTC')
-
-    # Remove nodes without a window (these seems to be temporary states)
-    nodes = nodes[nodes.creation_timestamp != nodes.modified_timestamp]
-    connectors = connectors[connectors.creation_timestamp != connectors.modified_timestamp]
-
-    # Second subset to versions of the nodes that existed at given time
-    before_nodes = nodes[(nodes.creation_timestamp <= target) & (nodes.modified_timestamp >= target)]
-    before_connectors = connectors[(connectors.creation_timestamp <= target) & (connectors.modified_timestamp >= target)]
+    an_dict = an_list.set_index('annotation_id').annotation.to_dict()
 
-    # Now fix tags and annotations
-    before_annotations = annotations[annotations.annotated_timestamp <= target]
-    before_tags = {t: [e[0] for e in tags[t] if e[1] <= target] for t in tags}
-    before_tags = {t: before_tags[t] for t in before_tags if before_tags[t]}
+    # Treat current versions as valid until now
+    now = pd.Timestamp.now().tz_localize('UTC')
+
+    # Get connector links for all neurons at once
+    links = fetch.get_connector_links(skids, remote_instance=remote_instance)
+    links['creation_time'] = pd.to_datetime(links.creation_time).dt.tz_localize('UTC')
+    links['connector_id'] = links.connector_id.astype(int)
+    links['treenode_id'] = links.treenode_id.astype(int)
+    links = {str(s): df for s, df in links.groupby('skeleton_id')}
+
+    hist = {}
+    for s, d in zip(skids, data):
+        # Turn stuff into DataFrames for easier sifting/sorting
+        nodes = pd.DataFrame(d[0], columns=['treenode_id', 'parent_id',
+                                            'user_id', 'x', 'y', 'z', 'radius',
+                                            'confidence', 'creation_timestamp',
+                                            'modified_timestamp', 'ordering_by'])
+        nodes['parent_id'] = nodes.parent_id.values.astype(object)
+        not_root = ~nodes.parent_id.isnull()
+        nodes.loc[not_root, 'parent_id'] = nodes.loc[not_root, 'parent_id'].map(int)
+        nodes.loc[~not_root, 'parent_id'] = None
+
+        connectors = pd.DataFrame(d[1], columns=['treenode_id', 'connector_id',
+                                                 'relation', 'x', 'y', 'z',
+                                                 'creation_timestamp',
+                                                 'modified_timestamp'])
+        # This is a dictionary with {'tag': [[treenode_id, date_tagged], ...]}
+        tags = {t: (np.array([e[0] for e in d[2][t]]),
+                    _to_ns(_to_utc([e[1] for e in d[2][t]])))
+                for t in d[2] if d[2][t]}
+
+        annotations = pd.DataFrame(d[4], columns=['annotation_id',
+                                                  'annotated_timestamp'])
+        annotations['annotation'] = annotations.annotation_id.map(an_dict)
+        annotations['annotated_timestamp'] = _to_utc(annotations.annotated_timestamp)
+
+        # General rules:
+        # 1. creation_timestamp and modified timestamp represent a validity
+        #    intervals.
+        # 2. Nodes where creation_timestamp is older than modified_timestamp,
+        #    represent the existing, most up-to-date versions.
+        # 3. Nodes with creation_timestamp younger than modified_timestamp,
+        #    and with NO future version of themselves, got cut off/deleted at
+        #    modification time.
+        # 4. Useful little detail: nodes/connectors are ordered by new -> old
+        h = {'tags': tags, 'annotations': annotations,
+             'links': links.get(str(s), pd.DataFrame(columns=['connector_id',
+                                                             'treenode_id',
+                                                             'creation_time']))}
+        for k, df in [('nodes', nodes), ('connectors', connectors)]:
+            for ts in ['creation_timestamp', 'modified_timestamp']:
+                df[ts] = _to_utc(df[ts])
+
+            # Change the modified_timestamp for versions that still exist
+            # (see rule 2) to right now
+            df.loc[df.creation_timestamp > df.modified_timestamp,
+                   'modified_timestamp'] = now
+
+            # Remove versions without a window (temporary states)
+            df = df[df.creation_timestamp != df.modified_timestamp]
+
+            # Sort validity intervals once so that we can sweep over targets
+            created = _to_ns(df.creation_timestamp)
+            order = np.argsort(created, kind='mergesort')
+
+            h[k] = df
+            h[k + '_order'] = order
+            h[k + '_created'] = created[order]
+            h[k + '_modified'] = _to_ns(df.modified_timestamp)
+
+        hist[str(s)] = h
+
+    return hist
+
+
+def _valid_at(h, key, target):
+    """ Subsets table in history to versions that existed at target time. """
+    t = _to_ns(target)
+    order = h[key + '_order']
+    # Versions created before target
+    ix = order[:np.searchsorted(h[key + '_created'], t, side='right')]
+    # ... that still existed at target - keep original order (new -> old)
+    ix = np.sort(ix[h[key + '_modified'][ix] >= t])
+    return h[key].iloc[ix]
+
+
+def _rejuvenate(x, h, target):
+    """ Returns copy of neuron at given (UTC) target time. """
+    x = x.copy()
+
+    x.nodes, x.connectors, x.annotations, x.tags = _rejuvenate_tables(h,
+                                                                      target)
+    x._clear_temp_attr()
+
+    return x
 
-    x.nodes = before_nodes
-    x.connectors = before_connectors
-    x.annotations = before_annotations
-    x.tags = before_tags
+
+def _rejuvenate_tables(h, target):
+    """ Produces nodes, connectors, annotations and tags at given (UTC)
+    target time from parsed history (see :func:`~pymaid.morpho._fetch_history`).
+    """
+    t = _to_ns(target)
+
+    # Subset to versions of the nodes that existed at given time
+    nodes = _valid_at(h, 'nodes', target).copy()
+    connectors = _valid_at(h, 'connectors', target)
+
+    # Now fix tags and annotations
+    annotations = h['annotations']
+    annotations = annotations[annotations.annotated_timestamp <= target]
+    tags = {tag: h['tags'][tag][0][h['tags'][tag][1] <= t].tolist()
+            for tag in h['tags']}
+    tags = {tag: tags[tag] for tag in tags if tags[tag]}
 
     # We might end up with multiple disconnected pieces - I don't yet know why
-    x.nodes.loc[~x.nodes.parent_id.isin(x.nodes.treenode_id), 'parent_id'] = None
+    nodes.loc[~nodes.parent_id.isin(nodes.treenode_id), 'parent_id'] = None
 
     # If there is more than one root, we have to remove the disconnected
     # pieces and keep only the "oldest branch".
     # The theory for doing this is: if a node shows up as "root" and the very
     # next step is that it is a child to another node, we should consider
     # it a not-yet connected branch that needs to be removed.
-    roots = x.nodes[x.nodes.parent_id.isnull()].treenode_id.tolist()
+    roots = nodes[nodes.parent_id.isnull()].treenode_id.tolist()
     if len(roots) > 1:
-        after_nodes = nodes[nodes.modified_timestamp > target]
-        for r in roots:
+        after_nodes = h['nodes'][h['nodes_modified'] > t]
+        for r in list(roots):
             # Find the next version of this node
             nv = after_nodes[(after_nodes.treenode_id == r)]
             # If this node is not a root anymore in its next iteration, it's
@@ -2169,8 +2477,12 @@ def time_machine(x, target, inplace=False, remote_instance=None):
                 roots.remove(r)
 
         # Get disconnected components
-        g = graph.neuron2nx(x)
-        subgraphs = [l for l in nx.connected_components(nx.to_undirected(g))]
+        g = nx.Graph()
+        g.add_nodes_from(nodes.treenode_id.values)
+        not_root = ~nodes.parent_id.isnull()
+        g.add_edges_from(zip(nodes.treenode_id.values[not_root.values],
+                             nodes.parent_id.values[not_root.values]))
+        subgraphs = [l for l in nx.connected_components(g)]
 
         # If we have a winner root, keep the bit that it is part of
         if len(roots) == 1:
@@ -2180,32 +2492,32 @@ def time_machine(x, target, inplace=False, remote_instance=None):
         else:
             keep = sorted(subgraphs, key=lambda x: len(x), reverse=True)[0]
 
-        x.nodes = x.nodes[x.nodes.treenode_id.isin(keep)].copy()
+        nodes = nodes[nodes.treenode_id.isin(keep)]
 
     # Remove connectors where the treenode does not even exist yet
-    x.connectors = x.connectors[x.connectors.treenode_id.isin(x.nodes.treenode_id)]
-
-    # Take care of connectors where the treenode might exist but was not yet linked
-    links = fetch.get_connector_links(x.skeleton_id)
-    localize = lambda x: pd.Timestamp.tz_localize(x, 'UTC')
-    links.creation_time = links.creation_time.map(localize)
-    links = links[links.creation_time <= target]
-    links['connector_id'] = links.connector_id.astype(int)
-    links['treenode_id'] = links.treenode_id.astype(int)
-
-    # Get connector ID -> treenode combinations
-    l = links[['connector_id', 'treenode_id']].T.apply(tuple)
-    c = x.connectors[['connector_id', 'treenode_id']].T.apply(tuple)
-
-    # Keep only those where connector->treenode connection is present
-    x.connectors = x.connectors[c.isin(l)]
-
-    x._clear_temp_attr()
-
-    if not inplace:
-        return x
-
-    return
+    connectors = connectors[connectors.treenode_id.isin(nodes.treenode_id)]
+
+    # Take care of connectors where the treenode might exist but was not yet
+    # linked: keep only those where connector->treenode connection is present
+    this_links = h['links'][h['links'].creation_time <= target]
+    l = pd.MultiIndex.from_arrays([this_links.connector_id.values,
+                                   this_links.treenode_id.values])
+    c = pd.MultiIndex.from_arrays([connectors.connector_id.values.astype(int),
+                                   connectors.treenode_id.values.astype(int)])
+    connectors = connectors[c.isin(l)]
+
+    return nodes, connectors, annotations, tags
+
+
+def _cable(nodes):
+    """ Cable length [um] from nodes table without building a graph. """
+    if nodes.empty:
+        return 0
+    locs = nodes.set_index('treenode_id')[['x', 'y', 'z']]
+    not_root = ~nodes.parent_id.isnull().values
+    child = nodes[['x', 'y', 'z']].values[not_root].astype(float)
+    parent = locs.loc[nodes.parent_id.values[not_root].astype(int)].values.astype(float)
+    return float(np.sqrt(((child - parent) ** 2).sum(axis=1)).sum() / 1000)
 
 
 def break_fragments(x):
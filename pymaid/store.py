@@ -0,0 +1,1745 @@
+#    This script is part of pymaid (http://www.github.com/schlegelp/pymaid).
+#    Copyright (C) 2017 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along
+
+""" This module contains classes that keep local, indexed copies of CATMAID
+data so that repeated queries don't have to go to the server.
+
+Examples
+--------
+>>> # Download all edges in the project once and save to disk
+>>> snap = pymaid.ConnectomeSnapshot.from_server()
+>>> snap.save('connectome.npz')
+>>> # Later: load snapshot and query locally
+>>> snap = pymaid.ConnectomeSnapshot.load('connectome.npz')
+>>> cn = snap.get_partners([16, 2333007], threshold=3)
+
+"""
+
+import datetime
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import core, fetch, utils, config, connectivity
+
+# Set up logging
+logger = config.logger
+
+__all__ = sorted(['ConnectomeSnapshot', 'ConnectorStore', 'MetadataRegistry',
+                  'NodeIndex', 'NodeDetailStore'])
+
+
+def _ranges(starts, stops):
+    """ Concatenates ``np.arange(start, stop)`` for all start/stop pairs. """
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.asarray(stops, dtype=np.int64) - starts
+
+    if not lengths.sum():
+        return np.zeros(0, dtype=np.int64)
+
+    # Offset of each range relative to its position in the output
+    offsets = starts - np.cumsum(np.append(0, lengths[:-1]))
+
+    return np.repeat(offsets, lengths) + np.arange(lengths.sum())
+
+
+class NodeIndex:
+    """ Compact node ID -> skeleton ID lookup table.
+
+    Mappings are kept in two sorted int64 arrays, i.e. ~16 bytes per node.
+    Each :class:`~pymaid.CatmaidInstance` keeps one of these to avoid
+    resolving the same node twice (see :func:`~pymaid.get_skid_from_treenode`).
+
+    Examples
+    --------
+    >>> ix = pymaid.NodeIndex()
+    >>> ix.update([1, 2, 3], [10, 10, 20])
+    >>> ix.get([3, 4])
+    array([20, -1])
+
+    """
+
+    def __init__(self, node_ids=[], skeleton_ids=[]):
+        self.node_ids = np.zeros(0, dtype=np.int64)
+        self.skeleton_ids = np.zeros(0, dtype=np.int64)
+        self.update(node_ids, skeleton_ids)
+
+    def __len__(self):
+        return self.node_ids.shape[0]
+
+    def __repr__(self):
+        return '<{}: {} nodes in {} skeletons>'.format(type(self).__name__,
+                                                     len(self),
+                                                     np.unique(self.skeleton_ids).shape[0])
+
+    def _find(self, node_ids):
+        """ Positions of given nodes and whether they are in the index. """
+        ix = np.searchsorted(self.node_ids, node_ids)
+        ix[ix >= len(self)] = 0
+        return ix, self.node_ids[ix] == node_ids
+
+    def get(self, node_ids):
+        """ Look up skeleton IDs.
+
+        Parameters
+        ----------
+        node_ids :  array-like
+                    Node IDs to look up.
+
+        Returns
+        -------
+        numpy.ndarray
+                    Skeleton IDs. ``-1`` for nodes not in the index.
+
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        if not len(self):
+            return np.full(node_ids.shape[0], -1, dtype=np.int64)
+        ix, found = self._find(node_ids)
+        return np.where(found, self.skeleton_ids[ix], -1)
+
+    def update(self, node_ids, skeleton_ids):
+        """ Add or overwrite mappings.
+
+        Parameters
+        ----------
+        node_ids :      array-like
+        skeleton_ids :  array-like
+
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        skeleton_ids = np.asarray(skeleton_ids, dtype=np.int64).ravel()
+
+        if node_ids.shape != skeleton_ids.shape:
+            raise ValueError('Need the same number of node and skeleton IDs')
+
+        if not node_ids.shape[0]:
+            return
+
+        # New mappings take precedence over existing ones
+        node_ids = np.append(node_ids[::-1], self.node_ids)
+        skeleton_ids = np.append(skeleton_ids[::-1], self.skeleton_ids)
+        node_ids, first = np.unique(node_ids, return_index=True)
+
+        self.node_ids = node_ids
+        self.skeleton_ids = skeleton_ids[first]
+
+    def drop(self, node_ids=None, skeleton_ids=None):
+        """ Remove mappings by node and/or skeleton ID.
+
+        Use this when skeletons have been edited (e.g. joined or split).
+
+        Parameters
+        ----------
+        node_ids :      array-like, optional
+        skeleton_ids :  array-like, optional
+
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if not isinstance(node_ids, type(None)):
+            keep &= ~np.isin(self.node_ids, np.asarray(node_ids, dtype=np.int64))
+        if not isinstance(skeleton_ids, type(None)):
+            keep &= ~np.isin(self.skeleton_ids,
+                             np.asarray(skeleton_ids, dtype=np.int64))
+
+        self.node_ids = self.node_ids[keep]
+        self.skeleton_ids = self.skeleton_ids[keep]
+
+    def clear(self):
+        """ Remove all mappings. """
+        self.drop(node_ids=self.node_ids)
+
+
+class MetadataRegistry:
+    """ Registry of project metadata: neuron names and tables such as the
+    user and annotation lists.
+
+    Each :class:`~pymaid.CatmaidInstance` keeps one of these (if caching is
+    on) so that :func:`~pymaid.get_names`, :func:`~pymaid.get_user_list` and
+    :func:`~pymaid.get_annotation_list` don't have to go to the server every
+    time. Entries expire after ``config.metadata_ttl`` seconds.
+
+    Examples
+    --------
+    >>> reg = pymaid.MetadataRegistry()
+    >>> reg.update_names({'16': 'PN glomerulus DA1'})
+    >>> reg.get_names([16, 17])
+    {'16': 'PN glomerulus DA1'}
+
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return '<{}: {} names; tables: {}>'.format(type(self).__name__,
+                                                   len(self),
+                                                   ', '.join(sorted(self.tables)) or 'none')
+
+    @staticmethod
+    def _is_fresh(timestamp):
+        ttl = config.metadata_ttl
+        return isinstance(ttl, type(None)) or (time.time() - timestamp) < ttl
+
+    def get_names(self, skeleton_ids):
+        """ Look up neuron names.
+
+        Parameters
+        ----------
+        skeleton_ids :  list of int | str
+
+        Returns
+        -------
+        dict
+                        ``{skid: name}`` for all skeleton IDs with a valid
+                        entry. Skeleton IDs are returned as strings.
+
+        """
+        names = {}
+        for s in skeleton_ids:
+            entry = self.names.get(str(s))
+            if entry and self._is_fresh(entry[0]):
+                names[str(s)] = entry[1]
+        return names
+
+    def update_names(self, names):
+        """ Add or overwrite neuron names.
+
+        Parameters
+        ----------
+        names :     dict
+                    ``{skid: name}``
+
+        """
+        now = time.time()
+        self.names.update({str(s): (now, n) for s, n in names.items()})
+
+    def get_table(self, table):
+        """ Get a copy of a table or ``None`` if not available or expired. """
+        entry = self.tables.get(table)
+        if entry and self._is_fresh(entry[0]):
+            return entry[1].copy()
+        return None
+
+    def update_table(self, table, df):
+        """ Add or overwrite a table (e.g. ``'users'``). """
+        self.tables[table] = (time.time(), df.copy())
+
+    def drop(self, skeleton_ids=None, tables=None):
+        """ Remove entries by skeleton ID and/or table.
+
+        Use this when neurons have been renamed or annotated.
+
+        Parameters
+        ----------
+        skeleton_ids :  list of int | str, optional
+        tables :        str | list of str, optional
+                        E.g. ``'annotations'`` or ``'users'``.
+
+        """
+        if not isinstance(skeleton_ids, type(None)):
+            for s in utils._make_iterable(skeleton_ids):
+                self.names.pop(str(s), None)
+        if not isinstance(tables, type(None)):
+            for t in utils._make_iterable(tables):
+                self.tables.pop(t, None)
+
+    def clear(self):
+        """ Remove all entries. """
+        self.names = {}
+        self.tables = {}
+
+
+class NodeDetailStore:
+    """ Local store for node details (creation, edition, reviews).
+
+    Works as a drop-in for :func:`~pymaid.get_node_details`: only nodes that
+    are not yet in the store - or whose edition time has changed - are
+    fetched from the server, everything else is served locally.
+
+    Pass it to e.g. :func:`~pymaid.get_time_invested` or
+    :func:`~pymaid.get_team_contributions` via ``node_store``.
+
+    Important
+    ---------
+    Nodes are re-fetched only if their ``edition_time`` changed. Reviews do
+    not change a node's edition time: use :func:`~NodeDetailStore.drop`
+    (or ``refresh=True``) to force an update, e.g. for neurons under review.
+    Edition times are compared at a resolution of minutes and are only
+    checked for treenodes: connectors are fetched once and never refreshed
+    unless dropped.
+
+    Parameters
+    ----------
+    filename :  str, optional
+                If provided, will load store from this file.
+
+    Examples
+    --------
+    >>> store = pymaid.NodeDetailStore()
+    >>> # First run fetches all node details
+    >>> t = pymaid.get_time_invested(neurons, node_store=store)
+    >>> store.save('node_details.npz')
+    >>> # Next week: only new or edited nodes are fetched
+    >>> store = pymaid.NodeDetailStore('node_details.npz')
+    >>> t = pymaid.get_time_invested(neurons, node_store=store)
+
+    """
+
+    DETAIL_COLUMNS = ['node_id', 'creation_time', 'creator', 'edition_time',
+                      'editor']
+    REVIEW_COLUMNS = ['node_id', 'reviewer', 'review_time']
+
+    def __init__(self, filename=None):
+        self.details = pd.DataFrame({'node_id': np.zeros(0, dtype=np.int64),
+                                     'creation_time': np.zeros(0, dtype='datetime64[ns]'),
+                                     'creator': np.zeros(0, dtype=np.int64),
+                                     'edition_time': np.zeros(0, dtype='datetime64[ns]'),
+                                     'editor': np.zeros(0, dtype=np.int64)},
+                                    columns=self.DETAIL_COLUMNS)
+        self.reviews = pd.DataFrame({'node_id': np.zeros(0, dtype=np.int64),
+                                     'reviewer': np.zeros(0, dtype=np.int64),
+                                     'review_time': np.zeros(0, dtype='datetime64[ns]')},
+                                    columns=self.REVIEW_COLUMNS)
+
+        if filename:
+            self._load(filename)
+
+    def __len__(self):
+        return self.details.shape[0]
+
+    def __repr__(self):
+        return '<{}: {} nodes, {} reviews>'.format(type(self).__name__,
+                                                   len(self),
+                                                   self.reviews.shape[0])
+
+    def get_node_details(self, x, remote_instance=None, edition_times='auto',
+                         skeleton_ids=None, refresh=False,
+                         return_reviews=False, **kwargs):
+        """ Retrieve node details, fetching only new or changed nodes.
+
+        Parameters
+        ----------
+        x :                 list | CatmaidNeuron | CatmaidNeuronList
+                            Node IDs (treenodes or connectors). If
+                            CatmaidNeuron/List will use both, treenodes and
+                            connectors.
+        remote_instance :   CatmaidInstance, optional
+                            If not passed directly, will try using global.
+        edition_times :     "auto" | "fetch" | array-like | None, optional
+                            Current edition times used to decide which stored
+                            nodes are outdated:
+                              - "fetch" will fetch edition times of all
+                                treenodes in the skeletons of ``x`` (requires
+                                CatmaidNeuron/List or ``skeleton_ids``)
+                              - "auto" will do the same if ``x`` is a
+                                CatmaidNeuron/List or ``skeleton_ids`` is
+                                given, and otherwise behave like None
+                              - array-like: edition times for the nodes in
+                                ``x``
+                              - None: stored nodes are considered up-to-date
+                            Connectors are never checked.
+        skeleton_ids :      list, optional
+                            Skeletons the nodes in ``x`` belong to. Used to
+                            fetch edition times if ``x`` is a list of node
+                            IDs.
+        refresh :           bool, optional
+                            If True, will re-fetch all nodes in ``x``.
+        return_reviews :    bool, optional
+                            If True, will also return long-format review
+                            table.
+        **kwargs
+                            Passed to :func:`~pymaid.get_node_details`.
+
+        Returns
+        -------
+        pandas.DataFrame
+                            See :func:`~pymaid.get_node_details`.
+
+        """
+        if isinstance(skeleton_ids, type(None)) and \
+           isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+            skeleton_ids = x.skeleton_id
+
+        if isinstance(edition_times, str) and edition_times == 'auto':
+            if isinstance(skeleton_ids, type(None)):
+                logger.debug('No skeleton IDs - stored node details are '
+                             'not checked for edits.')
+                edition_times = None
+            else:
+                edition_times = 'fetch'
+
+        if isinstance(edition_times, str) and edition_times == 'fetch':
+            if isinstance(skeleton_ids, type(None)):
+                raise TypeError('Need CatmaidNeuron/List or skeleton_ids to '
+                                'fetch edition times.')
+            et = self._fetch_edition_times(skeleton_ids,
+                                           remote_instance=remote_instance)
+        elif not isinstance(edition_times, type(None)):
+            et = pd.Series(np.asarray(edition_times, dtype='datetime64[ns]'),
+                           index=np.asarray(self._eval_nodes(x), dtype=np.int64))
+        else:
+            et = None
+
+        node_ids = np.unique(self._eval_nodes(x))
+
+        stored = self.details.set_index('node_id', drop=False)
+        if refresh:
+            to_fetch = node_ids
+        else:
+            to_fetch = node_ids[~np.isin(node_ids, stored.index.values)]
+
+            if not isinstance(et, type(None)):
+                known = stored.reindex(et.index[et.index.isin(stored.index)])
+                outdated = known.index.values[known.edition_time.values != et.loc[known.index].values]
+                to_fetch = np.union1d(to_fetch, outdated[np.isin(outdated, node_ids)])
+
+        if to_fetch.shape[0]:
+            logger.info('Fetching details for {} of {} nodes'.format(to_fetch.shape[0],
+                                                                     node_ids.shape[0]))
+            details, reviews = fetch.get_node_details(to_fetch,
+                                                      remote_instance=remote_instance,
+                                                      return_reviews=True,
+                                                      **kwargs)
+            self.update(details, reviews, replace=to_fetch)
+
+        details = self.details[self.details.node_id.isin(node_ids)]
+        details = details.reset_index(drop=True)
+        reviews = self.reviews[self.reviews.node_id.isin(node_ids)]
+        reviews = reviews.sort_values('node_id', kind='mergesort').reset_index(drop=True)
+
+        # Add review lists per node for compatibility with get_node_details
+        start = np.searchsorted(reviews.node_id.values, details.node_id.values,
+                                side='left')
+        end = np.searchsorted(reviews.node_id.values, details.node_id.values,
+                              side='right')
+        reviewers = reviews.reviewer.values
+        review_times = pd.to_datetime(reviews.review_time.values).to_pydatetime()
+        details['reviewers'] = [list(reviewers[a:b]) for a, b in zip(start, end)]
+        details['review_times'] = [list(review_times[a:b]) for a, b in zip(start, end)]
+
+        if return_reviews:
+            return details, reviews
+        return details
+
+    def update(self, details, reviews, replace=None):
+        """ Add node details to the store.
+
+        Parameters
+        ----------
+        details :   pandas.DataFrame
+                    Node details as returned by :func:`~pymaid.get_node_details`.
+        reviews :   pandas.DataFrame
+                    Reviews as returned by :func:`~pymaid.get_node_details`
+                    with ``return_reviews=True``.
+        replace :   array-like, optional
+                    Node IDs to drop from the store before adding (defaults
+                    to all nodes in ``details``). Use to also remove nodes
+                    that no longer exist.
+
+        """
+        if isinstance(replace, type(None)):
+            replace = details.node_id.values
+        self.drop(replace)
+
+        self.details = pd.concat([self.details,
+                                  details[self.DETAIL_COLUMNS]],
+                                 axis=0, ignore_index=True)
+        self.reviews = pd.concat([self.reviews,
+                                  reviews[self.REVIEW_COLUMNS]],
+                                 axis=0, ignore_index=True)
+
+    def drop(self, node_ids):
+        """ Remove nodes from the store.
+
+        Parameters
+        ----------
+        node_ids :  array-like
+
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.details = self.details[~self.details.node_id.isin(node_ids)]
+        self.reviews = self.reviews[~self.reviews.node_id.isin(node_ids)]
+
+    def save(self, filename):
+        """ Save store to (uncompressed) ``.npz`` file.
+
+        Parameters
+        ----------
+        filename :  str
+                    Filename to save to.
+
+        """
+        arrays = {'details_' + c: self.details[c].values for c in self.DETAIL_COLUMNS}
+        arrays.update({'reviews_' + c: self.reviews[c].values for c in self.REVIEW_COLUMNS})
+        np.savez(filename, **arrays)
+
+    def _load(self, filename):
+        """ Load store from file. """
+        with np.load(filename) as f:
+            self.details = pd.DataFrame({c: f['details_' + c] for c in self.DETAIL_COLUMNS},
+                                        columns=self.DETAIL_COLUMNS)
+            self.reviews = pd.DataFrame({c: f['reviews_' + c] for c in self.REVIEW_COLUMNS},
+                                        columns=self.REVIEW_COLUMNS)
+
+    @staticmethod
+    def _eval_nodes(x):
+        """ Extract node IDs from input. """
+        if isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+            return np.append(x.nodes.treenode_id.values,
+                             x.connectors.connector_id.values).astype(np.int64)
+        return np.asarray(utils._make_iterable(x), dtype=np.int64)
+
+    @staticmethod
+    def _fetch_edition_times(skids, remote_instance=None):
+        """ Fetch edition times for all treenodes of given skeletons. """
+        remote_instance = utils._eval_remote_instance(remote_instance)
+        url = remote_instance._get_treenode_table_url()
+        data = remote_instance.fetch_chunked(url, utils._make_iterable(skids),
+                                             'skeleton_ids[{}]',
+                                             chunk_size=10,
+                                             desc='Edition times')
+
+        # Format is [[ID, parent ID, x, y, z, confidence, radius, skeleton_id,
+        # edition_time, user_id], ...]
+        nodes = [n for d in data for n in d]
+        return pd.Series(fetch._parse_epochs([n[8] for n in nodes]),
+                         index=np.array([n[0] for n in nodes], dtype=np.int64))
+
+
+class ConnectorStore:
+    """ Local, indexed store for connectors and their links.
+
+    Keeps connector locations, tags and links (presynaptic, postsynaptic,
+    gap junction and abutting) so that connector-centric queries can be
+    answered without going back to the server. Works as a drop-in for
+    :func:`~pymaid.get_connectors`, :func:`~pymaid.get_connector_details`,
+    :func:`~pymaid.get_connector_links` and
+    :func:`~pymaid.get_connectors_between`: skeletons or connectors that are
+    not yet in the store are fetched on demand.
+
+    Pass it to e.g. :func:`~pymaid.cn_table_from_connectors`,
+    :func:`~pymaid.adjacency_from_connectors`,
+    :func:`~pymaid.filter_connectivity` or :func:`~pymaid.flow_centrality`
+    via ``connector_store``.
+
+    Important
+    ---------
+    All links of *loaded* skeletons (see :func:`~ConnectorStore.populate`)
+    are stored with confidence, creator and timestamps. Links of their
+    partners are known only from connector details and have these fields
+    set to ``-1``/``NaT``. :func:`~ConnectorStore.refresh` re-checks loaded
+    skeletons only: links that partners add to or remove from existing
+    connectors are picked up if the partner is loaded too or with
+    ``full=True``.
+
+    Parameters
+    ----------
+    filename :  str, optional
+                If provided, will load store from this file.
+
+    Examples
+    --------
+    >>> store = pymaid.ConnectorStore()
+    >>> # Fetch all links of these neurons and details of their connectors
+    >>> store.populate('annotation:glomerulus DA1')
+    >>> cn_table = pymaid.cn_table_from_connectors(neurons,
+    ...                                            connector_store=store)
+    >>> store.save('connectors.npz')
+    >>> # Next week: only fetch connectors that have changed
+    >>> store = pymaid.ConnectorStore('connectors.npz')
+    >>> store.refresh()
+
+    """
+
+    CONNECTOR_COLUMNS = ['connector_id', 'x', 'y', 'z']
+    LINK_COLUMNS = ['connector_id', 'relation', 'skeleton_id', 'treenode_id',
+                    'confidence', 'creator_id', 'creation_time',
+                    'edition_time']
+    TAG_COLUMNS = ['connector_id', 'tag']
+
+    CONNECTOR_TYPES = {'presynaptic_to': 'synaptic',
+                       'postsynaptic_to': 'synaptic',
+                       'gapjunction_with': 'gap_junction',
+                       'abutting': 'abutting'}
+
+    def __init__(self, filename=None):
+        self.connectors = pd.DataFrame({'connector_id': np.zeros(0, dtype=np.int64),
+                                        'x': np.zeros(0),
+                                        'y': np.zeros(0),
+                                        'z': np.zeros(0)},
+                                       columns=self.CONNECTOR_COLUMNS)
+        self.links = pd.DataFrame({'connector_id': np.zeros(0, dtype=np.int64),
+                                   'relation': np.zeros(0, dtype=object),
+                                   'skeleton_id': np.zeros(0, dtype=np.int64),
+                                   'treenode_id': np.zeros(0, dtype=np.int64),
+                                   'confidence': np.zeros(0, dtype=np.int64),
+                                   'creator_id': np.zeros(0, dtype=np.int64),
+                                   'creation_time': np.zeros(0, dtype='datetime64[ns]'),
+                                   'edition_time': np.zeros(0, dtype='datetime64[ns]')},
+                                  columns=self.LINK_COLUMNS)
+        self.tags = pd.DataFrame({'connector_id': np.zeros(0, dtype=np.int64),
+                                  'tag': np.zeros(0, dtype=object)},
+                                 columns=self.TAG_COLUMNS)
+        # Skeletons for which all links are in the store
+        self.skeleton_ids = np.zeros(0, dtype=np.int64)
+
+        if filename:
+            self._load(filename)
+
+    def __len__(self):
+        return self.connectors.shape[0]
+
+    def __repr__(self):
+        return '<{}: {} connectors, {} links, {} skeletons>'.format(type(self).__name__,
+                                                                    len(self),
+                                                                    self.links.shape[0],
+                                                                    self.skeleton_ids.shape[0])
+
+    def populate(self, x, remote_instance=None):
+        """ Fetch all links of given skeletons and details of their
+        connectors.
+
+        Links of skeletons already in the store are replaced. Details are
+        only fetched for connectors not yet in the store: use
+        :func:`~ConnectorStore.refresh` to update these.
+
+        Parameters
+        ----------
+        x :                 skeleton IDs | CatmaidNeuron | CatmaidNeuronList
+                            Skeletons to load. Can be anything that
+                            :func:`~pymaid.eval_skids` accepts.
+        remote_instance :   CatmaidInstance, optional
+                            If not passed directly, will try using global.
+
+        """
+        skids = self._eval_skids(x, remote_instance=remote_instance)
+
+        if not skids.shape[0]:
+            return
+
+        links, tags = self._fetch_links(skids, remote_instance=remote_instance)
+        self._update_links(skids, links, tags)
+
+        cn_ids = np.unique(links.connector_id.values)
+        new = cn_ids[~np.isin(cn_ids, self.connectors.connector_id.values)]
+        self._fetch_details(new, remote_instance=remote_instance,
+                            locations=links)
+
+    def refresh(self, x=None, full=False, remote_instance=None):
+        """ Update the store, fetching only connectors that have changed.
+
+        Re-fetches the links of loaded skeletons (one bulk request) and
+        compares them to the stored links. Details are re-fetched only for
+        connectors whose links to these skeletons were added, removed or
+        edited.
+
+        Parameters
+        ----------
+        x :                 skeleton IDs | CatmaidNeuron | CatmaidNeuronList, optional
+                            Skeletons to refresh. If None, will refresh all
+                            loaded skeletons.
+        full :              bool, optional
+                            If True, will re-fetch details for all connectors
+                            of these skeletons. Use this to also pick up
+                            changes made by their (not loaded) partners.
+        remote_instance :   CatmaidInstance, optional
+                            If not passed directly, will try using global.
+
+        """
+        if isinstance(x, type(None)):
+            skids = self.skeleton_ids
+        else:
+            skids = self._eval_skids(x, remote_instance=remote_instance)
+
+        if not skids.shape[0]:
+            return
+
+        old = self.links[self.links.skeleton_id.isin(skids)]
+        links, tags = self._fetch_links(skids, remote_instance=remote_instance)
+
+        if full:
+            to_fetch = np.union1d(old.connector_id.values,
+                                  links.connector_id.values)
+        else:
+            # Connectors whose links to these skeletons have changed
+            cols = ['connector_id', 'relation', 'skeleton_id', 'treenode_id',
+                    'edition_time']
+            diff = old[cols].merge(links[cols], how='outer', indicator=True)
+            changed = diff[diff._merge != 'both'].connector_id.values
+            new = links.connector_id.values[~links.connector_id.isin(self.connectors.connector_id)]
+            to_fetch = np.union1d(changed, new)
+
+        logger.info('{} of {} connectors changed'.format(to_fetch.shape[0],
+                                                         links.connector_id.unique().shape[0]))
+
+        self._update_links(skids, links, tags)
+        self._fetch_details(to_fetch, remote_instance=remote_instance,
+                            locations=links)
+        self._prune()
+
+    def get_connector_details(self, x, remote_instance=None):
+        """ Retrieve details on sets of connectors.
+
+        Connectors not yet in the store are fetched from the server.
+
+        Parameters
+        ----------
+        x :                 list of connector IDs | CatmaidNeuron | CatmaidNeuronList
+                            Connector ID(s) to retrieve details for. If
+                            CatmaidNeuron/List, will use their connectors.
+        remote_instance :   CatmaidInstance, optional
+                            If not passed directly, will try using global.
+
+        Returns
+        -------
+        pandas.DataFrame
+                            See :func:`~pymaid.get_connector_details`. Unlike
+                            the server's response, ``postsynaptic_to`` has
+                            one skeleton ID per postsynaptic node.
+
+        """
+        cn_ids = np.unique(self._eval_connectors(x))
+        self._ensure_connectors(cn_ids, remote_instance=remote_instance)
+
+        links = self.links[self.links.connector_id.isin(cn_ids)]
+        pre = links[links.relation == 'presynaptic_to'].drop_duplicates('connector_id')
+        post = links[links.relation == 'postsynaptic_to'].sort_values(['connector_id',
+                                                                        'treenode_id'])
+
+        # Only connectors with pre- or postsynaptic links (like the server)
+        cn_ids = cn_ids[np.isin(cn_ids, links[links.relation.isin(['presynaptic_to',
+                                                                  'postsynaptic_to'])].connector_id.values)]
+
+        pre_skid = dict(zip(pre.connector_id.values, pre.skeleton_id.values.tolist()))
+        pre_node = dict(zip(pre.connector_id.values, pre.treenode_id.values.tolist()))
+
+        ids, starts = np.unique(post.connector_id.values, return_index=True)
+        post_skids = dict(zip(ids, np.split(post.skeleton_id.values, starts[1:])))
+        post_nodes = dict(zip(ids, np.split(post.treenode_id.values, starts[1:])))
+        empty = np.zeros(0, dtype=np.int64)
+
+        columns = ['connector_id', 'presynaptic_to', 'postsynaptic_to',
+                   'presynaptic_to_node', 'postsynaptic_to_node']
+
+        return pd.DataFrame([[cn,
+                              pre_skid.get(cn),
+                              post_skids.get(cn, empty).tolist(),
+                              pre_node.get(cn),
+                              post_nodes.get(cn, empty).tolist()] for cn in cn_ids.tolist()],
+                            columns=columns,
+                            dtype=object)
+
+    def get_connector_links(self, x, with_tags=False, remote_instance=None):
+        """ Retrieve connector links for a set of neurons.
+
+        Skeletons not yet in the store are fetched from the server.
+
+        Parameters
+        ----------
+        x :                 skeleton IDs | CatmaidNeuron | CatmaidNeuronList
+                            Neurons to retrieve links for. If
+                            CatmaidNeuron/List will respect changes made to
+                            original neurons (e.g. pruning)!
+        with_tags :         bool, optional
+                            If True will also return dictionary of connector
+                            tags.
+        remote_instance :   CatmaidInstance, optional
+                            If not passed directly, will try using global.
+
+        Returns
+        -------
+        pandas.DataFrame
+                            See :func:`~pymaid.get_connector_links`.
+        (links, tags)
+                            If ``with_tags=True``.
+
+        """
+        skids = self._eval_skids(x, remote_instance=remote_instance)
+        self._ensure_skeletons(skids, remote_instance=remote_instance)
+
+        df = self.links[self.links.skeleton_id.isin(skids)]
+        df = df.merge(self.connectors, on='connector_id', how='left')
+        df = df[['skeleton_id', 'connector_id', 'x', 'y', 'z', 'confidence',
+                 'creator_id', 'treenode_id', 'creation_time', 'edition_time',
+                 'relation']]
+
+        # Cater for cases in which the original neurons have been edited
+        if isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+            df = df[df.connector_id.isin(x.connectors.connector_id)]
+
+        df = df.reset_index(drop=True)
+
+        if with_tags:
+            tags = self.tags[self.tags.connector_id.isin(df.connector_id)]
+            tags = {str(k): list(v) for k, v in tags.groupby('connector_id').tag}
+            return df, tags
+
+        return df
+
+    def get_connectors(self, x, relation_type=None, tags=None,
+                       remote_instance=None):
+        """ Retrieve connectors based on a set of filters.
+
+        Parameters
+        ----------
+        x :                 skeleton IDs | CatmaidNeuron | CatmaidNeuronList | None
+                            Neurons for which to retrieve connectors. If
+                            ``None``, will use all connectors in the store.
+        relation_type :     'presynaptic_to' | 'postsynaptic_to' | 'gapjunction_with' | 'abutting', optional
+                            If provided, will filter for these connection
+                            types.
+        tags :              str | list of str, optional
+                            If provided, will filter connectors for tag(s).
+        remote_instance :   CatmaidInstance, optional
+                            If not passed directly, will try using global.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame in which each row represents a connector::
+
+               connector_id  x  y  z  tags  type
+             0
+             1
+
+            Unlike :func:`~pymaid.get_connectors`, this does not include
+            confidence, creator/editor and timestamps of the connectors.
+
+        """
+        if not isinstance(relation_type, type(None)) and \
+           relation_type not in self.CONNECTOR_TYPES:
+            raise ValueError('Unknown relation type "{0}". Must be in '
+                             '{1}'.format(relation_type,
+                                          list(self.CONNECTOR_TYPES)))
+
+        links = self.links
+        if not isinstance(x, type(None)):
+            skids = self._eval_skids(x, remote_instance=remote_instance)
+            self._ensure_skeletons(skids, remote_instance=remote_instance)
+            links = links[links.skeleton_id.isin(skids)]
+
+        if not isinstance(relation_type, type(None)):
+            links = links[links.relation == relation_type]
+
+        if isinstance(x, type(None)) and isinstance(relation_type, type(None)):
+            df = self.connectors
+        else:
+            df = self.connectors[self.connectors.connector_id.isin(links.connector_id)]
+
+        if not isinstance(tags, type(None)):
+            tags = utils._make_iterable(tags).astype(str)
+            tagged = self.tags[self.tags.tag.isin(tags)].connector_id
+            df = df[df.connector_id.isin(tagged)]
+
+        df = df.reset_index(drop=True)
+
+        cn_tags = self.tags[self.tags.connector_id.isin(df.connector_id)]
+        cn_tags = {k: list(v) for k, v in cn_tags.groupby('connector_id').tag}
+        df['tags'] = [cn_tags.get(cn) for cn in df.connector_id.values]
+
+        cn_type = self.links.drop_duplicates('connector_id').set_index('connector_id').relation
+        df['type'] = df.connector_id.map(cn_type).map(self.CONNECTOR_TYPES)
+
+        return df
+
+    def get_connectors_between(self, a, b, directional=True,
+                               remote_instance=None):
+        """ Retrieve connectors between sets of neurons.
+
+        Skeletons not yet in the store are fetched from the server.
+
+        Parameters
+        ----------
+        a,b :               skeleton IDs | CatmaidNeuron | CatmaidNeuronList
+                            Neurons for which to retrieve connectors.
+        directional :       bool, optional
+                            If True, only connectors a -> b are listed,
+                            otherwise it is a <-> b.
+        remote_instance :   CatmaidInstance, optional
+                            If not passed directly, will try using global.
+
+        Returns
+        -------
+        pandas.DataFrame
+                            See :func:`~pymaid.get_connectors_between`.
+                            Treenode locations are not stored and hence
+                            ``None``.
+
+        """
+        a = self._eval_skids(a, remote_instance=remote_instance)
+        b = self._eval_skids(b, remote_instance=remote_instance)
+
+        if len(a) == 0:
+            raise ValueError('No source neurons provided')
+
+        if len(b) == 0:
+            raise ValueError('No target neurons provided')
+
+        self._ensure_skeletons(np.union1d(a, b),
+                               remote_instance=remote_instance)
+
+        df = self._links_between(a, b, 'presynaptic_to', 'postsynaptic_to')
+
+        if not directional:
+            df = pd.concat([df, self._links_between(a, b, 'postsynaptic_to',
+                                                    'presynaptic_to')],
+                           axis=0, ignore_index=True)
+
+        loc = self.connectors.set_index('connector_id')[['x', 'y', 'z']]
+        loc = loc.reindex(df.connector_id.values).values
+        df.insert(1, 'connector_loc', list(loc))
+
+        # Get user list and replace IDs with logins
+        user_list = fetch.get_user_list(remote_instance=remote_instance)
+        user_dict = user_list.set_index('id').login.to_dict()
+        df['creator1'] = df.creator1.map(user_dict)
+        df['creator2'] = df.creator2.map(user_dict)
+
+        df['treenode1_loc'] = None
+        df['treenode2_loc'] = None
+
+        return df[['connector_id', 'connector_loc', 'treenode1_id',
+                   'source_neuron', 'confidence1', 'creator1',
+                   'treenode1_loc', 'treenode2_id', 'target_neuron',
+                   'confidence2', 'creator2', 'treenode2_loc']]
+
+    def drop(self, connector_ids=None, skeleton_ids=None):
+        """ Remove connectors and/or skeletons from the store.
+
+        Dropping a skeleton also drops all connectors it links to. Use this
+        when skeletons have been deleted, joined or split.
+
+        Parameters
+        ----------
+        connector_ids :     array-like, optional
+        skeleton_ids :      array-like, optional
+
+        """
+        if not isinstance(skeleton_ids, type(None)):
+            skeleton_ids = np.asarray(utils._make_iterable(skeleton_ids),
+                                      dtype=np.int64)
+            linked = self.links[self.links.skeleton_id.isin(skeleton_ids)].connector_id.values
+            self.links = self.links[~self.links.skeleton_id.isin(skeleton_ids)]
+            self.skeleton_ids = self.skeleton_ids[~np.isin(self.skeleton_ids,
+                                                           skeleton_ids)]
+            if isinstance(connector_ids, type(None)):
+                connector_ids = linked
+            else:
+                connector_ids = np.append(connector_ids, linked)
+
+        if not isinstance(connector_ids, type(None)):
+            connector_ids = np.asarray(utils._make_iterable(connector_ids),
+                                       dtype=np.int64)
+            self.connectors = self.connectors[~self.connectors.connector_id.isin(connector_ids)]
+            self.tags = self.tags[~self.tags.connector_id.isin(connector_ids)]
+            # Links of loaded skeletons stay until these are refreshed
+            self.links = self.links[~self.links.connector_id.isin(connector_ids) |
+                                    self.links.skeleton_id.isin(self.skeleton_ids)]
+
+    def save(self, filename):
+        """ Save store to (uncompressed) ``.npz`` file.
+
+        Parameters
+        ----------
+        filename :  str
+                    Filename to save to.
+
+        """
+        arrays = {'connectors_' + c: self.connectors[c].values for c in self.CONNECTOR_COLUMNS}
+        arrays.update({'links_' + c: self.links[c].values for c in self.LINK_COLUMNS})
+        arrays.update({'tags_' + c: self.tags[c].values for c in self.TAG_COLUMNS})
+        arrays['links_relation'] = arrays['links_relation'].astype(str)
+        arrays['tags_tag'] = arrays['tags_tag'].astype(str)
+        arrays['skeleton_ids'] = self.skeleton_ids
+        np.savez(filename, **arrays)
+
+    def _load(self, filename):
+        """ Load store from file. """
+        with np.load(filename) as f:
+            self.connectors = pd.DataFrame({c: f['connectors_' + c] for c in self.CONNECTOR_COLUMNS},
+                                           columns=self.CONNECTOR_COLUMNS)
+            self.links = pd.DataFrame({c: f['links_' + c] for c in self.LINK_COLUMNS},
+                                      columns=self.LINK_COLUMNS)
+            self.tags = pd.DataFrame({c: f['tags_' + c] for c in self.TAG_COLUMNS},
+                                     columns=self.TAG_COLUMNS)
+            self.skeleton_ids = f['skeleton_ids']
+
+        self.links['relation'] = self.links.relation.astype(object)
+        self.tags['tag'] = self.tags.tag.astype(object)
+
+    def _ensure_skeletons(self, skids, remote_instance=None):
+        """ Load skeletons that are not yet in the store. """
+        missing = skids[~np.isin(skids, self.skeleton_ids)]
+        if missing.shape[0]:
+            logger.info('Fetching links for {} of {} skeletons'.format(missing.shape[0],
+                                                                       skids.shape[0]))
+            self.populate(missing, remote_instance=remote_instance)
+
+    def _ensure_connectors(self, cn_ids, remote_instance=None):
+        """ Fetch details for connectors that are not yet in the store. """
+        missing = cn_ids[~np.isin(cn_ids, self.connectors.connector_id.values)]
+        if missing.shape[0]:
+            logger.info('Fetching details for {} of {} connectors'.format(missing.shape[0],
+                                                                          cn_ids.shape[0]))
+            self._fetch_details(missing, remote_instance=remote_instance)
+
+    def _fetch_links(self, skids, remote_instance=None):
+        """ Fetch all links of given skeletons. """
+        links, tags = fetch.get_connector_links(skids, with_tags=True,
+                                                remote_instance=remote_instance)
+
+        links = links.astype({'connector_id': np.int64,
+                              'skeleton_id': np.int64,
+                              'treenode_id': np.int64,
+                              'confidence': np.int64,
+                              'creator_id': np.int64,
+                              'creation_time': 'datetime64[ns]',
+                              'edition_time': 'datetime64[ns]'})
+        links = links.drop_duplicates(['connector_id', 'relation',
+                                       'treenode_id']).reset_index(drop=True)
+
+        tags = pd.DataFrame([[int(cn), t] for cn, tt in tags.items() for t in tt],
+                            columns=self.TAG_COLUMNS)
+        tags['connector_id'] = tags.connector_id.astype(np.int64)
+
+        return links, tags
+
+    def _update_links(self, skids, links, tags):
+        """ Replace links of given skeletons and tags and locations of their
+        connectors.
+        """
+        self.links = pd.concat([self.links[~self.links.skeleton_id.isin(skids)],
+                                links[self.LINK_COLUMNS]],
+                               axis=0, ignore_index=True)
+        self.skeleton_ids = np.union1d(self.skeleton_ids, skids)
+
+        self.tags = pd.concat([self.tags[~self.tags.connector_id.isin(links.connector_id)],
+                               tags[self.TAG_COLUMNS]],
+                              axis=0, ignore_index=True)
+
+        self._set_locations(links)
+
+    def _set_locations(self, locations):
+        """ Update locations of connectors in the store. """
+        loc = locations.drop_duplicates('connector_id').set_index('connector_id')
+        is_in = self.connectors.connector_id.isin(loc.index).values
+        if is_in.any():
+            cn = self.connectors.connector_id.values[is_in]
+            self.connectors.loc[is_in, ['x', 'y', 'z']] = loc.loc[cn, ['x', 'y', 'z']].values
+
+    def _fetch_details(self, cn_ids, remote_instance=None, locations=None):
+        """ (Re-)fetch pre- and postsynaptic links of given connectors. """
+        cn_ids = np.unique(np.asarray(cn_ids, dtype=np.int64))
+
+        if not cn_ids.shape[0]:
+            return
+
+        details = fetch.get_connector_details(cn_ids,
+                                              remote_instance=remote_instance)
+
+        has_pre = ~details.presynaptic_to.isnull().values
+        pre = pd.DataFrame({'connector_id': details.connector_id.values[has_pre],
+                            'skeleton_id': details.presynaptic_to.values[has_pre],
+                            'treenode_id': details.presynaptic_to_node.values[has_pre]},
+                           dtype=np.int64)
+        pre['relation'] = 'presynaptic_to'
+
+        n_links = details.postsynaptic_to_node.apply(len).values.astype(int)
+        post = pd.DataFrame({'connector_id': np.repeat(details.connector_id.values,
+                                                       n_links).astype(np.int64)})
+        post['relation'] = 'postsynaptic_to'
+        if n_links.sum():
+            post['treenode_id'] = np.concatenate(details.postsynaptic_to_node.values).astype(np.int64)
+        else:
+            post['treenode_id'] = np.zeros(0, dtype=np.int64)
+
+        # If there is one target neuron per link, skeleton IDs line up with
+        # the postsynaptic treenodes
+        is_single = details.postsynaptic_to.apply(len).values.astype(int) >= n_links
+        single = np.repeat(is_single, n_links)
+        post_skid = np.full(post.shape[0], -1, dtype=np.int64)
+        if single.any():
+            post_skid[single] = np.concatenate([s[:n] for s, n in zip(details.postsynaptic_to.values[is_single],
+                                                                      n_links[is_single])])
+        # For the rest try the store first, then the server
+        if (~single).any():
+            known = self.links.drop_duplicates('treenode_id').set_index('treenode_id').skeleton_id
+            post_skid[~single] = known.reindex(post.treenode_id.values[~single]).fillna(-1).values
+            unknown = post_skid < 0
+            if unknown.any():
+                tn_to_skid = fetch.get_skid_from_treenode(np.unique(post.treenode_id.values[unknown]),
+                                                          remote_instance=remote_instance)
+                post_skid[unknown] = pd.Series(tn_to_skid, dtype=float).fillna(-1).reindex(
+                                        post.treenode_id.values[unknown]).fillna(-1).values
+        post['skeleton_id'] = post_skid
+        post = post[post.skeleton_id >= 0]
+
+        # Connector details supersede partner links but not the (more
+        # detailed) links of loaded skeletons
+        self.links = self.links[~self.links.connector_id.isin(cn_ids) |
+                                self.links.skeleton_id.isin(self.skeleton_ids)]
+        new = pd.concat([pre, post], axis=0, ignore_index=True, sort=False)
+        new = new.merge(self.links[['connector_id', 'relation', 'treenode_id']],
+                        how='left', indicator=True)
+        new = new[new._merge == 'left_only'].drop('_merge', axis=1)
+        new['confidence'] = -1
+        new['creator_id'] = -1
+        new['creation_time'] = pd.NaT
+        new['edition_time'] = pd.NaT
+
+        self.links = pd.concat([self.links, new[self.LINK_COLUMNS]],
+                               axis=0, ignore_index=True)
+
+        # Add connectors that are not yet in the store
+        new_cn = cn_ids[~np.isin(cn_ids, self.connectors.connector_id.values)]
+        no_loc = np.full(new_cn.shape[0], np.nan)
+        self.connectors = pd.concat([self.connectors,
+                                     pd.DataFrame({'connector_id': new_cn,
+                                                   'x': no_loc,
+                                                   'y': no_loc,
+                                                   'z': no_loc},
+                                                  columns=self.CONNECTOR_COLUMNS)],
+                                    axis=0, ignore_index=True)
+
+        if not isinstance(locations, type(None)):
+            self._set_locations(locations)
+
+    def _links_between(self, a, b, rel1, rel2):
+        """ Join links of ``a`` (relation ``rel1``) and ``b`` (``rel2``) via
+        their connectors.
+        """
+        cols = ['connector_id', 'treenode_id', 'skeleton_id', 'confidence',
+                'creator_id']
+        left = self.links[(self.links.relation == rel1) &
+                          self.links.skeleton_id.isin(a)][cols]
+        right = self.links[(self.links.relation == rel2) &
+                           self.links.skeleton_id.isin(b)][cols]
+
+        df = left.merge(right, on='connector_id', suffixes=('1', '2'))
+        return df.rename(columns={'treenode_id1': 'treenode1_id',
+                                  'treenode_id2': 'treenode2_id',
+                                  'skeleton_id1': 'source_neuron',
+                                  'skeleton_id2': 'target_neuron',
+                                  'creator_id1': 'creator1',
+                                  'creator_id2': 'creator2'})
+
+    def _prune(self):
+        """ Remove connectors that have no links left. """
+        orphans = ~self.connectors.connector_id.isin(self.links.connector_id)
+        self.tags = self.tags[~self.tags.connector_id.isin(self.connectors.connector_id[orphans])]
+        self.connectors = self.connectors[~orphans].reset_index(drop=True)
+
+    @staticmethod
+    def _eval_skids(x, remote_instance=None):
+        """ Extract skeleton IDs from input. """
+        skids = utils.eval_skids(x, remote_instance=remote_instance)
+        return np.unique(np.asarray(utils._make_iterable(skids), dtype=np.int64))
+
+    @staticmethod
+    def _eval_connectors(x):
+        """ Extract connector IDs from input. """
+        if isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+            return x.connectors.connector_id.values.astype(np.int64)
+        if isinstance(x, pd.DataFrame):
+            return x.connector_id.values.astype(np.int64)
+        return np.asarray(utils._make_iterable(x), dtype=np.int64)
+
+
+class ConnectomeSnapshot:
+    """ Local, indexed copy of connectivity (edges between skeletons).
+
+    Stores, for each pair of connected skeletons, the number of links per
+    confidence (1-5) and the node counts of all skeletons. Edges are indexed
+    by source and by target, so that partner queries are simple lookups.
+
+    Use :func:`~pymaid.ConnectomeSnapshot.from_server` to generate a
+    snapshot and :func:`~pymaid.ConnectomeSnapshot.save`/
+    :func:`~pymaid.ConnectomeSnapshot.load` to store it on disk.
+
+    Parameters
+    ----------
+    skeleton_ids :  array-like
+                    (N, ) skeleton IDs.
+    num_nodes :     array-like
+                    (N, ) node counts of above skeletons. ``-1`` if unknown.
+    source :        array-like
+                    (M, ) skeleton IDs of edge sources.
+    target :        array-like
+                    (M, ) skeleton IDs of edge targets.
+    relation :      array-like
+                    (M, ) type of edge: 0 = synapse (source is presynaptic),
+                    1 = gap junction, 2 = attachment.
+    counts :        array-like
+                    (M, 5) number of links for confidence 1-5.
+    queried :       array-like, optional
+                    (N, ) boolean array. True if the connectivity of this
+                    skeleton was queried, i.e. if its partners are complete.
+                    Defaults to all True.
+    names :         array-like, optional
+                    (N, ) neuron names.
+    server :        str, optional
+                    Server this snapshot was generated from.
+    project_id :    int, optional
+                    Project this snapshot was generated from.
+    created :       str, optional
+                    When this snapshot was generated.
+
+    """
+
+    RELATIONS = ['synapse', 'gapjunction', 'attachment']
+
+    def __init__(self, skeleton_ids, num_nodes, source, target, relation,
+                 counts, queried=None, names=None, server=None,
+                 project_id=None, created=None):
+        skeleton_ids = np.asarray(skeleton_ids, dtype=np.int64)
+        srt = np.argsort(skeleton_ids)
+
+        self.skeleton_ids = skeleton_ids[srt]
+        self.num_nodes = np.asarray(num_nodes, dtype=np.int64)[srt]
+
+        if isinstance(queried, type(None)):
+            self.queried = np.ones(self.skeleton_ids.shape[0], dtype=bool)
+        else:
+            self.queried = np.asarray(queried, dtype=bool)[srt]
+
+        if isinstance(names, type(None)):
+            self.names = None
+        else:
+            self.names = np.asarray(names, dtype=str)[srt]
+
+        # Edges are stored as indices into skeleton_ids and sorted by source
+        source = self._to_index(source)
+        target = self._to_index(target)
+        srt = np.lexsort((target, source))
+        self.source = source[srt]
+        self.target = target[srt]
+        self.relation = np.asarray(relation, dtype=np.int8)[srt]
+        self.counts = np.asarray(counts, dtype=np.int32).reshape(-1, 5)[srt]
+
+        self.server = server
+        self.project_id = project_id
+        self.created = created or str(datetime.datetime.now())
+
+        self._build_index()
+
+    def _build_index(self):
+        """ Generate offsets of each skeleton's edges by source and by target.
+        """
+        n = self.skeleton_ids.shape[0]
+        self._source_ptr = np.searchsorted(self.source, np.arange(n + 1))
+
+        self._target_order = np.argsort(self.target, kind='mergesort')
+        self._target_ptr = np.searchsorted(self.target[self._target_order],
+                                           np.arange(n + 1))
+
+    def _to_index(self, skids):
+        """ Turn skeleton IDs into indices into ``self.skeleton_ids``. """
+        skids = np.asarray(skids, dtype=np.int64)
+        ix = np.searchsorted(self.skeleton_ids, skids)
+        ix[ix >= self.skeleton_ids.shape[0]] = 0
+
+        missing = self.skeleton_ids[ix] != skids
+        if any(missing):
+            raise ValueError('Skeleton ID(s) not in snapshot: '
+                             '{}'.format(', '.join(skids[missing].astype(str))))
+
+        return ix
+
+    def _eval_query(self, x):
+        """ Turn query into skeleton IDs and indices. Skeletons not in the
+        snapshot don't have edges and are ignored.
+        """
+        skids = np.array(utils.eval_skids(x, remote_instance=None),
+                         dtype=np.int64)
+
+        in_snap = np.isin(skids, self.skeleton_ids)
+        ix = self._to_index(skids[in_snap])
+
+        not_queried = np.append(skids[~in_snap],
+                                self.skeleton_ids[ix[~self.queried[ix]]])
+        if not_queried.shape[0]:
+            logger.warning('Connectivity of {} skeleton(s) was not queried '
+                           'when generating the snapshot: results might be '
+                           'incomplete.'.format(not_queried.shape[0]))
+
+        return skids, ix
+
+    def _edges_from(self, ix):
+        """ Indices of edges with given skeletons as source. """
+        return _ranges(self._source_ptr[ix], self._source_ptr[ix + 1])
+
+    def _edges_to(self, ix):
+        """ Indices of edges with given skeletons as target. """
+        return self._target_order[_ranges(self._target_ptr[ix],
+                                          self._target_ptr[ix + 1])]
+
+    def _get_names(self, ix):
+        """ Names for given indices. Falls back to skeleton IDs. """
+        if isinstance(self.names, type(None)):
+            return self.skeleton_ids[ix].astype(str)
+        return self.names[ix]
+
+    def __repr__(self):
+        return '<{}: {} skeletons, {} edges (server: {}, project: {}, ' \
+               'created: {})>'.format(type(self).__name__,
+                                      self.skeleton_ids.shape[0],
+                                      self.source.shape[0],
+                                      self.server, self.project_id,
+                                      self.created)
+
+    @classmethod
+    def from_server(cls, x=None, remote_instance=None, chunk_size=500,
+                    with_names=True):
+        """ Generate snapshot by bulk downloading edges from the server.
+
+        Parameters
+        ----------
+        x
+                            Neurons for which to fetch connectivity. Can be:
+
+                            1. list of skeleton ID(s) (int or str)
+                            2. list of neuron name(s) (str, exact match)
+                            3. an annotation: e.g. 'annotation:PN right'
+                            4. CatmaidNeuron or CatmaidNeuronList object
+                            5. ``None`` to fetch all skeletons in the project
+
+                            Queries for partners of skeletons not in ``x``
+                            will be incomplete.
+        remote_instance :   CatmaidInstance, optional
+                            If not passed directly, will try using global.
+        chunk_size :        int, optional
+                            Initial number of skeletons to query per
+                            request. Requests are run in parallel.
+        with_names :        bool, optional
+                            If True, will also fetch neuron names.
+
+        Returns
+        -------
+        ConnectomeSnapshot
+
+        """
+
+        remote_instance = utils._eval_remote_instance(remote_instance)
+
+        if isinstance(x, type(None)):
+            skids = fetch.get_neuron_list(node_count=0,
+                                          remote_instance=remote_instance)
+        else:
+            skids = utils.eval_skids(x, remote_instance=remote_instance)
+
+        skids = np.unique(np.asarray(skids, dtype=np.int64))
+
+        logger.info('Fetching connectivity for {} skeletons'.format(len(skids)))
+        data = remote_instance.fetch_chunked(remote_instance._get_connectivity_url(),
+                                             skids, 'source_skeleton_ids[{}]',
+                                             post={'boolean_op': 'OR',
+                                                   'with_nodes': False},
+                                             chunk_size=chunk_size,
+                                             desc='Fetching edges')
+
+        # Flatten responses into edge lists
+        relations = {'upstream': 0, 'downstream': 0, 'gapjunction': 1,
+                     'attachment': 2}
+        edges, num_nodes = [], {}
+        for resp in data:
+            partners, e = fetch._parse_connectivity(resp)
+            num_nodes.update(zip(partners.skeleton_id.astype(int),
+                                 partners.num_nodes))
+
+            p = partners.skeleton_id.values[e['row']].astype(np.int64)
+            q = e['query'].astype(np.int64)
+            rel = partners.relation.values[e['row']]
+
+            # Incoming edges point from partner to query
+            inc = rel == 'upstream'
+            e = pd.DataFrame(e['counts'].astype(np.int32),
+                             columns=['c1', 'c2', 'c3', 'c4', 'c5'])
+            e['source'] = np.where(inc, p, q)
+            e['target'] = np.where(inc, q, p)
+            e['relation'] = np.array([relations[r] for r in rel],
+                                     dtype=np.int8)
+            edges.append(e)
+
+        edges = pd.concat(edges, axis=0, ignore_index=True)
+
+        # Synapses between queried skeletons show up as outgoing AND incoming
+        edges = edges.drop_duplicates(['source', 'target', 'relation'])
+
+        all_skids = np.unique(np.concatenate([skids,
+                                              edges.source.values,
+                                              edges.target.values]))
+        nodes = np.array([num_nodes.get(s, -1) for s in all_skids],
+                         dtype=np.int64)
+
+        names = None
+        if with_names:
+            resp = remote_instance.fetch_chunked(remote_instance._get_neuronnames(),
+                                                 all_skids, 'skids[{}]',
+                                                 chunk_size=chunk_size * 10,
+                                                 desc='Fetching names')
+            name_dict = {int(k): v for r in resp for k, v in r.items()}
+            names = [name_dict.get(s, str(s)) for s in all_skids]
+
+        return cls(all_skids, nodes,
+                   source=edges.source.values,
+                   target=edges.target.values,
+                   relation=edges.relation.values,
+                   counts=edges[['c1', 'c2', 'c3', 'c4', 'c5']].values,
+                   queried=np.isin(all_skids, skids),
+                   names=names,
+                   server=remote_instance.server,
+                   project_id=remote_instance.project_id)
+
+    def save(self, filename):
+        """ Save snapshot to (uncompressed) ``.npz`` file.
+
+        Parameters
+        ----------
+        filename :  str
+                    Filename to save to.
+
+        """
+        arrays = {'skeleton_ids': self.skeleton_ids,
+                  'num_nodes': self.num_nodes,
+                  'queried': self.queried,
+                  'source': self.source,
+                  'target': self.target,
+                  'relation': self.relation,
+                  'counts': self.counts,
+                  'meta': np.array([str(self.server), str(self.project_id),
+                                    str(self.created)])}
+        if not isinstance(self.names, type(None)):
+            arrays['names'] = self.names
+
+        np.savez(filename, **arrays)
+
+    @classmethod
+    def load(cls, filename):
+        """ Load snapshot from file.
+
+        Parameters
+        ----------
+        filename :  str
+                    File generated by
+                    :func:`~pymaid.ConnectomeSnapshot.save`.
+
+        Returns
+        -------
+        ConnectomeSnapshot
+
+        """
+        with np.load(filename) as f:
+            server, project_id, created = f['meta']
+            skids = f['skeleton_ids']
+            return cls(skids,
+                       f['num_nodes'],
+                       source=skids[f['source']],
+                       target=skids[f['target']],
+                       relation=f['relation'],
+                       counts=f['counts'],
+                       queried=f['queried'],
+                       names=f['names'] if 'names' in f else None,
+                       server=server,
+                       project_id=project_id,
+                       created=created)
+
+    def get_partners(self, x, threshold=1, min_size=2, filt=[],
+                     min_confidence=1, directions=['incoming', 'outgoing',
+                                                   'gapjunctions',
+                                                   'attachments']):
+        """ Retrieve partners from the snapshot.
+
+        Works like :func:`~pymaid.get_partners` but without querying the
+        server. Names and annotations in ``x`` still need a server to be
+        resolved.
+
+        Parameters
+        ----------
+        x
+                            Neurons for which to retrieve partners. Can be
+                            either:
+
+                            1. list of skeleton ID(s) (int or str)
+                            2. list of neuron name(s) (str, exact match)
+                            3. an annotation: e.g. 'annotation:PN right'
+                            4. CatmaidNeuron or CatmaidNeuronList object
+        threshold :         int, optional
+                            Minimum # of links (synapses/gap-junctions/etc).
+        min_size :          int, optional
+                            Minimum node count of partner
+                            (default=2 to hide single-node partners).
+        filt :              list of str, optional
+                            Filters partners for neuron names (must be exact)
+                            or skeleton_ids.
+        min_confidence :    int, optional
+                            If set, edges with lower confidence will be
+                            ignored.
+        directions :        'incoming' | 'outgoing' | 'gapjunctions' | 'attachments', optional
+                            Use to restrict to either up- or downstream
+                            partners.
+
+        Returns
+        -------
+        pandas.DataFrame
+                            See :func:`~pymaid.get_partners`.
+
+        """
+
+        if not isinstance(min_confidence, (float, int)) or min_confidence < 0 or min_confidence > 5:
+            raise ValueError('min_confidence must be 0-5.')
+
+        relations = {'incoming': 'upstream',
+                     'outgoing': 'downstream',
+                     'gapjunctions': 'gapjunction',
+                     'attachments': 'attachment'}
+
+        # Catch some easy mistakes regarding relations:
+        repl = {v: k for k, v in relations.items()}
+        directions = [repl.get(d, d) for d in directions]
+
+        wrong_dir = set(directions) - set(relations.keys())
+        if wrong_dir:
+            raise ValueError('Unknown direction "{}". Please use a combination '
+                             'of "{}"'.format(', '.join(wrong_dir),
+                                              ', '.join(relations.keys())))
+
+        skids, ix = self._eval_query(x)
+        cols = skids.astype(str)
+        # Column of each snapshot skeleton in the final table (-1 if not
+        # queried). Query skeletons not in the snapshot get an empty column
+        col_ix = pd.Index(skids).get_indexer(self.skeleton_ids)
+
+        tables = []
+        for d in relations:
+            if d not in directions:
+                continue
+
+            if d == 'incoming':
+                e = self._edges_to(ix)
+                e = e[self.relation[e] == 0]
+                partner, query = self.source[e], self.target[e]
+            else:
+                e = self._edges_from(ix)
+                e = e[self.relation[e] == ['outgoing',
+                                           'gapjunctions',
+                                           'attachments'].index(d)]
+                partner, query = self.target[e], self.source[e]
+
+            weights = self.counts[e, max(min_confidence - 1, 0):].sum(axis=1)
+
+            # Collapse into partners x query skeletons
+            partners, p_ix = np.unique(partner, return_inverse=True)
+            mat = np.zeros((partners.shape[0], cols.shape[0]), dtype=np.int64)
+            np.add.at(mat, (p_ix, col_ix[query]), weights)
+
+            table = pd.DataFrame(mat, columns=cols)
+            table.insert(0, 'neuron_name', self._get_names(partners))
+            table.insert(1, 'skeleton_id', self.skeleton_ids[partners].astype(str))
+            table.insert(2, 'num_nodes', self.num_nodes[partners])
+            table.insert(3, 'relation', relations[d])
+            tables.append(table)
+
+        if tables:
+            df = pd.concat(tables, axis=0, ignore_index=True)
+        else:
+            df = pd.DataFrame(columns=['neuron_name', 'skeleton_id',
+                                       'num_nodes', 'relation'] + list(cols))
+
+        df['total'] = df[cols].sum(axis=1).values
+
+        # Now filter for synapse threshold and size
+        df = df[(df.num_nodes >= min_size) & (df.total >= threshold)]
+
+        df = df.sort_values(['relation', 'total'], ascending=False)
+
+        if filt:
+            if not isinstance(filt, (list, np.ndarray)):
+                filt = [filt]
+
+            filt = [str(s) for s in filt]
+
+            df = df[df.skeleton_id.isin(filt) | df.neuron_name.isin(filt)]
+
+        # Return reindexed concatenated dataframe
+        df = df.reset_index(drop=True)
+
+        df.datatype = 'connectivity_table'
+
+        return df
+
+    def get_edges(self, x, min_confidence=1):
+        """ Retrieve synaptic edges between sets of neurons from the
+        snapshot.
+
+        Works like :func:`~pymaid.get_edges` but without querying the
+        server.
+
+        Parameters
+        ----------
+        x
+                            Neurons for which to retrieve edges. Can be
+                            either:
+
+                            1. list of skeleton ID(s) (int or str)
+                            2. list of neuron name(s) (str, exact match)
+                            3. an annotation: e.g. 'annotation:PN right'
+                            4. CatmaidNeuron or CatmaidNeuronList object
+        min_confidence :    int, optional
+                            If set, links with lower confidence will be
+                            ignored.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame in which each row represents an edge::
+
+               source_skid     target_skid     weight
+             1
+             2
+             3
+
+        """
+
+        _, ix = self._eval_query(x)
+
+        e = self._edges_from(ix)
+        e = e[(self.relation[e] == 0) & np.isin(self.target[e], ix)]
+
+        return pd.DataFrame({'source_skid': self.skeleton_ids[self.source[e]],
+                             'target_skid': self.skeleton_ids[self.target[e]],
+                             'weight': self.counts[e, max(min_confidence - 1, 0):].sum(axis=1)},
+                            columns=['source_skid', 'target_skid', 'weight'])
+
+    def adjacency_matrix(self, s, t=None, source_grp={}, target_grp={},
+                         syn_threshold=None, syn_cutoff=None, sparse=False):
+        """ Generate adjacency matrix from the snapshot.
+
+        Works like :func:`~pymaid.adjacency_matrix` but without querying the
+        server.
+
+        Parameters
+        ----------
+        s
+                            Source neurons (rows). See
+                            :func:`~pymaid.adjacency_matrix`.
+        t
+                            Optional. Target neurons (columns). If not
+                            provided, ``source neurons = target neurons``.
+        source_grp :        dict, optional
+                            Use to collapse sources into groups. See
+                            :func:`~pymaid.adjacency_matrix`.
+        target_grp :        dict, optional
+                            Use to collapse targets into groups.
+        syn_threshold :     int, optional
+                            If set, will ignore connections with less
+                            synapses.
+        syn_cutoff :        int, optional
+                            If set, will cut off connections above given
+                            value.
+        sparse :            bool, optional
+                            If True, will return a
+                            :class:`~pymaid.SparseAdjacencyMatrix`.
+
+        Returns
+        -------
+        pandas.DataFrame | SparseAdjacencyMatrix
+
+        """
+
+        if t is None:
+            t = s
+
+        neuronsA = [int(n) for n in utils.eval_skids(s, remote_instance=None)]
+        neuronsB = [int(n) for n in utils.eval_skids(t, remote_instance=None)]
+
+        edges = self.get_edges(neuronsA + neuronsB)
+
+        matrix = connectivity._edges_to_adjacency(edges, neuronsA, neuronsB,
+                                                  syn_threshold=syn_threshold,
+                                                  syn_cutoff=syn_cutoff,
+                                                  sparse=sparse)
+
+        if source_grp or target_grp:
+            matrix = connectivity.group_matrix(matrix,
+                                               source_grp,
+                                               target_grp,
+                                               drop_ungrouped=False)
+
+        return matrix
+
+    def get_nth_partners(self, x, n_circles=1, min_pre=2, min_post=2):
+        """ Retrieve partners that are directly (``n_circles=1``) or via n
+        "hops" (``n_circles>1``) connected to a set of seed neurons.
+
+        Works like :func:`~pymaid.get_nth_partners` but without querying the
+        server.
+
+        Parameters
+        ----------
+        x
+                            Seed neurons for which to retrieve partners.
+        n_circles :         int, optional
+                            Number of circles around your seed neurons.
+        min_pre/min_post :  int, optional
+                            Synapse threshold for downstream (seed neuron is
+                            presynaptic) and upstream partners, respectively.
+                            Set to -1 to not get any downstream/upstream
+                            partners.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame each row represents a partner::
+
+               neuron_name   skeleton_id
+             0   name1           123
+             1   name2           456
+             2   ...             ...
+
+        """
+
+        _, seeds = self._eval_query(x)
+
+        visited = np.zeros(self.skeleton_ids.shape[0], dtype=bool)
+        visited[seeds] = True
+        current = seeds
+        weights = self.counts.sum(axis=1)
+        for i in range(n_circles):
+            next_circle = []
+            if min_pre != -1:
+                e = self._edges_from(current)
+                e = e[(self.relation[e] == 0) & (weights[e] >= min_pre)]
+                next_circle.append(self.target[e])
+            if min_post != -1:
+                e = self._edges_to(current)
+                e = e[(self.relation[e] == 0) & (weights[e] >= min_post)]
+                next_circle.append(self.source[e])
+
+            current = np.unique(np.concatenate(next_circle + [np.zeros(0, dtype=np.int64)]))
+            current = current[~visited[current]]
+            visited[current] = True
+
+        visited[seeds] = False
+        partners = np.where(visited)[0]
+
+        return pd.DataFrame({'skeleton_id': self.skeleton_ids[partners].astype(str),
+                             'neuron_name': self._get_names(partners)},
+                            columns=['skeleton_id', 'neuron_name'])
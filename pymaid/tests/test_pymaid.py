@@ -52,11 +52,18 @@ mpl.use('template')
 import matplotlib.pyplot as plt
 
 import unittest
+import concurrent.futures
+import threading
+import time
 import datetime
+import json
+import tempfile
 
 import pymaid
 import pandas as pd
+import requests
 import numpy as np
+import scipy.spatial.distance
 import networkx as nx
 
 import importlib
@@ -67,6 +74,11 @@ except BaseException:
     igraph = None
     warnings.warn('iGraph library not found. Will test only with NetworkX.')
 
+try:
+    import pymaid.cytoscape as cytomaid
+except ImportError:
+    cytomaid = None
+
 # Silence module loggers
 pymaid.set_loggers('ERROR')
 
@@ -103,7 +115,7 @@ class TestModules(unittest.TestCase):
     def test_imports(self):
         mods = ['morpho', 'core', 'plotting', 'graph', 'graph_utils', 'core',
                 'connectivity', 'user_stats', 'cluster', 'resample',
-                'intersect', 'fetch', 'scene3d']
+                'intersect', 'fetch', 'scene3d', 'store']
 
         for m in mods:
             _ = importlib.import_module('pymaid.{}'.format(m))
@@ -149,6 +161,18 @@ class TestFetch(unittest.TestCase):
             'annotation:{}'.format(config_test.test_annotations[0]),
             remote_instance=self.rm))
 
+    @try_conditions
+    def test_eval_skids_batch(self):
+        """ Test batched and memoized skeleton ID evaluation. """
+        q = ['annotation:{}'.format(an) for an in config_test.test_annotations]
+        skids = pymaid.eval_skids(q + config_test.test_skids,
+                                  remote_instance=self.rm)
+        self.assertTrue(set(map(str, config_test.test_skids)) <= set(skids))
+        # Second call is answered from memo
+        self.assertEqual(pymaid.eval_skids(q + config_test.test_skids,
+                                           remote_instance=self.rm),
+                         skids)
+
     @try_conditions
     def test_neuron_exists(self):
         self.assertIsInstance(pymaid.neuron_exists(
@@ -171,6 +195,17 @@ class TestFetch(unittest.TestCase):
         self.assertIsInstance(pymaid.get_history(
             remote_instance=self.rm), pd.Series)
 
+    @try_conditions
+    def test_get_history_cached(self):
+        cache_dir = tempfile.mkdtemp()
+        start = datetime.date.today() - datetime.timedelta(days=400)
+        h1 = pymaid.get_history(start_date=start, cache_dir=cache_dir,
+                                remote_instance=self.rm)
+        self.assertTrue(len(os.listdir(cache_dir)) > 0)
+        h2 = pymaid.get_history(start_date=start, cache_dir=cache_dir,
+                                remote_instance=self.rm)
+        self.assertEqual(h1.cable.shape, h2.cable.shape)
+
     @try_conditions
     def test_get_annotated_skids(self):
         self.assertIsInstance(pymaid.get_skids_by_annotation(
@@ -224,6 +259,15 @@ class TestFetch(unittest.TestCase):
         self.assertIsInstance(pymaid.get_partners(
             config_test.test_skids[0], remote_instance=self.rm), pd.DataFrame)
 
+    @try_conditions
+    def test_get_partners_long(self):
+        wide = pymaid.get_partners(config_test.test_skids,
+                                   remote_instance=self.rm)
+        long = pymaid.get_partners(config_test.test_skids,
+                                   remote_instance=self.rm,
+                                   return_type='long')
+        self.assertEqual(wide.total.sum(), long.weight.sum())
+
     @try_conditions
     def test_get_names(self):
         names = pymaid.get_names(
@@ -232,6 +276,21 @@ class TestFetch(unittest.TestCase):
         self.assertIsInstance(pymaid.get_skids_by_name(
             list(names.values()), remote_instance=self.rm), pd.DataFrame)
 
+    @try_conditions
+    def test_metadata_registry(self):
+        names = pymaid.get_names(
+            config_test.test_skids, remote_instance=self.rm)
+        # Second call is answered from the registry
+        self.assertEqual(self.rm._metadata.get_names(config_test.test_skids),
+                         names)
+        self.assertEqual(pymaid.get_names(
+            config_test.test_skids, remote_instance=self.rm), names)
+        users = pymaid.get_user_list(remote_instance=self.rm)
+        self.assertTrue(users.equals(
+            pymaid.get_user_list(remote_instance=self.rm)))
+        self.rm.clear_cache()
+        self.assertEqual(len(self.rm._metadata), 0)
+
     @try_conditions
     def test_get_cn_table(self):
         self.assertIsInstance(pymaid.get_partners('annotation:%s' % config_test.test_annotations[
@@ -263,17 +322,45 @@ class TestFetch(unittest.TestCase):
         self.assertIsInstance(pymaid.get_node_details(n.nodes.sample(100).treenode_id.values),
                               pd.DataFrame)
 
+    @try_conditions
+    def test_node_details_reviews(self):
+        n = pymaid.get_neuron(config_test.test_skids[0])
+        details, reviews = pymaid.get_node_details(n.nodes.sample(100).treenode_id.values,
+                                                   return_reviews=True)
+        self.assertEqual(details.node_id.dtype, np.int64)
+        self.assertEqual(reviews.shape[0],
+                         sum([len(r) for r in details.reviewers]))
+
     @try_conditions
     def test_skid_from_treenode(self):
         n = pymaid.get_neuron(config_test.test_skids[0])
         self.assertIsInstance(pymaid.get_skid_from_treenode(n.nodes.iloc[0].treenode_id),
                               dict)
 
+    @try_conditions
+    def test_skid_from_treenode_batch(self):
+        n = pymaid.get_neuron(config_test.test_skids[0])
+        tn = n.nodes.treenode_id.values[:100]
+        skids = pymaid.get_skid_from_treenode(tn, remote_instance=self.rm)
+        self.assertEqual(set(skids.values()), {int(n.skeleton_id)})
+        self.assertEqual(len(self.rm._node_index.get(tn)), len(tn))
+
     @try_conditions
     def test_get_edges(self):
         self.assertIsInstance(pymaid.get_edges(config_test.test_skids),
                               pd.DataFrame)
 
+    @try_conditions
+    def test_connectome_snapshot(self):
+        snap = pymaid.ConnectomeSnapshot.from_server(config_test.test_skids,
+                                                     remote_instance=self.rm)
+        local = snap.get_partners(config_test.test_skids[0])
+        remote = pymaid.get_partners(config_test.test_skids[0],
+                                     remote_instance=self.rm)
+        self.assertEqual(sorted(local.skeleton_id), sorted(remote.skeleton_id))
+        self.assertIsInstance(snap.get_edges(config_test.test_skids),
+                              pd.DataFrame)
+
     @try_conditions
     def test_connectors_between(self):
         self.assertIsInstance(pymaid.get_connectors_between(config_test.test_skids,
@@ -314,6 +401,20 @@ class TestFetch(unittest.TestCase):
         self.assertIsInstance(pymaid.find_neurons(annotations=config_test.test_annotations),
                               pymaid.CatmaidNeuronList)
 
+    @try_conditions
+    def test_find_neurons_intersect(self):
+        an = pymaid.find_neurons(annotations=config_test.test_annotations,
+                                 remote_instance=self.rm)
+        vol = pymaid.get_neurons_in_volume(config_test.test_volume,
+                                           min_nodes=1, min_cable=0,
+                                           remote_instance=self.rm)
+        nl = pymaid.find_neurons(annotations=config_test.test_annotations,
+                                 volumes=config_test.test_volume,
+                                 intersect=True,
+                                 remote_instance=self.rm)
+        self.assertTrue(set(nl.skeleton_id) <= set(an.skeleton_id))
+        self.assertTrue(set(nl.skeleton_id) <= set(str(s) for s in vol))
+
     @try_conditions
     def test_get_paths(self):
         paths, g = pymaid.get_paths(
@@ -343,6 +444,20 @@ class TestFetch(unittest.TestCase):
         self.assertIsInstance(pymaid.get_neurons_in_volume(config_test.test_volume),
                               list)
 
+    @try_conditions
+    def test_nodes_in_volume(self):
+        vol = pymaid.get_volume(config_test.test_volume)
+        nodes = pymaid.get_nodes_in_volume(*vol.bbox.ravel(), limit=1000,
+                                           max_depth=3, volume=vol)
+        self.assertIsInstance(nodes['treenodes'], pd.DataFrame)
+        self.assertFalse(nodes['treenodes'].treenode_id.duplicated().any())
+
+    @try_conditions
+    def test_neurons_in_volume_tiled(self):
+        vol = pymaid.get_volume(config_test.test_volume)
+        self.assertEqual(sorted(pymaid.get_neurons_in_bbox(vol.bbox)),
+                         pymaid.get_neurons_in_bbox(vol.bbox, tile_size=20000))
+
     @try_conditions
     def test_label_list(self):
         self.assertIsInstance(pymaid.get_label_list(),
@@ -411,6 +526,19 @@ class TestCore(unittest.TestCase):
         self.nl.reload()
         self.assertIsInstance(self.nl, pymaid.CatmaidNeuronList)
 
+    @try_conditions
+    def test_sync(self):
+        nl = self.nl.copy()
+        status = nl.sync()
+        self.assertIsInstance(status, pd.DataFrame)
+        # Neurons were just retrieved -> nothing should be fetched
+        n = nl[0]
+        n.nodes = n.nodes.iloc[:-1]
+        status = pymaid.sync_neurons(nl, remote_instance=self.rm)
+        self.assertTrue(status.set_index('skeleton_id').loc[str(n.skeleton_id),
+                                                            'changed'])
+        self.assertEqual(nl[0].n_nodes, self.nl[0].n_nodes)
+
     @try_conditions
     def test_graph_related(self):
         self.assertIsInstance(self.nl[0].graph, nx.Graph)
@@ -570,6 +698,22 @@ class TestMorpho(unittest.TestCase):
                                                     method='LEAFS'),
                               pymaid.CatmaidNeuron)
 
+    @try_conditions
+    def test_healing(self):
+        n = self.nl[0].copy()
+        # Fragment neuron by disconnecting a few nodes from their parents
+        cut = n.nodes[n.nodes.parent_id.notnull()].treenode_id.values[::50]
+        n.nodes.loc[n.nodes.treenode_id.isin(cut), 'parent_id'] = None
+        n._clear_temp_attr()
+        self.assertGreater(n.n_skeletons, 1)
+
+        for method in ['LEAFS', 'ALL']:
+            healed = pymaid.heal_fragmented_neuron(n, method=method)
+            self.assertEqual(healed.n_skeletons, 1)
+            self.assertEqual(healed.n_nodes, n.n_nodes)
+            self.assertEqual(len(healed.tags['stitched']),
+                             2 * (n.n_skeletons - 1))
+
     @try_conditions
     def test_averaging(self):
         self.assertIsInstance(pymaid.average_neurons(self.nl[:2]),
@@ -620,6 +764,21 @@ class TestMorpho(unittest.TestCase):
                                                   inplace=False),
                               pymaid.CatmaidNeuron)
 
+    @try_conditions
+    def test_time_lapse(self):
+        dates = ['2017-01-01', '2018-01-01']
+        snaps = pymaid.time_lapse(self.nl[:2], dates, remote_instance=self.rm)
+        self.assertEqual(len(snaps), 2)
+        single = pymaid.time_machine(self.nl[0], dates[0],
+                                     remote_instance=self.rm)
+        first = snaps[pd.Timestamp(dates[0], tz='UTC')][0]
+        self.assertEqual(single.n_nodes, first.n_nodes)
+
+        stats = pymaid.time_lapse(self.nl[:2], dates, summary=True,
+                                  remote_instance=self.rm)
+        self.assertIsInstance(stats, pd.DataFrame)
+        self.assertEqual(stats.shape[0], 4)
+
 
 class TestGraphs(unittest.TestCase):
     """Test pymaid.graph and pymaid.graph_utils """
@@ -766,6 +925,18 @@ class TestConnectivity(unittest.TestCase):
         self.assertIsInstance(pymaid.adjacency_matrix(nl, use_connectors=True),
                               pd.DataFrame)
 
+    @try_conditions
+    def test_adjacency_matrix_sparse(self):
+        adj = pymaid.adjacency_matrix(self.adj.index.values, sparse=True)
+        self.assertIsInstance(adj, pymaid.SparseAdjacencyMatrix)
+        self.assertTrue(np.allclose(adj.to_dense().values, self.adj.values))
+
+        gr_adj = pymaid.group_matrix(adj,
+                                     row_groups={n: 'group1' for n in adj.sources})
+        self.assertIsInstance(gr_adj, pymaid.SparseAdjacencyMatrix)
+        self.assertIsInstance(pymaid.sparseness(adj), pd.Series)
+        self.assertIsInstance(pymaid.network2nx(adj), nx.DiGraph)
+
     @try_conditions
     def test_group_matrix(self):
         gr_adj = pymaid.group_matrix(self.adj,
@@ -811,6 +982,31 @@ class TestConnectivity(unittest.TestCase):
                                                               remote_instance=self.rm),
                               pd.DataFrame)
 
+    @try_conditions
+    def test_cn_table_from_fragments(self):
+        # Split neuron into two fragments: connectivity should add up
+        tn = self.n.nodes.treenode_id.values
+        frags = pymaid.CatmaidNeuronList([pymaid.subset_neuron(self.n, tn[:len(tn) // 2]),
+                                          pymaid.subset_neuron(self.n, tn[len(tn) // 2:])])
+        whole = pymaid.cn_table_from_connectors(self.n, remote_instance=self.rm)
+        split = pymaid.cn_table_from_connectors(frags, remote_instance=self.rm)
+        self.assertEqual(list(split.columns[4:]), [self.n.skeleton_id] * 2)
+        self.assertEqual(whole.total.sum(), split.total.sum())
+
+    @try_conditions
+    def test_connector_store(self):
+        store = pymaid.ConnectorStore()
+        store.populate(self.n, remote_instance=self.rm)
+        remote = pymaid.cn_table_from_connectors(self.n,
+                                                 remote_instance=self.rm)
+        local = pymaid.cn_table_from_connectors(self.n,
+                                                remote_instance=self.rm,
+                                                connector_store=store)
+        self.assertEqual(remote.total.sum(), local.total.sum())
+        self.assertEqual(len(store.get_connector_links(self.n)),
+                         len(pymaid.get_connector_links(self.n,
+                                                        remote_instance=self.rm)))
+
     @try_conditions
     def test_adjacency_from_connectors(self):
         nl = pymaid.get_neurons(
@@ -866,6 +1062,27 @@ class TestCluster(unittest.TestCase):
         self.assertIsInstance(res.get_colormap(k=2), dict)
         self.assertIsInstance(res.get_clusters(k=2), list)
 
+    @try_conditions
+    def test_clustresults_condensed(self):
+        mat = np.random.rand(20, 20)
+        mat = (mat + mat.T) / 2
+        np.fill_diagonal(mat, 1)
+
+        res = pymaid.ClustResults(mat, mat_type='similarity')
+        res_cond = pymaid.ClustResults(mat, mat_type='similarity',
+                                       condensed=True, dtype=np.float32)
+
+        self.assertEqual(res_cond.condensed_dist_mat.dtype, np.float32)
+        self.assertTrue(np.allclose(res.linkage, res_cond.linkage, atol=1e-5))
+
+        # k-NN clustering with all neighbours is exact single linkage
+        res_cond.cluster(method='knn', n_neighbors=19)
+        res.cluster(method='single')
+        self.assertTrue(np.allclose(res.linkage, res_cond.linkage, atol=1e-5))
+        self.assertIsInstance(res_cond.get_clusters(k=2,
+                                                    return_type='indices'),
+                              list)
+
 
 class TestPlot(unittest.TestCase):
     """Test pymaid.plotting """
@@ -957,6 +1174,77 @@ class TestTiles(unittest.TestCase):
         # Show
         plt.close()
 
+    def test_tiles_memmap(self):
+        from pymaid import tiles
+        job = tiles.LoadTiles([119000, 119500, 36000, 36500, 4050, 4052],
+                              stack_id=5,
+                              coords='PIXEL',
+                              mem_lim=50)
+        fp = os.path.join(tempfile.mkdtemp(), 'stack.npy')
+        job.load_in_memory(memmap=fp)
+        self.assertEqual(job.img.dtype, np.uint8)
+        self.assertEqual(job.img.shape[2], 3)
+        self.assertTrue((np.load(fp)[0] == job.img[:, :, 0]).all())
+
+    def test_tile_cache(self):
+        from pymaid import tiles
+        cache = tiles.TileCache(tempfile.mkdtemp(), size_limit=100)
+        job = tiles.LoadTiles([119000, 119500, 36000, 36500, 4050, 4052],
+                              stack_id=5,
+                              coords='PIXEL',
+                              cache=cache)
+        im = job.get_image(0)
+        self.assertGreater(cache.size, 0)
+        self.assertTrue((job.get_image(0) == im).all())
+        # Browse without loading the full stack first
+        ax = job.render_im(slider=True, prefetch=1)
+        self.assertIsInstance(ax, plt.Axes)
+
+    def test_interpolate_z(self):
+        from pymaid import tiles
+        coords = np.array([[0, 0, 0], [100, 100, 200], [100, 100, 40]])
+        interp = tiles._interpolate_z(coords, 40)
+        self.assertEqual(interp.shape, (10, 3))
+        self.assertTrue((np.diff(interp[:, 2])[:5] == 40).all())
+        # Do not interpolate across segments
+        interp = tiles._interpolate_z(coords, 40,
+                                      seg_start=np.array([1, 0, 1], dtype=bool))
+        self.assertEqual(interp.shape, (7, 3))
+
+    def test_mirror_pool(self):
+        import threading
+        from http.server import HTTPServer, BaseHTTPRequestHandler
+        from requests_futures.sessions import FuturesSession
+        from pymaid import tiles
+
+        def serve(status):
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    self.send_response(status)
+                    self.end_headers()
+                    self.wfile.write(b'tile')
+
+                def log_message(self, *args):
+                    pass
+
+            server = HTTPServer(('127.0.0.1', 0), Handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            return server, 'http://127.0.0.1:{}/'.format(server.server_port)
+
+        servers = [serve(200), serve(500)]
+        pool = tiles.MirrorPool([dict(image_base=url, file_extension='jpg')
+                                 for srv, url in servers][::-1])
+        session = FuturesSession(max_workers=2)
+        resp = [pool.get(session, '0/1/2/{}'.format(i)) for i in range(10)]
+        self.assertTrue(all([r.result().content == b'tile' for r in resp]))
+
+        stats = pool.stats.set_index('mirror')
+        self.assertEqual(stats.loc[servers[0][1], 'requests'], 10)
+        self.assertFalse(stats.loc[servers[1][1], 'healthy'])
+
+        for srv, url in servers:
+            srv.shutdown()
+
     def tearDown(self):
         plt.close()
 
@@ -989,6 +1277,23 @@ class TestUserStats(unittest.TestCase):
                                                        remote_instance=self.rm),
                               pd.DataFrame)
 
+    def test_time_invested_sets(self):
+        ds = self.n.downsample(20, inplace=False)
+        single = pymaid.get_time_invested(ds, remote_instance=self.rm)
+        sets = pymaid.get_time_invested({'a': ds, 'b': ds},
+                                        remote_instance=self.rm)
+        self.assertTrue((sets.loc['a'].values == single.values).all())
+
+    def test_node_detail_store(self):
+        ds = self.n.downsample(20, inplace=False)
+        store = pymaid.NodeDetailStore()
+        first = pymaid.get_time_invested(ds, node_store=store,
+                                         remote_instance=self.rm)
+        self.assertEqual(len(store), ds.n_nodes + ds.n_connectors)
+        second = pymaid.get_time_invested(ds, node_store=store,
+                                          remote_instance=self.rm)
+        self.assertTrue((first.values == second.values).all())
+
     def test_team_contributions(self):
         ds = self.n.downsample(20, inplace=False)
         ul = pymaid.get_user_list().set_index('id')
@@ -1015,5 +1320,549 @@ class TestUserStats(unittest.TestCase):
         self.assertIsInstance(user_actions, pd.DataFrame)
 
 
+class _FakeCyNetwork:
+    """ Minimal local stand-in for a py2cytoscape network. """
+
+    def __init__(self):
+        self.nodes, self.edges, self.suid = {}, {}, 0
+
+    def get_node_table(self):
+        return pd.DataFrame([[k, n, l] for k, (n, l) in self.nodes.items()],
+                            columns=['SUID', 'name', 'neuron_name'])
+
+    def get_edge_table(self):
+        name = {k: n for k, (n, l) in self.nodes.items()}
+        return pd.DataFrame([[k, '{} (None) {}'.format(name[s], name[t]), w]
+                             for k, (s, t, w) in self.edges.items()],
+                            columns=['SUID', 'name', 'weight'])
+
+    def add_nodes(self, names):
+        for n in names:
+            self.suid += 1
+            self.nodes[self.suid] = (n, None)
+
+    def add_edges(self, edges):
+        for e in edges:
+            self.suid += 1
+            self.edges[self.suid] = (e['source'], e['target'], None)
+
+    def delete_node(self, suid):
+        self.nodes.pop(suid)
+        self.edges = {k: e for k, e in self.edges.items() if suid not in e[:2]}
+
+    def delete_edge(self, suid):
+        self.edges.pop(suid)
+
+    def update_node_table(self, df, data_key_col, network_key_col):
+        by_name = {n: k for k, (n, l) in self.nodes.items()}
+        for n, l in df[['name', 'neuron_name']].values:
+            self.nodes[by_name[n]] = (n, l)
+
+    def _CyNetwork__update_table(self, table, df, network_key_col,
+                                 data_key_col):
+        for suid, w in df[['SUID', 'weight']].values:
+            self.edges[suid] = self.edges[suid][:2] + (w, )
+
+
+@unittest.skipIf(cytomaid is None, 'py2cytoscape not found')
+class TestCytoscape(unittest.TestCase):
+    """ Test incremental network updates against a local stand-in """
+
+    def test_diff_networks(self):
+        nodes = pd.Series({'1': 'a', '2': 'b', '3': 'c'})
+        edges = pd.DataFrame([['1', '2', 5], ['2', '3', 1]],
+                             columns=['source', 'target', 'weight'])
+        new_nodes = pd.Series({'1': 'a', '2': 'B', '4': 'd'})
+        new_edges = pd.DataFrame([['1', '2', 6], ['4', '1', 2]],
+                                 columns=['source', 'target', 'weight'])
+
+        network = _FakeCyNetwork()
+        empty = pd.Series([], dtype=object)
+        no_edges = edges.iloc[:0]
+        suids = cytomaid._NetworkIndex(network)
+        for (n1, e1), (n2, e2) in [((empty, no_edges), (nodes, edges)),
+                                   ((nodes, edges), (new_nodes, new_edges))]:
+            diff = cytomaid._diff_networks(n1, e1, n2, e2)
+            cytomaid._apply_diff(network, diff, suids)
+
+        self.assertEqual(diff['nodes_removed'], ['3'])
+        self.assertEqual(diff['weights_changed'].shape[0], 1)
+
+        name = {k: n for k, (n, l) in network.nodes.items()}
+        self.assertEqual(dict(network.nodes.values()), new_nodes.to_dict())
+        self.assertEqual({(name[s], name[t]): w for s, t, w in network.edges.values()},
+                         {(s, t): w for s, t, w in new_edges.values})
+
+class _FakeInstance(pymaid.CatmaidInstance):
+    """ CatmaidInstance that answers requests from canned responses instead
+    of a server.
+
+    ``responses`` maps URL fragments to functions that are called with the
+    URL and request parameters (POST data or chunk of items) and return the
+    response.
+    """
+
+    def __init__(self, responses):
+        super().__init__('http://localhost', None, None, None,
+                         make_global=False, caching=False)
+        self.responses = responses
+        self.requests = []
+
+    def _respond(self, url, params):
+        self.requests.append(url)
+        for k, f in self.responses.items():
+            if k in url:
+                return f(url, params)
+        raise ValueError('No canned response for {}'.format(url))
+
+    def fetch(self, url, post=None, **kwargs):
+        if isinstance(url, str):
+            return self._respond(url, post)
+        post = post if isinstance(post, list) else [post] * len(url)
+        return [self._respond(u, p) for u, p in zip(url, post)]
+
+    def fetch_chunked(self, url, items, key, post=None, chunk_size=100,
+                      **kwargs):
+        items = list(items)
+        return [self._respond(url, items[i:i + chunk_size])
+                for i in range(0, len(items), chunk_size)]
+
+
+class _FakeSession:
+    """ Stand-in for a FuturesSession. ``respond`` is called with URL and
+    POST data and returns status code and (json) content. If ``executor``
+    is given, requests are answered asynchronously.
+    """
+
+    class _Done:
+        def __init__(self, r):
+            self.r = r
+
+        def result(self):
+            return self.r
+
+    def __init__(self, respond, executor=None):
+        self.respond = respond
+        self.executor = executor
+        self.requests = []
+
+    def get(self, url, params=None):
+        return self.post(url)
+
+    def post(self, url, data=None, files=None):
+        self.requests.append(url)
+        if self.executor:
+            return self.executor.submit(self._respond, url, data)
+        return self._Done(self._respond(url, data))
+
+    def _respond(self, url, data):
+        status, content = self.respond(url, data)
+        r = requests.Response()
+        r.url = url
+        r.status_code = status
+        r.elapsed = datetime.timedelta(seconds=.1)
+        r._content = json.dumps(content).encode()
+        return r
+
+
+class TestOffline(unittest.TestCase):
+    """ Test parsing of server responses against canned responses """
+
+    def setUp(self):
+        # [ID, parent ID, x, y, z, confidence, radius, skeleton_id,
+        #  edition_time, user_id]
+        self.nodes = [[1, None, 0, 0, 0, 5, -1, 1, 1497277971.123, 1],
+                      [2, 1, 0, 0, 0, 5, -1, 1, 1451606400.0, 1],
+                      [3, None, 0, 0, 0, 5, -1, 2, 1451606400.0, 1]]
+        self.rm = _FakeInstance({
+            'treenodes/compact-detail': lambda url, skids: [n for n in self.nodes
+                                                            if str(n[7]) in map(str, skids)],
+            'connectors/links': lambda url, skids: {'links': [], 'tags': {}},
+            'skeletons/review-status': lambda url, skids: {
+                str(s): [sum(1 for n in self.nodes if str(n[7]) == str(s)), 0]
+                for s in skids if any(str(n[7]) == str(s) for n in self.nodes)}})
+
+    def test_find_changed_skeletons(self):
+        status = pymaid.find_changed_skeletons(['1', '2', '3'],
+                                               since=pd.Timestamp('2017-01-01', tz='UTC'),
+                                               remote_instance=self.rm)
+        status = status.set_index('skeleton_id')
+        self.assertEqual(status.changed.to_dict(),
+                         {'1': True, '2': False, '3': True})
+        self.assertEqual(status.exists.to_dict(),
+                         {'1': True, '2': True, '3': False})
+        self.assertEqual(pd.Timestamp(status.loc['1', 'last_edited']),
+                         pd.Timestamp('2017-06-12 14:32'))
+
+    def test_find_changed_skeletons_counts(self):
+        nodes = pd.DataFrame({'treenode_id': [3, 4],
+                              'parent_id': pd.Series([None, 3], dtype=object),
+                              'creator_id': 1, 'x': 0, 'y': 0, 'z': 0,
+                              'radius': -1, 'confidence': 5})
+        n = pymaid.CatmaidNeuron(pd.Series({'skeleton_id': '2',
+                                            'neuron_name': 'test',
+                                            'nodes': nodes,
+                                            'connectors': pd.DataFrame(columns=['treenode_id',
+                                                                                'connector_id',
+                                                                                'relation']),
+                                            'tags': {}}),
+                                 remote_instance=self.rm)
+        status = pymaid.find_changed_skeletons(n, remote_instance=self.rm)
+        # Node count differs -> no need to download nodes or links
+        self.assertEqual(status.changed.tolist(), [True])
+        self.assertEqual(status.n_nodes.tolist(), [1])
+        self.assertFalse(any('compact-detail' in u or 'connectors/links' in u
+                             for u in self.rm.requests))
+
+        # Same node count -> check edits since the neuron was retrieved
+        n.nodes = n.nodes.iloc[:1]
+        n.date_retrieved = '2017-01-01'
+        self.rm.responses['neuronnames'] = lambda url, post: {'2': 'test'}
+        status = pymaid.find_changed_skeletons(n, remote_instance=self.rm)
+        self.assertEqual(status.changed.tolist(), [False])
+        self.assertTrue(any('compact-detail' in u for u in self.rm.requests))
+
+    def test_to_utc(self):
+        t = pymaid.fetch._to_utc('2017-06-12 14:32')
+        offset = datetime.datetime(2017, 6, 12, 14, 32).timestamp() - \
+                 datetime.datetime(2017, 6, 12, 14, 32,
+                                   tzinfo=datetime.timezone.utc).timestamp()
+        self.assertEqual(t, np.datetime64('2017-06-12T14:32') +
+                         np.timedelta64(int(offset), 's'))
+
+    def test_node_store_edition_times(self):
+        et = pymaid.NodeDetailStore._fetch_edition_times(['1', '2'],
+                                                         remote_instance=self.rm)
+        self.assertEqual(et.index.tolist(), [1, 2, 3])
+        self.assertEqual(pd.Timestamp(et.loc[1]),
+                         pd.Timestamp('2017-06-12 14:32'))
+        self.assertEqual(pd.Timestamp(et.loc[3]), pd.Timestamp('2016-01-01'))
+
+    def test_node_store_refetches_edited(self):
+        fetched = []
+
+        def user_info(url, ids):
+            fetched.extend(ids)
+            return {i: {'creation_time': '2016-01-01T00:00:00Z', 'user': 1,
+                        'edition_time': '2017-06-12T14:32:00Z', 'editor': 1,
+                        'reviewers': [3],
+                        'review_times': ['2017-06-13T10:00:00Z']}
+                    for i in ids}
+        self.rm.responses['node/user-info'] = user_info
+
+        store = pymaid.NodeDetailStore()
+        details, reviews = pymaid.get_node_details([1, 2], return_reviews=True,
+                                                   remote_instance=self.rm)
+        details['edition_time'] = np.array(['2016-01-01', '2016-01-01'],
+                                           dtype='datetime64[ns]')
+        store.update(details, reviews)
+
+        # Without skeleton IDs, stored nodes are not checked
+        pymaid.user_stats._get_node_details([1, 2], remote_instance=self.rm,
+                                            node_store=store)
+        self.assertEqual(fetched, [1, 2])
+
+        # Node 1 was edited since it was stored
+        details, _ = pymaid.user_stats._get_node_details([1, 2],
+                                                         remote_instance=self.rm,
+                                                         node_store=store,
+                                                         skeleton_ids=[1])
+        self.assertEqual(fetched, [1, 2, 1])
+        self.assertEqual(pd.Timestamp(details.set_index('node_id').loc[1, 'edition_time']),
+                         pd.Timestamp('2017-06-12 14:32'))
+        self.assertEqual(details.reviewers.tolist(), [[3], [3]])
+        self.assertEqual(details.review_times.tolist(),
+                         [[datetime.datetime(2017, 6, 13, 10, 0)]] * 2)
+
+    def test_snapshot_unknown_skid(self):
+        snap = pymaid.ConnectomeSnapshot([1, 2, 3], [10, 10, 10],
+                                         source=[1, 3], target=[2, 2],
+                                         relation=[0, 0],
+                                         counts=[[5, 0, 0, 0, 0],
+                                                 [1, 0, 0, 0, 0]])
+        cn = snap.get_partners([99, 2], directions=['incoming'])
+        cn = cn.set_index('skeleton_id')
+        self.assertEqual(cn['2'].to_dict(), {'1': 5, '3': 1})
+        self.assertEqual(cn['99'].sum(), 0)
+
+    def test_chunk_tuner(self):
+        tuner = pymaid.fetch._ChunkTuner(100, inflight=2)
+        # Slow start: requests in flight double while responses are fast
+        tuner.update([.1, .1], 0, max_inflight=100)
+        self.assertEqual((tuner.size, tuner.inflight), (125, 4))
+        # Halve chunk size and requests in flight on errors
+        tuner.update([.1], 1, max_inflight=100)
+        self.assertEqual((tuner.size, tuner.inflight), (62, 2))
+        # Afterwards, additive increase
+        tuner.update([.1], 0, max_inflight=100)
+        self.assertEqual((tuner.size, tuner.inflight), (87, 3))
+        # Shrink chunks if responses are slow
+        tuner.update([4], 0, max_inflight=100)
+        self.assertEqual((tuner.size, tuner.inflight), (43, 3))
+        # Never exceed max in flight or max chunk size
+        for i in range(100):
+            tuner.update([.1], 0, max_inflight=5)
+        self.assertEqual((tuner.size, tuner.inflight), (1000, 5))
+
+    def test_fetch_chunked_split(self):
+        rm = pymaid.CatmaidInstance('http://localhost', None, None, None,
+                                    make_global=False, caching=False)
+
+        # Reject URLs for more than 3 items
+        def respond(url, data):
+            n = url.count('ids')
+            return 414 if n > 3 else 200, [n]
+
+        rm._future_session = _FakeSession(respond)
+        res = rm.fetch_chunked('http://localhost/1/test', range(10),
+                               'ids[{}]', chunk_size=10, method='GET')
+        self.assertEqual(sum(r[0] for r in res), 10)
+        self.assertLessEqual(max(r[0] for r in res), 3)
+        tuner = list(rm._chunk_tuners.values())[0]
+        self.assertLess(tuner.max_size, 10)
+
+    def test_connector_details_chunked(self):
+        rm = _FakeInstance({'connector/skeletons': lambda url, ids: [
+            [i, {'presynaptic_to': 1, 'postsynaptic_to': [2],
+                 'presynaptic_to_node': 10, 'postsynaptic_to_node': [20]}]
+            for i in ids]})
+        cn = pymaid.get_connector_details([5, 6, 7], chunk_size=2,
+                                          remote_instance=rm)
+        self.assertEqual(sorted(cn.connector_id.tolist()), [5, 6, 7])
+        self.assertEqual(len(rm.requests), 2)
+
+    def test_fetch_chunked_instance_limit(self):
+        rm = pymaid.CatmaidInstance('http://localhost', None, None, None,
+                                    make_global=False, caching=False,
+                                    max_threads=3)
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def respond(url, data):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(.01)
+            with lock:
+                active[0] -= 1
+            return 200, [len(data)]
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=20)
+        rm._future_session = _FakeSession(respond, executor=executor)
+
+        # Two parallel calls to different endpoints share the limit
+        res = {}
+        threads = [threading.Thread(target=lambda u: res.update({u: rm.fetch_chunked(u, range(40), 'ids[{}]', chunk_size=1)}),
+                                    args=('http://localhost/1/{}'.format(i), ))
+                   for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        executor.shutdown()
+
+        self.assertEqual([sum(r[0] for r in v) for v in res.values()], [40, 40])
+        self.assertLessEqual(active[1], 3)
+        self.assertEqual(rm._chunk_slots.active, 0)
+
+    def test_sparse_adjacency_from_edges(self):
+        edges = pd.DataFrame([[123, 5, 3], [12, 5, 1], ['12', '7', 2]],
+                             columns=['source_skid', 'target_skid', 'weight'])
+        adj = pymaid.SparseAdjacencyMatrix.from_edges(edges, sources=['12'],
+                                                      targets=[5, 7])
+        self.assertEqual(adj.to_dense().values.tolist(), [[1, 2]])
+
+    def test_fetch_bypass_cache(self):
+        rm = pymaid.CatmaidInstance('http://localhost', None, None, None,
+                                    make_global=False, caching=True)
+        rm._future_session = _FakeSession(lambda url, data: (200, []))
+        for i in range(2):
+            rm.fetch('http://localhost/1/users', use_cache=False)
+        self.assertEqual(len(rm._future_session.requests), 2)
+        self.assertTrue(rm.caching)
+        self.assertEqual(len(rm._cache), 0)
+
+    def test_find_neurons_in_bbox_candidates(self):
+        # [ID, parent ID, user ID, x, y, z, radius, confidence]
+        skeletons = {1: [[1, None, 1, 5, 5, 5, -1, 5],
+                         [2, 1, 1, 8, 5, 5, -1, 5]],
+                     # Single node in the box but no cable
+                     2: [[3, None, 1, 5, 5, 5, -1, 5]],
+                     3: [[5, None, 1, 50, 50, 50, -1, 5]],
+                     # Passes through the box without a node in it
+                     4: [[6, None, 1, -50, 5, 5, -1, 5],
+                         [7, 6, 1, 50, 5, 5, -1, 5]]}
+        rm = _FakeInstance({'compact-detail': lambda url, params: [
+                            skeletons[int(url.split('/')[-2])]],
+                            'review-status': lambda url, skids: {
+                            str(s): [len(skeletons[s]), 0] for s in skids},
+                            'in-bounding-box': lambda url, params: [1, 2, 4]})
+        bbox = [[0, 10], [0, 10], [0, 10]]
+        found = pymaid.fetch._find_neurons_in_bbox(bbox,
+                                                   candidates={1, 2, 3, 4},
+                                                   remote_instance=rm)
+        self.assertEqual(found, {1, 4})
+        self.assertFalse(any('in-bounding-box' in u for u in rm.requests))
+
+        # Too many nodes to check individually
+        found = pymaid.fetch._find_neurons_in_bbox(bbox,
+                                                   candidates={1, 2, 3, 4},
+                                                   max_nodes=5,
+                                                   remote_instance=rm)
+        self.assertEqual(found, {1, 2, 4})
+        self.assertTrue(any('in-bounding-box' in u for u in rm.requests))
+
+    def test_node_details_review_times(self):
+        info = {1: {'creation_time': '2017-06-12T14:32:51.123Z', 'user': 1,
+                    'edition_time': '2017-06-12T14:32:51.123Z', 'editor': 1,
+                    'reviewers': [2, 3],
+                    'review_times': ['2017-06-13T10:00:00Z',
+                                     '2017-06-14T11:30:00Z']},
+                2: {'creation_time': '2017-06-12T14:32:51.123Z', 'user': 1,
+                    'edition_time': '2017-06-12T14:32:51.123Z', 'editor': 1,
+                    'reviewers': [], 'review_times': []}}
+        rm = _FakeInstance({'node/user-info': lambda url, ids: {i: info[i]
+                                                                for i in ids}})
+        df = pymaid.get_node_details([1, 2], remote_instance=rm)
+        self.assertEqual(df.review_times.tolist(),
+                         [[datetime.datetime(2017, 6, 13, 10, 0),
+                           datetime.datetime(2017, 6, 14, 11, 30)], []])
+        self.assertIsInstance(df.review_times.values[0][0], datetime.datetime)
+
+    def test_neurons_in_bbox_from_nodes(self):
+        nodes = pd.DataFrame([[1, None, 1, 5, 5, 5],
+                              [2, 1, 1, 8, 5, 5],
+                              # Passes through the box without a node in it
+                              [3, None, 2, -50, 5, 5],
+                              [4, 3, 2, 50, 5, 5],
+                              [5, None, 3, 50, 50, 50],
+                              # Passes next to the box
+                              [6, None, 4, 20, 20, 5],
+                              [7, 6, 4, 20, -20, 5]],
+                             columns=['treenode_id', 'parent_id',
+                                      'skeleton_id', 'x', 'y', 'z'],
+                             dtype=object)
+        bbox = [[0, 10], [0, 10], [0, 10]]
+        find = pymaid.fetch._neurons_in_bbox_from_nodes
+        self.assertEqual(find(nodes, bbox, min_nodes=1, min_cable=0), {1, 2})
+        self.assertEqual(find(nodes, bbox, min_nodes=2, min_cable=0), {1})
+        self.assertEqual(find(nodes, bbox, min_nodes=1, min_cable=10), {2})
+
+        with self.assertRaises(ValueError):
+            pymaid.fetch._get_skeletons_in_bbox_urls(bbox, min_nodes=2,
+                                                     tile_size=5,
+                                                     remote_instance=self.rm)
+
+    def test_tiles_prefetch_memory(self):
+        from pymaid import tiles
+
+        class _Mirrors:
+            def __init__(self):
+                self.futures = {}
+
+            def get(self, session, path):
+                self.futures[path] = concurrent.futures.Future()
+                return self.futures[path]
+
+        class _Response:
+            ok = True
+            content = b'tile'
+
+        # Skip stack info and mirror probing
+        job = tiles.LoadTiles.__new__(tiles.LoadTiles)
+        job.cache = None
+        job._memory = tiles._TileMemory(size_limit=1)
+        job._in_flight = {}
+        job._lock = threading.RLock()
+        job.remote_instance = None
+        job._session = None
+        job.mirrors = _Mirrors()
+        job.stack_id, job.mirror_url, job.zoom_level = 1, 'http://mirror', 0
+        job._get_tile_path = lambda x, y, z: '{}/{}_{}'.format(z, y, x)
+        job.image_coords = [{'tiles_to_load': [(x, y, z) for x in range(2)
+                                               for y in range(2)]}
+                            for z in range(3)]
+
+        # Requests in flight are capped
+        job.prefetch(1, n=1, max_requests=6)
+        self.assertEqual(len(job._in_flight), 6)
+        self.assertEqual(len(job.mirrors.futures), 6)
+
+        # Finished tiles are kept in memory and not requested again
+        for f in list(job.mirrors.futures.values()):
+            f.set_result(_Response())
+        self.assertEqual(len(job._in_flight), 0)
+        job.prefetch(1, n=1, max_requests=6)
+        self.assertEqual(len(job.mirrors.futures), 12)
+        for co in job.image_coords[1]['tiles_to_load']:
+            self.assertEqual(job._memory.get(job._cache_key(co)), b'tile')
+
+        # Least recently used tiles are evicted
+        memory = tiles._TileMemory(size_limit=10 / 10**6)
+        for k in 'abc':
+            memory.put(k, b'tile')
+        self.assertNotIn('a', memory)
+        self.assertEqual(memory.size, 8)
+
+    def test_fragment_mst(self):
+        rng = np.random.RandomState(0)
+        for coords in [rng.rand(300, 3) * 100,
+                       # Flat, duplicate and too few points
+                       np.c_[rng.rand(100, 2), np.zeros(100)],
+                       np.repeat(rng.rand(30, 3), 2, axis=0),
+                       rng.rand(4, 3)]:
+            frag = rng.randint(0, min(20, len(coords)), len(coords))
+            edges = pymaid.morpho._fragment_mst(coords, frag)
+
+            # Compare against brute force: shortest distance between fragments
+            _, frag = np.unique(frag, return_inverse=True)
+            d = scipy.spatial.distance.cdist(coords, coords)
+            n = frag.max() + 1
+            g = nx.Graph()
+            g.add_nodes_from(range(n))
+            for i in range(n):
+                for j in range(i + 1, n):
+                    g.add_edge(i, j, weight=d[frag == i][:, frag == j].min())
+            mst = nx.minimum_spanning_tree(g)
+
+            self.assertEqual(len(edges), n - 1)
+            self.assertAlmostEqual(sum(e[2] for e in edges), mst.size(weight='weight'),
+                                   places=6)
+
+    def test_flow_centrality_remote_instance(self):
+        nodes = pd.DataFrame({'treenode_id': [1, 2, 3, 4],
+                              'parent_id': pd.Series([None, 1, 2, 2],
+                                                     dtype=object),
+                              'creator_id': 1, 'x': [0, 1, 2, 2],
+                              'y': [0, 0, 1, -1], 'z': 0, 'radius': -1,
+                              'confidence': 5})
+        connectors = pd.DataFrame({'treenode_id': [3, 4],
+                                   'connector_id': [10, 11],
+                                   'relation': [0, 1], 'x': 0, 'y': 0, 'z': 0})
+        n = pymaid.CatmaidNeuron(pd.Series({'skeleton_id': '1',
+                                            'neuron_name': 'test',
+                                            'nodes': nodes,
+                                            'connectors': connectors,
+                                            'tags': {}}),
+                                 remote_instance=self.rm)
+
+        class Store():
+            def get_connector_details(self, x, remote_instance=None):
+                self.remote_instance = remote_instance
+                raise StopIteration
+
+        # Falls back to the neuron's instance
+        store = Store()
+        with self.assertRaises(StopIteration):
+            pymaid.flow_centrality(n, polypre=True, connector_store=store)
+        self.assertIs(store.remote_instance, self.rm)
+
+        other = _FakeInstance({})
+        with self.assertRaises(StopIteration):
+            pymaid.bending_flow(n, polypre=True, connector_store=store,
+                                remote_instance=other)
+        self.assertIs(store.remote_instance, other)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -15,12 +15,15 @@
 #    along
 
 import requests
-import gc
-import math
+import hashlib
+import shutil
+import threading
 import time
 import urllib
 import os
-import warnings
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import pandas as pd
 import numpy as np
@@ -38,7 +41,7 @@ try:
 except ImportError:
     logger.error('Unable to import imageio. Please make sure library is installed!')
 
-__all__ = sorted(['crop_neuron', 'LoadTiles'])
+__all__ = sorted(['crop_neuron', 'LoadTiles', 'TileCache', 'MirrorPool'])
 
 def crop_neuron(x, output, dimensions=(1000, 1000), interpolate_z_res=40,
                 remote_instance=None):
@@ -74,52 +77,22 @@ def crop_neuron(x, output, dimensions=(1000, 1000), interpolate_z_res=40,
     # Prepare treenode table to be indexed by treenode_id
     this_tn = x.nodes.set_index('treenode_id')
 
-    # Iterate over neuron's segments
-    bboxes = []
-    for seg in x.segments:
-        # Get treenode coordinates
-        center_coords = this_tn.loc[seg, ['x', 'y', 'z']].values
-
-        # If a z resolution for interpolation is given, interpolate virtual nodes
-        if interpolate_z_res:
-            interp_coords = center_coords[0:1]
-            # Go over all treenode -> parent pairs
-            for i, (co, next_co) in enumerate(zip(center_coords[:-1], center_coords[1:])):
-                # If nodes are more than interpolate_z_res nm away from another
-                if math.fabs(co[2] - next_co[2]) >= (2 * interpolate_z_res):
-                    # Get steps we would expect to be there
-                    steps = int(
-                        math.fabs(co[2] - next_co[2]) / interpolate_z_res)
-
-                    # If we're going anterior, we need to inverse step size
-                    if co[2] < next_co[2]:
-                        step_size = interpolate_z_res
-                    else:
-                        step_size = -interpolate_z_res
-
-                    # Interpolate coordinates
-                    new_co = [(co[0] + int((next_co[0] - co[0]) / steps * (i + 1)),
-                               co[1] + int((next_co[1] - co[1]) /
-                                           steps * (i + 1)),
-                               z)
-                              for i, z in enumerate(range(co[2] + step_size, next_co[2], step_size))]
-
-                    # Track new coordinates
-                    interp_coords = np.append(interp_coords, new_co, axis=0)
-                # Add next coordinate
-                interp_coords = np.append(interp_coords, [next_co], axis=0)
-            # Use interpolated coords
-            center_coords = interp_coords
-
-        # Turn into bounding boxes: left, right, top, bottom, z
-        bbox = np.array([[co[0] - dimensions[0] / 2,
-                          co[0] + dimensions[0] / 2,
-                          co[1] - dimensions[1] / 2,
-                          co[1] + dimensions[1] / 2,
-                          co[2]]
-                         for co in center_coords]
-                        ).astype(int)
-        bboxes += list(bbox)
+    # Get coordinates of all segments in one go
+    segments = [s for s in x.segments if len(s)]
+    center_coords = this_tn.loc[np.concatenate(segments),
+                                ['x', 'y', 'z']].values
+
+    # If a z resolution for interpolation is given, interpolate virtual nodes
+    if interpolate_z_res and len(center_coords):
+        # Mark first node of each segment: we don't interpolate across them
+        seg_start = np.zeros(len(center_coords), dtype=bool)
+        seg_start[np.cumsum([0] + [len(s) for s in segments[:-1]])] = True
+
+        center_coords = _interpolate_z(center_coords, interpolate_z_res,
+                                       seg_start)
+
+    # Turn into bounding boxes: left, right, top, bottom, z
+    bboxes = list(_bbox_helper(center_coords, dimensions))
 
     # Generate tile job
     job = LoadTiles(bboxes,
@@ -154,26 +127,451 @@ def _bbox_helper(coords, dimensions=(500, 500)):
     if isinstance(coords, list):
         coords = np.array(coords)
 
-    if isinstance(coords, np.ndarray) and coords.ndim == 2:
-        return np.array([_bbox_helper(c, dimensions) for c in coords])
+    coords = np.asarray(coords)
 
     # Turn into bounding boxes: left, right, top, bottom, z
-    bbox = np.array([coords[0] - dimensions[0] / 2,
-                     coords[0] + dimensions[0] / 2,
-                     coords[1] - dimensions[1] / 2,
-                     coords[1] + dimensions[1] / 2,
-                     coords[2]]).astype(int)
+    bbox = np.stack([coords[..., 0] - dimensions[0] / 2,
+                     coords[..., 0] + dimensions[0] / 2,
+                     coords[..., 1] - dimensions[1] / 2,
+                     coords[..., 1] + dimensions[1] / 2,
+                     coords[..., 2]], axis=-1).astype(int)
 
     return bbox
 
 
+def _interpolate_z(coords, z_res, seg_start=None):
+    """ Interpolates coordinates between consecutive points that are at least
+    ``2 * z_res`` apart in z.
+
+    Parameters
+    ----------
+    coords :        numpy.array
+                    (N, 3) array of x/y/z coordinates.
+    z_res :         int
+                    Z resolution to interpolate to.
+    seg_start :     numpy.array of bool, optional
+                    Marks points that start a new segment. No coordinates are
+                    interpolated between such a point and its predecessor.
+
+    Returns
+    -------
+    numpy.array
+                    Coordinates with interpolated points inserted between
+                    their neighbours. Interpolated x/y are truncated to int.
+    """
+    coords = np.asarray(coords)
+
+    if len(coords) < 2:
+        return coords
+
+    this, nxt = coords[:-1], coords[1:]
+    dz = nxt[:, 2] - this[:, 2]
+    adz = np.abs(dz)
+
+    # Number of points to add between each pair: one every z_res
+    to_interp = adz >= 2 * z_res
+    if not isinstance(seg_start, type(None)):
+        to_interp &= ~seg_start[1:]
+    n_new = np.where(to_interp, np.ceil(adz / z_res).astype(int) - 1, 0)
+    steps = np.where(to_interp, (adz / z_res).astype(int), 1)
+
+    # Each pair contributes its interpolated points followed by its end point
+    group = np.repeat(np.arange(len(this)), n_new + 1)
+    k = np.arange(len(group)) - np.repeat(np.cumsum(n_new + 1) - (n_new + 1),
+                                          n_new + 1)
+    is_new = k < n_new[group]
+
+    out = nxt[group].copy()
+    g = group[is_new]
+    kk = k[is_new] + 1
+    d = (nxt[g] - this[g]).astype(float)
+    out[is_new, 0] = this[g, 0] + np.trunc(d[:, 0] / steps[g] * kk)
+    out[is_new, 1] = this[g, 1] + np.trunc(d[:, 1] / steps[g] * kk)
+    out[is_new, 2] = this[g, 2] + np.sign(dz[g]) * z_res * kk
+
+    return np.append(coords[:1], out, axis=0)
+
+
+class TileCache:
+    """ Disk-backed cache for encoded image tiles.
+
+    Tiles are stored as they come from the image mirror under
+    ``{path}/{stack}_{mirror hash}/{zoom}/{z}/{y}_{x}``. Reading a tile marks
+    it as recently used. Once the cache exceeds ``size_limit``, least recently
+    used tiles are evicted until it is back at 90% of the limit.
+
+    Parameters
+    ----------
+    path :          str
+                    Directory to store tiles in. Is created if necessary.
+    size_limit :    int | None, optional
+                    Max size of the cache in megabytes. If None, cache is
+                    unbounded.
+
+    Examples
+    --------
+    >>> cache = pymaid.tiles.TileCache('~/.pymaid/tiles', size_limit=500)
+    >>> job = pymaid.tiles.LoadTiles(bbox, stack_id=5, cache=cache)
+    >>> # Check current size of cache in Mb
+    >>> cache.size / 10**6
+    >>> # Remove all cached tiles
+    >>> cache.clear()
+    """
+
+    def __init__(self, path, size_limit=None):
+        self.path = os.path.expanduser(path)
+        self.size_limit = size_limit
+
+        # Running total of bytes in cache - is initialised lazily
+        self._size = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<TileCache at {} (limit: {} Mb)>'.format(self.path,
+                                                          self.size_limit)
+
+    def __contains__(self, key):
+        return os.path.isfile(self._filepath(key))
+
+    def _filepath(self, key):
+        """ Turns ``(stack, mirror, zoom, x, y, z)`` into a filepath. """
+        stack, mirror, zoom, x, y, z = key
+        mirror = hashlib.md5(str(mirror).encode()).hexdigest()[:12]
+        return os.path.join(self.path,
+                            '{}_{}'.format(stack, mirror),
+                            str(zoom),
+                            str(z),
+                            '{}_{}'.format(y, x))
+
+    def _files(self):
+        """ Returns ``[(last used, size, filepath), ...]`` for cached tiles. """
+        files = []
+        for root, dirs, fnames in os.walk(self.path):
+            for f in fnames:
+                fp = os.path.join(root, f)
+                try:
+                    st = os.stat(fp)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, fp))
+        return files
+
+    @property
+    def size(self):
+        """ Current size of the cache in bytes. """
+        return sum([f[1] for f in self._files()])
+
+    def get(self, key):
+        """ Returns encoded tile for ``key`` or None if not cached. """
+        fp = self._filepath(key)
+        try:
+            with open(fp, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(fp)
+        except OSError:
+            pass
+
+        return content
+
+    def put(self, key, content):
+        """ Adds encoded tile to cache and evicts old tiles if necessary. """
+        fp = self._filepath(key)
+        os.makedirs(os.path.dirname(fp), exist_ok=True)
+
+        # Write to temporary file first so that concurrent readers never see
+        # partial tiles
+        tmp = '{}.{}.tmp'.format(fp, threading.get_ident())
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, fp)
+
+        with self._lock:
+            if isinstance(self._size, type(None)):
+                self._size = self.size
+            else:
+                self._size += len(content)
+
+            if self.size_limit and self._size > self.size_limit * 10**6:
+                self._evict()
+
+    def _evict(self):
+        """ Removes least recently used tiles until cache is at 90% of its
+        size limit.
+        """
+        files = sorted(self._files())
+        self._size = sum([f[1] for f in files])
+
+        target = self.size_limit * 10**6 * .9
+        for mtime, size, fp in files:
+            if self._size <= target:
+                break
+            try:
+                os.remove(fp)
+                self._size -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """ Removes all tiles from the cache. """
+        with self._lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self._size = 0
+
+
+class _TileMemory:
+    """ Small in-memory LRU cache for encoded tiles. Used by
+    :class:`~pymaid.tiles.LoadTiles` to keep prefetched tiles if there is no
+    disk cache. Same interface as :class:`~pymaid.tiles.TileCache`.
+
+    Parameters
+    ----------
+    size_limit :    int | float, optional
+                    Max size in megabytes. Least recently used tiles are
+                    evicted first.
+    """
+
+    def __init__(self, size_limit=100):
+        self.size_limit = size_limit
+        self.size = 0
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<_TileMemory with {} tiles (limit: {} Mb)>'.format(len(self._tiles),
+                                                                   self.size_limit)
+
+    def __contains__(self, key):
+        return key in self._tiles
+
+    def get(self, key):
+        """ Returns encoded tile for ``key`` or None if not cached. """
+        with self._lock:
+            content = self._tiles.get(key)
+            if not isinstance(content, type(None)):
+                self._tiles.move_to_end(key)
+        return content
+
+    def put(self, key, content):
+        """ Adds encoded tile and evicts least recently used tiles. """
+        with self._lock:
+            old = self._tiles.pop(key, None)
+            if not isinstance(old, type(None)):
+                self.size -= len(old)
+            self._tiles[key] = content
+            self.size += len(content)
+
+            while self.size > self.size_limit * 10**6 and len(self._tiles) > 1:
+                self.size -= len(self._tiles.popitem(last=False)[1])
+
+    def clear(self):
+        """ Removes all tiles. """
+        with self._lock:
+            self._tiles.clear()
+            self.size = 0
+
+
+class MirrorPool:
+    """ Spreads tile requests across image mirrors.
+
+    Each request goes to the mirror with the lowest expected wait: the moving
+    average of its response time multiplied by the number of its requests
+    already in flight. Mirrors that fail (connection errors, timeouts or
+    server errors) are skipped for ``cooldown`` seconds and the request is
+    retried on the next best mirror.
+
+    Parameters
+    ----------
+    mirrors :       list of dict
+                    Image mirrors as listed in the stack info. Must contain
+                    ``image_base`` and ``file_extension``.
+    timeout :       int | float, optional
+                    Timeout in seconds for individual tile requests.
+    cooldown :      int | float, optional
+                    Seconds for which a failing mirror is skipped.
+
+    Examples
+    --------
+    >>> job = pymaid.tiles.LoadTiles(bbox, stack_id=5, image_mirror='all')
+    >>> job.load_in_memory()
+    >>> # Check how requests were distributed
+    >>> job.mirrors.stats
+    """
+
+    def __init__(self, mirrors, timeout=10, cooldown=30):
+        self.mirrors = list(mirrors)
+        self.timeout = timeout
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._stats = {m['image_base']: dict(requests=0, failed=0,
+                                             in_flight=0, latency=None,
+                                             bytes=0, time=0.,
+                                             blocked_until=0.)
+                       for m in self.mirrors}
+
+    def __repr__(self):
+        return '<MirrorPool with {} mirror(s)>'.format(len(self.mirrors))
+
+    def __len__(self):
+        return len(self.mirrors)
+
+    @property
+    def stats(self):
+        """ Per-mirror request statistics. """
+        now = time.time()
+        data = []
+        for m in self.mirrors:
+            s = self._stats[m['image_base']]
+            data.append([m['image_base'], s['requests'], s['failed'],
+                         s['in_flight'], s['latency'],
+                         s['bytes'] / s['time'] / 10**6 if s['time'] else None,
+                         s['blocked_until'] <= now])
+
+        return pd.DataFrame(data, columns=['mirror', 'requests', 'failed',
+                                           'in_flight', 'latency',
+                                           'throughput', 'healthy'])
+
+    def probe(self, calls=2):
+        """ Measures response times of all mirrors in parallel.
+
+        Returns
+        -------
+        dict
+                    ``{image_base: response time}``. Unresponsive mirrors
+                    have ``float("inf")``.
+        """
+        urls = [m['image_base'] for m in self.mirrors]
+        with ThreadPoolExecutor(max_workers=max(len(urls), 1)) as pool:
+            times = list(pool.map(lambda u: test_response_time(u, calls=calls),
+                                  urls))
+        times = [t if np.isfinite(t) else float('inf') for t in times]
+
+        with self._lock:
+            for u, t in zip(urls, times):
+                if np.isfinite(t):
+                    self._stats[u]['latency'] = t
+
+        return dict(zip(urls, times))
+
+    def pick(self, exclude=[]):
+        """ Returns the mirror with the lowest expected wait and registers a
+        request with it.
+        """
+        now = time.time()
+        with self._lock:
+            cand = [m for m in self.mirrors if m['image_base'] not in exclude]
+            healthy = [m for m in cand
+                       if self._stats[m['image_base']]['blocked_until'] <= now]
+
+            # If all mirrors are blocked, try them anyway
+            if not healthy:
+                healthy = cand
+
+            # Mirrors without measurements are assumed to be average
+            known = [self._stats[m['image_base']]['latency'] for m in healthy]
+            known = [l for l in known if not isinstance(l, type(None))]
+            default = np.mean(known) if known else 1
+
+            def cost(m):
+                s = self._stats[m['image_base']]
+                lat = s['latency'] if not isinstance(s['latency'], type(None)) else default
+                return lat * (s['in_flight'] + 1)
+
+            m = min(healthy, key=cost)
+            self._stats[m['image_base']]['requests'] += 1
+            self._stats[m['image_base']]['in_flight'] += 1
+
+        return m
+
+    def _report(self, m, elapsed=None, n_bytes=0, failed=False):
+        """ Books finished request. """
+        with self._lock:
+            s = self._stats[m['image_base']]
+            s['in_flight'] -= 1
+            if failed:
+                s['failed'] += 1
+                s['blocked_until'] = time.time() + self.cooldown
+            else:
+                # Exponential moving average of response time
+                if isinstance(s['latency'], type(None)):
+                    s['latency'] = elapsed
+                else:
+                    s['latency'] = .8 * s['latency'] + .2 * elapsed
+                s['bytes'] += n_bytes
+                s['time'] += elapsed
+
+    def get(self, session, path):
+        """ Requests ``path`` from the best mirror in the background.
+
+        The mirror is picked once the request is actually executed by the
+        session's thread pool: faster mirrors free up workers sooner and
+        hence receive more requests.
+
+        Parameters
+        ----------
+        session :   requests_futures.sessions.FuturesSession
+        path :      str
+                    Path relative to the mirrors' base URL and without
+                    file extension, e.g. ``'{zoom}/{z}/{y}/{x}'``.
+
+        Returns
+        -------
+        concurrent.futures.Future
+                    Resolves to the ``requests.Response`` of the first mirror
+                    that did not fail.
+        """
+        return session.executor.submit(self._get, session, path)
+
+    def _get(self, session, path):
+        """ Blocking request with failover. """
+        tried = []
+        while True:
+            m = self.pick(exclude=tried)
+            tried.append(m['image_base'])
+            url = '{}{}.{}'.format(m['image_base'], path, m['file_extension'])
+            last = len(tried) >= len(self.mirrors)
+
+            start = time.time()
+            try:
+                # Bypass FuturesSession.request: we are already in a worker
+                if getattr(session, 'session', None):
+                    r = session.session.get(url, timeout=self.timeout)
+                else:
+                    r = requests.Session.request(session, 'GET', url,
+                                                 timeout=self.timeout)
+            except requests.RequestException:
+                self._report(m, failed=True)
+                if last:
+                    raise
+                logger.debug('Mirror {} failed - retrying {} on another '
+                             'mirror.'.format(m['image_base'], path))
+                continue
+
+            if r.status_code >= 500:
+                self._report(m, failed=True)
+                if not last:
+                    continue
+            else:
+                self._report(m, elapsed=time.time() - start,
+                             n_bytes=len(r.content))
+
+            return r
+
+
 class LoadTiles:
     """ Loads tiles from CATMAID and returns stitched image.
 
     Important
     ---------
     Loading lots of tiles is memory intensive. A single 100x100 pixel image
-    already requires 80Kb, 1000x1000 8Mb and so on.
+    already requires 10Kb, 1000x1000 1Mb and so on. Use
+    ``load_in_memory(memmap=filename)`` or ``load_and_save`` for large
+    cutouts.
 
     Parameters
     ----------
@@ -187,17 +585,33 @@ class LoadTiles:
                     Zoom level
     coords :        'NM' | 'PIXEL', optional
                     Dimension of bbox.
-    image_mirror :  int | str | 'auto', optional
-                    Image mirror to use:
+    image_mirror :  int | str | list | 'auto' | 'all', optional
+                    Image mirror(s) to use:
 
                     - ``int`` is interpreted as mirror ID
                     - ``str`` must be URL
                     - ``'auto'`` will automatically pick fastest
+                    - ``'all'`` or list of IDs/URLs will spread requests
+                      across these mirrors (see
+                      :class:`~pymaid.tiles.MirrorPool`). Stats are
+                      available via ``.mirrors.stats``
 
     mem_lim :       int, optional
                     Memory limit in megabytes for loading tiles. This restricts
-                    the number of tiles that can be simultaneously loaded into
-                    memory.
+                    the number of decoded tiles that are simultaneously held
+                    in memory.
+    cache :         None | bool | TileCache, optional
+                    If True, will use a disk cache for tiles at
+                    ``pymaid.config.tile_cache`` (size limited by
+                    ``pymaid.config.tile_cache_size``). That location is not
+                    set by default - set it first to activate the cache.
+                    If None, will use that cache only if it is set. Tiles in
+                    the cache are shared across jobs and sessions. Pass a
+                    :class:`~pymaid.tiles.TileCache` to use a custom location.
+                    Without a disk cache, tiles (e.g. from prefetching) are
+                    kept in a small in-memory cache of ``mem_cache`` Mb.
+    mem_cache :     int, optional
+                    Size limit [Mb] for the in-memory tile cache.
 
     Examples
     --------
@@ -217,6 +631,9 @@ class LoadTiles:
     >>> job.scalebar(size=1000, ax=ax, label=False)
     >>> # Show
     >>> plt.show()
+    >>> # Alternatively, browse slices without loading the full stack first.
+    >>> # Neighbouring slices are downloaded in the background.
+    >>> ax = job.render_im(slider=True, prefetch=3)
 
     """
 
@@ -225,10 +642,11 @@ class LoadTiles:
     # 1. Check for available image mirror automatically (make stack_mirror and stack_id superfluous) - DONE
     # 2. Test using matplotlib instead (would allow storing nodes and scalebar as SVG) - DONE
     # 3. Code clean up
-    # 4. Add second mode that loads sections sequentially, saves them and discards tiles: slower but memory efficient
+    # 4. Add second mode that loads sections sequentially, saves them and discards tiles: slower but memory efficient - DONE
 
     def __init__(self, bbox, stack_id, zoom_level=0, coords='NM',
-                 image_mirror='auto', mem_lim=4000, remote_instance=None):
+                 image_mirror='auto', mem_lim=4000, cache=None,
+                 mem_cache=100, remote_instance=None):
         """ Initialise class.
         """
         if coords not in ['PIXEL', 'NM']:
@@ -258,6 +676,25 @@ class LoadTiles:
         self.stack_id = int(stack_id)
         self.mem_lim = mem_lim
 
+        if isinstance(cache, TileCache):
+            self.cache = cache
+        elif cache is not False and config.tile_cache:
+            self.cache = TileCache(config.tile_cache,
+                                   size_limit=config.tile_cache_size)
+        else:
+            if cache is True:
+                logger.warning('No tile cache location set - tiles will not '
+                               'be cached. Set pymaid.config.tile_cache or '
+                               'pass a TileCache to activate.')
+            self.cache = None
+
+        # Keeps tiles if there is no disk cache
+        self._memory = _TileMemory(size_limit=mem_cache)
+
+        # Tile requests that are currently in flight: {(x, y, z): future}
+        self._in_flight = {}
+        self._lock = threading.RLock()
+
         self.get_stack_info(image_mirror=image_mirror)
 
         self.bboxes2imgcoords()
@@ -307,17 +744,23 @@ class LoadTiles:
         self.resolution_y = info['resolution']['y']
         self.resolution_z = info['resolution']['z']
 
-        if image_mirror == 'auto':
-            # Get fastest image mirror
+        pool = MirrorPool(info['mirrors'])
+
+        if image_mirror in ['auto', 'all']:
+            # Get fastest image mirror(s)
+            times = pool.probe(calls=2)
             match = sorted(info['mirrors'],
-                          key=lambda x: test_response_time(x['image_base'],
-                                                           calls=2))
+                           key=lambda x: times[x['image_base']])
         elif isinstance(image_mirror, int):
             match = [m for m in info['mirrors'] if m['id'] == image_mirror]
         elif isinstance(image_mirror, str):
             match = [m for m in info['mirrors'] if m['image_base'] == image_mirror]
+        elif isinstance(image_mirror, (list, np.ndarray)):
+            match = [m for m in info['mirrors']
+                     if m['id'] in image_mirror or m['image_base'] in image_mirror]
         else:
-            raise ValueError('`image_mirror` must be int, str or "auto".')
+            raise ValueError('`image_mirror` must be int, str, list, "auto" '
+                             'or "all".')
 
         if not match:
             raise ValueError('No mirror matching "{}" found. Available '
@@ -332,10 +775,22 @@ class LoadTiles:
         self.mirror_url = self.img_mirror['image_base']
         self.file_ext = self.img_mirror['file_extension']
 
-        # Memory size per tile in byte
-        self.bytes_per_tile = self.tile_width ** 2 * 8
+        # Tiles are only interchangeable between mirrors with the same tile
+        # size
+        if image_mirror == 'all' or isinstance(image_mirror, (list, np.ndarray)):
+            pool.mirrors = [m for m in match if m['tile_width'] == self.tile_width]
+        else:
+            pool.mirrors = [self.img_mirror]
+        self.mirrors = pool
+
+        # Memory size per (8bit) tile in byte
+        self.bytes_per_tile = self.tile_width ** 2
 
-        logger.info('Image mirror: {0}'.format(self.mirror_url))
+        if len(self.mirrors) > 1:
+            logger.info('Image mirrors: {0}'.format(', '.join(
+                        [m['image_base'] for m in self.mirrors.mirrors])))
+        else:
+            logger.info('Image mirror: {0}'.format(self.mirror_url))
 
     def bboxes2imgcoords(self):
         """ Converts bounding box(es) to coordinates for individual images.
@@ -440,64 +895,232 @@ class LoadTiles:
 
                 self.image_coords.append(this_im)
 
+    @property
+    def _store(self):
+        """ Disk cache if used, in-memory cache otherwise. """
+        return self.cache if self.cache else self._memory
+
     def _get_tiles(self, tiles):
-        """ Retrieves all tiles in parallel.
+        """ Retrieves all tiles in parallel. Tiles are decoded in a thread
+        pool as soon as they arrive.
 
         Parameters
         ----------
         tiles :     list | np.ndarray
                     Triplets of x/y/z tile indices. E.g. [ (20,10,400 ), (...) ]
+
+        Returns
+        -------
+        dict
+                    ``{(x, y, z): uint8 array}``
         """
 
         tiles = list(set(tiles))
 
-        if self.remote_instance:
-            future_session = self.remote_instance._future_session
-        else:
-            future_session = FuturesSession(max_workers=30)
+        # Get what we can from the cache
+        cached = {}
+        for co in tiles:
+            content = self._store.get(self._cache_key(co))
+            if not isinstance(content, type(None)):
+                cached[co] = content
+
+        # Fetch the rest (or wait for them if they are already being fetched)
+        futures = {self._fetch_tile(co): co for co in tiles if co not in cached}
+
+        data = {}
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            decoding = {pool.submit(_decode_tile, c): co
+                        for co, c in cached.items()}
+            for f in config.tqdm(as_completed(futures),
+                                 total=len(futures),
+                                 desc='Loading tiles',
+                                 disable=config.pbar_hide or len(futures) == 1,
+                                 leave=False):
+                r = f.result()
+                # Make sure all responses returned data
+                r.raise_for_status()
+                decoding[pool.submit(_decode_tile, r.content)] = futures[f]
+
+            for f in as_completed(decoding):
+                data[decoding[f]] = f.result()
 
-        urls = [self._get_tile_url(*c) for c in tiles]
-        futures = [future_session.get(u, params=None) for u in urls]
-        resp = [f.result() for f in config.tqdm(futures,
-                                                desc='Loading tiles',
-                                                disable=config.pbar_hide or len(futures) == 1,
-                                                leave=False)]
+        return data
 
-        # Make sure all responses returned data
-        for r in resp:
-            r.raise_for_status()
+    def _cache_key(self, co):
+        """ Returns key for tile ``(x, y, z)`` in the tile caches. """
+        return (self.stack_id, self.mirror_url, self.zoom_level) + tuple(co)
 
-        data = {co: imageio.imread(r.content) for co, r in zip(tiles, resp)}
+    def _fetch_tile(self, co):
+        """ Requests tile ``(x, y, z)`` in the background. Returns a future.
 
-        return data
+        Tiles that are already being requested (e.g. by :func:`prefetch`)
+        are not requested twice. Successful responses are written to the
+        tile cache (or the in-memory cache if there is none).
+        """
+        with self._lock:
+            f = self._in_flight.get(co)
+            if isinstance(f, type(None)):
+                if self.remote_instance:
+                    session = self.remote_instance._future_session
+                else:
+                    if not hasattr(self, '_session'):
+                        self._session = FuturesSession(max_workers=30)
+                    session = self._session
+
+                f = self.mirrors.get(session, self._get_tile_path(*co))
+                self._in_flight[co] = f
+                f.add_done_callback(lambda x, co=co: self._tile_done(co, x))
+        return f
+
+    def _tile_done(self, co, f):
+        """ Callback for finished tile requests. """
+        if not f.cancelled() and not f.exception():
+            r = f.result()
+            if r.ok:
+                try:
+                    self._store.put(self._cache_key(co), r.content)
+                except OSError as e:
+                    logger.warning('Unable to write tile to cache: {}'.format(e))
+
+        with self._lock:
+            self._in_flight.pop(co, None)
+
+    def prefetch(self, ix, n=2, max_requests=50):
+        """ Downloads tiles for images within ``n`` of image ``ix`` into
+        the tile cache (or the in-memory cache if there is none) in the
+        background.
+
+        Parameters
+        ----------
+        ix :            int
+                        Index of the current image.
+        n :             int, optional
+                        Number of images to prefetch in either direction.
+        max_requests :  int, optional
+                        Max number of tile requests in flight. Tiles beyond
+                        that are not prefetched.
+        """
+        # Fetch images closest to the current one first
+        order = sorted(range(max(ix - n, 0),
+                             min(ix + n + 1, len(self.image_coords))),
+                       key=lambda i: abs(i - ix))
+
+        store = self._store
+        # Finished requests are stored before they leave _in_flight
+        with self._lock:
+            for i in order:
+                for co in set(self.image_coords[i]['tiles_to_load']):
+                    if len(self._in_flight) >= max_requests:
+                        return
+                    if co not in self._in_flight and self._cache_key(co) not in store:
+                        self._fetch_tile(co)
+
+    def get_image(self, ix):
+        """ Download and stitch a single image.
+
+        Parameters
+        ----------
+        ix :        int
+                    Index of the image (see ``.image_coords``).
 
-    def _stich_tiles(self, im, tiles):
+        Returns
+        -------
+        np.ndarray
+                    (y, x) uint8 array.
+        """
+        im = self.image_coords[ix]
+        return self._stich_tiles(im, self._get_tiles(im['tiles_to_load']))
+
+    def _image_shape(self, im):
+        """ Returns (height, width) of stitched image in pixels. """
+        return (im['px_bot'] - im['px_top'], im['px_right'] - im['px_left'])
+
+    def _stich_tiles(self, im, tiles, out=None):
         """ Stitch tiles into final image.
+
+        Tiles are pasted directly into the cropped (uint8) image. If ``out``
+        is smaller than the image, the image is cropped around its center.
         """
 
-        # Generate empty array
-        im_dim = np.array([
-            math.fabs((im['tile_bot'] - im['tile_top']) * self.tile_width),
-            math.fabs((im['tile_right'] - im['tile_left']) * self.tile_width)]).astype(int)
-        img = np.zeros(im_dim, dtype=int)
+        if isinstance(out, type(None)):
+            out = np.zeros(self._image_shape(im), dtype=np.uint8)
+
+        h, w = self._image_shape(im)
+        # Offset from center cropping
+        off_y = (h - out.shape[0]) // 2
+        off_x = (w - out.shape[1]) // 2
 
         # Fill array
-        for i, ix_x in enumerate(range(im['tile_left'], im['tile_right'])):
-            for k, ix_y in enumerate(range(im['tile_top'], im['tile_bot'])):
-                # Paste this tile onto our canvas
-                img[k * self.tile_width: (k + 1) * self.tile_width, i * self.tile_width: (
-                    i + 1) * self.tile_width] = tiles[(ix_x, ix_y, im['tile_z'])]
+        for ix_x in range(im['tile_left'], im['tile_right']):
+            for ix_y in range(im['tile_top'], im['tile_bot']):
+                tile = tiles[(ix_x, ix_y, im['tile_z'])]
+
+                # Position of this tile in the output
+                y0 = ix_y * self.tile_width - im['px_top'] - off_y
+                x0 = ix_x * self.tile_width - im['px_left'] - off_x
+
+                # Clip to output
+                y1 = min(y0 + tile.shape[0], out.shape[0])
+                x1 = min(x0 + tile.shape[1], out.shape[1])
+                ty, tx = max(-y0, 0), max(-x0, 0)
+                y0, x0 = max(y0, 0), max(x0, 0)
+
+                if y1 > y0 and x1 > x0:
+                    out[y0:y1, x0:x1] = tile[ty: ty + (y1 - y0),
+                                             tx: tx + (x1 - x0)]
+
+        return out
+
+    def _iter_images(self):
+        """ Yields ``(index, image, tiles)`` for each image while keeping at
+        most ``mem_lim`` worth of decoded tiles in memory. Tiles needed for
+        upcoming images are prefetched within that budget.
+        """
+        max_safe_tiles = int((self.mem_lim * 10**6) / self.bytes_per_tile)
 
-        # Remove borders and create a copy (otherwise we will not be able
-        # to clear the original tile)
-        cropped_img = np.array(img[im['px_border_top']: -im['px_border_bot'],
-                                   im['px_border_left']: -im['px_border_right']],
-                               dtype=int)
+        # Count for each tile how often it is still needed
+        remaining = {}
+        for im in self.image_coords:
+            for t in set(im['tiles_to_load']):
+                remaining[t] = remaining.get(t, 0) + 1
 
-        # Delete image to free memory (not sure if this does much though)
-        del img
+        # Order in which tiles will be needed
+        queue = [t for im in self.image_coords for t in im['tiles_to_load']]
+        starts = np.cumsum([0] + [len(im['tiles_to_load']) for im in self.image_coords])
+        queue_ix = 0
 
-        return cropped_img
+        tiles = {}
+        for l, im in enumerate(self.image_coords):
+            needed = set(im['tiles_to_load'])
+
+            if len(needed) > max_safe_tiles:
+                raise ValueError('Memory limit of {} Mb too low: a single '
+                                 'image requires {:.2f} Mb.'.format(self.mem_lim,
+                                            len(needed) * self.bytes_per_tile / 10**6))
+
+            # Get missing tiles plus as many upcoming tiles as the memory
+            # limit allows
+            to_get = [t for t in needed if t not in tiles]
+            if to_get:
+                budget = max_safe_tiles - len(tiles) - len(to_get)
+                to_get = set(to_get)
+                queue_ix = max(queue_ix, starts[l])
+                while budget > 0 and queue_ix < len(queue):
+                    t = queue[queue_ix]
+                    if t not in tiles and t not in to_get:
+                        to_get.add(t)
+                        budget -= 1
+                    queue_ix += 1
+
+                tiles.update(self._get_tiles(list(to_get)))
+
+            yield l, im, tiles
+
+            # Clear tiles that we don't need anymore
+            for t in needed:
+                remaining[t] -= 1
+                if not remaining[t]:
+                    tiles.pop(t, None)
 
     def load_and_save(self, filepath, filename=None):
         """ Download and stitch tiles, and save as images right away (memory
@@ -527,114 +1150,54 @@ class LoadTiles:
                 raise ValueError('Number of filenames must match number of '
                                  'images ({})'.format(len(self.image_coords)))
 
-
-        tiles = {}
-        max_safe_tiles = int((self.mem_lim * 10**6) / self.bytes_per_tile)
-        for l, f, im in zip(range(len(self.image_coords)),
-                            filename,
-                            config.tqdm(self.image_coords, 'Stitching',
+        for l, im, tiles in config.tqdm(self._iter_images(), 'Stitching',
+                                        total=len(self.image_coords),
                                         leave=config.pbar_leave,
-                                        disable=config.pbar_hide)):
-            # Get a list of all tiles that remain to be used and are not
-            # currently part of the tiles
-            remaining_tiles = [t for img in self.image_coords[l:]
-                               for t in img['tiles_to_load']]
-
-            # Clear tiles that we don't need anymore and force garbage collection
-            to_delete = [t for t in tiles if t not in remaining_tiles]
-            for t in to_delete:
-                del tiles[t]
-            gc.collect()
-
-            # Check if we're still missing tiles
-            missing_tiles = [t for t in im['tiles_to_load'] if t not in tiles]
-
-            if len(tiles) == 0 or len(missing_tiles) > 0:
-                tiles_to_get = [
-                    t for t in remaining_tiles if t not in tiles][: max_safe_tiles] + missing_tiles
-            else:
-                tiles_to_get = []
-
-            if tiles_to_get:
-                # Get missing tiles
-                tiles.update(self._get_tiles(tiles_to_get))
-
-            cropped_img = self._stich_tiles(im, tiles)
-
+                                        disable=config.pbar_hide):
             # Save image
-            fp = os.path.join(filepath, f)
-
-            # This prevents a User Warning regarding conversion from int64
-            # to uint8
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                imageio.imwrite(fp ,cropped_img)
-
-            del cropped_img
-
-    def load_in_memory(self):
-        """ Download and stitch tiles, and keep images in memory. Accessible
-        via ``.img`` attribute. """
-        tiles = {}
-        max_safe_tiles = int((self.mem_lim * 10**6) / self.bytes_per_tile)
+            imageio.imwrite(os.path.join(filepath, filename[l]),
+                            self._stich_tiles(im, tiles))
 
-        # Assemble tiles into the requested images
-        images = []
-        for l, im in enumerate(config.tqdm(self.image_coords, 'Stitching',
-                                           leave=config.pbar_leave,
-                                           disable=config.pbar_hide)):
-            # Get a list of all tiles that remain to be used and are not
-            # currently part of the tiles
-            remaining_tiles = [t for img in self.image_coords[l:]
-                               for t in img['tiles_to_load']]
-
-            # Clear tiles that we don't need anymore and force garbage collection
-            to_delete = [t for t in tiles if t not in remaining_tiles]
-            for t in to_delete:
-                del tiles[t]
-            gc.collect()
-
-            # Check if we're still missing tiles
-            missing_tiles = [t for t in im['tiles_to_load'] if t not in tiles]
-
-            if len(tiles) == 0 or len(missing_tiles) > 0:
-                tiles_to_get = [
-                    t for t in remaining_tiles if t not in tiles][: max_safe_tiles] + missing_tiles
-            else:
-                tiles_to_get = []
-
-            if tiles_to_get:
-                # Get missing tiles
-                tiles.update(self._get_tiles(tiles_to_get))
-
-            cropped_img = self._stich_tiles(im, tiles)
+    def load_in_memory(self, memmap=None):
+        """ Download and stitch tiles. Accessible via ``.img`` attribute.
 
-            # Add slice
-            images.append(cropped_img)
-
-        # Clear tile data
-        del tiles
-        gc.collect()
-
-        # Before we assemble all images into a large stack make sure that
-        # all individual images have the same dimensions
-        dims = np.vstack([im.shape for im in images])
-
-        min_dims = np.min(dims, axis=0)
+        Parameters
+        ----------
+        memmap :    str | None, optional
+                    If filename, will stitch slice by slice into a memory
+                    mapped ``.npy`` file instead of keeping the image stack
+                    in memory. Can be reopened with
+                    ``numpy.load(memmap, mmap_mode='r')`` (slices are along
+                    the first axis).
+        """
+        shapes = np.array([self._image_shape(im) for im in self.image_coords])
 
-        # Get standard deviation to check if they are all the same
-        if sum(np.std(dims, axis=0)) != 0:
+        # Make sure that all individual images have the same dimensions
+        min_dims = tuple(int(v) for v in np.min(shapes, axis=0))
+        if np.any(shapes != min_dims):
             logger.warning(
                 'Varying image dimensions detected. Cropping everything to the smallest image size: {0}'.format(min_dims))
 
-            # Crop images to the smallest common dimension
-            for im in images:
-                if im.shape != min_dims:
-                    center = im.shape // 2
-                    im = im[center[0] - min_dims[0]: center[0] + min_dims[0],
-                            center[1] - min_dims[1]: center[1] + min_dims[1]]
+        # Slices are kept contiguous -> (z, y, x)
+        shape = (len(self.image_coords), ) + min_dims
+        if memmap:
+            stack = np.lib.format.open_memmap(memmap, mode='w+',
+                                              dtype=np.uint8, shape=shape)
+        else:
+            stack = np.zeros(shape, dtype=np.uint8)
+
+        # Assemble tiles into the requested images
+        for l, im, tiles in config.tqdm(self._iter_images(), 'Stitching',
+                                        total=len(self.image_coords),
+                                        leave=config.pbar_leave,
+                                        disable=config.pbar_hide):
+            self._stich_tiles(im, tiles, out=stack[l])
 
-        self.img = np.dstack(images).astype(int)
+        if memmap:
+            stack.flush()
+
+        # Expose as (y, x, z) view
+        self.img = np.moveaxis(stack, 0, -1)
 
     def scalebar(self, ax, size=1000, pos='lower left', label=True, line_kws={}, label_kws={}):
         """ Adds scalebar to image.
@@ -829,6 +1392,10 @@ class LoadTiles:
                        edgecolors=cn_ec,
                        **cn_kws)
 
+    def _get_tile_path(self, x, y, z):
+        """ Returns tile path relative to mirror URL (without extension)."""
+        return '{0}/{1}/{2}/{3}'.format(self.zoom_level, z, y, x)
+
     def _get_tile_url(self, x, y, z):
         """ Returns tile url."""
         return '{0}{1}/{2}/{3}/{4}.{5}'.format(self.mirror_url,
@@ -872,61 +1439,78 @@ class LoadTiles:
         # Get nodes that have a parent in our list
         has_parent = nodes[nodes.parent_id.isin(nodes.treenode_id)]
 
-        # Get treenode and parent section
-        tn_section = has_parent.z.values / self.resolution_z
-        pn_section = nodes.set_index(
-            'treenode_id').loc[has_parent.parent_id.values, 'z'].values / self.resolution_z
+        # Get treenode and parent locations
+        locs = nodes.set_index('treenode_id')[['x', 'y', 'z']]
+        tn_locs = has_parent[['x', 'y', 'z']].values
+        pn_locs = locs.loc[has_parent.parent_id.values].values
 
         # Get distance in sections
-        sec_dist = np.absolute(tn_section - pn_section)
+        sec_dist = np.absolute(tn_locs[:, 2] / self.resolution_z
+                               - pn_locs[:, 2] / self.resolution_z)
 
         # Get those that have more than one section in between them
-        to_interpolate = has_parent[sec_dist > 1]
-        tn_locs = to_interpolate[['x', 'y', 'z']].values
-        pn_locs = nodes.set_index('treenode_id').loc[to_interpolate.parent_id, [
-            'x', 'y', 'z']].values
-        distances = sec_dist[sec_dist > 1].astype(int)
-        skids = to_interpolate.skeleton_id.values
-
-        virtual_nodes = []
-        for i in range(to_interpolate.shape[0]):
-            x_interp = np.round(np.linspace(
-                tn_locs[i][0], pn_locs[i][0], distances[i] + 1).astype(int))
-            y_interp = np.round(np.linspace(
-                tn_locs[i][1], pn_locs[i][1], distances[i] + 1).astype(int))
-            z_interp = np.round(np.linspace(
-                tn_locs[i][2], pn_locs[i][2], distances[i] + 1))
-
-            virtual_nodes += [[x_interp[k], y_interp[k], z_interp[k], skids[i]]
-                              for k in range(1, len(x_interp) - 1)]
-
-        virtual_nodes = pd.DataFrame(virtual_nodes,
-                                     columns=['x', 'y', 'z', 'skeleton_id'])
+        to_interpolate = sec_dist > 1
+        tn_locs = tn_locs[to_interpolate].astype(float)
+        pn_locs = pn_locs[to_interpolate].astype(float)
+        distances = sec_dist[to_interpolate].astype(int)
+        skids = has_parent.skeleton_id.values[to_interpolate]
+
+        # One virtual node per section in between treenode and parent:
+        # same as np.linspace(tn, pn, distance + 1)[1:-1] for each edge
+        n_virt = np.maximum(distances - 1, 0)
+        edge = np.repeat(np.arange(len(distances)), n_virt)
+        k = np.arange(len(edge)) - np.repeat(np.cumsum(n_virt) - n_virt,
+                                             n_virt) + 1
+        step = (pn_locs[edge] - tn_locs[edge]) / distances[edge][:, None]
+        interp = k[:, None] * step + tn_locs[edge]
+
+        virtual_nodes = pd.DataFrame({'x': interp[:, 0].astype(int),
+                                      'y': interp[:, 1].astype(int),
+                                      'z': np.round(interp[:, 2]),
+                                      'skeleton_id': skids[edge]})
 
         return pd.concat([nodes, virtual_nodes], axis=0, ignore_index=True)
 
-    def render_im(self, slider=False, ax=None, **kwargs):
-        """ Draw image slices with a slider."""
+    def render_im(self, slider=False, ax=None, prefetch=2, **kwargs):
+        """ Draw image slices with a slider.
+
+        If images have not been loaded via :func:`load_in_memory`, slices
+        are downloaded on demand as the slider moves and ``prefetch``
+        neighbouring slices are downloaded in the background.
+        """
 
         if isinstance(ax, type(None)):
             fig, ax = plt.subplots(**kwargs)
             ax.set_aspect('equal')
+        else:
+            fig = ax.get_figure()
 
         plt.subplots_adjust(bottom=0.25)
 
-        mpl_img = ax.imshow(self.img[:, :, 0], cmap='gray')
+        # Browse slices on demand if images have not been loaded
+        lazy = isinstance(getattr(self, 'img', None), type(None))
+
+        def get_slice(ix):
+            if not lazy:
+                return self.img[:, :, ix]
+            if slider:
+                self.prefetch(ix, n=prefetch)
+            return self.get_image(ix)
+
+        mpl_img = ax.imshow(get_slice(0), cmap='gray')
 
         if slider:
             axcolor = 'grey'
             axslice = plt.axes([0.25, 0.1, 0.5, 0.03], facecolor=axcolor)
 
-            sslice = Slider(axslice, 'Slice', 1, self.img.shape[2],
+            n_slices = len(self.image_coords) if lazy else self.img.shape[2]
+            sslice = Slider(axslice, 'Slice', 1, n_slices,
                             valinit=0, valfmt='%i')
 
             def update(val):
                 slice_ix = int(round(sslice.val))
                 sslice.valtext.set_text(str(slice_ix))
-                mpl_img.set_data(self.img[:, :, slice_ix - 1])
+                mpl_img.set_data(get_slice(slice_ix - 1))
                 fig.canvas.draw_idle()
 
             sslice.on_changed(update)
@@ -934,6 +1518,15 @@ class LoadTiles:
         return ax
 
 
+def _decode_tile(content):
+    """ Decodes tile image to 2D uint8 array. """
+    tile = np.asarray(imageio.imread(content))
+    # Collapse RGB(A) tiles to a single channel
+    if tile.ndim == 3:
+        tile = tile[:, :, 0]
+    return tile.astype(np.uint8, copy=False)
+
+
 def test_response_time(url, calls=5):
     """ Returns server response time. If unresponsive returns float("inf") """
     resp_times = []
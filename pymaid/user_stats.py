@@ -151,7 +151,8 @@ def get_user_stats(start_date=None, end_date=None, remote_instance=None):
     return stats
 
 
-def get_team_contributions(teams, neurons=None, remote_instance=None):
+def get_team_contributions(teams, neurons=None, remote_instance=None,
+                           node_store=None):
     """ Get contributions by teams: nodes, reviews, connectors, time invested.
 
     Notes
@@ -200,6 +201,9 @@ def get_team_contributions(teams, neurons=None, remote_instance=None):
                         function.
     remote_instance :   Catmaid Instance, optional
                         Either pass explicitly or define globally.
+    node_store :        NodeDetailStore, optional
+                        If provided, node details are fetched through this
+                        store, i.e. only new or changed nodes are downloaded.
 
     Returns
     -------
@@ -301,8 +305,9 @@ def get_team_contributions(teams, neurons=None, remote_instance=None):
             raise ValueError('User "{}" not found in user list'.format(u))
 
     # Get all node details
-    all_node_details = fetch.get_node_details(neurons,
-                                              remote_instance=remote_instance)
+    all_node_details, all_reviews = _get_node_details(neurons,
+                                                      remote_instance=remote_instance,
+                                                      node_store=node_store)
 
     # Get connector links
     link_details = fetch.get_connector_links(neurons)
@@ -312,98 +317,86 @@ def get_team_contributions(teams, neurons=None, remote_instance=None):
     link_details = link_details[link_details.connector_id.isin(neurons.connectors.connector_id.values)]
 
     interval = 3
-    bin_width = '%iMin' % interval
     minimum_actions = 10 * interval
-    stats = []
-    for n in config.tqdm(neurons, desc='Processing',
-                         disable=config.pbar_hide, leave=config.pbar_leave):
-        # Get node details
-        tn_ids = n.nodes.treenode_id.values.astype(str)
-        cn_ids = n.connectors.connector_id.values.astype(str)
-
-        current_status = config.pbar_hide
-        config.pbar_hide = True
-        node_details = all_node_details[all_node_details.node_id.isin(np.append(tn_ids, cn_ids))]
-        config.pbar_hide = current_status
-
-        # Extract node creation
-        node_creation = node_details.loc[node_details.node_id.isin(tn_ids),
-                                         ['creator', 'creation_time']].values
-        node_creation = np.c_[node_creation, ['node_creation'] * node_creation.shape[0]]
-
-        # Extract connector creation
-        cn_creation = node_details.loc[node_details.node_id.isin(cn_ids),
-                                         ['creator', 'creation_time']].values
-        cn_creation = np.c_[cn_creation, ['cn_creation'] * cn_creation.shape[0]]
-
-        # Extract edition times (treenodes + connectors)
-        node_edits = node_details.loc[:, ['editor', 'edition_time']].values
-        node_edits = np.c_[node_edits, ['editor'] * node_edits.shape[0]]
-
-        # Link creation
-        link_creation = link_details.loc[link_details.connector_id.isin(cn_ids),
-                                         ['creator_id', 'creation_time']].values
-        link_creation = np.c_[link_creation, ['link_creation'] * link_creation.shape[0]]
-
-        # Extract review times
-        reviewers = [u for l in node_details.reviewers.values for u in l]
-        timestamps = [ts for l in node_details.review_times.values for ts in l]
-        node_review = np.c_[reviewers, timestamps, ['review'] * len(reviewers)]
-
-        # Merge all timestamps (ignore edits for now) to get time_invested
-        all_ts = pd.DataFrame(np.vstack([node_creation,
-                                         node_review,
-                                         cn_creation,
-                                         link_creation,
-                                         node_edits]),
-                              columns=['user', 'timestamp', 'type'])
-
-        # Add column with just the date and make it the index
-        all_ts['date'] = [v for v in all_ts.timestamp.astype('datetime64[D]').values]
-        all_ts.index = pd.to_datetime(all_ts.date)
-
-        # Fill in teams for each timestamp based on user + date
-        all_ts['team'] = None
-        for t in teams:
-            for u in teams[t]:
-                # Assign all timestamps by this user in the right time to
-                # this team
-                existing_dates = (teams[t][u] & all_ts.index).unique()
-                ss = (all_ts.index.isin(existing_dates)) & (all_ts.user.values == user_list.loc[u, 'id'])
-                all_ts.loc[ss, 'team'] = t
-
-        # Get total
-        total_time = sum(all_ts.timestamp.to_frame().set_index(
-                'timestamp', drop=False).groupby(pd.Grouper(freq=bin_width)).count().values >= minimum_actions)[0] * interval
-
-        this_neuron = [n.skeleton_id, n.n_nodes, n.n_connectors,
-                       node_review.shape[0], total_time]
-        # Go over the teams and collect values
-        for t in teams:
-            # Subset to team
-            this_team = all_ts[all_ts.team == t]
-            if this_team.shape[0] > 0:
-                # Subset to user ID
-                team_time = sum(this_team.timestamp.to_frame().set_index(
-                    'timestamp', drop=False).groupby(pd.Grouper(freq=bin_width)).count().values >= minimum_actions)[0] * interval
-                team_nodes = this_team[this_team['type'] == 'node_creation'].shape[0]
-                team_cn = this_team[this_team['type'] == 'cn_creation'].shape[0]
-                team_rev = this_team[this_team['type'] == 'review'].shape[0]
-            else:
-                team_nodes = team_cn = team_rev = team_time = 0
-
-            this_neuron += [team_nodes, team_cn, team_rev, team_time]
-
-        stats.append(this_neuron)
-
-    cols = ['skeleton_id', 'total_nodes', 'total_connectors',
-            'total_reviews', 'total_time']
 
-    for t in teams:
-        for s in ['nodes', 'connectors', 'reviews', 'time']:
-            cols += ['{}_{}'.format(t, s)]
-
-    stats = pd.DataFrame(stats, columns=cols)
+    # Generate one table of events: (neuron, user, timestamp, type)
+    # A node (e.g. a connector) can belong to multiple neurons
+    skids = [n.skeleton_id for n in neurons]
+    tn = pd.DataFrame({'neuron': np.repeat(np.arange(len(neurons)),
+                                           [n.nodes.shape[0] for n in neurons]),
+                       'node_id': np.concatenate([n.nodes.treenode_id.values for n in neurons] + [[]]).astype(np.int64)})
+    cn = pd.DataFrame({'neuron': np.repeat(np.arange(len(neurons)),
+                                           [n.connectors.shape[0] for n in neurons]),
+                       'node_id': np.concatenate([n.connectors.connector_id.values for n in neurons] + [[]]).astype(np.int64)})
+    tn = tn.drop_duplicates()
+    cn = cn.drop_duplicates()
+    tn_cn = pd.concat([tn, cn], axis=0, ignore_index=True).drop_duplicates()
+
+    details = all_node_details.drop_duplicates('node_id')
+    tn_det = tn.merge(details, on='node_id')
+    cn_det = cn.merge(details, on='node_id')
+    all_det = tn_cn.merge(details, on='node_id')
+    rev = tn_cn.merge(all_reviews, on='node_id')
+    links = cn.merge(link_details[['connector_id', 'creator_id', 'creation_time']],
+                     left_on='node_id', right_on='connector_id')
+
+    # Types: 0 = node creation, 1 = review, 2 = connector creation,
+    # 3 = link creation, 4 = edition
+    parts = [(tn_det, 'creator', 'creation_time'),
+             (rev, 'reviewer', 'review_time'),
+             (cn_det, 'creator', 'creation_time'),
+             (links, 'creator_id', 'creation_time'),
+             (all_det, 'editor', 'edition_time')]
+    neuron = np.concatenate([p.neuron.values for p, _, _ in parts]).astype(np.int64)
+    user = np.concatenate([p[u].values for p, u, _ in parts]).astype(np.int64)
+    ts = np.concatenate([p[t].values.astype('datetime64[m]') for p, _, t in parts]).astype(np.int64)
+    types = np.repeat(np.arange(len(parts)), [p.shape[0] for p, _, _ in parts])
+
+    # Assign events to teams based on user + date (later teams take
+    # precedence as users can be in multiple teams)
+    team = np.full(user.shape[0], -1, dtype=np.int64)
+    days = ts // 1440
+    for i, t in enumerate(teams):
+        for u in teams[t]:
+            dates = np.asarray(teams[t][u].values, dtype='datetime64[D]').astype(np.int64)
+            team[(user == user_list.loc[u, 'id']) & np.isin(days, dates)] = i
+
+    n_neurons, n_teams = len(neurons), len(teams)
+
+    def active_time(codes, times, n_codes):
+        """ Minutes in active bins per code. """
+        if not codes.shape[0]:
+            return np.zeros(n_codes, dtype=int)
+        bins = times // interval
+        offset = bins.min()
+        span = bins.max() - offset + 1
+        key, counts = np.unique(codes * span + (bins - offset), return_counts=True)
+        return np.bincount(key[counts >= minimum_actions] // span,
+                           minlength=n_codes) * interval
+
+    # Total time across all users and time per team
+    total_time = active_time(neuron, ts, n_neurons)
+    in_team = team >= 0
+    team_time = active_time(team[in_team] * n_neurons + neuron[in_team],
+                            ts[in_team],
+                            n_teams * n_neurons).reshape(n_teams, n_neurons)
+
+    # Count per team, type and neuron
+    counts = np.bincount((team[in_team] * len(parts) + types[in_team]) * n_neurons + neuron[in_team],
+                         minlength=n_teams * len(parts) * n_neurons).reshape(n_teams, len(parts), n_neurons)
+
+    stats = pd.DataFrame({'skeleton_id': skids,
+                          'total_nodes': [n.n_nodes for n in neurons],
+                          'total_connectors': [n.n_connectors for n in neurons],
+                          'total_reviews': np.bincount(rev.neuron.values,
+                                                       minlength=n_neurons),
+                          'total_time': total_time})
+
+    for i, t in enumerate(teams):
+        stats['{}_nodes'.format(t)] = counts[i, 0]
+        stats['{}_connectors'.format(t)] = counts[i, 2]
+        stats['{}_reviews'.format(t)] = counts[i, 1]
+        stats['{}_time'.format(t)] = team_time[i]
 
     cols_ordered = ['skeleton_id'] + ['{}_{}'.format(t, v) for v in
                     ['nodes', 'connectors', 'reviews', 'time']for t in ['total'] + list(teams)]
@@ -535,7 +528,7 @@ def get_user_contributions(x, teams=None, remote_instance=None):
 
 def get_time_invested(x, mode='SUM', minimum_actions=10, max_inactive_time=3,
                       treenodes=True, connectors=True, start_date=None,
-                      end_date=None, remote_instance=None):
+                      end_date=None, remote_instance=None, node_store=None):
     """ Calculates the time individual users have spent working on a set of
     neurons.
 
@@ -573,12 +566,14 @@ def get_time_invested(x, mode='SUM', minimum_actions=10, max_inactive_time=3,
                         2. neuron name (str, must be exact match)
                         3. annotation: e.g. 'annotation:PN right'
                         4. CatmaidNeuron or CatmaidNeuronList object
+                        5. dict of any of the above: ``{'set1': skids1, ...}``
 
                         If you pass a CatmaidNeuron/List, its node/connectors
                         are used to calculate time invested. You can exploit
                         this to get time spent reconstructing in given
                         compartment of a neurons, e.g. by pruning it to a
                         volume before passing it to ``get_time_invested``.
+                        If dict, data for all sets is fetched in one go.
     mode :              'SUM' | 'OVER_TIME' | 'ACTIONS', optional
                         (1) 'SUM' will return total time invested (in minutes)
                             per user.
@@ -606,6 +601,9 @@ def get_time_invested(x, mode='SUM', minimum_actions=10, max_inactive_time=3,
                         See ``start_date``.
     remote_instance :   CatmaidInstance, optional
                         Either pass explicitly or define globally.
+    node_store :        NodeDetailStore, optional
+                        If provided, node details are fetched through this
+                        store, i.e. only new or changed nodes are downloaded.
 
     Returns
     -------
@@ -630,6 +628,9 @@ def get_time_invested(x, mode='SUM', minimum_actions=10, max_inactive_time=3,
         `ACTIONS`, values represent actions (creation, edition, review) on that
         day.
 
+        If ``x`` is a dict, above DataFrames are concatenated and indexed by
+        ``(set, user)``.
+
 
     Examples
     --------
@@ -650,6 +651,12 @@ def get_time_invested(x, mode='SUM', minimum_actions=10, max_inactive_time=3,
     ...                                     end_date=[2018, 1, 31])
 
 
+    Get time invested for several sets of neurons at once:
+
+    >>> time = pymaid.get_time_invested({'DA1': 'annotation:glomerulus DA1',
+    ...                                  'DA2': 'annotation:glomerulus DA2'})
+    >>> time.loc['DA1']
+
     Plot pie chart of contributions per user using Plotly:
 
     >>> import plotly
@@ -671,29 +678,13 @@ def get_time_invested(x, mode='SUM', minimum_actions=10, max_inactive_time=3,
 
     """
 
-    def _extract_timestamps(ts, desc='Calc'):
-        if ts.empty:
-            return {}
-        grouped = ts.set_index('timestamp',
-                               drop=False).groupby(['user',
-                                                    pd.Grouper(freq=bin_width)]).count() >= minimum_actions
-        temp_stats = {}
-        for u in config.tqdm(set(ts.user.unique()) & set(relevant_users),
-                             desc=desc, disable=config.pbar_hide, leave=False):
-            temp_stats[u] = sum(grouped.loc[u].values)[0] * interval
-        return temp_stats
-
     if mode not in ['SUM', 'OVER_TIME', 'ACTIONS']:
         raise ValueError('Unknown mode "%s"' % str(mode))
 
     remote_instance = utils._eval_remote_instance(remote_instance)
 
-    skids = utils.eval_skids(x, remote_instance)
-
     # Maximal inactive time is simply translated into binning
-    # We need this later for pandas.TimeGrouper() anyway
     interval = max_inactive_time
-    bin_width = '%iMin' % interval
 
     # Update minimum_actions to reflect actions/interval instead of
     # actions/minute
@@ -701,144 +692,212 @@ def get_time_invested(x, mode='SUM', minimum_actions=10, max_inactive_time=3,
 
     user_list = fetch.get_user_list(remote_instance).set_index('id')
 
-    if not isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
-        x = fetch.get_neuron(skids, remote_instance=remote_instance)
-
-    if isinstance(x, core.CatmaidNeuron):
-        skdata = core.CatmaidNeuronList(x)
-    elif isinstance(x, core.CatmaidNeuronList):
-        skdata = x
-
     if not isinstance(end_date, (datetime.date, np.datetime64, type(None))):
         end_date = datetime.date(*end_date)
 
     if not isinstance(start_date, (datetime.date, np.datetime64, type(None))):
         start_date = datetime.date(*start_date)
 
+    # Multiple sets of neurons are processed together
+    if isinstance(x, dict):
+        sets = x
+    else:
+        sets = {None: x}
+
+    # Turn all sets into CatmaidNeuronLists - fetch missing neurons in one go
+    to_fetch = {k: utils.eval_skids(v, remote_instance=remote_instance)
+                for k, v in sets.items()
+                if not isinstance(v, (core.CatmaidNeuron, core.CatmaidNeuronList))}
+    if to_fetch:
+        fetched = fetch.get_neuron(list(set([s for v in to_fetch.values() for s in v])),
+                                   remote_instance=remote_instance)
+        fetched = core.CatmaidNeuronList(fetched)
+
+    neurons = {}
+    for k, v in sets.items():
+        if k in to_fetch:
+            skids = [str(s) for s in to_fetch[k]]
+            neurons[k] = core.CatmaidNeuronList([n for n in fetched
+                                                 if n.skeleton_id in skids])
+        else:
+            neurons[k] = core.CatmaidNeuronList(v)
+
     # Extract connector and node IDs
-    node_ids = []
-    connector_ids = []
-    for n in skdata.itertuples():
-        if treenodes:
-            node_ids += n.nodes.treenode_id.tolist()
-        if connectors:
-            connector_ids += n.connectors.connector_id.tolist()
+    node_ids = {}
+    connector_ids = {}
+    for k, nl in neurons.items():
+        node_ids[k] = nl.nodes.treenode_id.values if treenodes else np.array([], dtype=int)
+        connector_ids[k] = nl.connectors.connector_id.values if connectors else np.array([], dtype=int)
+
+    all_nodes = np.unique(np.concatenate(list(node_ids.values()) + list(connector_ids.values())))
+    all_skids = np.unique(np.concatenate([nl.skeleton_id for nl in neurons.values()]))
 
     # Get node details
-    node_details = fetch.get_node_details(
-        node_ids + connector_ids, remote_instance=remote_instance)
+    node_details, reviews = _get_node_details(all_nodes,
+                                              remote_instance=remote_instance,
+                                              node_store=node_store,
+                                              skeleton_ids=all_skids)
 
     if connectors:
         # Get details for links
-        link_details = fetch.get_connector_links(skdata)
+        link_details = fetch.get_connector_links(all_skids,
+                                                 remote_instance=remote_instance)
+        link_details['skeleton_id'] = link_details.skeleton_id.astype(str)
+    else:
+        link_details = pd.DataFrame([], columns=['skeleton_id', 'connector_id',
+                                                 'creator_id', 'creation_time'])
+
+    stats = {}
+    for k, nl in neurons.items():
+        this_nodes = np.append(node_ids[k], connector_ids[k])
+        this_details = node_details[node_details.node_id.isin(this_nodes)]
 
         # link_details contains all links. We have to subset this to existing
         # connectors in case the input neurons have been pruned
-        link_details = link_details[link_details.connector_id.isin(connector_ids)]
-    else:
-        link_details = pd.DataFrame([], columns=['creator_id', 'creation_time'])
+        this_links = link_details[link_details.connector_id.isin(connector_ids[k])
+                                  & link_details.skeleton_id.isin(nl.skeleton_id)]
+
+        # Remove timestamps outside of date range (if provided)
+        if start_date:
+            this_details = this_details[this_details.creation_time >= np.datetime64(start_date)]
+            this_links = this_links[this_links.creation_time >= np.datetime64(start_date)]
+        if end_date:
+            this_details = this_details[this_details.creation_time <= np.datetime64(end_date)]
+            this_links = this_links[this_links.creation_time <= np.datetime64(end_date)]
+
+        this_reviews = reviews[reviews.node_id.isin(this_details.node_id.values)]
+
+        # Collect (user, timestamp, action) for creation, edition and review.
+        # Edition can't use links as there is no editor
+        users = np.concatenate([this_details.creator.values,
+                                this_links.creator_id.values,
+                                this_details.editor.values,
+                                this_reviews.reviewer.values]).astype(np.int64)
+        times = np.concatenate([this_details.creation_time.values,
+                                this_links.creation_time.values,
+                                this_details.edition_time.values,
+                                this_reviews.review_time.values]).astype('datetime64[m]')
+        actions = np.repeat([0, 0, 1, 2], [this_details.shape[0],
+                                           this_links.shape[0],
+                                           this_details.shape[0],
+                                           this_reviews.shape[0]])
+
+        stats[k] = _time_invested(users, times, actions, mode, interval,
+                                  minimum_actions, user_list)
+
+    if list(stats.keys()) == [None]:
+        return stats[None]
+
+    return pd.concat(stats, axis=0, names=['set']).fillna(0)
+
+
+def _time_invested(users, times, actions, mode, interval, minimum_actions,
+                   user_list):
+    """ Bin actions by user and time to calculate time invested.
 
-    # Remove timestamps outside of date range (if provided)
-    if start_date:
-        node_details = node_details[node_details.creation_time >= np.datetime64(start_date)]
-        link_details = link_details[link_details.creation_time >= np.datetime64(start_date)]
-    if end_date:
-        node_details = node_details[node_details.creation_time <= np.datetime64(end_date)]
-        link_details = link_details[link_details.creation_time <= np.datetime64(end_date)]
-
-    # Dataframe for creation (i.e. the actual generation of the nodes)
-    creation_timestamps = np.append(node_details[['creator', 'creation_time']].values,
-                                    link_details[['creator_id', 'creation_time']].values,
-                                    axis=0)
-    creation_timestamps = pd.DataFrame(creation_timestamps,
-                                       columns=['user', 'timestamp'])
+    Parameters
+    ----------
+    users :             numpy.ndarray
+                        User ID for each action.
+    times :             numpy.ndarray
+                        datetime64[m] timestamp for each action.
+    actions :           numpy.ndarray
+                        Type of each action: 0 = creation, 1 = edition,
+                        2 = review.
+    mode :              'SUM' | 'OVER_TIME' | 'ACTIONS'
+                        See :func:`~pymaid.get_time_invested`.
+    interval :          int
+                        Bin width in minutes.
+    minimum_actions :   int
+                        Minimum actions per bin to count as active.
+    user_list :         pandas.DataFrame
+                        User list with ID as index.
 
-    # Dataframe for edition times - can't use links as there is no editor
-    edition_timestamps = node_details[['editor', 'edition_time']]
-    edition_timestamps.columns = ['user', 'timestamp']
+    Returns
+    -------
+    pandas.DataFrame
 
-    # Generate dataframe for reviews
-    reviewers = [u for l in node_details.reviewers.values for u in l]
-    timestamps = [ts for l in node_details.review_times.values for ts in l]
-    review_timestamps = pd.DataFrame([[u, ts] for u, ts in zip(
-        reviewers, timestamps)], columns=['user', 'timestamp'])
+    """
+    # Integer user codes and minutes
+    uid, ucode = np.unique(users, return_inverse=True)
+    minutes = times.astype(np.int64)
+    n_users = uid.shape[0]
+
+    if not n_users:
+        if mode == 'SUM':
+            return pd.DataFrame([], columns=['total', 'creation', 'edition',
+                                             'review'],
+                                index=pd.Index([], name='user'))
+        return pd.DataFrame([], index=['all_users'])
+
+    logins = user_list.reindex(uid).login.fillna(pd.Series(uid.astype(str),
+                                                           index=uid)).values
+
+    def count_bins(codes, bins):
+        """ Count actions per (code, bin). Returns codes, bins and counts. """
+        offset = bins.min()
+        span = bins.max() - offset + 1
+        key, counts = np.unique(codes.astype(np.int64) * span + (bins - offset),
+                                return_counts=True)
+        return key // span, key % span + offset, counts
+
+    bins = minutes // interval
+    if mode == 'SUM':
+        res = {}
+        for name, sel in zip(['total', 'creation', 'edition', 'review'],
+                             [slice(None), actions == 0, actions == 1, actions == 2]):
+            if not ucode[sel].shape[0]:
+                res[name] = np.zeros(n_users, dtype=int)
+                continue
+            codes, _, counts = count_bins(ucode[sel], bins[sel])
+            res[name] = np.bincount(codes[counts >= minimum_actions],
+                                    minlength=n_users) * interval
+
+        df = pd.DataFrame(res, columns=['total', 'creation', 'edition', 'review'])
+        df['user'] = logins
+
+        # Only users with the minimum number of actions in total
+        df = df[np.bincount(ucode, minlength=n_users) >= minimum_actions]
+
+        return df.sort_values('total', ascending=False).reset_index(drop=True).set_index('user')
+
+    # Rows are ordered by first action
+    first = np.full(n_users, minutes.max(), dtype=np.int64)
+    np.minimum.at(first, ucode, minutes)
+    order = np.argsort(first, kind='mergesort')
+
+    if mode == 'ACTIONS':
+        codes, days, counts = count_bins(ucode, minutes // 1440)
+        all_days, all_counts = days, counts
+    else:
+        # First count all bins with minimum number of actions per user...
+        codes, ubins, counts = count_bins(ucode, bins)
+        active = counts > minimum_actions
+        codes, days = codes[active], ubins[active] * interval // 1440
+        counts = np.ones(codes.shape[0], dtype=int)
 
-    # Merge all timestamps
-    all_timestamps = pd.concat(
-        [creation_timestamps, edition_timestamps, review_timestamps], axis=0)
+        # ... and across all users
+        _, abins, acounts = count_bins(np.zeros(bins.shape[0], dtype=int), bins)
+        all_days = abins[acounts > minimum_actions] * interval // 1440
+        all_counts = np.ones(all_days.shape[0], dtype=int)
 
-    all_timestamps.sort_values('timestamp', inplace=True)
+    if not all_days.shape[0]:
+        return pd.DataFrame([], index=['all_users'] + list(logins[order]))
 
-    relevant_users = all_timestamps.groupby('user').count()
-    relevant_users = relevant_users[relevant_users.timestamp >= minimum_actions].index.values
+    # Generate users x days matrix
+    first_day = all_days.min()
+    n_days = all_days.max() - first_day + 1
+    mat = np.zeros((n_users + 1, n_days), dtype=int)
+    np.add.at(mat, (np.zeros(all_days.shape[0], dtype=int), all_days - first_day), all_counts)
+    np.add.at(mat, (codes + 1, days - first_day), counts)
 
-    if mode == 'SUM':
-        stats = {
-            'total': {u: 0 for u in relevant_users},
-            'creation': {u: 0 for u in relevant_users},
-            'edition': {u: 0 for u in relevant_users},
-            'review': {u: 0 for u in relevant_users}
-        }
-        stats['total'].update(_extract_timestamps(all_timestamps,
-                                                  desc='Calc total'))
-        stats['creation'].update(_extract_timestamps(creation_timestamps,
-                                                     desc='Calc creation'))
-        stats['edition'].update(_extract_timestamps(edition_timestamps,
-                                                    desc='Calc edition'))
-        stats['review'].update(_extract_timestamps(review_timestamps,
-                                                   desc='Calc review'))
-
-        return pd.DataFrame([[user_list.loc[u, 'login'],
-                              stats['total'][u],
-                              stats['creation'][u],
-                              stats['edition'][u],
-                              stats['review'][u]] for u in relevant_users],
-                            columns=['user', 'total', 'creation', 'edition', 'review']).sort_values('total', ascending=False).reset_index(drop=True).set_index('user')
-
-    elif mode == 'ACTIONS':
-        all_ts = all_timestamps.set_index('timestamp', drop=False).timestamp.groupby(
-            pd.Grouper(freq='1d')).count().to_frame()
-        all_ts.columns = ['all_users']
-        all_ts = all_ts.T
-        # Get total time spent
-        for u in config.tqdm(all_timestamps.user.unique(), desc='Calc. total',
-                             disable=config.pbar_hide, leave=False):
-            this_ts = all_timestamps[all_timestamps.user == u].set_index(
-                'timestamp', drop=False).timestamp.groupby(pd.Grouper(freq='1d')).count().to_frame()
-            this_ts.columns = [user_list.loc[u, 'login']]
-
-            all_ts = pd.concat([all_ts, this_ts.T])
-
-        return all_ts.fillna(0)
-
-    elif mode == 'OVER_TIME':
-        # First count all minutes with minimum number of actions
-        minutes_counting = (all_timestamps.set_index('timestamp', drop=False).timestamp.groupby(
-            pd.Grouper(freq=bin_width)).count().to_frame() > minimum_actions)
-        # Then remove the minutes that have less than minimum actions
-        minutes_counting = minutes_counting[minutes_counting.timestamp == True]
-        # Now group by hour
-        all_ts = minutes_counting.groupby(pd.Grouper(freq='1d')).count()
-        all_ts.columns = ['all_users']
-        all_ts = all_ts.T
-        # Get total time spent
-        for u in config.tqdm(all_timestamps.user.unique(), desc='Calc. total', disable=config.pbar_hide, leave=False):
-            minutes_counting = (all_timestamps[all_timestamps.user == u].set_index(
-                'timestamp', drop=False).timestamp.groupby(pd.Grouper(freq=bin_width)).count().to_frame() > minimum_actions)
-            minutes_counting = minutes_counting[minutes_counting.timestamp == True]
-            this_ts = minutes_counting.groupby(pd.Grouper(freq='1d')).count()
-
-            this_ts.columns = [user_list.loc[u, 'login']]
-
-            all_ts = pd.concat([all_ts, this_ts.T])
-
-        all_ts.fillna(0, inplace=True)
-
-        return all_ts
+    return pd.DataFrame(mat[np.append(0, order + 1)],
+                        index=['all_users'] + list(logins[order]),
+                        columns=pd.DatetimeIndex((np.arange(n_days) + first_day).astype('datetime64[D]')))
 
 
 def get_user_actions(users=None, neurons=None, start_date=None, end_date=None,
-                     remote_instance=None):
+                     remote_instance=None, node_store=None):
     """ Get timestamps of users' actions (creations, editions, reviews,
     linking).
 
@@ -864,6 +923,9 @@ def get_user_actions(users=None, neurons=None, start_date=None, end_date=None,
     end_date :        tuple | datetime.date, optional
                       Start and end date of time window to check.
     remote_instance : CatmaidInstance, optional
+    node_store :      NodeDetailStore, optional
+                      If provided, node details are fetched through this
+                      store, i.e. only new or changed nodes are downloaded.
 
     Return
     ------
@@ -930,8 +992,10 @@ def get_user_actions(users=None, neurons=None, start_date=None, end_date=None,
     connector_ids = neurons.connectors.connector_id.tolist()
 
     # Get node details
-    node_details = fetch.get_node_details(
-        node_ids + connector_ids, remote_instance=remote_instance)
+    node_details, reviews = _get_node_details(node_ids + connector_ids,
+                                              remote_instance=remote_instance,
+                                              node_store=node_store,
+                                              skeleton_ids=neurons.skeleton_id)
 
     # Get details for links
     link_details = fetch.get_connector_links(neurons)
@@ -952,10 +1016,9 @@ def get_user_actions(users=None, neurons=None, start_date=None, end_date=None,
     linking_timestamps.columns = ['user', 'timestamp', 'action']
 
     # Generate dataframe for reviews
-    reviewers = [u for l in node_details.reviewers.tolist() for u in l]
-    timestamps = [ts for l in node_details.review_times.tolist() for ts in l]
-    review_timestamps = pd.DataFrame([[u, ts, 'review'] for u, ts in zip(
-        reviewers, timestamps)], columns=['user', 'timestamp', 'action'])
+    review_timestamps = reviews[['reviewer', 'review_time']]
+    review_timestamps['action'] = 'review'
+    review_timestamps.columns = ['user', 'timestamp', 'action']
 
     # Merge all timestamps
     all_timestamps = pd.concat([creation_timestamps,
@@ -977,3 +1040,24 @@ def get_user_actions(users=None, neurons=None, start_date=None, end_date=None,
         all_timestamps = all_timestamps[all_timestamps.timestamp.values <= np.datetime64(end_date)]
 
     return all_timestamps.sort_values('timestamp').reset_index(drop=True)
+
+
+def _get_node_details(x, remote_instance=None, node_store=None,
+                      skeleton_ids=None):
+    """ Get node details and reviews - via ``node_store`` if provided.
+
+    Stored treenodes are checked against their current edition times if
+    ``x`` is a CatmaidNeuron/List or ``skeleton_ids`` are given.
+    """
+    if isinstance(node_store, type(None)):
+        return fetch.get_node_details(x, remote_instance=remote_instance,
+                                      return_reviews=True)
+    if isinstance(skeleton_ids, type(None)) and \
+       not isinstance(x, (core.CatmaidNeuron, core.CatmaidNeuronList)):
+        edition_times = None
+    else:
+        edition_times = 'fetch'
+    return node_store.get_node_details(x, remote_instance=remote_instance,
+                                       edition_times=edition_times,
+                                       skeleton_ids=skeleton_ids,
+                                       return_reviews=True)
@@ -151,6 +151,16 @@ def _is_iterable(x):
         return False
 
 
+def _is_int(x):
+    """ Helper function. Returns True if x can be converted to int.
+    """
+    try:
+        int(x)
+        return True
+    except BaseException:
+        return False
+
+
 def _eval_conditions(x):
     """ Splits list of strings into positive (no ~) and negative (~) conditions
     """
@@ -344,29 +354,32 @@ def eval_skids(x, remote_instance=None, warn_duplicates=True):
             int(x)
             return [str(x)]
         except BaseException:
-            if x.startswith('annotation:') or x.startswith('annotations:'):
-                an = x[x.index(':') + 1:]
-                return fetch.get_skids_by_annotation(an,
-                                                     remote_instance=remote_instance)
-            elif x.startswith('name:'):
-                return fetch.get_skids_by_name(x[5:],
-                                               remote_instance=remote_instance,
-                                               allow_partial=False
-                                               ).skeleton_id.tolist()
-            else:
-                return fetch.get_skids_by_name(x,
-                                               remote_instance=remote_instance,
-                                               allow_partial=False
-                                               ).skeleton_id.tolist()
+            return fetch._resolve_skid_queries([x],
+                                               remote_instance=remote_instance)[x]
     elif isinstance(x, (list, np.ndarray, set)):
+        # Fast track for arrays of integers
+        if isinstance(x, np.ndarray) and x.dtype.kind in ('i', 'u'):
+            return list(collections.OrderedDict.fromkeys(x.astype(str).tolist()))
+
+        # Resolve all annotations and names in one batch
+        queries = [e for e in x if isinstance(e, str) and not _is_int(e)]
+        if queries:
+            resolved = fetch._resolve_skid_queries(queries,
+                                                   remote_instance=remote_instance)
+        else:
+            resolved = {}
+
         skids = []
         for e in x:
-            temp = eval_skids(e, remote_instance=remote_instance)
+            if isinstance(e, str) and e in resolved:
+                temp = resolved[e]
+            else:
+                temp = eval_skids(e, remote_instance=remote_instance)
             if isinstance(temp, (list, np.ndarray)):
-                skids += temp
+                skids += list(temp)
             else:
                 skids.append(temp)
-        return sorted(set(skids), key=skids.index)
+        return list(collections.OrderedDict.fromkeys(skids))
     elif isinstance(x, core.CatmaidNeuron):
         return [x.skeleton_id]
     elif isinstance(x, core.CatmaidNeuronList):